@@ -2,7 +2,7 @@
 GEO Tool 功能模块包
 
 包含所有核心功能模块：
-- 数据存储
+- 数据存储（含读取缓存）
 - 关键词处理
 - 内容评分
 - E-E-A-T 增强
@@ -11,8 +11,12 @@ GEO Tool 功能模块包
 - Schema 生成
 - 话题集群
 - 多模态提示
+- 图片资源库（本地化存储与打包导出）
 - ROI 分析
-- 工作流自动化
+- 工作流自动化（含后台调度）
+- 并发执行（有序分片、进度回调）
+- 断点续跑
+- 执行日志（流式写入与结果摘要）
 - 关键词挖掘
 - 优化技巧
 - 内容指标
@@ -20,4 +24,8 @@ GEO Tool 功能模块包
 - 负面监控
 - 资源推荐
 - 配置优化
+- LLM 网关（共用连接池、调用指标）
+- LLM 生成路由（按延迟与成本选择提供商、对冲请求）
+- LLM 打包调用（多条目合并为一次请求）
+- 离线模拟 LLM（无 API Key 的压测与录制回放）
 """
@@ -0,0 +1,87 @@
+"""
+断点续跑模块
+按 (运行, 步骤, 条目) 记录执行结果与输入哈希，重跑时跳过输入未变化且已完成的条目
+"""
+import hashlib
+import json
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+def compute_inputs_hash(inputs: Any) -> str:
+    """计算输入的稳定哈希（键排序后序列化，无法序列化的对象按字符串处理）"""
+    payload = json.dumps(inputs, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CheckpointStore:
+    """某一次运行的断点记录读写封装"""
+
+    def __init__(self, storage, run_key: str):
+        """
+        初始化断点记录
+
+        Args:
+            storage: DataStorage 实例（仅 SQLite 存储支持断点，JSON 存储下自动禁用）
+            run_key: 运行标识，如 "workflow_execution:12"、"autowrite:<hash>"
+        """
+        self.storage = storage
+        self.run_key = run_key
+        self.enabled = bool(run_key) and getattr(storage, "storage_type", None) == "sqlite"
+
+    def lookup(self, step_key: str, item_key: str, inputs: Any) -> Tuple[bool, Any]:
+        """
+        查找已完成且输入未变化的断点
+
+        Returns:
+            (是否命中, 输出)；输出可能为 None，因此需要通过第一个返回值判断是否命中
+        """
+        if not self.enabled:
+            return False, None
+        checkpoint = self.storage.get_checkpoint(self.run_key, step_key, str(item_key))
+        if (not checkpoint or checkpoint["status"] != "completed"
+                or checkpoint["inputs_hash"] != compute_inputs_hash(inputs)):
+            return False, None
+        return True, checkpoint["output"]
+
+    def save(self, step_key: str, item_key: str, inputs: Any, output: Any):
+        """记录条目已完成"""
+        if self.enabled:
+            self.storage.save_checkpoint(
+                self.run_key, step_key, str(item_key), compute_inputs_hash(inputs), output, "completed"
+            )
+
+    def fail(self, step_key: str, item_key: str, inputs: Any, error: str):
+        """记录条目失败（重跑时会重新执行）"""
+        if self.enabled:
+            self.storage.save_checkpoint(
+                self.run_key, step_key, str(item_key), compute_inputs_hash(inputs), None, "failed", error
+            )
+
+    def run(self, step_key: str, item_key: str, inputs: Any, func: Callable[[], Any]) -> Any:
+        """命中断点则直接返回记录的输出，否则执行 func 并记录结果（失败时记录后继续抛出）"""
+        hit, output = self.lookup(step_key, item_key, inputs)
+        if hit:
+            return output
+        try:
+            output = func()
+        except Exception as e:
+            self.fail(step_key, item_key, inputs, str(e))
+            raise
+        self.save(step_key, item_key, inputs, output)
+        return output
+
+    def summary(self) -> Dict[str, int]:
+        """按状态统计断点数量"""
+        if not self.enabled:
+            return {}
+        return self.storage.get_checkpoint_summary(self.run_key)
+
+    def clear(self):
+        """清除本次运行的全部断点"""
+        if self.enabled:
+            self.storage.delete_checkpoints(self.run_key)
+
+
+def workflow_run_key(execution_id: Optional[int]) -> Optional[str]:
+    """工作流执行记录对应的断点运行标识"""
+    return f"workflow_execution:{execution_id}" if execution_id is not None else None
@@ -0,0 +1,63 @@
+"""
+并发执行工具模块
+提供保持输入顺序的有界线程池执行，用于按关键词分片、按段落并发调用 LLM 等 I/O 密集场景
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+def chunk_list(items: List[Any], size: int) -> List[List[Any]]:
+    """将列表按固定大小切分为若干分片"""
+    size = max(1, int(size or 1))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def run_ordered(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_workers: int = 4,
+    on_done: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> List[Dict[str, Any]]:
+    """
+    在有界线程池中并发执行 func(item)，按输入顺序返回结果
+
+    单个任务失败不会影响其他任务，失败信息记录在对应结果的 error 字段中。
+
+    Args:
+        func: 对每个元素执行的函数
+        items: 输入元素
+        max_workers: 最大并发数
+        on_done: 每个任务完成时的回调（在调用线程中按完成顺序触发），参数为该任务的结果字典
+
+    Returns:
+        [{"index": int, "item": Any, "result": Any, "error": Optional[str]}, ...]，与输入顺序一致
+    """
+    items = list(items)
+    outcomes: List[Dict[str, Any]] = [
+        {"index": i, "item": item, "result": None, "error": None} for i, item in enumerate(items)
+    ]
+    if not items:
+        return outcomes
+
+    workers = max(1, min(int(max_workers or 1), len(items)))
+    if workers == 1:
+        for outcome in outcomes:
+            try:
+                outcome["result"] = func(outcome["item"])
+            except Exception as e:
+                outcome["error"] = str(e)
+            if on_done:
+                on_done(outcome)
+        return outcomes
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(func, outcome["item"]): outcome for outcome in outcomes}
+        for future in as_completed(futures):
+            outcome = futures[future]
+            try:
+                outcome["result"] = future.result()
+            except Exception as e:
+                outcome["error"] = str(e)
+            if on_done:
+                on_done(outcome)
+    return outcomes
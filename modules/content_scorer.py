@@ -8,22 +8,20 @@ from langchain_core.output_parsers import StrOutputParser
 import json
 import re
 
+from modules.llm_batching import run_packed
+
+
+# 批量评分时每次请求最多打包的篇数与内容总字数
+SCORE_PACK_MAX_ITEMS = 4
+SCORE_PACK_MAX_CHARS = 12000
+
 
 class ContentScorer:
     """内容质量评分器"""
     
     def __init__(self):
-        self.scoring_prompt_template = """
-你是一名 GEO（生成式引擎优化）内容质量评估专家。请对以下内容进行全面评估，并给出详细的评分和改进建议。
-
-【内容】
-{content}
-
-【品牌】{brand}
-【优势】{advantages}
-【平台】{platform}
-
-【评估维度】
+        # 评估维度（单篇与批量评分共用）
+        self.scoring_criteria = """【评估维度】
 请从以下维度进行评估（每个维度 0-25 分，总分 100 分）：
 
 1. **结构化程度**（25分）
@@ -50,7 +48,19 @@ class ContentScorer:
    - 是否容易被 AI 提取和引用？
    - 是否符合目标平台的格式要求？
 
-【输出格式】
+"""
+        
+        self.scoring_prompt_template = """
+你是一名 GEO（生成式引擎优化）内容质量评估专家。请对以下内容进行全面评估，并给出详细的评分和改进建议。
+
+【内容】
+{content}
+
+【品牌】{brand}
+【优势】{advantages}
+【平台】{platform}
+
+""" + self.scoring_criteria + """【输出格式】
 请严格按照以下 JSON 格式输出，不要添加任何其他内容：
 
 {{
@@ -78,6 +88,31 @@ class ContentScorer:
   ]
 }}
 
+【开始评估】
+"""
+        
+        # 批量评分：多篇内容打包进一次请求，按 id 返回 JSON 数组
+        self.batch_scoring_prompt_template = """
+你是一名 GEO（生成式引擎优化）内容质量评估专家。请分别评估以下 {count} 篇内容，每篇独立评分，互不参照。
+
+【品牌】{brand}
+【优势】{advantages}
+
+{articles}
+
+""" + self.scoring_criteria + """【输出格式】
+请严格输出一个 JSON 数组，每篇内容一个元素，id 与内容编号一致，不要添加任何其他内容：
+
+[
+  {{
+    "id": <内容编号>,
+    "scores": {{"structure": <0-25>, "brand_mention": <0-25>, "authority": <0-25>, "citations": <0-25>, "total": <0-100>}},
+    "details": {{"structure": "<评估详情>", "brand_mention": "<评估详情>", "authority": "<评估详情>", "citations": "<评估详情>"}},
+    "improvements": ["<改进建议1>", "<改进建议2>", "<改进建议3>"],
+    "strengths": ["<优点1>", "<优点2>"]
+  }}
+]
+
 【开始评估】
 """
     
@@ -114,23 +149,81 @@ class ContentScorer:
             
         except Exception as e:
             # 如果评分失败，返回默认评分
-            return {
-                "scores": {
-                    "structure": 0,
-                    "brand_mention": 0,
-                    "authority": 0,
-                    "citations": 0,
-                    "total": 0
-                },
-                "details": {
-                    "structure": f"评分失败：{str(e)}",
-                    "brand_mention": "",
-                    "authority": "",
-                    "citations": ""
-                },
-                "improvements": ["评分系统暂时无法评估此内容，请手动检查"],
-                "strengths": []
-            }
+            return self._failed_score(e)
+    
+    def score_contents(self, items: List[Dict], brand: str, advantages: str, llm_chain,
+                       max_items: int = SCORE_PACK_MAX_ITEMS, max_chars: int = SCORE_PACK_MAX_CHARS,
+                       max_workers: int = 2) -> Dict:
+        """
+        批量评分：多篇内容打包进一次请求（见 modules.llm_batching.run_packed）
+        
+        整包失败时拆分重试，仍失败的内容逐篇评分；逐篇评分失败时返回与 score_content 相同的默认评分。
+        
+        Args:
+            items: [{"content": str, "platform": str}, ...]
+            brand: 品牌名称
+            advantages: 品牌优势
+            llm_chain: LangChain 链对象（接受 {"input": str} 格式）
+            max_items: 每次请求最多评分的篇数
+            max_chars: 每次请求的内容总字数上限
+            max_workers: 并发请求数
+            
+        Returns:
+            {"scores": [评分字典, ...]（与 items 顺序一致）, "requests": 打包请求数, "single_calls": 逐篇评分次数}
+        """
+        def build_prompt(pack: List[Dict]) -> str:
+            articles = "\n\n".join(
+                f"【内容 {i}】（平台：{item['platform']}）\n{item['content']}" for i, item in enumerate(pack, start=1)
+            )
+            return self.batch_scoring_prompt_template.format(
+                count=len(pack), brand=brand, advantages=advantages, articles=articles
+            )
+        
+        def parse_item(element: Dict, item: Dict) -> Dict:
+            if not isinstance(element.get("scores"), dict) or "total" not in element["scores"]:
+                raise ValueError("缺少 scores.total")
+            return {key: value for key, value in element.items() if key != "id"}
+        
+        def single(item: Dict) -> Dict:
+            try:
+                prompt = self.scoring_prompt_template.format(
+                    content=item["content"], brand=brand, advantages=advantages, platform=item["platform"]
+                )
+                return self._parse_score_result(llm_chain.invoke({"input": prompt}))
+            except Exception as e:
+                return self._failed_score(e)
+        
+        outcome = run_packed(
+            items, build_prompt, llm_chain, parse_item, single=single,
+            max_items=max_items, max_chars=max_chars, size_fn=lambda item: len(item["content"]),
+            max_depth=1, max_workers=max_workers,
+        )
+        return {
+            "scores": [r["result"] if r["result"] is not None else self._failed_score(r["error"])
+                       for r in outcome["results"]],
+            "requests": len(outcome["requests"]),
+            "single_calls": outcome["single_calls"],
+        }
+    
+    def _failed_score(self, error) -> Dict:
+        """评分失败时的默认评分"""
+        return {
+            "scores": {
+                "structure": 0,
+                "brand_mention": 0,
+                "authority": 0,
+                "citations": 0,
+                "total": 0
+            },
+            "details": {
+                "structure": f"评分失败：{error}",
+                "brand_mention": "",
+                "authority": "",
+                "citations": ""
+            },
+            "improvements": ["评分系统暂时无法评估此内容，请手动检查"],
+            "strengths": []
+        }
     
     def _parse_score_result(self, result: str) -> Dict:
         """解析评分结果"""
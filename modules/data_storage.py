@@ -5,12 +5,71 @@
 import sqlite3
 import json
 import os
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Iterator, Tuple
 import pandas as pd
 
 
+# 表数据版本号：save_* 写入后递增（按数据库路径区分，同一进程内所有 DataStorage 实例共享），
+# 读取缓存据此判断底层表是否变化
+_TABLE_GENERATIONS: Dict[Tuple[str, str], int] = {}
+_STATS_CACHE: Dict[Tuple[str, Optional[str]], Tuple[float, Tuple, Dict[str, Any]]] = {}
+_CACHE_LOCK = threading.Lock()
+
+# get_stats 缓存有效期（秒）：本进程写入会立即失效，TTL 用于兜底其他进程（如后台调度器）的写入
+STATS_CACHE_TTL = 30.0
+STATS_TABLES = ("keywords", "articles", "optimizations", "verify_results")
+
+
+# 日汇总表增量更新：把指定 id 范围内的明细按天汇总后累加到汇总表
+# （空值统一记为 ''，保证联合主键可以去重；数值列空值按 0 累加，避免单条空值把汇总行变成 NULL）
+API_CALLS_DAILY_UPSERT = """
+    INSERT INTO api_calls_daily
+        (day, brand, provider, model, operation_type, calls,
+         input_tokens, output_tokens, total_tokens, cost_usd, cost_cny)
+    SELECT DATE(created_at), COALESCE(brand, ''), COALESCE(provider, ''), COALESCE(model, ''),
+           COALESCE(operation_type, ''), COUNT(*),
+           COALESCE(SUM(input_tokens), 0), COALESCE(SUM(output_tokens), 0), COALESCE(SUM(total_tokens), 0),
+           COALESCE(SUM(cost_usd), 0), COALESCE(SUM(cost_cny), 0)
+    FROM api_calls
+    WHERE id > ? AND id <= ?
+    GROUP BY 1, 2, 3, 4, 5
+    ON CONFLICT(day, brand, provider, model, operation_type) DO UPDATE SET
+        calls = calls + excluded.calls,
+        input_tokens = input_tokens + excluded.input_tokens,
+        output_tokens = output_tokens + excluded.output_tokens,
+        total_tokens = total_tokens + excluded.total_tokens,
+        cost_usd = cost_usd + excluded.cost_usd,
+        cost_cny = cost_cny + excluded.cost_cny
+"""
+
+VERIFY_RESULTS_DAILY_UPSERT = """
+    INSERT INTO verify_results_daily (day, brand, verify_model, checks, mentioned, mention_sum)
+    SELECT DATE(created_at), COALESCE(brand, ''), COALESCE(verify_model, ''), COUNT(*),
+           SUM(CASE WHEN mention_count > 0 THEN 1 ELSE 0 END), SUM(COALESCE(mention_count, 0))
+    FROM verify_results
+    WHERE id > ? AND id <= ?
+    GROUP BY 1, 2, 3
+    ON CONFLICT(day, brand, verify_model) DO UPDATE SET
+        checks = checks + excluded.checks,
+        mentioned = mentioned + excluded.mentioned,
+        mention_sum = mention_sum + excluded.mention_sum
+"""
+
+
+def _publish_job_row(row) -> Dict[str, Any]:
+    """发布队列任务行转字典，payload 解析为字典"""
+    job = dict(row)
+    try:
+        job['payload'] = json.loads(job.get('payload') or '{}')
+    except (TypeError, ValueError):
+        job['payload'] = {}
+    return job
+
+
 class DataStorage:
     """统一的数据存储接口，支持SQLite和JSON两种后端"""
     
@@ -22,6 +81,7 @@ class DataStorage:
         """
         self.storage_type = storage_type
         self.db_path = db_path
+        self._cache_scope = os.path.abspath(db_path)
         
         if storage_type == "sqlite":
             self._init_sqlite()
@@ -101,6 +161,37 @@ class DataStorage:
                 )
             """)
             
+            # API 调用日汇总表（按 天/品牌/提供商/模型/操作类型 汇总，写入明细时增量更新）
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS api_calls_daily (
+                    day TEXT NOT NULL,
+                    brand TEXT NOT NULL DEFAULT '',
+                    provider TEXT NOT NULL DEFAULT '',
+                    model TEXT NOT NULL DEFAULT '',
+                    operation_type TEXT NOT NULL DEFAULT '',
+                    calls INTEGER DEFAULT 0,
+                    input_tokens INTEGER DEFAULT 0,
+                    output_tokens INTEGER DEFAULT 0,
+                    total_tokens INTEGER DEFAULT 0,
+                    cost_usd REAL DEFAULT 0.0,
+                    cost_cny REAL DEFAULT 0.0,
+                    PRIMARY KEY (day, brand, provider, model, operation_type)
+                )
+            """)
+            
+            # 验证结果日汇总表（按 天/品牌/验证模型 汇总）
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS verify_results_daily (
+                    day TEXT NOT NULL,
+                    brand TEXT NOT NULL DEFAULT '',
+                    verify_model TEXT NOT NULL DEFAULT '',
+                    checks INTEGER DEFAULT 0,
+                    mentioned INTEGER DEFAULT 0,
+                    mention_sum INTEGER DEFAULT 0,
+                    PRIMARY KEY (day, brand, verify_model)
+                )
+            """)
+            
             # 工作流表
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS workflows (
@@ -129,6 +220,74 @@ class DataStorage:
                 )
             """)
             
+            # 工作流运行队列表（后台调度器使用，lease 防止多副本重复执行）
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS workflow_runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    workflow_id TEXT NOT NULL,
+                    source TEXT NOT NULL DEFAULT 'schedule',
+                    status TEXT NOT NULL DEFAULT 'queued',
+                    scheduled_for TIMESTAMP NOT NULL,
+                    lease_owner TEXT,
+                    lease_expires_at TIMESTAMP,
+                    heartbeat_at TIMESTAMP,
+                    attempts INTEGER DEFAULT 0,
+                    execution_id INTEGER,
+                    error TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    started_at TIMESTAMP,
+                    finished_at TIMESTAMP,
+                    UNIQUE(workflow_id, scheduled_for),
+                    FOREIGN KEY (workflow_id) REFERENCES workflows(id)
+                )
+            """)
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_workflow_runs_status ON workflow_runs(status, scheduled_for)"
+            )
+            
+            # 按品牌过滤的常用查询索引
+            for index_sql in (
+                "CREATE INDEX IF NOT EXISTS idx_keywords_brand ON keywords(brand)",
+                "CREATE INDEX IF NOT EXISTS idx_articles_brand ON articles(brand, platform)",
+                "CREATE INDEX IF NOT EXISTS idx_optimizations_brand ON optimizations(brand)",
+                "CREATE INDEX IF NOT EXISTS idx_verify_results_brand ON verify_results(brand, created_at)",
+                "CREATE INDEX IF NOT EXISTS idx_api_calls_brand ON api_calls(brand, created_at)",
+            ):
+                cursor.execute(index_sql)
+            
+            # 工作流执行日志表（执行期间流式写入，执行记录本身只保存结果摘要）
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS workflow_execution_logs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    execution_id INTEGER NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    level TEXT NOT NULL,
+                    step_index INTEGER,
+                    message TEXT,
+                    FOREIGN KEY (execution_id) REFERENCES workflow_executions(id)
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_workflow_execution_logs_execution
+                ON workflow_execution_logs (execution_id, id)
+            """)
+            
+            # 断点记录表（工作流步骤/条目、批量生成条目的执行结果，用于断点续跑）
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS run_checkpoints (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    run_key TEXT NOT NULL,
+                    step_key TEXT NOT NULL,
+                    item_key TEXT NOT NULL,
+                    inputs_hash TEXT NOT NULL,
+                    output TEXT,
+                    status TEXT NOT NULL,
+                    error TEXT,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(run_key, step_key, item_key)
+                )
+            """)
+            
             # 工作流模板表
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS workflow_templates (
@@ -191,6 +350,58 @@ class DataStorage:
             except sqlite3.OperationalError:
                 # 字段已存在等预期情况，忽略
                 pass
+            
+            # 扩展publish_records表，作为持久化发布队列（租约 + 指数退避 + 幂等键）
+            for column_sql in (
+                "ALTER TABLE publish_records ADD COLUMN idempotency_key TEXT",
+                "ALTER TABLE publish_records ADD COLUMN payload TEXT",
+                "ALTER TABLE publish_records ADD COLUMN next_attempt_at TIMESTAMP",
+                "ALTER TABLE publish_records ADD COLUMN lease_owner TEXT",
+                "ALTER TABLE publish_records ADD COLUMN lease_expires_at TIMESTAMP",
+                "ALTER TABLE publish_records ADD COLUMN updated_at TIMESTAMP",
+            ):
+                try:
+                    cursor.execute(column_sql)
+                except sqlite3.OperationalError:
+                    # 字段已存在等预期情况，忽略
+                    pass
+            # 同一幂等键（平台 + 目标 + 内容哈希）只会存在一个队列任务；手工发布记录的幂等键为 NULL，不受约束
+            cursor.execute("""
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_publish_records_idempotency
+                ON publish_records(idempotency_key) WHERE idempotency_key IS NOT NULL
+            """)
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_publish_records_queue ON publish_records(publish_status, next_attempt_at)"
+            )
+            
+            # 扩展workflow_executions表，记录步骤/分片执行进度（JSON）
+            try:
+                cursor.execute("ALTER TABLE workflow_executions ADD COLUMN progress TEXT")
+            except sqlite3.OperationalError:
+                # 字段已存在等预期情况，忽略
+                pass
+            
+            # 扩展workflow_executions表，记录初始上下文（断点续跑时恢复）
+            try:
+                cursor.execute("ALTER TABLE workflow_executions ADD COLUMN context TEXT")
+            except sqlite3.OperationalError:
+                # 字段已存在等预期情况，忽略
+                pass
+            
+            # 扩展workflow_executions表，记录执行心跳（防止其他会话/进程同时恢复同一条执行）
+            try:
+                cursor.execute("ALTER TABLE workflow_executions ADD COLUMN heartbeat_at TIMESTAMP")
+            except sqlite3.OperationalError:
+                # 字段已存在等预期情况，忽略
+                pass
+            
+            # 旧数据库首次升级：汇总表为空但已有明细时，从明细回填
+            for raw_table, daily_table in (("api_calls", "api_calls_daily"), ("verify_results", "verify_results_daily")):
+                cursor.execute(f"""
+                    SELECT EXISTS(SELECT 1 FROM {raw_table}) AND NOT EXISTS(SELECT 1 FROM {daily_table})
+                """)
+                if cursor.fetchone()[0]:
+                    self._rebuild_daily_rollup(cursor, raw_table)
     
     def _init_json(self):
         """初始化JSON存储目录"""
@@ -226,6 +437,7 @@ class DataStorage:
             
             with open(json_file, 'w', encoding='utf-8') as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
+        self._touch("keywords")
     
     def get_keywords(self, brand: Optional[str] = None) -> List[str]:
         """获取关键词列表"""
@@ -253,8 +465,8 @@ class DataStorage:
     # ==================== 文章内容相关 ====================
     
     def save_article(self, keyword: str, platform: str, content: str, 
-                     filename: str, brand: str):
-        """保存生成的文章"""
+                     filename: str, brand: str) -> Optional[int]:
+        """保存生成的文章，SQLite 存储返回文章ID"""
         if self.storage_type == "sqlite":
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
@@ -263,6 +475,9 @@ class DataStorage:
                     VALUES (?, ?, ?, ?, ?)
                 """, (keyword, platform, content, filename, brand))
                 conn.commit()
+                article_id = cursor.lastrowid
+            self._touch("articles")
+            return article_id
         else:
             json_file = Path(self.db_path) / "articles.json"
             data = []
@@ -281,6 +496,7 @@ class DataStorage:
             
             with open(json_file, 'w', encoding='utf-8') as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
+            self._touch("articles")
     
     def get_articles(self, brand: Optional[str] = None, 
                      platform: Optional[str] = None) -> List[Dict]:
@@ -315,6 +531,45 @@ class DataStorage:
                 return [item for item in data if item.get("brand") == brand]
             return data
     
+    def iter_articles(self, brand: Optional[str] = None,
+                      columns: Tuple[str, ...] = ("id", "keyword", "platform", "brand", "created_at"),
+                      batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        逐条迭代文章（SQLite 按批从游标读取，不把全表载入内存），用于 sitemap 等全量导出
+        
+        Args:
+            brand: 按品牌过滤（可选）
+            columns: 读取的字段（默认不读取正文 content）
+            batch_size: 每批从游标读取的行数
+        """
+        if self.storage_type == "sqlite":
+            # 字段名来自调用方代码，这里仍限制为合法标识符，避免拼接出任意 SQL
+            for column in columns:
+                if not column.isidentifier():
+                    raise ValueError(f"非法字段名: {column}")
+            query = f"SELECT {', '.join(columns)} FROM articles"
+            params = []
+            if brand:
+                query += " WHERE brand = ?"
+                params.append(brand)
+            query += " ORDER BY id"
+            # 调用方可能中途停止迭代，连接在生成器关闭时释放
+            conn = sqlite3.connect(self.db_path)
+            try:
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield dict(zip(columns, row))
+            finally:
+                conn.close()
+        else:
+            for item in self.get_articles(brand=brand):
+                yield {column: item.get(column) for column in columns}
+    
     # ==================== 优化记录相关 ====================
     
     def save_optimization(self, original_content: str, optimized_content: str,
@@ -347,6 +602,7 @@ class DataStorage:
             
             with open(json_file, 'w', encoding='utf-8') as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
+        self._touch("optimizations")
     
     def get_optimizations(self, brand: Optional[str] = None) -> List[Dict]:
         """获取优化记录"""
@@ -380,8 +636,12 @@ class DataStorage:
     def save_verify_results(self, results: List[Dict]):
         """批量保存验证结果"""
         if self.storage_type == "sqlite":
-            with sqlite3.connect(self.db_path) as conn:
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
                 cursor = conn.cursor()
+                # 先取得写锁再读 MAX(id)：否则并发写入方读到同一个 last_id，会把对方的明细也累加进日汇总表
+                cursor.execute("BEGIN IMMEDIATE")
+                cursor.execute("SELECT COALESCE(MAX(id), 0) FROM verify_results")
+                last_id = cursor.fetchone()[0]
                 for result in results:
                     cursor.execute("""
                         INSERT INTO verify_results 
@@ -394,6 +654,8 @@ class DataStorage:
                         result.get("提及次数"),
                         result.get("位置")
                     ))
+                # 同一事务内增量更新日汇总表
+                cursor.execute(VERIFY_RESULTS_DAILY_UPSERT, (last_id, cursor.lastrowid or last_id))
                 conn.commit()
         else:
             json_file = Path(self.db_path) / "verify_results.json"
@@ -414,6 +676,7 @@ class DataStorage:
             
             with open(json_file, 'w', encoding='utf-8') as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
+        self._touch("verify_results", "verify_results_daily")
     
     def get_verify_results(self, brand: Optional[str] = None, include_timestamp: bool = False) -> pd.DataFrame:
         """获取验证结果（返回DataFrame）
@@ -489,43 +752,67 @@ class DataStorage:
                 df = df.sort_values("验证时间", ascending=False)
             return df
     
+    # ==================== 读取缓存与失效 ====================
+    
+    def _touch(self, *tables: str):
+        """标记表数据已变化：递增版本号，依赖这些表的读取缓存随之失效"""
+        with _CACHE_LOCK:
+            for table in tables:
+                key = (self._cache_scope, table)
+                _TABLE_GENERATIONS[key] = _TABLE_GENERATIONS.get(key, 0) + 1
+    
+    def table_generation(self, table: str) -> int:
+        """获取表数据版本号（本进程内每次写入该表后递增）"""
+        with _CACHE_LOCK:
+            return _TABLE_GENERATIONS.get((self._cache_scope, table), 0)
+    
     # ==================== 统计功能 ====================
     
     def get_stats(self, brand: Optional[str] = None) -> Dict[str, Any]:
-        """获取统计数据"""
+        """
+        获取统计数据
+        
+        结果按 (数据库, 品牌) 缓存：本进程写入相关表后立即失效，其余情况最多缓存 STATS_CACHE_TTL 秒；
+        JSON 存储还会比对文件修改时间，其他进程写入后也能及时失效。
+        """
+        token: Tuple = tuple(self.table_generation(table) for table in STATS_TABLES)
+        if self.storage_type != "sqlite":
+            token += tuple(self._json_mtime(table) for table in STATS_TABLES)
+        cache_key = (self._cache_scope, brand)
+        now = time.monotonic()
+        with _CACHE_LOCK:
+            cached = _STATS_CACHE.get(cache_key)
+            if cached and cached[0] > now and cached[1] == token:
+                return dict(cached[2])
+        
+        stats = self._query_stats(brand)
+        with _CACHE_LOCK:
+            _STATS_CACHE[cache_key] = (now + STATS_CACHE_TTL, token, stats)
+        return dict(stats)
+    
+    def _json_mtime(self, table: str) -> float:
+        """JSON 存储文件的修改时间（文件不存在时为 0）"""
+        try:
+            return os.stat(Path(self.db_path) / f"{table}.json").st_mtime
+        except OSError:
+            return 0.0
+    
+    def _query_stats(self, brand: Optional[str] = None) -> Dict[str, Any]:
+        """查询统计数据（SQLite 下一条语句完成全部计数）"""
         stats = {}
         
         if self.storage_type == "sqlite":
+            where = " WHERE brand = ?" if brand else ""
+            params = (brand,) * len(STATS_TABLES) if brand else ()
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
-                
-                # 关键词数量
-                if brand:
-                    cursor.execute("SELECT COUNT(*) FROM keywords WHERE brand = ?", (brand,))
-                else:
-                    cursor.execute("SELECT COUNT(*) FROM keywords")
-                stats["keywords_count"] = cursor.fetchone()[0]
-                
-                # 文章数量
-                if brand:
-                    cursor.execute("SELECT COUNT(*) FROM articles WHERE brand = ?", (brand,))
-                else:
-                    cursor.execute("SELECT COUNT(*) FROM articles")
-                stats["articles_count"] = cursor.fetchone()[0]
-                
-                # 优化记录数量
-                if brand:
-                    cursor.execute("SELECT COUNT(*) FROM optimizations WHERE brand = ?", (brand,))
-                else:
-                    cursor.execute("SELECT COUNT(*) FROM optimizations")
-                stats["optimizations_count"] = cursor.fetchone()[0]
-                
-                # 验证结果数量
-                if brand:
-                    cursor.execute("SELECT COUNT(*) FROM verify_results WHERE brand = ?", (brand,))
-                else:
-                    cursor.execute("SELECT COUNT(*) FROM verify_results")
-                stats["verify_results_count"] = cursor.fetchone()[0]
+                cursor.execute(
+                    "SELECT " + ", ".join(f"(SELECT COUNT(*) FROM {table}{where})" for table in STATS_TABLES),
+                    params
+                )
+                row = cursor.fetchone()
+            stats["keywords_count"], stats["articles_count"], \
+                stats["optimizations_count"], stats["verify_results_count"] = row
         else:
             # JSON方式统计
             keywords_file = Path(self.db_path) / "keywords.json"
@@ -578,6 +865,8 @@ class DataStorage:
                     operation_type, provider, model, input_tokens, output_tokens, total_tokens,
                     cost_usd, cost_cny, keyword, platform, brand
                 ))
+                # 同一事务内增量更新日汇总表
+                cursor.execute(API_CALLS_DAILY_UPSERT, (cursor.lastrowid - 1, cursor.lastrowid))
                 conn.commit()
         else:
             json_file = Path(self.db_path) / "api_calls.json"
@@ -603,6 +892,7 @@ class DataStorage:
             
             with open(json_file, 'w', encoding='utf-8') as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
+        self._touch("api_calls", "api_calls_daily")
     
     def get_api_calls(
         self,
@@ -697,14 +987,15 @@ class DataStorage:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
+                # 读取日汇总表，耗时只与天数相关，与明细行数无关
                 if brand:
                     cursor.execute("""
                         SELECT 
                             SUM(cost_usd) as total_usd,
                             SUM(cost_cny) as total_cny,
                             SUM(total_tokens) as total_tokens,
-                            COUNT(*) as total_calls
-                        FROM api_calls WHERE brand = ?
+                            SUM(calls) as total_calls
+                        FROM api_calls_daily WHERE brand = ?
                     """, (brand,))
                 else:
                     cursor.execute("""
@@ -712,8 +1003,8 @@ class DataStorage:
                             SUM(cost_usd) as total_usd,
                             SUM(cost_cny) as total_cny,
                             SUM(total_tokens) as total_tokens,
-                            COUNT(*) as total_calls
-                        FROM api_calls
+                            SUM(calls) as total_calls
+                        FROM api_calls_daily
                     """)
                 
                 row = cursor.fetchone()
@@ -747,6 +1038,123 @@ class DataStorage:
                 "total_calls": len(data)
             }
     
+    def get_api_call_breakdowns(self, brand: Optional[str] = None) -> Dict[str, Any]:
+        """
+        按维度汇总 API 调用成本（SQLite 下由 GROUP BY 在数据库内完成，不加载明细）
+        
+        Returns:
+            {"totals": get_cost_stats() 结构,
+             "operation"/"provider"/"keyword"/"platform"/"day": DataFrame(key, cost_usd, cost_cny, calls, tokens)}
+        """
+        breakdowns: Dict[str, Any] = {"totals": self.get_cost_stats(brand)}
+        
+        if self.storage_type == "sqlite":
+            where, params = ("WHERE brand = ?", [brand]) if brand else ("", [])
+            # 操作类型/提供商/日期 读取日汇总表；关键词/平台不在汇总键中，仍从明细汇总
+            dimensions = {
+                "operation": ("NULLIF(operation_type, '')", "api_calls_daily", "SUM(calls)"),
+                "provider": ("NULLIF(provider, '')", "api_calls_daily", "SUM(calls)"),
+                "day": ("day", "api_calls_daily", "SUM(calls)"),
+                "keyword": ("keyword", "api_calls", "COUNT(*)"),
+                "platform": ("platform", "api_calls", "COUNT(*)"),
+            }
+            with sqlite3.connect(self.db_path) as conn:
+                for name, (expr, table, calls_expr) in dimensions.items():
+                    breakdowns[name] = pd.read_sql_query(f"""
+                        SELECT {expr} AS key,
+                               SUM(cost_usd) AS cost_usd,
+                               SUM(cost_cny) AS cost_cny,
+                               {calls_expr} AS calls,
+                               SUM(total_tokens) AS tokens
+                        FROM {table} {where}
+                        GROUP BY key
+                        HAVING key IS NOT NULL
+                        ORDER BY key
+                    """, conn, params=params)
+            return breakdowns
+        
+        df = self.get_api_calls(brand=brand)
+        if df.empty:
+            return breakdowns
+        df = df.assign(日期=pd.to_datetime(df["调用时间"]).dt.strftime("%Y-%m-%d"))
+        columns = {"operation": "操作类型", "provider": "提供商", "keyword": "关键词", "platform": "平台", "day": "日期"}
+        for name, column in columns.items():
+            breakdowns[name] = df.groupby(column, sort=True).agg(
+                cost_usd=("成本(USD)", "sum"),
+                cost_cny=("成本(CNY)", "sum"),
+                calls=("成本(USD)", "size"),
+                tokens=("总Token", "sum"),
+            ).rename_axis("key").reset_index()
+        return breakdowns
+    
+    # ==================== 日汇总表 ====================
+    
+    def _rebuild_daily_rollup(self, cursor, raw_table: str):
+        """清空并从明细重新生成某张日汇总表"""
+        daily_table, upsert = {
+            "api_calls": ("api_calls_daily", API_CALLS_DAILY_UPSERT),
+            "verify_results": ("verify_results_daily", VERIFY_RESULTS_DAILY_UPSERT),
+        }[raw_table]
+        cursor.execute(f"DELETE FROM {daily_table}")
+        cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {raw_table}")
+        cursor.execute(upsert, (0, cursor.fetchone()[0]))
+    
+    def rebuild_daily_rollups(self) -> Dict[str, int]:
+        """
+        从明细重建全部日汇总表（汇总表与明细不一致时的修复/压实任务）
+        
+        Returns:
+            各汇总表重建后的行数
+        """
+        self._require_sqlite("日汇总表")
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            counts = {}
+            for raw_table in ("api_calls", "verify_results"):
+                self._rebuild_daily_rollup(cursor, raw_table)
+                cursor.execute(f"SELECT COUNT(*) FROM {raw_table}_daily")
+                counts[f"{raw_table}_daily"] = cursor.fetchone()[0]
+            conn.commit()
+        self._touch("api_calls_daily", "verify_results_daily")
+        return counts
+    
+    def get_daily_mention_stats(self, brand: Optional[str] = None) -> pd.DataFrame:
+        """
+        按 天/验证模型 获取提及统计（SQLite 下读取日汇总表）
+        
+        Returns:
+            DataFrame：日期、验证模型、验证次数、提及次数合计、被提及次数、平均提及次数、提及率
+        """
+        if self.storage_type == "sqlite":
+            where, params = ("WHERE brand = ?", (brand,)) if brand else ("", ())
+            with sqlite3.connect(self.db_path) as conn:
+                df = pd.read_sql_query(f"""
+                    SELECT day AS "日期", verify_model AS "验证模型",
+                           SUM(checks) AS "验证次数", SUM(mention_sum) AS "提及次数合计",
+                           SUM(mentioned) AS "被提及次数"
+                    FROM verify_results_daily {where}
+                    GROUP BY day, verify_model
+                    ORDER BY day
+                """, conn, params=params)
+        else:
+            raw = self.get_verify_results(brand=brand, include_timestamp=True)
+            if raw.empty:
+                return pd.DataFrame(columns=["日期", "验证模型", "验证次数", "提及次数合计", "被提及次数", "平均提及次数", "提及率"])
+            raw = raw.assign(
+                日期=pd.to_datetime(raw["验证时间"]).dt.strftime("%Y-%m-%d"),
+                被提及=(raw["提及次数"].fillna(0) > 0).astype(int)
+            )
+            df = raw.groupby(["日期", "验证模型"], sort=True).agg(
+                验证次数=("提及次数", "size"),
+                提及次数合计=("提及次数", "sum"),
+                被提及次数=("被提及", "sum"),
+            ).reset_index()
+        
+        df["平均提及次数"] = df["提及次数合计"] / df["验证次数"]
+        df["提及率"] = df["被提及次数"] / df["验证次数"]
+        return df
+    
     # ==================== 工作流相关 ====================
     
     def save_workflow(self, workflow: Dict[str, Any]) -> str:
@@ -897,24 +1305,27 @@ class DataStorage:
                 json.dump(data, f, ensure_ascii=False, indent=2)
             return True
     
-    def save_workflow_execution(self, execution: Dict[str, Any]):
-        """保存工作流执行记录"""
+    def save_workflow_execution(self, execution: Dict[str, Any]) -> Optional[int]:
+        """保存工作流执行记录，返回执行记录ID"""
         if self.storage_type == "sqlite":
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT INTO workflow_executions 
-                    (workflow_id, status, result, started_at, completed_at, error)
-                    VALUES (?, ?, ?, ?, ?, ?)
+                    (workflow_id, status, result, started_at, completed_at, error, context, heartbeat_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """, (
                     execution.get("workflow_id"),
                     execution.get("status"),
                     json.dumps(execution.get("result", {}), ensure_ascii=False),
                     execution.get("started_at"),
                     execution.get("completed_at"),
-                    execution.get("error")
+                    execution.get("error"),
+                    json.dumps(execution.get("context", {}), ensure_ascii=False),
+                    execution.get("heartbeat_at")
                 ))
                 conn.commit()
+                return cursor.lastrowid
         else:
             json_file = Path(self.db_path) / "workflow_executions.json"
             data = []
@@ -922,10 +1333,122 @@ class DataStorage:
                 with open(json_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
             
+            execution["id"] = max([e.get("id", 0) or 0 for e in data], default=0) + 1
             data.append(execution)
             
             with open(json_file, 'w', encoding='utf-8') as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
+            return execution["id"]
+    
+    def update_workflow_execution(self, execution_id: int, updates: Dict[str, Any]) -> bool:
+        """
+        更新工作流执行记录（状态、结果、进度等）
+        
+        Args:
+            execution_id: 执行记录ID
+            updates: 需要更新的字段，支持 status/result/progress/context/completed_at/error/heartbeat_at
+        """
+        json_fields = {"result", "progress", "context"}
+        allowed = ["status", "result", "progress", "context", "completed_at", "error", "heartbeat_at"]
+        fields = [k for k in allowed if k in updates]
+        if not fields:
+            return False
+        
+        if self.storage_type == "sqlite":
+            values = [
+                json.dumps(updates[k], ensure_ascii=False) if k in json_fields else updates[k]
+                for k in fields
+            ]
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    f"UPDATE workflow_executions SET {', '.join(f'{k} = ?' for k in fields)} WHERE id = ?",
+                    (*values, execution_id)
+                )
+                conn.commit()
+                return cursor.rowcount == 1
+        else:
+            json_file = Path(self.db_path) / "workflow_executions.json"
+            if not json_file.exists():
+                return False
+            
+            with open(json_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            
+            updated = False
+            for execution in data:
+                if execution.get("id") == execution_id:
+                    execution.update({k: updates[k] for k in fields})
+                    updated = True
+            
+            if updated:
+                with open(json_file, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+            return updated
+    
+    def claim_workflow_execution(self, execution_id: int, now: str, stale_before: Optional[str] = None) -> bool:
+        """
+        把执行记录标记为运行中并写入心跳（恢复执行前调用）
+        
+        Args:
+            execution_id: 执行记录ID
+            now: 当前时间（写入 heartbeat_at）
+            stale_before: 执行记录为 running 且心跳不早于该时间时视为仍在其他会话/进程中执行，领取失败；
+                为 None 时无条件领取（调用方已通过调度器租约保证互斥）
+        
+        Returns:
+            是否领取成功
+        """
+        if self.storage_type == "sqlite":
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    UPDATE workflow_executions
+                    SET status = 'running', completed_at = NULL, error = NULL, heartbeat_at = ?
+                    WHERE id = ? AND (? IS NULL OR status != 'running' OR COALESCE(heartbeat_at, '') < ?)
+                """, (now, execution_id, stale_before, stale_before))
+                conn.commit()
+                return cursor.rowcount == 1
+        else:
+            execution = self.get_workflow_execution(execution_id)
+            if not execution:
+                return False
+            if (stale_before is not None and execution.get("status") == "running"
+                    and (execution.get("heartbeat_at") or "") >= stale_before):
+                return False
+            return self.update_workflow_execution(execution_id, {
+                "status": "running", "completed_at": None, "error": None, "heartbeat_at": now
+            })
+    
+    def get_workflow_execution(self, execution_id: int) -> Optional[Dict[str, Any]]:
+        """获取单条工作流执行记录（result/progress/context 已解析为对象）"""
+        if self.storage_type == "sqlite":
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                cursor = conn.cursor()
+                cursor.execute("SELECT * FROM workflow_executions WHERE id = ?", (execution_id,))
+                row = cursor.fetchone()
+            if not row:
+                return None
+            execution = dict(row)
+            for key in ("result", "progress", "context"):
+                try:
+                    execution[key] = json.loads(execution[key]) if execution.get(key) else {}
+                except ValueError:
+                    execution[key] = {}
+            return execution
+        else:
+            json_file = Path(self.db_path) / "workflow_executions.json"
+            if not json_file.exists():
+                return None
+            
+            with open(json_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            
+            for execution in data:
+                if execution.get("id") == execution_id:
+                    return execution
+            return None
     
     def get_workflow_executions(self, workflow_id: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
         """获取工作流执行记录"""
@@ -955,6 +1478,280 @@ class DataStorage:
             
             return sorted(data, key=lambda x: x.get("started_at", ""), reverse=True)[:limit]
     
+    # ==================== 工作流执行日志 ====================
+    
+    def append_workflow_logs(self, execution_id: int, entries: List[Dict[str, Any]]):
+        """批量追加执行日志"""
+        if self.storage_type != "sqlite" or not entries:
+            return
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT INTO workflow_execution_logs (execution_id, timestamp, level, step_index, message)
+                VALUES (?, ?, ?, ?, ?)
+            """, [
+                (execution_id, e.get("timestamp"), e.get("level", "info"), e.get("step_index"), e.get("message"))
+                for e in entries
+            ])
+            conn.commit()
+    
+    def get_workflow_logs(self, execution_id: int, levels: Optional[List[str]] = None,
+                          limit: int = 500, offset: int = 0) -> List[Dict[str, Any]]:
+        """按写入顺序获取执行日志，可按级别过滤并分页"""
+        if self.storage_type != "sqlite":
+            return []
+        query = "SELECT timestamp, level, step_index, message FROM workflow_execution_logs WHERE execution_id = ?"
+        params: List[Any] = [execution_id]
+        if levels:
+            query += f" AND level IN ({', '.join('?' for _ in levels)})"
+            params.extend(levels)
+        query += " ORDER BY id LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return [dict(row) for row in cursor.fetchall()]
+    
+    # ==================== 断点记录（断点续跑） ====================
+    
+    def save_checkpoint(self, run_key: str, step_key: str, item_key: str, inputs_hash: str,
+                        output: Any = None, status: str = "completed", error: Optional[str] = None):
+        """保存（覆盖）一条断点记录"""
+        self._require_sqlite("断点续跑")
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT INTO run_checkpoints (run_key, step_key, item_key, inputs_hash, output, status, error, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(run_key, step_key, item_key) DO UPDATE SET
+                    inputs_hash = excluded.inputs_hash, output = excluded.output,
+                    status = excluded.status, error = excluded.error, updated_at = excluded.updated_at
+            """, (
+                run_key, step_key, item_key, inputs_hash,
+                json.dumps(output, ensure_ascii=False, default=str),
+                status, error, datetime.now().isoformat()
+            ))
+            conn.commit()
+    
+    def get_checkpoint(self, run_key: str, step_key: str, item_key: str) -> Optional[Dict[str, Any]]:
+        """获取一条断点记录（output 已解析）"""
+        self._require_sqlite("断点续跑")
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT inputs_hash, output, status, error, updated_at FROM run_checkpoints
+                WHERE run_key = ? AND step_key = ? AND item_key = ?
+            """, (run_key, step_key, item_key))
+            row = cursor.fetchone()
+        if not row:
+            return None
+        return {
+            "inputs_hash": row[0],
+            "output": json.loads(row[1]) if row[1] else None,
+            "status": row[2],
+            "error": row[3],
+            "updated_at": row[4]
+        }
+    
+    def get_checkpoint_summary(self, run_key: str) -> Dict[str, int]:
+        """按状态统计断点记录数量，如 {"completed": 150, "failed": 1}"""
+        if self.storage_type != "sqlite":
+            return {}
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT status, COUNT(*) FROM run_checkpoints WHERE run_key = ? GROUP BY status",
+                (run_key,)
+            )
+            return {status: count for status, count in cursor.fetchall()}
+    
+    def delete_checkpoints(self, run_key: str):
+        """删除某次运行的全部断点记录"""
+        self._require_sqlite("断点续跑")
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM run_checkpoints WHERE run_key = ?", (run_key,))
+            conn.commit()
+    
+    # ==================== 工作流运行队列（调度器） ====================
+    
+    def _require_sqlite(self, feature: str):
+        """仅 SQLite 后端支持的功能统一校验"""
+        if self.storage_type != "sqlite":
+            raise ValueError(f"{feature} 仅支持 SQLite 存储")
+    
+    def enqueue_workflow_run(self, workflow_id: str, scheduled_for: str,
+                             source: str = "schedule") -> Optional[int]:
+        """
+        将一次工作流运行加入队列
+        
+        同一 (workflow_id, scheduled_for) 只会入队一次，多个调度器副本同时入队时自动去重。
+        
+        Returns:
+            新运行记录ID；已存在时返回 None
+        """
+        self._require_sqlite("工作流运行队列")
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR IGNORE INTO workflow_runs (workflow_id, source, status, scheduled_for)
+                VALUES (?, ?, 'queued', ?)
+            """, (workflow_id, source, scheduled_for))
+            conn.commit()
+            return cursor.lastrowid if cursor.rowcount else None
+    
+    def get_last_scheduled_run_time(self, workflow_id: str) -> Optional[str]:
+        """获取工作流最近一次定时入队的计划时间"""
+        self._require_sqlite("工作流运行队列")
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT MAX(scheduled_for) FROM workflow_runs WHERE workflow_id = ? AND source = 'schedule'",
+                (workflow_id,)
+            )
+            row = cursor.fetchone()
+        return row[0] if row else None
+    
+    def claim_workflow_run(self, owner: str, now: str, lease_expires_at: str,
+                           max_attempts: int = 3) -> Optional[Dict[str, Any]]:
+        """
+        原子地领取一个待执行的运行（带租约）
+        
+        可领取：到期的 queued 运行，或租约已过期的 running 运行（原持有者已失联）。
+        同一工作流已有有效租约在执行时不会被再次领取，避免重复执行。
+        
+        Args:
+            owner: 领取者标识（主机名:进程号:随机串）
+            now: 当前时间（ISO 格式）
+            lease_expires_at: 租约到期时间（ISO 格式）
+            max_attempts: 最大尝试次数，超出后标记为失败
+        
+        Returns:
+            领取到的运行记录，没有可领取的运行时返回 None
+        """
+        self._require_sqlite("工作流运行队列")
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            
+            # 租约过期且重试次数耗尽的运行直接标记失败
+            cursor.execute("""
+                UPDATE workflow_runs
+                SET status = 'failed', error = '租约过期且超过最大重试次数', finished_at = ?,
+                    lease_owner = NULL, lease_expires_at = NULL
+                WHERE status = 'running' AND lease_expires_at < ? AND attempts >= ?
+            """, (now, now, max_attempts))
+            
+            cursor.execute("""
+                SELECT * FROM workflow_runs r
+                WHERE ((r.status = 'queued' AND r.scheduled_for <= ?)
+                       OR (r.status = 'running' AND r.lease_expires_at < ?))
+                  AND NOT EXISTS (
+                      SELECT 1 FROM workflow_runs o
+                      WHERE o.workflow_id = r.workflow_id AND o.id != r.id
+                        AND o.status = 'running' AND o.lease_expires_at >= ?
+                  )
+                ORDER BY r.scheduled_for, r.id
+                LIMIT 1
+            """, (now, now, now))
+            row = cursor.fetchone()
+            if not row:
+                cursor.execute("COMMIT")
+                return None
+            
+            cursor.execute("""
+                UPDATE workflow_runs
+                SET status = 'running', lease_owner = ?, lease_expires_at = ?, heartbeat_at = ?,
+                    attempts = attempts + 1, started_at = COALESCE(started_at, ?), error = NULL
+                WHERE id = ?
+            """, (owner, lease_expires_at, now, now, row["id"]))
+            cursor.execute("SELECT * FROM workflow_runs WHERE id = ?", (row["id"],))
+            claimed = dict(cursor.fetchone())
+            cursor.execute("COMMIT")
+            return claimed
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+    
+    def heartbeat_workflow_run(self, run_id: int, owner: str, now: str, lease_expires_at: str) -> bool:
+        """续租：仅当租约仍由 owner 持有时才会成功"""
+        self._require_sqlite("工作流运行队列")
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE workflow_runs SET lease_expires_at = ?, heartbeat_at = ?
+                WHERE id = ? AND lease_owner = ? AND status = 'running'
+            """, (lease_expires_at, now, run_id, owner))
+            conn.commit()
+            return cursor.rowcount == 1
+    
+    def attach_workflow_run_execution(self, run_id: int, owner: str, execution_id: int) -> bool:
+        """运行开始时关联执行记录，租约过期后接手的副本可据此从断点恢复"""
+        self._require_sqlite("工作流运行队列")
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE workflow_runs SET execution_id = ?
+                WHERE id = ? AND lease_owner = ? AND status = 'running'
+            """, (execution_id, run_id, owner))
+            conn.commit()
+            return cursor.rowcount == 1
+    
+    def get_execution_workflow_run(self, execution_id: int) -> Optional[Dict[str, Any]]:
+        """获取关联到执行记录、仍处于 running 的运行（含租约信息），没有时返回 None"""
+        if self.storage_type != "sqlite":
+            return None
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM workflow_runs
+                WHERE execution_id = ? AND status = 'running'
+                ORDER BY id DESC LIMIT 1
+            """, (execution_id,))
+            row = cursor.fetchone()
+        return dict(row) if row else None
+    
+    def finish_workflow_run(self, run_id: int, owner: str, status: str, finished_at: str,
+                            execution_id: Optional[int] = None, error: Optional[str] = None) -> bool:
+        """结束运行并释放租约；租约已被他人接管时返回 False"""
+        self._require_sqlite("工作流运行队列")
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE workflow_runs
+                SET status = ?, finished_at = ?, execution_id = ?, error = ?,
+                    lease_owner = NULL, lease_expires_at = NULL
+                WHERE id = ? AND lease_owner = ? AND status = 'running'
+            """, (status, finished_at, execution_id, error, run_id, owner))
+            conn.commit()
+            return cursor.rowcount == 1
+    
+    def get_workflow_runs(self, workflow_id: Optional[str] = None,
+                          status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """获取工作流运行队列记录"""
+        if self.storage_type != "sqlite":
+            return []
+        with sqlite3.connect(self.db_path) as conn:
+            query = "SELECT * FROM workflow_runs WHERE 1=1"
+            params = []
+            if workflow_id:
+                query += " AND workflow_id = ?"
+                params.append(workflow_id)
+            if status:
+                query += " AND status = ?"
+                params.append(status)
+            query += " ORDER BY scheduled_for DESC, id DESC LIMIT ?"
+            params.append(limit)
+            df = pd.read_sql_query(query, conn, params=params)
+        return df.to_dict('records')
+    
     def save_workflow_template(self, template: Dict[str, Any]) -> str:
         """保存工作流模板"""
         import uuid
@@ -1240,6 +2037,201 @@ class DataStorage:
             
             return data
     
+    # ==================== 发布队列（publish_records 中带幂等键的任务） ====================
+    
+    def enqueue_publish_job(self, article_id: Optional[int], platform: str, idempotency_key: str,
+                            payload: Dict[str, Any], now: str) -> Dict[str, Any]:
+        """
+        将一篇文章的发布任务加入队列
+        
+        同一幂等键只会存在一个任务：已排队、发布中或已成功的任务不会重复入队；
+        已失败的任务重新入队（尝试次数清零）。
+        
+        Args:
+            article_id: 文章ID
+            platform: 发布平台
+            idempotency_key: 幂等键（平台 + 发布目标 + 内容哈希）
+            payload: 发布所需数据（标题、内容、文件路径、品牌等），入队时快照
+            now: 当前时间（ISO 格式）
+        
+        Returns:
+            {'id': int, 'status': str, 'created': bool}
+        """
+        self._require_sqlite("发布队列")
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR IGNORE INTO publish_records
+                (article_id, platform, publish_method, publish_status, retry_count,
+                 idempotency_key, payload, next_attempt_at, updated_at)
+                VALUES (?, ?, 'queue', 'pending', 0, ?, ?, ?, ?)
+            """, (article_id, platform, idempotency_key, json.dumps(payload, ensure_ascii=False), now, now))
+            if cursor.rowcount:
+                conn.commit()
+                return {'id': cursor.lastrowid, 'status': 'pending', 'created': True}
+            
+            cursor.execute("""
+                UPDATE publish_records
+                SET publish_status = 'pending', retry_count = 0, error_message = NULL,
+                    next_attempt_at = ?, updated_at = ?, lease_owner = NULL, lease_expires_at = NULL
+                WHERE idempotency_key = ? AND publish_status = 'failed'
+            """, (now, now, idempotency_key))
+            requeued = cursor.rowcount == 1
+            cursor.execute(
+                "SELECT id, publish_status FROM publish_records WHERE idempotency_key = ?",
+                (idempotency_key,)
+            )
+            job_id, status = cursor.fetchone()
+            conn.commit()
+        return {'id': job_id, 'status': status, 'created': requeued}
+    
+    def claim_publish_job(self, owner: str, now: str, lease_expires_at: str, max_attempts: int = 5,
+                          exclude_platforms: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        原子地领取一个到期的发布任务（带租约），retry_count 记录已尝试次数
+        
+        可领取：到期的 pending 任务，或租约已过期的 publishing 任务（原持有者已失联）。
+        
+        Args:
+            owner: 领取者标识
+            now: 当前时间（ISO 格式）
+            lease_expires_at: 租约到期时间（ISO 格式）
+            max_attempts: 最大尝试次数，租约过期且次数耗尽的任务标记为失败
+            exclude_platforms: 本次不领取的平台（如已达到速率上限）
+        
+        Returns:
+            领取到的任务（payload 已解析为字典），没有可领取的任务时返回 None
+        """
+        self._require_sqlite("发布队列")
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            
+            cursor.execute("""
+                UPDATE publish_records
+                SET publish_status = 'failed', error_message = '租约过期且超过最大重试次数', updated_at = ?,
+                    lease_owner = NULL, lease_expires_at = NULL
+                WHERE publish_status = 'publishing' AND lease_expires_at < ? AND retry_count >= ?
+            """, (now, now, max_attempts))
+            
+            query = """
+                SELECT id FROM publish_records
+                WHERE idempotency_key IS NOT NULL
+                  AND ((publish_status = 'pending' AND next_attempt_at <= ?)
+                       OR (publish_status = 'publishing' AND lease_expires_at < ?))
+            """
+            params = [now, now]
+            if exclude_platforms:
+                query += f" AND platform NOT IN ({','.join('?' * len(exclude_platforms))})"
+                params.extend(exclude_platforms)
+            query += " ORDER BY next_attempt_at, id LIMIT 1"
+            cursor.execute(query, params)
+            row = cursor.fetchone()
+            if not row:
+                cursor.execute("COMMIT")
+                return None
+            
+            cursor.execute("""
+                UPDATE publish_records
+                SET publish_status = 'publishing', lease_owner = ?, lease_expires_at = ?,
+                    retry_count = retry_count + 1, updated_at = ?
+                WHERE id = ?
+            """, (owner, lease_expires_at, now, row["id"]))
+            cursor.execute("SELECT * FROM publish_records WHERE id = ?", (row["id"],))
+            claimed = _publish_job_row(cursor.fetchone())
+            cursor.execute("COMMIT")
+            return claimed
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+    
+    def finish_publish_job(self, job_id: int, owner: str, status: str, now: str,
+                           publish_url: str = '', publish_id: str = '', error: Optional[str] = None,
+                           next_attempt_at: Optional[str] = None) -> bool:
+        """
+        结束一次发布尝试并释放租约；租约已被他人接管时返回 False
+        
+        Args:
+            status: success / failed（最终失败）/ pending（退避后重试，需提供 next_attempt_at）
+        """
+        self._require_sqlite("发布队列")
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE publish_records
+                SET publish_status = ?, publish_url = ?, publish_id = ?, error_message = ?,
+                    next_attempt_at = COALESCE(?, next_attempt_at), updated_at = ?,
+                    published_at = CASE WHEN ? = 'success' THEN ? ELSE published_at END,
+                    lease_owner = NULL, lease_expires_at = NULL
+                WHERE id = ? AND lease_owner = ? AND publish_status = 'publishing'
+            """, (status, publish_url, publish_id, error, next_attempt_at, now, status, now, job_id, owner))
+            conn.commit()
+            return cursor.rowcount == 1
+    
+    def count_due_publish_jobs(self, now: str, platforms: Optional[List[str]] = None) -> int:
+        """统计已到期可领取的发布任务数（可限定平台）"""
+        self._require_sqlite("发布队列")
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            query = """
+                SELECT COUNT(*) FROM publish_records
+                WHERE idempotency_key IS NOT NULL
+                  AND ((publish_status = 'pending' AND next_attempt_at <= ?)
+                       OR (publish_status = 'publishing' AND lease_expires_at < ?))
+            """
+            params = [now, now]
+            if platforms:
+                query += f" AND platform IN ({','.join('?' * len(platforms))})"
+                params.extend(platforms)
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return cursor.fetchone()[0]
+    
+    def get_publish_queue_stats(self, brand: Optional[str] = None) -> Dict[str, int]:
+        """发布队列各状态的任务数：{'pending': n, 'publishing': n, 'success': n, 'failed': n}"""
+        stats = {'pending': 0, 'publishing': 0, 'success': 0, 'failed': 0}
+        if self.storage_type != "sqlite":
+            return stats
+        with sqlite3.connect(self.db_path) as conn:
+            query = """
+                SELECT pr.publish_status, COUNT(*) FROM publish_records pr
+                LEFT JOIN articles a ON pr.article_id = a.id
+                WHERE pr.idempotency_key IS NOT NULL
+            """
+            params = []
+            if brand:
+                query += " AND a.brand = ?"
+                params.append(brand)
+            query += " GROUP BY pr.publish_status"
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            for status, count in cursor.fetchall():
+                stats[status] = count
+        return stats
+    
+    def requeue_failed_publish_jobs(self, now: str, brand: Optional[str] = None) -> int:
+        """将失败的发布任务重新入队（尝试次数清零），返回重新入队的任务数"""
+        self._require_sqlite("发布队列")
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            query = """
+                UPDATE publish_records
+                SET publish_status = 'pending', retry_count = 0, error_message = NULL,
+                    next_attempt_at = ?, updated_at = ?
+                WHERE idempotency_key IS NOT NULL AND publish_status = 'failed'
+            """
+            params = [now, now]
+            if brand:
+                query += " AND article_id IN (SELECT id FROM articles WHERE brand = ?)"
+                params.append(brand)
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            conn.commit()
+            return cursor.rowcount
+    
     def get_article_by_id(self, article_id: int) -> Optional[Dict]:
         """根据ID获取文章"""
         if self.storage_type == "sqlite":
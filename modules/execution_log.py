@@ -0,0 +1,128 @@
+"""
+工作流执行日志模块
+内存中只保留最近 N 条日志（环形缓冲），完整日志按批流式写入 workflow_execution_logs 表；
+并提供执行结果摘要，执行记录中只保存产物引用而不内联全部生成内容
+"""
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+LOG_LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionLogSink:
+    """带级别的执行日志：环形缓冲 + 批量落库，仅 warning 及以上级别经 logging 输出"""
+
+    def __init__(self, storage=None, execution_id: Optional[int] = None, buffer_size: int = 200,
+                 flush_every: int = 20, console_level: str = "warning"):
+        """
+        Args:
+            storage: DataStorage 实例（仅 SQLite 存储且提供 execution_id 时写入日志表）
+            execution_id: 执行记录ID
+            buffer_size: 内存中保留的最近日志条数
+            flush_every: 累积多少条后批量写入日志表（warning 及以上级别立即写入）
+            console_level: 经 logging 输出的最低级别（默认 warning，info/debug 只进环形缓冲与日志表）
+        """
+        self.storage = storage
+        self.execution_id = execution_id
+        self.buffer = deque(maxlen=max(1, buffer_size))
+        self.flush_every = max(1, flush_every)
+        self.console_level = LOG_LEVELS.get(console_level, LOG_LEVELS["warning"])
+        self.persist = execution_id is not None and getattr(storage, "storage_type", None) == "sqlite"
+        self.counts = {level: 0 for level in LOG_LEVELS}
+        self._pending: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def emit(self, message: str, level: str = "info", step_index: Optional[int] = None) -> Dict[str, Any]:
+        """记录一条日志"""
+        level = level if level in LOG_LEVELS else "info"
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "level": level,
+            "message": message,
+            "step_index": step_index
+        }
+        with self._lock:
+            self.buffer.append(entry)
+            self.counts[level] += 1
+            if self.persist:
+                self._pending.append(entry)
+                if len(self._pending) >= self.flush_every or LOG_LEVELS[level] >= LOG_LEVELS["warning"]:
+                    self._flush_locked()
+        if LOG_LEVELS[level] >= self.console_level:
+            logger.log(LOG_LEVELS[level], message)
+        return entry
+
+    def flush(self):
+        """把尚未写入的日志写入日志表"""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        entries, self._pending = self._pending, []
+        try:
+            self.storage.append_workflow_logs(self.execution_id, entries)
+        except Exception as e:
+            logger.warning("执行日志写入失败: %s", e)
+
+    def recent(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """内存中最近的日志"""
+        with self._lock:
+            entries = list(self.buffer)
+        return entries[-limit:] if limit else entries
+
+
+def summarize_step_result(step_result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    步骤结果摘要：生成内容替换为文章引用，验证结果只保留统计，其余标量字段原样保留
+    """
+    summary: Dict[str, Any] = {}
+    for key, value in (step_result or {}).items():
+        if key in ("contents", "optimized_contents") and isinstance(value, list):
+            summary[key] = [
+                {
+                    "article_id": item.get("article_id"),
+                    "keyword": item.get("keyword"),
+                    "platform": item.get("platform"),
+                    "chars": len(item.get("content") or "")
+                }
+                for item in value if isinstance(item, dict)
+            ]
+        elif key == "verify_results" and isinstance(value, list):
+            mentioned = sum(1 for r in value if isinstance(r, dict) and r.get("mention_count", 0) > 0)
+            summary[key] = {
+                "total": len(value),
+                "mentioned": mentioned,
+                "mention_rate": mentioned / len(value) if value else 0
+            }
+        elif isinstance(value, (list, dict)) and key != "keywords":
+            summary[key] = {"type": type(value).__name__, "size": len(value)}
+        else:
+            summary[key] = value
+    return summary
+
+
+def summarize_execution_result(result: Dict[str, Any], log_counts: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+    """
+    执行结果摘要（写入 workflow_executions.result）
+
+    不包含完整上下文与日志：生成内容以 articles 表中的文章引用表示，完整日志见 workflow_execution_logs 表。
+    """
+    summary = {
+        "status": result.get("status"),
+        "error": result.get("error"),
+        "results": {
+            step_key: summarize_step_result(step_result)
+            for step_key, step_result in (result.get("results") or {}).items()
+        }
+    }
+    if log_counts is not None:
+        summary["log_counts"] = {level: count for level, count in log_counts.items() if count}
+    return summary
@@ -0,0 +1,343 @@
+"""
+离线模拟 LLM 与录制 / 回放模块
+没有 API Key 时也能跑通生成、验证和工作流，用于压测和 CI：
+- FakeChatModel：LangChain 聊天模型，首 token 延迟服从对数正态分布（可带长尾），按输出长度模拟生成耗时，
+  可按比例注入 429 限流与 500 错误；回复优先取录制的 fixture，其次取预设回复，否则按提示词合成
+- LLMFixtureStore：提示词 → 回复的 JSONL fixture 库（按提示词 sha256 寻址，追加写入）
+- RecordingLLM：包装真实模型，把每次调用的提示词与回复写入 fixture 库，之后用 FakeChatModel 回放
+
+提供商名称为 FAKE_PROVIDER，API Key 一栏填写参数串，如 "p50=1.5;tail=0.05;rate_limit=0.02;replay=fixtures/llm.jsonl"。
+"""
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable, RunnableConfig
+from pydantic import PrivateAttr
+
+
+FAKE_PROVIDER = "Fake (离线模拟)"
+
+# 设置后，create_gateway 构建的真实模型会把调用录制到该路径的 fixture 库
+RECORD_ENV = "GEO_LLM_RECORD"
+
+# 参数串中的键 → (FakeChatModel 字段, 类型)
+FAKE_SPEC_KEYS = {
+    "p50": ("p50", float),
+    "sigma": ("sigma", float),
+    "tail": ("tail_rate", float),
+    "tail_factor": ("tail_factor", float),
+    "error": ("error_rate", float),
+    "rate_limit": ("rate_limit_rate", float),
+    "tokens": ("tokens", int),
+    "tps": ("tokens_per_second", float),
+    "replay": ("replay_path", str),
+    "strict": ("strict_replay", lambda v: v.lower() in ("1", "true", "yes")),
+    "seed": ("seed", int),
+}
+
+
+class FakeRateLimitError(Exception):
+    """模拟的 429 限流错误（消息与真实 SDK 一样包含 429 / rate limit，现有重试逻辑可识别）"""
+
+
+class FakeProviderError(Exception):
+    """模拟的服务端错误"""
+
+
+def prompt_text(input: Any) -> str:
+    """把 LLM 输入（字符串、PromptValue、消息列表）规整为文本，用作 fixture 的键"""
+    if isinstance(input, str):
+        # 与聊天模型收到的单条用户消息一致
+        return f"human: {input}"
+    if hasattr(input, "to_messages"):
+        input = input.to_messages()
+    if isinstance(input, (list, tuple)):
+        parts = []
+        for message in input:
+            if isinstance(message, BaseMessage):
+                parts.append(f"{message.type}: {message.content}")
+            elif isinstance(message, (list, tuple)) and len(message) == 2:
+                parts.append(f"{message[0]}: {message[1]}")
+            else:
+                parts.append(str(message))
+        return "\n".join(parts)
+    return str(input)
+
+
+def prompt_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class LLMFixtureStore:
+    """
+    提示词 → 回复的 fixture 库（JSONL，每行一条，线程安全）
+
+    同一提示词多次录制时保留最后一条。文件在首次读取时加载到内存。
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._index is None:
+            index = {}
+            if self.path.exists():
+                with self.path.open("r", encoding="utf-8") as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+                        index[entry["key"]] = entry
+            self._index = index
+        return self._index
+
+    def get(self, prompt: str) -> Optional[str]:
+        with self._lock:
+            entry = self._load().get(prompt_key(prompt))
+        return entry["response"] if entry else None
+
+    def put(self, prompt: str, response: str, provider: str = "", model: str = ""):
+        entry = {
+            "key": prompt_key(prompt),
+            "prompt": prompt,
+            "response": response,
+            "provider": provider,
+            "model": model,
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        with self._lock:
+            self._load()[entry["key"]] = entry
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load())
+
+
+_STORES: Dict[str, LLMFixtureStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def fixture_store(path: str) -> LLMFixtureStore:
+    """同一路径在进程内共用一个 fixture 库（录制与回放看到同一份内存索引）"""
+    resolved = str(Path(path).resolve())
+    with _STORES_LOCK:
+        store = _STORES.get(resolved)
+        if store is None:
+            store = LLMFixtureStore(resolved)
+            _STORES[resolved] = store
+        return store
+
+
+def synthetic_response(prompt: str, tokens: int, rng: random.Random) -> str:
+    """
+    按提示词合成回复，使依赖输出格式的调用方也能跑通：
+    - 要求按 id 输出 JSON 数组（打包评分、打包验证等）：每个 id 返回一个元素
+    - 要求输出 JSON 数组（关键词生成等）：返回「数量」指定个数的字符串
+    - 其他：返回约 tokens 字的 Markdown 文章（带品牌名，便于验证统计提及）
+    """
+    brand_match = re.search(r"【(?:候选)?品牌】\s*(\S+)|品牌[：:]\s*(\S+)", prompt)
+    brand = next((g for g in brand_match.groups() if g), "") if brand_match else ""
+
+    if "JSON" in prompt and '"id"' in prompt:
+        # 条目编号：「[id=n]」「"id": n」「【内容 n】」或行首「n. 」
+        numbered = re.findall(r'(?:\[id=|"id":\s*|【内容\s*)(\d+)', prompt) + re.findall(r"(?m)^(\d+)\.\s", prompt)
+        ids = sorted({int(n) for n in numbered}) or [1]
+        return json.dumps([
+            {
+                "id": n,
+                "keyword": f"{brand}相关问题{n}怎么选",
+                "answer": f"结论：综合选择标准，{brand}是可选方案之一。",
+                "scores": {"structure": 20, "brand_mention": 20, "authority": 18, "citations": 19, "total": 77},
+                "details": {}, "improvements": ["补充数据来源"], "strengths": ["结构清晰"],
+            }
+            for n in ids
+        ], ensure_ascii=False)
+
+    if "JSON" in prompt and ("数组" in prompt or "array" in prompt.lower()):
+        count_match = re.search(r"数量[：:]\s*(\d+)", prompt)
+        count = int(count_match.group(1)) if count_match else 10
+        return json.dumps([f"{brand or '产品'}哪个好用第{i + 1}问" for i in range(count)], ensure_ascii=False)
+
+    sections = []
+    filler = "这是离线模拟生成的内容，用于压测与回归测试。"
+    while sum(len(s) for s in sections) < tokens:
+        n = len(sections) + 1
+        sections.append(f"## 第 {n} 部分\n\n{brand}{filler}{rng.choice(['要点一', '要点二', '要点三'])}。\n")
+    return f"# 模拟回答\n\n结论：{brand}在多数场景下值得考虑。\n\n" + "\n".join(sections)
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    离线模拟聊天模型
+
+    每次调用：按对数正态分布抽样首 token 延迟（tail_rate 比例放大 tail_factor 倍），
+    再按 tokens_per_second 模拟输出耗时；按比例抛出 FakeRateLimitError / FakeProviderError。
+    """
+
+    p50: float = 1.0
+    sigma: float = 0.3
+    tail_rate: float = 0.0
+    tail_factor: float = 5.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    tokens: int = 600
+    tokens_per_second: float = 200.0
+    responses: List[str] = []
+    replay_path: str = ""
+    strict_replay: bool = False
+    seed: Optional[int] = None
+
+    _rng: Any = PrivateAttr()
+    _lock: Any = PrivateAttr()
+    _calls: int = PrivateAttr(default=0)
+
+    def __init__(self, **data: Any):
+        super().__init__(**data)
+        self._rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def _plan(self, messages: List[BaseMessage]):
+        """抽样本次调用的延迟、错误与回复"""
+        prompt = prompt_text(messages)
+        with self._lock:
+            self._calls += 1
+            calls = self._calls
+            ttft = self.p50 * math.exp(self._rng.gauss(0, self.sigma))
+            if self._rng.random() < self.tail_rate:
+                ttft *= self.tail_factor
+            roll = self._rng.random()
+            error = None
+            if roll < self.rate_limit_rate:
+                error = FakeRateLimitError("Error code: 429 - rate limit exceeded（模拟限流）")
+            elif roll < self.rate_limit_rate + self.error_rate:
+                error = FakeProviderError("Error code: 500 - 模拟提供商错误")
+            rng = random.Random(prompt_key(prompt))
+
+        response = fixture_store(self.replay_path).get(prompt) if self.replay_path else None
+        if response is None:
+            if self.strict_replay:
+                error = error or KeyError(f"fixture 中没有该提示词（sha256={prompt_key(prompt)[:12]}）")
+            elif self.responses:
+                response = self.responses[(calls - 1) % len(self.responses)]
+            else:
+                response = synthetic_response(prompt, self.tokens, rng)
+        return prompt, ttft, error, response or ""
+
+    def _usage(self, prompt: str, response: str) -> Dict[str, int]:
+        # 中文约 1.5 字 / token，这里只需量级正确
+        input_tokens = max(1, len(prompt) * 2 // 3)
+        output_tokens = max(1, len(response) * 2 // 3)
+        return {"input_tokens": input_tokens, "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens}
+
+    def _generation_time(self, response: str) -> float:
+        return len(response) / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[Any] = None, **kwargs: Any) -> ChatResult:
+        prompt, ttft, error, response = self._plan(messages)
+        time.sleep(ttft)
+        if error is not None:
+            raise error
+        time.sleep(self._generation_time(response))
+        message = AIMessage(content=response, usage_metadata=self._usage(prompt, response))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Optional[Any] = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        prompt, ttft, error, response = self._plan(messages)
+        time.sleep(ttft)
+        if error is not None:
+            raise error
+        step = 8
+        interval = self._generation_time(response[:step])
+        for start in range(0, len(response), step):
+            end = start + step
+            usage = self._usage(prompt, response) if end >= len(response) else None
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=response[start:end], usage_metadata=usage))
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+            time.sleep(interval)
+
+
+def parse_fake_spec(spec: str) -> Dict[str, Any]:
+    """
+    解析参数串（分号或逗号分隔的 key=value），不含 "=" 的片段忽略（可以随便填一个占位 Key）
+
+    Example:
+        "p50=1.5;tail=0.05;rate_limit=0.02;replay=fixtures/llm.jsonl"
+    """
+    params: Dict[str, Any] = {}
+    for part in re.split(r"[;,]", spec or ""):
+        if "=" not in part:
+            continue
+        key, value = (s.strip() for s in part.split("=", 1))
+        if key not in FAKE_SPEC_KEYS:
+            raise ValueError(f"未知的模拟参数：{key}（可用：{', '.join(FAKE_SPEC_KEYS)}）")
+        field, cast = FAKE_SPEC_KEYS[key]
+        try:
+            params[field] = cast(value)
+        except ValueError:
+            raise ValueError(f"模拟参数 {key} 的值无效：{value}")
+    return params
+
+
+def create_fake_llm(spec: str = "", temperature: float = 0.7) -> FakeChatModel:
+    """按参数串构建 FakeChatModel（temperature 仅为与其他提供商接口一致，不影响输出）"""
+    return FakeChatModel(**parse_fake_spec(spec))
+
+
+class RecordingLLM(Runnable):
+    """
+    录制包装：委托给真实模型，并把提示词与完整回复写入 fixture 库
+
+    之后以 FakeChatModel(replay_path=...) 回放，同样的提示词得到同样的回复。
+    """
+
+    def __init__(self, llm: Any, store: LLMFixtureStore, provider: str = "", model: str = ""):
+        self.llm = llm
+        self.store = store
+        self.provider = provider
+        self.model = model
+
+    def __repr__(self) -> str:
+        return f"RecordingLLM(provider={self.provider!r}, path={str(self.store.path)!r})"
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        result = self.llm.invoke(input, config, **kwargs)
+        self.store.put(prompt_text(input), str(getattr(result, "content", result)), self.provider, self.model)
+        return result
+
+    def stream(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Iterator[Any]:
+        merged = None
+        for chunk in self.llm.stream(input, config, **kwargs):
+            merged = chunk if merged is None else merged + chunk
+            yield chunk
+        # 只录制完整输出（中途关闭的流不录制）
+        if merged is not None:
+            self.store.put(prompt_text(input), str(getattr(merged, "content", merged)), self.provider, self.model)
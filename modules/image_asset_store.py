@@ -0,0 +1,358 @@
+"""
+图片资源库模块
+将生成的配图（通义万相等返回的临时 URL）下载到本地，按内容哈希存储并记录尺寸信息，
+Markdown 中改用稳定的本地路径或 CDN 地址，重新导出、发布时不再依赖临时链接，同一张图片只下载一次。
+
+目录结构（root_dir 下）：
+- objects/<sha 前两位>/<sha256>.<ext>：图片文件（内容寻址，相同内容只存一份）
+- objects/<sha 前两位>/<sha256>.json：元数据（格式、字节数、宽高、首次来源 URL、创建时间）
+- urls/<url 哈希前两位>/<url 哈希>.json：来源 URL → 图片 sha256 的映射，已下载过的 URL 不再请求
+"""
+import hashlib
+import io
+import json
+import os
+import re
+import struct
+import tempfile
+import zipfile
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+from modules.concurrency import run_ordered
+
+
+# Markdown 图片语法中的远程地址：![alt](http...)，可带 "title"
+_MD_REMOTE_IMAGE = re.compile(r'!\[[^\]]*\]\(\s*<?(https?://[^\s)>]+)>?(?:\s+"[^"]*")?\s*\)')
+
+# 单张图片大小上限（字节）
+MAX_IMAGE_BYTES = 20 * 1024 * 1024
+
+_FORMATS = {
+    "png": ("png", "image/png"),
+    "jpeg": ("jpg", "image/jpeg"),
+    "gif": ("gif", "image/gif"),
+    "webp": ("webp", "image/webp"),
+}
+
+
+def _jpeg_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """逐个扫描 JPEG 段，读取 SOF 段中的宽高"""
+    i = 2
+    length = len(data)
+    while i + 9 < length:
+        if data[i] != 0xFF:
+            i += 1
+            continue
+        marker = data[i + 1]
+        if marker == 0xFF:
+            i += 1
+            continue
+        # 无长度字段的标记：TEM、RST0–RST7
+        if marker == 0x01 or 0xD0 <= marker <= 0xD7:
+            i += 2
+            continue
+        if marker in (0xD9, 0xDA):
+            return None
+        segment_length = struct.unpack(">H", data[i + 2:i + 4])[0]
+        # SOF0–SOF15，排除 DHT(C4)、JPG(C8)、DAC(CC)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack(">HH", data[i + 5:i + 9])
+            return width, height
+        i += 2 + segment_length
+    return None
+
+
+def image_info(data: bytes) -> Optional[Dict[str, Any]]:
+    """
+    从文件头识别图片格式和宽高（PNG / JPEG / GIF / WebP），不解码像素
+
+    Returns:
+        {"format": str, "ext": str, "mime": str, "width": int, "height": int}；无法识别时返回 None
+    """
+    size = None
+    fmt = None
+    if data[:8] == b"\x89PNG\r\n\x1a\n" and data[12:16] == b"IHDR":
+        fmt = "png"
+        size = struct.unpack(">II", data[16:24])
+    elif data[:3] == b"\xff\xd8\xff":
+        fmt = "jpeg"
+        size = _jpeg_size(data)
+    elif data[:6] in (b"GIF87a", b"GIF89a"):
+        fmt = "gif"
+        size = struct.unpack("<HH", data[6:10])
+    elif data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        fmt = "webp"
+        chunk = data[12:16]
+        if chunk == b"VP8X":
+            size = (int.from_bytes(data[24:27], "little") + 1, int.from_bytes(data[27:30], "little") + 1)
+        elif chunk == b"VP8 ":
+            width, height = struct.unpack("<HH", data[26:30])
+            size = (width & 0x3FFF, height & 0x3FFF)
+        elif chunk == b"VP8L":
+            bits = int.from_bytes(data[21:25], "little")
+            size = ((bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1)
+    if fmt is None:
+        return None
+    ext, mime = _FORMATS[fmt]
+    width, height = size if size else (0, 0)
+    return {"format": fmt, "ext": ext, "mime": mime, "width": width, "height": height}
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _atomic_write(path: str, data: bytes):
+    """先写临时文件再改名，并发写入同一路径时读者不会看到半个文件"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class ImageAssetStore:
+    """内容寻址的本地图片资源库"""
+
+    def __init__(self, root_dir: str = "image_assets", public_base_url: str = "",
+                 max_workers: int = 4, max_bytes: int = MAX_IMAGE_BYTES,
+                 client: Optional[httpx.Client] = None):
+        """
+        Args:
+            root_dir: 资源库目录
+            public_base_url: CDN / 静态站点地址（如 https://cdn.example.com/geo-images）；
+                为空时 Markdown 使用 root_dir 下的相对路径
+            max_workers: 并发下载数
+            max_bytes: 单张图片大小上限（字节）
+            client: 自定义 httpx.Client（默认按需创建）
+        """
+        self.root_dir = root_dir
+        self.public_base_url = (public_base_url or "").rstrip("/")
+        self.max_workers = max(1, max_workers)
+        self.max_bytes = max_bytes
+        self._client = client
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            self._client = httpx.Client(
+                timeout=httpx.Timeout(30.0, connect=10.0),
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=self.max_workers, max_keepalive_connections=self.max_workers),
+            )
+        return self._client
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    # ---------- 路径 ----------
+
+    def _object_rel(self, sha: str, ext: str) -> str:
+        return f"objects/{sha[:2]}/{sha}.{ext}"
+
+    def _meta_path(self, sha: str) -> str:
+        return os.path.join(self.root_dir, "objects", sha[:2], f"{sha}.json")
+
+    def _url_path(self, url: str) -> str:
+        key = _sha256(url.encode("utf-8"))
+        return os.path.join(self.root_dir, "urls", key[:2], f"{key}.json")
+
+    def local_path(self, meta: Dict[str, Any]) -> str:
+        """图片文件的本地路径"""
+        return os.path.join(self.root_dir, *meta["path"].split("/"))
+
+    def asset_url(self, meta: Dict[str, Any]) -> str:
+        """Markdown 中使用的稳定地址：配置了 public_base_url 时为 CDN 地址，否则为相对路径"""
+        if self.public_base_url:
+            return f"{self.public_base_url}/{meta['path']}"
+        return "/".join([os.path.normpath(self.root_dir).replace(os.sep, "/"), meta["path"]])
+
+    # ---------- 读写 ----------
+
+    def get(self, sha: str) -> Optional[Dict[str, Any]]:
+        """按 sha256 读取元数据（图片文件缺失时返回 None）"""
+        try:
+            with open(self._meta_path(sha), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if os.path.exists(self.local_path(meta)) else None
+
+    def lookup_url(self, url: str) -> Optional[Dict[str, Any]]:
+        """来源 URL 已下载过时返回对应图片的元数据"""
+        try:
+            with open(self._url_path(url), "r", encoding="utf-8") as f:
+                sha = json.load(f)["sha256"]
+        except (OSError, ValueError, KeyError):
+            return None
+        return self.get(sha)
+
+    def put_bytes(self, data: bytes, source_url: str = "") -> Dict[str, Any]:
+        """
+        保存图片内容（已存在相同内容时直接返回已有记录）
+
+        Returns:
+            {"sha256", "path", "format", "ext", "mime", "bytes", "width", "height", "source_url", "created_at"}
+        """
+        info = image_info(data)
+        if info is None:
+            raise ValueError("无法识别的图片格式")
+        sha = _sha256(data)
+        meta = self.get(sha)
+        if meta is None:
+            meta = {
+                "sha256": sha,
+                "path": self._object_rel(sha, info["ext"]),
+                "format": info["format"],
+                "ext": info["ext"],
+                "mime": info["mime"],
+                "bytes": len(data),
+                "width": info["width"],
+                "height": info["height"],
+                "source_url": source_url,
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            _atomic_write(self.local_path(meta), data)
+            _atomic_write(self._meta_path(sha), json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+        if source_url:
+            _atomic_write(self._url_path(source_url), json.dumps({"sha256": sha}).encode("utf-8"))
+        return meta
+
+    def read_bytes(self, meta: Dict[str, Any]) -> bytes:
+        with open(self.local_path(meta), "rb") as f:
+            return f.read()
+
+    # ---------- 下载 ----------
+
+    def fetch(self, url: str) -> Dict[str, Any]:
+        """下载并保存 url 指向的图片；该 URL 已下载过时不再请求"""
+        meta = self.lookup_url(url)
+        if meta is not None:
+            return meta
+        with self.client.stream("GET", url) as response:
+            if response.status_code != 200:
+                raise RuntimeError(f"下载图片失败，状态码：{response.status_code}")
+            declared = response.headers.get("Content-Length")
+            if declared and declared.isdigit() and int(declared) > self.max_bytes:
+                raise RuntimeError(f"图片超过大小上限（{self.max_bytes} 字节）")
+            buffer = io.BytesIO()
+            for chunk in response.iter_bytes():
+                buffer.write(chunk)
+                if buffer.tell() > self.max_bytes:
+                    raise RuntimeError(f"图片超过大小上限（{self.max_bytes} 字节）")
+        return self.put_bytes(buffer.getvalue(), source_url=url)
+
+    def fetch_many(self, urls: Iterable[str],
+                   on_done: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        并发下载多张图片（重复 URL 只下载一次，已下载过的 URL 不发请求）
+
+        Returns:
+            {url: {"asset": 元数据或 None, "error": 错误信息或 None}}
+        """
+        unique = list(dict.fromkeys(u for u in urls if u))
+        outcomes = run_ordered(self.fetch, unique, max_workers=self.max_workers, on_done=on_done)
+        return {o["item"]: {"asset": o["result"], "error": o["error"]} for o in outcomes}
+
+    # ---------- 改写 ----------
+
+    def localize_images(self, image_data: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        下载 embed_images_in_markdown 使用的图片列表，image_url 改为稳定地址
+
+        每项新增 source_url（原临时地址）、local_path、width、height、bytes；下载失败的图片保留原地址。
+
+        Returns:
+            (新的图片列表, 失败信息列表)
+        """
+        fetched = self.fetch_many(img.get("image_url", "") for img in image_data)
+        localized, errors = [], []
+        for img in image_data:
+            outcome = fetched.get(img.get("image_url", ""))
+            if not outcome:
+                localized.append(dict(img))
+                continue
+            if outcome["error"]:
+                errors.append(f"{img.get('image_url')}：{outcome['error']}")
+                localized.append(dict(img))
+                continue
+            asset = outcome["asset"]
+            localized.append(dict(
+                img,
+                image_url=self.asset_url(asset),
+                source_url=img.get("source_url") or img["image_url"],
+                local_path=self.local_path(asset),
+                width=asset["width"],
+                height=asset["height"],
+                bytes=asset["bytes"],
+            ))
+        return localized, errors
+
+    def rewrite_markdown(self, content: str) -> Tuple[str, List[str]]:
+        """
+        下载 Markdown 中引用的全部远程图片，并把地址替换为稳定地址
+
+        已是 public_base_url 下的地址不处理；下载失败的图片保留原地址。
+
+        Returns:
+            (改写后的内容, 失败信息列表)
+        """
+        urls = [
+            url for url in _MD_REMOTE_IMAGE.findall(content)
+            if not (self.public_base_url and url.startswith(self.public_base_url + "/"))
+        ]
+        if not urls:
+            return content, []
+        fetched = self.fetch_many(urls)
+        replacements = {url: self.asset_url(o["asset"]) for url, o in fetched.items() if o["asset"]}
+        errors = [f"{url}：{o['error']}" for url, o in fetched.items() if o["error"]]
+
+        def replace(match):
+            url = match.group(1)
+            if url not in replacements:
+                return match.group(0)
+            start, end = match.span(1)
+            whole = match.group(0)
+            offset = match.start(0)
+            return whole[:start - offset] + replacements[url] + whole[end - offset:]
+
+        return _MD_REMOTE_IMAGE.sub(replace, content), errors
+
+    def referenced_assets(self, content: str) -> List[Dict[str, Any]]:
+        """Markdown 中引用的本资源库图片（按首次出现顺序）"""
+        prefix = self.asset_url({"path": "objects/"})
+        pattern = re.compile(re.escape(prefix) + r"[0-9a-f]{2}/([0-9a-f]{64})\.[a-z]+")
+        assets = []
+        for sha in dict.fromkeys(pattern.findall(content)):
+            meta = self.get(sha)
+            if meta:
+                assets.append(meta)
+        return assets
+
+    def export_bundle(self, content: str, markdown_name: str) -> bytes:
+        """
+        打包 Markdown 与其引用的本地图片为 ZIP
+
+        图片按 Markdown 中的相对路径存放，解压后可直接预览；使用 CDN 地址时只包含 Markdown。
+        """
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr(markdown_name, content)
+            if not self.public_base_url:
+                for meta in self.referenced_assets(content):
+                    # 图片已压缩，不再 deflate
+                    zf.writestr(zipfile.ZipInfo(self.asset_url(meta)), self.read_bytes(meta),
+                                compress_type=zipfile.ZIP_STORED)
+        return buffer.getvalue()
@@ -7,6 +7,12 @@ import itertools
 from typing import List, Dict, Set
 from difflib import SequenceMatcher
 
+from modules.llm_batching import run_packed
+
+
+# 关键词润色时每次请求打包的关键词数
+POLISH_PACK_SIZE = 50
+
 
 class KeywordTool:
     """托词工具：通过词库组合生成关键词"""
@@ -145,7 +151,7 @@ class KeywordTool:
             keywords: 原始关键词列表
             llm_chain: LangChain chain 对象（接受 {"input": str} 格式）
             brand: 品牌名称（可选）
-            max_polish: 最多润色的关键词数量
+            max_polish: 最多润色的关键词数量（超过 POLISH_PACK_SIZE 时分多次请求）
         
         Returns:
             润色后的关键词列表
@@ -159,42 +165,34 @@ class KeywordTool:
         # 构建品牌信息部分
         brand_info = f"品牌：{brand}\n" if brand else ""
         
-        polish_prompt = f"""你是关键词优化专家。请将以下关键词润色为更自然、更符合用户搜索习惯的表达。
+        def build_prompt(pack: List[str]) -> str:
+            numbered = [{"id": i, "keyword": kw} for i, kw in enumerate(pack, start=1)]
+            return f"""你是关键词优化专家。请将以下关键词润色为更自然、更符合用户搜索习惯的表达。
 
 {brand_info}原始关键词列表：
-{json.dumps(keywords_to_polish, ensure_ascii=False, indent=2)}
+{json.dumps(numbered, ensure_ascii=False, indent=2)}
 
 要求：
 1) 保持原意，但表达更自然、口语化
 2) 长度控制在 12-28 字
 3) 去除生硬拼接感
-4) 输出 JSON 数组格式：["润色后的关键词1", "润色后的关键词2", ...]
+4) 每个关键词对应一个结果，id 与原关键词一致，输出 JSON 数组格式：[{{"id": 1, "keyword": "润色后的关键词1"}}, ...]
 
 只输出 JSON 数组，不要其他内容。
 """
         
-        try:
-            result = llm_chain.invoke({"input": polish_prompt})
-            if isinstance(result, str):
-                # 尝试解析 JSON
-                import re
-                m = re.search(r'\[[\s\S]*?\]', result)
-                if m:
-                    polished = json.loads(m.group(0))
-                else:
-                    # 如果解析失败，尝试按行分割
-                    lines = [line.strip() for line in result.split('\n') if line.strip()]
-                    polished = [line.strip('"\'[],') for line in lines if line.strip('"\'[],')]
-            elif isinstance(result, list):
-                polished = result
-            else:
-                polished = keywords_to_polish
-        except Exception as e:
-            polished = keywords_to_polish
+        def parse_item(element: Dict, original: str) -> str:
+            polished = str(element.get("keyword") or "").strip()
+            if not polished:
+                raise ValueError("润色结果为空")
+            return polished
         
-        # 确保返回的是列表
-        if not isinstance(polished, list):
-            polished = keywords_to_polish
+        # 每 POLISH_PACK_SIZE 个关键词一次请求；整包失败时拆半重试一次，仍失败的保留原关键词
+        outcome = run_packed(
+            keywords_to_polish, build_prompt, llm_chain, parse_item,
+            max_items=POLISH_PACK_SIZE, max_chars=POLISH_PACK_SIZE * 64, max_depth=1, max_workers=2,
+        )
+        polished = [r["result"] if r["result"] else r["item"] for r in outcome["results"]]
         
         # 合并润色后的和未润色的
         return polished + keywords[len(keywords_to_polish):]
@@ -0,0 +1,195 @@
+"""
+LLM 多条目打包调用模块
+把多个独立的小任务（评分、验证问题、关键词润色等）打包进一次 LLM 请求，要求模型返回按 id 对应的 JSON 数组：
+- 按条目数和字符数切分为若干包，包之间通过 modules/concurrency.run_ordered 并发执行
+- 整包失败（调用异常或输出无法解析）时对半拆分重试；部分条目缺失或不合格时只对这些条目重试
+- 拆分到上限后仍失败的条目交给单条处理函数（通常是原来的逐条调用），没有单条函数时记录错误
+在限流场景下减少请求数与每次请求的固定开销（系统提示、说明文字等）。
+"""
+import json
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from modules.concurrency import run_ordered
+
+
+def pack_items(
+    items: List[Any],
+    max_items: int = 5,
+    max_chars: int = 8000,
+    size_fn: Callable[[Any], int] = lambda item: len(str(item))
+) -> List[List[int]]:
+    """
+    按条目数和字符数把条目切分为若干包
+
+    单个条目超过 max_chars 时单独成包。
+
+    Returns:
+        每个包包含的条目下标列表（保持输入顺序）
+    """
+    max_items = max(1, int(max_items or 1))
+    packs: List[List[int]] = []
+    current: List[int] = []
+    current_chars = 0
+    for i, item in enumerate(items):
+        size = size_fn(item)
+        if current and (len(current) >= max_items or current_chars + size > max_chars):
+            packs.append(current)
+            current, current_chars = [], 0
+        current.append(i)
+        current_chars += size
+    if current:
+        packs.append(current)
+    return packs
+
+
+def parse_json_array(text: str) -> Optional[List[Any]]:
+    """从模型输出中解析 JSON 数组（允许 ```json 代码块和前后说明文字），失败返回 None"""
+    if not text:
+        return None
+    cleaned = re.sub(r"```(?:json)?", "", text).strip()
+    try:
+        data = json.loads(cleaned)
+        return data if isinstance(data, list) else None
+    except json.JSONDecodeError:
+        pass
+    m = re.search(r"\[[\s\S]*\]", cleaned)
+    if not m:
+        return None
+    try:
+        data = json.loads(m.group(0))
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, list) else None
+
+
+def run_packed(
+    items: List[Any],
+    build_prompt: Callable[[List[Any]], str],
+    llm_chain,
+    parse_item: Callable[[Dict[str, Any], Any], Any],
+    single: Optional[Callable[[Any], Any]] = None,
+    max_items: int = 5,
+    max_chars: int = 8000,
+    size_fn: Callable[[Any], int] = lambda item: len(str(item)),
+    max_depth: int = 2,
+    max_workers: int = 1,
+    on_done: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    打包调用 LLM 并把结果拆回各条目
+
+    Args:
+        items: 待处理条目
+        build_prompt: 根据一个包的条目列表构建提示词；提示词需要求模型输出 JSON 数组，
+            每个元素带 "id" 字段，对应条目在包内的序号（从 1 开始）
+        llm_chain: LangChain 链对象（接受 {"input": str}，返回 str 或已解析的列表）
+        parse_item: (数组元素, 条目) -> 结果；元素不合格时抛出异常，该条目进入重试
+        single: 单条处理函数（条目 -> 结果），用于拆分到上限后仍失败的条目；为 None 时记录错误
+        max_items / max_chars / size_fn: 切包规则（见 pack_items）
+        max_depth: 失败后最多拆分重试的轮数
+        max_workers: 包之间的并发数（1 表示在调用线程中依次执行）
+        on_done: 每个包处理完成时的回调（在调用线程中触发），参数为 run_ordered 的结果字典
+
+    Returns:
+        {
+            "results": [{"index", "item", "result", "error", "mode"}, ...]（与输入顺序一致，
+                mode 为 "packed" / "single" / None），
+            "requests": [{"indices", "prompt", "output", "error"}, ...]（每次打包请求，供成本统计），
+            "single_calls": 单条处理次数,
+            "resplits": 拆分重试次数
+        }
+    """
+    results: List[Dict[str, Any]] = [
+        {"index": i, "item": item, "result": None, "error": None, "mode": None} for i, item in enumerate(items)
+    ]
+    requests: List[Dict[str, Any]] = []
+    counters = {"single_calls": 0, "resplits": 0}
+    lock = threading.Lock()
+
+    def run_single(indices: List[int], reason: str):
+        for i in indices:
+            if single is None:
+                results[i]["error"] = reason
+                continue
+            with lock:
+                counters["single_calls"] += 1
+            try:
+                results[i]["result"] = single(items[i])
+                results[i]["mode"] = "single"
+                results[i]["error"] = None
+            except Exception as e:
+                results[i]["error"] = str(e)
+
+    def solve(indices: List[int], depth: int = 0):
+        pack = [items[i] for i in indices]
+        prompt = build_prompt(pack)
+        record = {"indices": list(indices), "prompt": prompt, "output": "", "error": None}
+        failed: List[int] = []
+        reason = ""
+        try:
+            output = llm_chain.invoke({"input": prompt})
+            if isinstance(output, list):
+                # 链末端已是 JsonOutputParser
+                array = output
+                record["output"] = json.dumps(output, ensure_ascii=False)
+            else:
+                record["output"] = output if isinstance(output, str) else str(output)
+                array = parse_json_array(record["output"])
+            if array is None:
+                raise ValueError("输出不是 JSON 数组")
+            by_id = {}
+            for element in array:
+                if isinstance(element, dict) and "id" in element:
+                    try:
+                        by_id[int(element["id"])] = element
+                    except (TypeError, ValueError):
+                        continue
+            for pos, i in enumerate(indices, start=1):
+                element = by_id.get(pos)
+                if element is None:
+                    failed.append(i)
+                    reason = f"缺少 id={pos} 的结果"
+                    continue
+                try:
+                    results[i]["result"] = parse_item(element, items[i])
+                    results[i]["mode"] = "packed"
+                except Exception as e:
+                    failed.append(i)
+                    reason = f"结果不合格：{e}"
+        except Exception as e:
+            record["error"] = str(e)
+            failed = list(indices)
+            reason = str(e)
+        with lock:
+            requests.append(record)
+
+        if not failed:
+            return
+        if depth >= max_depth or (len(failed) == 1 and len(indices) == 1):
+            run_single(failed, reason)
+            return
+        with lock:
+            counters["resplits"] += 1
+        if len(failed) == len(indices):
+            # 整包失败：对半拆分（可能是包太大或某个条目干扰了整体输出）
+            mid = len(failed) // 2
+            solve(failed[:mid], depth + 1)
+            solve(failed[mid:], depth + 1)
+        else:
+            solve(failed, depth + 1)
+
+    packs = pack_items(items, max_items=max_items, max_chars=max_chars, size_fn=size_fn)
+    outcomes = run_ordered(solve, packs, max_workers=max_workers, on_done=on_done)
+    for outcome in outcomes:
+        if outcome["error"]:
+            # build_prompt 等本地错误：整包按失败处理
+            run_single([i for i in outcome["item"] if results[i]["mode"] is None], outcome["error"])
+
+    return {
+        "results": results,
+        "requests": requests,
+        "single_calls": counters["single_calls"],
+        "resplits": counters["resplits"],
+    }
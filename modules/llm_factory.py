@@ -0,0 +1,223 @@
+"""
+LLM 客户端构建模块
+统一维护各提供商的默认模型与 LangChain 客户端构建逻辑，
+供 Streamlit 主程序与后台任务（如工作流调度器）共用
+"""
+from modules.fake_llm import FAKE_PROVIDER, create_fake_llm
+
+
+def model_defaults(provider: str) -> str:
+    if provider == "DeepSeek":
+        return "deepseek-chat"
+    if provider == "OpenAI (GPT)":
+        return "gpt-4o-mini"
+    if provider == "Tongyi (通义千问)":
+        return "qwen-max"
+    if provider == "Groq":
+        return "llama3-70b-8192"
+    if provider == "Moonshot (Kimi)":
+        return "moonshot-v1-128k"
+    if provider == "豆包（字节跳动）":
+        return ""  # 豆包使用 ENDPOINT_ID，不需要模型名
+    if provider == "文心一言（百度）":
+        return "ernie-bot-turbo"
+    if provider == FAKE_PROVIDER:
+        return "fake"
+    return ""
+
+
+def create_llm(provider: str, api_key: str, model: str, temperature: float):
+    """
+    构建 LLM 客户端（不带缓存，Streamlit 侧由 build_llm 负责缓存）
+    - Tongyi / Moonshot：保留原功能路径，同时提供更稳的 import 兜底
+    - 离线模拟（FAKE_PROVIDER）：api_key 为模拟参数串，见 modules.fake_llm
+    """
+    if provider == FAKE_PROVIDER:
+        return create_fake_llm(api_key, temperature)
+
+    if provider == "DeepSeek":
+        from langchain_deepseek import ChatDeepSeek
+
+        return ChatDeepSeek(api_key=api_key, model=model, temperature=temperature)
+
+    if provider == "OpenAI (GPT)":
+        from langchain_openai import ChatOpenAI
+
+        return ChatOpenAI(api_key=api_key, model=model, temperature=temperature)
+
+    if provider == "Tongyi (通义千问)":
+        try:
+            from langchain_community.chat_models import ChatTongyi
+
+            return ChatTongyi(api_key=api_key, model=model, model_kwargs={"temperature": temperature})
+        except Exception:
+            from langchain_aliyun import ChatTongyi  # type: ignore
+
+            return ChatTongyi(api_key=api_key, model=model, temperature=temperature)
+
+    if provider == "Groq":
+        from langchain_groq import ChatGroq
+
+        return ChatGroq(api_key=api_key, model=model, temperature=temperature)
+
+    if provider == "Moonshot (Kimi)":
+        try:
+            from langchain_moonshot import ChatMoonshot  # type: ignore
+
+            return ChatMoonshot(api_key=api_key, model=model, temperature=temperature)
+        except Exception:
+            from langchain_community.chat_models import MoonshotChat  # type: ignore
+
+            return MoonshotChat(api_key=api_key, model=model, temperature=temperature)
+
+    if provider == "豆包（字节跳动）":
+        try:
+            # 尝试使用 volcengine-python-sdk[ark]
+            from volcengine.ark import Ark
+            from langchain_core.language_models.chat_models import BaseChatModel
+            from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
+            from langchain_core.outputs import ChatGeneration, ChatResult
+            from typing import List, Optional, Any
+            
+            class ChatDoubao(BaseChatModel):
+                """豆包聊天模型封装（LangChain 兼容）"""
+                volc_ak: str
+                volc_sk: str
+                endpoint_id: str
+                temperature: float = 0.7
+                
+                def __init__(self, volc_ak: str, volc_sk: str, endpoint_id: str, temperature: float = 0.7):
+                    super().__init__(temperature=temperature)
+                    self.volc_ak = volc_ak
+                    self.volc_sk = volc_sk
+                    self.endpoint_id = endpoint_id
+                    self.temperature = temperature
+                    self.client = Ark(ak=volc_ak, sk=volc_sk)
+                
+                def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Optional[Any] = None, **kwargs: Any) -> ChatResult:
+                    # 转换消息格式
+                    volc_messages = []
+                    for msg in messages:
+                        if isinstance(msg, SystemMessage):
+                            volc_messages.append({"role": "system", "content": msg.content})
+                        elif isinstance(msg, HumanMessage):
+                            volc_messages.append({"role": "user", "content": msg.content})
+                        elif isinstance(msg, AIMessage):
+                            volc_messages.append({"role": "assistant", "content": msg.content})
+                        else:
+                            volc_messages.append({"role": "user", "content": str(msg.content)})
+                    
+                    response = self.client.chat.completions.create(
+                        model=self.endpoint_id,
+                        messages=volc_messages,
+                        temperature=self.temperature,
+                    )
+                    
+                    ai_message = AIMessage(content=response.choices[0].message.content)
+                    return ChatResult(generations=[ChatGeneration(message=ai_message)])
+                
+                @property
+                def _llm_type(self) -> str:
+                    return "doubao"
+            
+            # 豆包的 api_key 格式：access_key:secret_key:endpoint_id
+            parts = api_key.split(":")
+            if len(parts) >= 3:
+                return ChatDoubao(volc_ak=parts[0], volc_sk=parts[1], endpoint_id=parts[2], temperature=temperature)
+            else:
+                raise ValueError("豆包 API Key 格式错误，应为：access_key:secret_key:endpoint_id（用冒号分隔）")
+        except ImportError:
+            # 尝试其他导入方式
+            try:
+                from volcenginesdkarkruntime import Ark
+                # 使用相同的 ChatDoubao 类
+                from langchain_core.language_models.chat_models import BaseChatModel
+                from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
+                from langchain_core.outputs import ChatGeneration, ChatResult
+                from typing import List, Optional, Any
+                
+                class ChatDoubao(BaseChatModel):
+                    """豆包聊天模型封装（LangChain 兼容）"""
+                    volc_ak: str
+                    volc_sk: str
+                    endpoint_id: str
+                    temperature: float = 0.7
+                    
+                    def __init__(self, volc_ak: str, volc_sk: str, endpoint_id: str, temperature: float = 0.7):
+                        super().__init__(temperature=temperature)
+                        self.volc_ak = volc_ak
+                        self.volc_sk = volc_sk
+                        self.endpoint_id = endpoint_id
+                        self.temperature = temperature
+                        self.client = Ark(ak=volc_ak, sk=volc_sk)
+                    
+                    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Optional[Any] = None, **kwargs: Any) -> ChatResult:
+                        volc_messages = []
+                        for msg in messages:
+                            if isinstance(msg, SystemMessage):
+                                volc_messages.append({"role": "system", "content": msg.content})
+                            elif isinstance(msg, HumanMessage):
+                                volc_messages.append({"role": "user", "content": msg.content})
+                            elif isinstance(msg, AIMessage):
+                                volc_messages.append({"role": "assistant", "content": msg.content})
+                            else:
+                                volc_messages.append({"role": "user", "content": str(msg.content)})
+                        
+                        response = self.client.chat.completions.create(
+                            model=self.endpoint_id,
+                            messages=volc_messages,
+                            temperature=self.temperature,
+                        )
+                        
+                        ai_message = AIMessage(content=response.choices[0].message.content)
+                        return ChatResult(generations=[ChatGeneration(message=ai_message)])
+                    
+                    @property
+                    def _llm_type(self) -> str:
+                        return "doubao"
+                
+                parts = api_key.split(":")
+                if len(parts) >= 3:
+                    return ChatDoubao(volc_ak=parts[0], volc_sk=parts[1], endpoint_id=parts[2], temperature=temperature)
+                else:
+                    raise ValueError("豆包 API Key 格式错误，应为：access_key:secret_key:endpoint_id（用冒号分隔）")
+            except ImportError as e:
+                raise ValueError(f"豆包初始化失败：缺少依赖库。请运行：pip install 'volcengine-python-sdk[ark]'。错误：{e}")
+        except Exception as e:
+            raise ValueError(f"豆包初始化失败：{e}。请确保 API Key 格式为：access_key:secret_key:endpoint_id")
+
+    if provider == "文心一言（百度）":
+        # 文心一言的 api_key 格式：app_key:app_secret
+        parts = api_key.split(":")
+        if len(parts) != 2:
+            raise ValueError("文心一言 API Key 格式错误，应为：app_key:app_secret（用冒号分隔）")
+        
+        app_key, app_secret = parts
+        
+        # 优先使用 langchain-community 的千帆接口（已包含在依赖中）
+        try:
+            from langchain_community.chat_models import QianfanChatEndpoint
+            import os
+            
+            os.environ["QIANFAN_AK"] = app_key
+            os.environ["QIANFAN_SK"] = app_secret
+            return QianfanChatEndpoint(
+                model=model if model else "ernie-bot-turbo",
+                temperature=temperature,
+            )
+        except ImportError:
+            # 备选方案：尝试 langchain-wenxin
+            try:
+                from langchain_wenxin import ChatWenxin
+                return ChatWenxin(
+                    baidu_api_key=app_key,
+                    baidu_secret_key=app_secret,
+                    model=model if model else "ernie-bot-turbo",
+                    temperature=temperature,
+                )
+            except ImportError as e:
+                raise ValueError(f"文心一言初始化失败：缺少依赖库。请运行：pip install qianfan（或使用已安装的 langchain-community）。错误：{e}")
+        except Exception as e:
+            raise ValueError(f"文心一言初始化失败：{e}")
+
+    raise ValueError(f"Unknown provider: {provider}")
@@ -0,0 +1,514 @@
+"""
+LLM 网关模块
+在 llm_factory 构建的 LangChain 客户端外包一层统一入口：
+- OpenAI 兼容的提供商（DeepSeek / OpenAI / Groq / Moonshot）共用进程级 keep-alive HTTP 连接池
+- 共用连接池上的调用可通过 AttemptHandle 从其他线程取消（路由对冲时关闭落后一方的连接）
+- 每次调用记录耗时、首 token 耗时、token 用量与错误，写入进程级 LLM_METRICS
+- LLMGateway 本身是 LangChain Runnable，现有的 `PromptTemplate | llm | StrOutputParser()` 链无需修改
+"""
+import os
+import socket
+import threading
+import time
+import urllib.request
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import httpcore
+import httpx
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from modules.fake_llm import FAKE_PROVIDER, RECORD_ENV, RecordingLLM, fixture_store
+from modules.llm_factory import create_llm, model_defaults
+
+
+# 可以注入 httpx.Client 的提供商（基于 openai / groq SDK）
+POOLED_PROVIDERS = ("DeepSeek", "OpenAI (GPT)", "Groq", "Moonshot (Kimi)")
+
+# 每个提供商的连接池大小，同时作为 batch 的默认并发数
+POOL_MAX_CONNECTIONS = 8
+
+# 指标保留的最近调用条数
+METRICS_MAX_RECORDS = 2000
+
+_HTTP_CLIENTS: Dict[str, httpx.Client] = {}
+_HTTP_CLIENTS_LOCK = threading.Lock()
+
+_ATTEMPT = threading.local()
+
+
+class AttemptHandle:
+    """
+    单次调用的取消句柄（路由对冲时用于取消落后的一方）
+
+    bind() 期间，当前线程经共用连接池读写连接时都会登记到句柄上。close() 可从其他线程调用：
+    立即关闭正在读写的连接（包括还在等待响应头的请求），之后的读写直接失败，线程与连接随即释放。
+    不经共用连接池的提供商（通义、豆包等）只能在收到下一段输出时停止。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._streams = set()
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @contextmanager
+    def bind(self):
+        """在当前线程上绑定句柄"""
+        previous = getattr(_ATTEMPT, "handle", None)
+        _ATTEMPT.handle = self
+        try:
+            yield self
+        finally:
+            _ATTEMPT.handle = previous
+
+    def close(self):
+        """取消调用：关闭正在使用的连接"""
+        with self._lock:
+            self._closed = True
+            streams = list(self._streams)
+        for stream in streams:
+            sock = stream.get_extra_info("socket")
+            if sock is None:
+                continue
+            try:
+                # 直接关闭底层 socket 的读写（绕过 SSLSocket.shutdown），阻塞中的读取立即返回
+                socket.socket.shutdown(sock, socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _enter(self, stream: httpcore.NetworkStream):
+        with self._lock:
+            if self._closed:
+                raise httpcore.ReadError("调用已取消")
+            self._streams.add(stream)
+
+    def _leave(self, stream: httpcore.NetworkStream):
+        with self._lock:
+            self._streams.discard(stream)
+
+
+def current_attempt() -> Optional[AttemptHandle]:
+    """当前线程绑定的取消句柄"""
+    return getattr(_ATTEMPT, "handle", None)
+
+
+class _CancellableStream(httpcore.NetworkStream):
+    """读写前把连接登记到当前线程的 AttemptHandle 上"""
+
+    def __init__(self, stream: httpcore.NetworkStream):
+        self._stream = stream
+
+    def _io(self, fn, *args):
+        handle = current_attempt()
+        if handle is None:
+            return fn(*args)
+        handle._enter(self._stream)
+        try:
+            return fn(*args)
+        finally:
+            handle._leave(self._stream)
+
+    def read(self, max_bytes: int, timeout: Optional[float] = None) -> bytes:
+        return self._io(self._stream.read, max_bytes, timeout)
+
+    def write(self, buffer: bytes, timeout: Optional[float] = None) -> None:
+        self._io(self._stream.write, buffer, timeout)
+
+    def close(self) -> None:
+        self._stream.close()
+
+    def start_tls(self, ssl_context, server_hostname: Optional[str] = None,
+                  timeout: Optional[float] = None) -> httpcore.NetworkStream:
+        return _CancellableStream(self._stream.start_tls(ssl_context, server_hostname, timeout))
+
+    def get_extra_info(self, info: str) -> Any:
+        return self._stream.get_extra_info(info)
+
+
+class _CancellableBackend(httpcore.NetworkBackend):
+    def __init__(self, backend: httpcore.NetworkBackend):
+        self._backend = backend
+
+    def connect_tcp(self, *args: Any, **kwargs: Any) -> httpcore.NetworkStream:
+        return _CancellableStream(self._backend.connect_tcp(*args, **kwargs))
+
+    def connect_unix_socket(self, *args: Any, **kwargs: Any) -> httpcore.NetworkStream:
+        return _CancellableStream(self._backend.connect_unix_socket(*args, **kwargs))
+
+    def sleep(self, seconds: float) -> None:
+        self._backend.sleep(seconds)
+
+
+# httpcore 异常 -> httpx 异常（子类在前，保证映射到最具体的类型）
+_HTTPCORE_EXCEPTIONS = (
+    (httpcore.ConnectTimeout, httpx.ConnectTimeout),
+    (httpcore.ReadTimeout, httpx.ReadTimeout),
+    (httpcore.WriteTimeout, httpx.WriteTimeout),
+    (httpcore.PoolTimeout, httpx.PoolTimeout),
+    (httpcore.TimeoutException, httpx.TimeoutException),
+    (httpcore.ConnectError, httpx.ConnectError),
+    (httpcore.ReadError, httpx.ReadError),
+    (httpcore.WriteError, httpx.WriteError),
+    (httpcore.NetworkError, httpx.NetworkError),
+    (httpcore.ProxyError, httpx.ProxyError),
+    (httpcore.UnsupportedProtocol, httpx.UnsupportedProtocol),
+    (httpcore.RemoteProtocolError, httpx.RemoteProtocolError),
+    (httpcore.LocalProtocolError, httpx.LocalProtocolError),
+    (httpcore.ProtocolError, httpx.ProtocolError),
+)
+
+
+@contextmanager
+def _map_httpcore_errors():
+    try:
+        yield
+    except Exception as e:
+        for core_type, httpx_type in _HTTPCORE_EXCEPTIONS:
+            if isinstance(e, core_type):
+                raise httpx_type(str(e)) from e
+        raise
+
+
+class _CancellableResponseStream(httpx.SyncByteStream):
+    def __init__(self, stream):
+        self._stream = stream
+
+    def __iter__(self) -> Iterator[bytes]:
+        with _map_httpcore_errors():
+            for part in self._stream:
+                yield part
+
+    def close(self) -> None:
+        if hasattr(self._stream, "close"):
+            self._stream.close()
+
+
+class _CancellableTransport(httpx.BaseTransport):
+    """
+    共用连接池的 httpx 传输层
+
+    只使用 httpcore 的公开参数（ConnectionPool / HTTPProxy 的 network_backend），
+    通过 httpx.Client(transport=..., mounts=...) 注入；代理按标准环境变量（HTTP(S)_PROXY / NO_PROXY）挂载。
+    """
+
+    def __init__(self, limits: httpx.Limits, proxy_url: Optional[str] = None):
+        options = dict(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            network_backend=_CancellableBackend(httpcore.SyncBackend()),
+        )
+        if proxy_url:
+            self._pool = httpcore.HTTPProxy(proxy_url=proxy_url, **options)
+        else:
+            self._pool = httpcore.ConnectionPool(**options)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        with _map_httpcore_errors():
+            response = self._pool.handle_request(core_request)
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=_CancellableResponseStream(response.stream),
+            extensions=response.extensions,
+        )
+
+    def close(self) -> None:
+        self._pool.close()
+
+
+def _proxy_mounts(limits: httpx.Limits) -> Dict[str, Optional[httpx.BaseTransport]]:
+    """按环境变量生成代理挂载（传入 transport= 后 httpx 不再自动读取代理环境变量）"""
+    proxies = urllib.request.getproxies()
+    mounts: Dict[str, Optional[httpx.BaseTransport]] = {}
+    for scheme in ("http", "https"):
+        proxy_url = proxies.get(scheme) or proxies.get("all")
+        if proxy_url and proxy_url.startswith(("http://", "https://")):
+            mounts[f"{scheme}://"] = _CancellableTransport(limits, proxy_url)
+    if mounts:
+        no_proxy = os.environ.get("NO_PROXY") or os.environ.get("no_proxy") or ""
+        for host in (h.strip() for h in no_proxy.split(",")):
+            if host and host != "*":
+                mounts[f"all://*{host}" if host.startswith(".") else f"all://{host}"] = None
+    return mounts
+
+
+def shared_http_client(provider: str) -> httpx.Client:
+    """获取提供商共用的 keep-alive HTTP 客户端（进程内按提供商复用，线程安全）"""
+    with _HTTP_CLIENTS_LOCK:
+        client = _HTTP_CLIENTS.get(provider)
+        if client is None or client.is_closed:
+            limits = httpx.Limits(
+                max_connections=POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=POOL_MAX_CONNECTIONS,
+                keepalive_expiry=60.0,
+            )
+            client = httpx.Client(
+                timeout=httpx.Timeout(120.0, connect=10.0),
+                transport=_CancellableTransport(limits),
+                mounts=_proxy_mounts(limits),
+            )
+            _HTTP_CLIENTS[provider] = client
+        return client
+
+
+def close_http_clients():
+    """关闭所有共用的 HTTP 客户端（后台脚本退出前调用）"""
+    with _HTTP_CLIENTS_LOCK:
+        for client in _HTTP_CLIENTS.values():
+            client.close()
+        _HTTP_CLIENTS.clear()
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """最近秩分位数（values 为空时返回 0）"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+def extract_token_usage(message: Any) -> Tuple[int, int]:
+    """从模型输出中提取 (输入 token, 输出 token)，提供商未返回用量时为 (0, 0)"""
+    usage = getattr(message, "usage_metadata", None)
+    if usage:
+        return int(usage.get("input_tokens") or 0), int(usage.get("output_tokens") or 0)
+    meta = getattr(message, "response_metadata", None) or {}
+    token_usage = meta.get("token_usage") or meta.get("usage") or {}
+    if isinstance(token_usage, dict):
+        return (
+            int(token_usage.get("prompt_tokens") or token_usage.get("input_tokens") or 0),
+            int(token_usage.get("completion_tokens") or token_usage.get("output_tokens") or 0),
+        )
+    return 0, 0
+
+
+class LLMMetrics:
+    """线程安全的 LLM 调用指标（保留最近 max_records 条）"""
+
+    def __init__(self, max_records: int = METRICS_MAX_RECORDS):
+        self._records = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, model: str, op: str, latency_ms: float,
+               ttft_ms: Optional[float] = None, input_tokens: int = 0, output_tokens: int = 0,
+               error: Optional[str] = None, cancelled: bool = False):
+        entry = {
+            "ts": time.time(),
+            "provider": provider,
+            "model": model,
+            "op": op,
+            "latency_ms": latency_ms,
+            "ttft_ms": ttft_ms,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "error": error,
+            "cancelled": cancelled,
+        }
+        with self._lock:
+            self._records.append(entry)
+
+    def records(self, provider: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            items = list(self._records)
+        if provider:
+            items = [r for r in items if r["provider"] == provider]
+        return items
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        按提供商汇总
+
+        Returns:
+            {provider: {"calls", "errors", "cancelled", "error_rate", "p50_ms", "p95_ms", "ttft_p50_ms",
+                        "input_tokens", "output_tokens"}}
+            被取消的调用（如对冲请求中落后的一方）不计入失败和耗时分位数
+        """
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for r in self.records():
+            grouped.setdefault(r["provider"], []).append(r)
+
+        result = {}
+        for provider, items in grouped.items():
+            cancelled = sum(1 for r in items if r["cancelled"])
+            ok = [r for r in items if not r["error"] and not r["cancelled"]]
+            ttfts = [r["ttft_ms"] for r in ok if r["ttft_ms"] is not None]
+            errors = len(items) - len(ok) - cancelled
+            result[provider] = {
+                "calls": len(items),
+                "errors": errors,
+                "cancelled": cancelled,
+                "error_rate": errors / len(items),
+                "p50_ms": percentile([r["latency_ms"] for r in ok], 50),
+                "p95_ms": percentile([r["latency_ms"] for r in ok], 95),
+                "ttft_p50_ms": percentile(ttfts, 50) if ttfts else None,
+                "input_tokens": sum(r["input_tokens"] for r in items),
+                "output_tokens": sum(r["output_tokens"] for r in items),
+            }
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+
+# 进程级指标（Streamlit 会话与后台调度器共用）
+LLM_METRICS = LLMMetrics()
+
+
+class LLMGateway(Runnable):
+    """
+    LLM 统一入口
+
+    包装 llm_factory.create_llm 构建的客户端，invoke / batch / stream 委托给内部模型并记录指标。
+    作为 Runnable 可直接参与 `prompt | llm | parser` 组合，链式调用时同样经过网关计量。
+    """
+
+    def __init__(self, provider: str, llm: Any, model: str = "",
+                 metrics: Optional[LLMMetrics] = None, max_concurrency: int = POOL_MAX_CONNECTIONS):
+        """
+        Args:
+            provider: 提供商名称（与侧边栏选项一致）
+            llm: LangChain 聊天模型
+            model: 模型名（用于指标展示）
+            metrics: 指标存储（默认进程级 LLM_METRICS）
+            max_concurrency: batch 未指定 max_concurrency 时的默认并发数
+        """
+        self.provider = provider
+        self.llm = llm
+        self.model = model
+        self.metrics = metrics if metrics is not None else LLM_METRICS
+        self.max_concurrency = max_concurrency
+
+    def __repr__(self) -> str:
+        return f"LLMGateway(provider={self.provider!r}, model={self.model!r})"
+
+    def _record(self, op: str, start: float, message: Any = None, ttft_ms: Optional[float] = None,
+                error: Optional[BaseException] = None, cancelled: bool = False):
+        input_tokens, output_tokens = extract_token_usage(message) if message is not None else (0, 0)
+        self.metrics.record(
+            self.provider, self.model, op,
+            latency_ms=(time.perf_counter() - start) * 1000.0,
+            ttft_ms=ttft_ms,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            error=f"{type(error).__name__}: {error}" if error is not None else None,
+            cancelled=cancelled,
+        )
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            result = self.llm.invoke(input, config, **kwargs)
+        except Exception as e:
+            self._record("invoke", start, error=e)
+            raise
+        self._record("invoke", start, result)
+        return result
+
+    def batch(self, inputs: List[Any], config: Optional[RunnableConfig] = None,
+              *, return_exceptions: bool = False, **kwargs: Any) -> List[Any]:
+        """并发调用 invoke（每个请求单独计量），默认并发数与连接池大小一致"""
+        if config is None:
+            config = {"max_concurrency": self.max_concurrency}
+        elif isinstance(config, dict) and config.get("max_concurrency") is None:
+            config = {**config, "max_concurrency": self.max_concurrency}
+        return super().batch(inputs, config, return_exceptions=return_exceptions, **kwargs)
+
+    def stream(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Iterator[Any]:
+        start = time.perf_counter()
+        ttft_ms = None
+        merged = None
+        try:
+            for chunk in self.llm.stream(input, config, **kwargs):
+                if ttft_ms is None:
+                    ttft_ms = (time.perf_counter() - start) * 1000.0
+                merged = chunk if merged is None else merged + chunk
+                yield chunk
+        except GeneratorExit:
+            # 调用方提前关闭（如对冲请求中落后的一方被取消），底层 HTTP 流随之关闭
+            self._record("stream", start, merged, ttft_ms, cancelled=True)
+            raise
+        except Exception as e:
+            # 被 AttemptHandle 取消导致的连接错误同样记为 cancelled，不计入失败率
+            handle = current_attempt()
+            if handle is not None and handle.closed:
+                self._record("stream", start, merged, ttft_ms, cancelled=True)
+            else:
+                self._record("stream", start, merged, ttft_ms, error=e)
+            raise
+        self._record("stream", start, merged, ttft_ms)
+
+
+def _build_pooled_llm(provider: str, api_key: str, model: str, temperature: float, http_client: httpx.Client):
+    """为 OpenAI 兼容的提供商注入共用 HTTP 客户端"""
+    if provider == "DeepSeek":
+        from langchain_deepseek import ChatDeepSeek
+
+        return ChatDeepSeek(api_key=api_key, model=model, temperature=temperature, http_client=http_client)
+
+    if provider == "OpenAI (GPT)":
+        from langchain_openai import ChatOpenAI
+
+        return ChatOpenAI(api_key=api_key, model=model, temperature=temperature, http_client=http_client)
+
+    if provider == "Groq":
+        from langchain_groq import ChatGroq
+
+        return ChatGroq(api_key=api_key, model=model, temperature=temperature, http_client=http_client)
+
+    if provider == "Moonshot (Kimi)":
+        try:
+            from langchain_moonshot import ChatMoonshot  # type: ignore
+
+            return ChatMoonshot(api_key=api_key, model=model, temperature=temperature, http_client=http_client)
+        except Exception:
+            # langchain_community 的 MoonshotChat 不接受 http_client，直接传入 openai 客户端
+            import openai
+            from langchain_community.chat_models import MoonshotChat  # type: ignore
+            from langchain_community.llms.moonshot import MOONSHOT_SERVICE_URL_BASE  # type: ignore
+
+            client = openai.OpenAI(api_key=api_key, base_url=MOONSHOT_SERVICE_URL_BASE, http_client=http_client)
+            return MoonshotChat(api_key=api_key, model=model, temperature=temperature,
+                                client=client.chat.completions)
+
+    raise ValueError(f"Unknown provider: {provider}")
+
+
+def create_gateway(provider: str, api_key: str, model: str, temperature: float,
+                   metrics: Optional[LLMMetrics] = None, record_path: Optional[str] = None) -> LLMGateway:
+    """
+    构建 LLM 网关（不带缓存，Streamlit 侧由 build_llm 负责缓存）
+    - DeepSeek / OpenAI / Groq / Moonshot：共用 keep-alive 连接池
+    - 通义 / 豆包 / 文心一言：SDK 自行管理连接，沿用 create_llm，仅记录指标
+    - 离线模拟（FAKE_PROVIDER）：沿用 create_llm 构建 FakeChatModel
+    - record_path（默认取环境变量 GEO_LLM_RECORD）：真实模型的调用录制到该 fixture 库，供离线回放
+    """
+    model = model or model_defaults(provider)
+    if provider in POOLED_PROVIDERS:
+        llm = _build_pooled_llm(provider, api_key, model, temperature, shared_http_client(provider))
+    else:
+        llm = create_llm(provider, api_key, model, temperature)
+    record_path = record_path if record_path is not None else os.environ.get(RECORD_ENV, "")
+    if record_path and provider != FAKE_PROVIDER:
+        llm = RecordingLLM(llm, fixture_store(record_path), provider=provider, model=model)
+    return LLMGateway(provider, llm, model=model, metrics=metrics)
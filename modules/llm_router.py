@@ -0,0 +1,269 @@
+"""
+LLM 路由模块
+在多个已配置的提供商（LLMGateway）之间按最近的延迟与成本选择生成模型，并对慢请求做对冲：
+- 每次请求发往得分最好的提供商：最近 P50 耗时 ×（1 + 成本权重 × 相对单价）×（1 + 失败惩罚 × 失败率）；
+  最近样本不足的提供商优先试用，以便探测新加入或已恢复的提供商
+- 首选请求超过其最近 P95 耗时仍未完成（或直接失败）时，向次优提供商再发一份，先成功的结果胜出
+- 落后的一方被取消：胜负分出后由胜出方关闭其连接（AttemptHandle），提供商停止继续生成；
+  卡在首 token 之前的请求同样立即释放线程与连接
+- 每个线程记录最近一次请求实际使用的提供商与模型（last_route），成本按它记录
+延迟与失败率取自 modules.llm_gateway 记录的调用指标。
+"""
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from langchain_core.messages import message_chunk_to_message
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from modules.llm_gateway import POOL_MAX_CONNECTIONS, AttemptHandle, LLMGateway, LLMMetrics, percentile
+
+
+# 计算延迟分位数时使用的最近调用数与最长时效（秒）
+ROUTING_WINDOW = 20
+ROUTING_MAX_AGE = 300.0
+
+# 样本少于该数量时视为未知延迟，优先试用（新加入或长期未用的提供商重新探测）
+MIN_SAMPLES = 3
+
+# 无样本时的对冲等待时间与对冲等待时间的上下限（秒）
+DEFAULT_HEDGE_DELAY = 8.0
+MIN_HEDGE_DELAY = 0.5
+MAX_HEDGE_DELAY = 60.0
+
+
+def routing_candidates(cfg: dict) -> List[Tuple[str, str]]:
+    """生成路由的候选提供商：生成模型在前，其后是已填写 Key 的验证模型（去重）"""
+    candidates = [(cfg["gen_provider"], cfg.get("gen_api_key", ""))]
+    for vp in cfg.get("verify_providers", []):
+        key = cfg.get("verify_keys", {}).get(vp, "").strip()
+        if key and vp not in [p for p, _ in candidates]:
+            candidates.append((vp, key))
+    return candidates
+
+
+def default_prices(gateways: List[LLMGateway]) -> Dict[str, float]:
+    """按 ROIAnalyzer 的定价表估算各提供商每 1K 输入 + 1K 输出 token 的价格（USD）"""
+    from modules.roi_analyzer import ROIAnalyzer
+
+    analyzer = ROIAnalyzer()
+    return {gw.provider: analyzer.calculate_cost(gw.provider, gw.model, 1000, 1000)[0] for gw in gateways}
+
+
+def resolve_route(llm: Any, default_provider: str) -> Tuple[str, Optional[str]]:
+    """
+    确定一次生成调用的成本归属 (提供商, 模型)
+
+    llm 为 LLMRouter 时取当前线程最近一次请求实际使用的提供商与模型；否则返回 default_provider
+    与 llm 自身的模型名（未知时为 None，由调用方按提供商取默认模型）。
+    """
+    route = llm.last_route() if isinstance(llm, LLMRouter) else None
+    if route:
+        return route["provider"], route["model"] or None
+    return default_provider, getattr(llm, "model_name", None) or getattr(llm, "model", None) or None
+
+
+class LLMRouter(Runnable):
+    """
+    多提供商生成路由
+
+    与 LLMGateway 一样是 Runnable，可直接替换 gen_llm 参与 `prompt | llm | parser` 组合。
+    batch 通过并发调用 invoke 实现，每个请求单独路由和对冲。
+    """
+
+    def __init__(self, gateways: List[LLMGateway], prices: Optional[Dict[str, float]] = None,
+                 cost_weight: float = 0.3, error_penalty: float = 2.0, hedge: bool = True,
+                 hedge_percentile: float = 95, window: int = ROUTING_WINDOW, max_age: float = ROUTING_MAX_AGE,
+                 min_samples: int = MIN_SAMPLES,
+                 default_hedge_delay: float = DEFAULT_HEDGE_DELAY, min_hedge_delay: float = MIN_HEDGE_DELAY,
+                 max_hedge_delay: float = MAX_HEDGE_DELAY, max_concurrency: int = POOL_MAX_CONNECTIONS):
+        """
+        Args:
+            gateways: 候选提供商（按配置顺序，得分相同时靠前的优先）
+            prices: {提供商: 每 1K 输入 + 1K 输出 token 价格}，默认取 ROIAnalyzer 定价表
+            cost_weight: 成本权重（0 表示只看延迟）
+            error_penalty: 失败率惩罚系数
+            hedge: 是否启用对冲请求
+            hedge_percentile: 首选请求超过该分位数耗时后发出对冲请求
+            window: 计算分位数使用的最近调用数
+            max_age: 只使用最近 max_age 秒内的调用
+            min_samples: 样本少于该数量时视为未知延迟
+            default_hedge_delay: 首选提供商无样本时的对冲等待（秒）
+            min_hedge_delay / max_hedge_delay: 对冲等待的上下限（秒）
+            max_concurrency: batch 未指定 max_concurrency 时的默认并发数
+        """
+        if not gateways:
+            raise ValueError("LLMRouter 至少需要一个提供商")
+        self.gateways = list(gateways)
+        self.prices = prices if prices is not None else default_prices(self.gateways)
+        self.cost_weight = cost_weight
+        self.error_penalty = error_penalty
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.window = window
+        self.max_age = max_age
+        self.min_samples = min_samples
+        self.default_hedge_delay = default_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.max_hedge_delay = max_hedge_delay
+        self.max_concurrency = max_concurrency
+        # 每个请求最多同时占用两个线程（首选 + 对冲）
+        self._executor = ThreadPoolExecutor(max_workers=max(2, max_concurrency * 2),
+                                            thread_name_prefix="llm-router")
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()
+        self.stats = {"requests": 0, "hedged": 0, "hedge_wins": 0, "failovers": 0, "cancelled": 0}
+
+    def __repr__(self) -> str:
+        return f"LLMRouter(providers={[gw.provider for gw in self.gateways]!r})"
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _set_route(self, gateway: LLMGateway):
+        self._local.route = {"provider": gateway.provider, "model": gateway.model}
+
+    def last_route(self) -> Optional[Dict[str, str]]:
+        """当前线程最近一次请求实际使用的 {"provider", "model"}（对冲时为胜出方），尚无请求时返回 None"""
+        return getattr(self._local, "route", None)
+
+    # ---------- 选择 ----------
+
+    def _recent(self, gateway: LLMGateway) -> List[Dict[str, Any]]:
+        metrics: LLMMetrics = gateway.metrics
+        cutoff = time.time() - self.max_age
+        return [r for r in metrics.records(gateway.provider)[-self.window:] if r["ts"] >= cutoff]
+
+    def provider_stats(self) -> List[Dict[str, Any]]:
+        """
+        各候选提供商的路由依据，按得分从好到差排列
+
+        Returns:
+            [{"gateway", "provider", "samples", "p50_ms", "p95_ms", "error_rate", "price", "score"}, ...]
+        """
+        rows = []
+        for order, gw in enumerate(self.gateways):
+            recent = self._recent(gw)
+            # 被取消的调用耗时是下限，一并计入（否则总是落后的提供商看起来不慢）
+            latencies = [r["latency_ms"] for r in recent if not r["error"]]
+            errors = sum(1 for r in recent if r["error"])
+            known = len(latencies) >= self.min_samples
+            rows.append({
+                "gateway": gw,
+                "provider": gw.provider,
+                "order": order,
+                "samples": len(latencies),
+                "p50_ms": percentile(latencies, 50) if known else None,
+                "p95_ms": percentile(latencies, self.hedge_percentile) if known else None,
+                "error_rate": errors / len(recent) if recent else 0.0,
+                "price": float(self.prices.get(gw.provider, 0.0) or 0.0),
+            })
+
+        max_price = max((r["price"] for r in rows), default=0.0)
+        for r in rows:
+            if r["p50_ms"] is None:
+                # 样本不足：得分记 0，优先试用
+                r["score"] = 0.0
+                continue
+            relative_price = r["price"] / max_price if max_price > 0 else 0.0
+            r["score"] = (max(r["p50_ms"], 1.0) * (1 + self.cost_weight * relative_price)
+                          * (1 + self.error_penalty * r["error_rate"]))
+        rows.sort(key=lambda r: (r["score"], r["order"]))
+        return rows
+
+    def _hedge_delay(self, row: Dict[str, Any]) -> float:
+        if row["p95_ms"] is None:
+            delay = self.default_hedge_delay
+        else:
+            delay = row["p95_ms"] / 1000.0
+        return min(self.max_hedge_delay, max(self.min_hedge_delay, delay))
+
+    # ---------- 调用 ----------
+
+    def _attempt(self, gateway: LLMGateway, input: Any, config: Optional[RunnableConfig],
+                 handle: AttemptHandle, kwargs: Dict[str, Any]) -> Any:
+        """
+        以流式方式调用，胜出方调用 handle.close() 取消本次调用
+
+        共用连接池的提供商：连接被立即关闭，阻塞中的读取（包括等待首 token）随即报错返回；
+        其他提供商：收到下一段输出时停止并关闭流。
+        """
+        merged = None
+        with handle.bind():
+            stream = gateway.stream(input, config, **kwargs)
+            try:
+                for chunk in stream:
+                    if handle.closed:
+                        self._count("cancelled")
+                        return None
+                    merged = chunk if merged is None else merged + chunk
+            except Exception:
+                if handle.closed:
+                    self._count("cancelled")
+                    return None
+                raise
+            finally:
+                stream.close()
+        if merged is None:
+            raise ValueError(f"{gateway.provider} 未返回内容")
+        return message_chunk_to_message(merged)
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        self._count("requests")
+        ranked = self.provider_stats()
+        primary = ranked[0]
+        if not self.hedge or len(ranked) == 1:
+            self._set_route(primary["gateway"])
+            return primary["gateway"].invoke(input, config, **kwargs)
+
+        backup = ranked[1]
+        handles = {}
+        first_handle = AttemptHandle()
+        first = self._executor.submit(self._attempt, primary["gateway"], input, config, first_handle, kwargs)
+        handles[first] = first_handle
+
+        done, _ = wait([first], timeout=self._hedge_delay(primary))
+        if done and first.exception() is None:
+            self._set_route(primary["gateway"])
+            return first.result()
+
+        # 首选请求过慢（超过 P95）或已失败：向次优提供商发出对冲请求
+        self._count("failovers" if done else "hedged")
+        second_handle = AttemptHandle()
+        second = self._executor.submit(self._attempt, backup["gateway"], input, config, second_handle, kwargs)
+        handles[second] = second_handle
+
+        pending = set(handles)
+        last_error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    for other in pending:
+                        handles[other].close()
+                        other.cancel()
+                    if future is second:
+                        self._count("hedge_wins")
+                    self._set_route((primary if future is first else backup)["gateway"])
+                    return future.result()
+                last_error = error
+        raise last_error
+
+    def batch(self, inputs: List[Any], config: Optional[RunnableConfig] = None,
+              *, return_exceptions: bool = False, **kwargs: Any) -> List[Any]:
+        """并发调用 invoke（每个请求单独路由），默认并发数与连接池大小一致"""
+        if config is None:
+            config = {"max_concurrency": self.max_concurrency}
+        elif isinstance(config, dict) and config.get("max_concurrency") is None:
+            config = {**config, "max_concurrency": self.max_concurrency}
+        return super().batch(inputs, config, return_exceptions=return_exceptions, **kwargs)
+
+    def stream(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Iterator[Any]:
+        """流式输出直接交给当前得分最好的提供商（已开始输出的流不做对冲）"""
+        self._count("requests")
+        gateway = self.provider_stats()[0]["gateway"]
+        self._set_route(gateway)
+        yield from gateway.stream(input, config, **kwargs)
@@ -2,9 +2,11 @@
 多模态提示生成模块
 用于生成配图描述、视频脚本描述，并可选择性地生成图片
 """
-from typing import List, Dict, Optional, Tuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, List, Dict, Optional, Tuple
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from modules.concurrency import run_ordered
 import json
 import re
 import base64
@@ -13,6 +15,33 @@ from pathlib import Path
 import time
 
 
+# 通义万相异步任务的未结束状态
+TONGYI_PENDING_STATUSES = ("PENDING", "RUNNING", "SUSPENDED")
+
+# 逐段生成配图描述 / 视频脚本时的最大并发 LLM 调用数
+SEGMENT_MAX_WORKERS = 4
+
+
+def _safe_get(obj, key: str, default=None):
+    """兼容 DashScope 返回对象/字典，且避免 __getattr__ 抛 KeyError。"""
+    if obj is None:
+        return default
+    if isinstance(obj, dict):
+        return obj.get(key, default)
+    try:
+        return getattr(obj, key)
+    except Exception:
+        return default
+
+
+def _tongyi_task_status(output) -> str:
+    if _safe_get(output, "task_status", None) is not None:
+        return str(_safe_get(output, "task_status") or "")
+    if _safe_get(output, "taskStatus", None) is not None:
+        return str(_safe_get(output, "taskStatus") or "")
+    return ""
+
+
 class MultimodalPromptGenerator:
     """多模态提示生成器"""
     
@@ -261,25 +290,35 @@ class MultimodalPromptGenerator:
             配图描述字典
         """
         try:
-            prompt = PromptTemplate.from_template(self.image_prompt_template)
-            chain = prompt | llm_chain | StrOutputParser()
-            
-            result = chain.invoke({
-                "content_segment": content_segment,
-                "brand": brand,
-                "advantages": advantages,
-                "platform": platform,
-                "keyword": keyword
-            })
-            
-            # 解析结果
-            description_data = self._parse_image_description(result)
-            return description_data
-            
+            return self._llm_image_description(content_segment, brand, advantages, platform, keyword, llm_chain)
         except Exception as e:
             # 如果生成失败，返回基于规则的简单描述
             return self._rule_based_image_description(content_segment, platform)
     
+    def _llm_image_description(
+        self,
+        content_segment: str,
+        brand: str,
+        advantages: str,
+        platform: str,
+        keyword: str,
+        llm_chain
+    ) -> Dict:
+        """调用 LLM 生成单个配图描述（失败时抛出异常，由调用方决定如何降级）"""
+        prompt = PromptTemplate.from_template(self.image_prompt_template)
+        chain = prompt | llm_chain | StrOutputParser()
+        
+        result = chain.invoke({
+            "content_segment": content_segment,
+            "brand": brand,
+            "advantages": advantages,
+            "platform": platform,
+            "keyword": keyword
+        })
+        
+        # 解析结果
+        return self._parse_image_description(result)
+    
     def generate_batch_image_descriptions(
         self,
         content: str,
@@ -287,11 +326,16 @@ class MultimodalPromptGenerator:
         advantages: str,
         platform: str,
         keyword: str,
-        llm_chain
+        llm_chain,
+        max_workers: int = SEGMENT_MAX_WORKERS
     ) -> Dict:
         """
         批量生成所有配图的详细描述
         
+        先用一次 LLM 调用生成全部描述；调用失败或结果无法解析时，改为按占位符并发逐个生成
+        （最多 max_workers 个并发调用，结果与占位符顺序一致）。个别占位符生成失败时使用规则描述补齐，
+        并记录在 fallback_count / errors 中。
+        
         Args:
             content: 完整内容
             brand: 品牌名称
@@ -299,7 +343,8 @@ class MultimodalPromptGenerator:
             platform: 平台名称
             keyword: 关键词
             llm_chain: LangChain 链对象
-            
+            max_workers: 逐个生成时的最大并发数
+        
         Returns:
             包含所有配图描述的字典
         """
@@ -327,30 +372,44 @@ class MultimodalPromptGenerator:
             
             # 解析结果
             batch_data = self._parse_batch_image_descriptions(result, placeholders)
-            return batch_data
-            
+            if batch_data.get("image_descriptions"):
+                return batch_data
         except Exception as e:
-            # 如果批量生成失败，逐个生成
-            descriptions = []
-            for placeholder in placeholders:
-                desc = self.generate_image_description(
-                    placeholder["paragraph"],
-                    brand,
-                    advantages,
-                    platform,
-                    keyword,
-                    llm_chain
-                )
-                desc["position"] = placeholder["hint"]
-                desc["original_hint"] = placeholder["hint"]
-                descriptions.append(desc)
-            
-            return {
-                "image_descriptions": descriptions,
-                "total_images": len(descriptions),
-                "style_consistency": "逐个生成，风格可能不完全统一"
-            }
-    
+            pass
+        
+        # 批量生成失败：按占位符并发逐个生成
+        outcomes = run_ordered(
+            lambda placeholder: self._llm_image_description(
+                placeholder["paragraph"], brand, advantages, platform, keyword, llm_chain
+            ),
+            placeholders,
+            max_workers=max_workers
+        )
+        descriptions = []
+        errors = []
+        for outcome in outcomes:
+            placeholder = outcome["item"]
+            if outcome["error"]:
+                desc = self._rule_based_image_description(placeholder["paragraph"], platform)
+                desc["fallback_reason"] = outcome["error"]
+                errors.append({"index": outcome["index"], "hint": placeholder["hint"], "error": outcome["error"]})
+            else:
+                desc = outcome["result"]
+            desc["position"] = placeholder["hint"]
+            desc["original_hint"] = placeholder["hint"]
+            descriptions.append(desc)
+        
+        style_consistency = "逐个生成，风格可能不完全统一"
+        if errors:
+            style_consistency += f"；{len(errors)} 个配图生成失败，已使用规则描述"
+        return {
+            "image_descriptions": descriptions,
+            "total_images": len(descriptions),
+            "style_consistency": style_consistency,
+            "fallback_count": len(errors),
+            "errors": errors
+        }
+
     def generate_video_script_description(
         self,
         content_segment: str,
@@ -375,25 +434,83 @@ class MultimodalPromptGenerator:
             视频画面描述字典
         """
         try:
-            prompt = PromptTemplate.from_template(self.video_script_template)
-            chain = prompt | llm_chain | StrOutputParser()
-            
-            result = chain.invoke({
-                "content_segment": content_segment,
-                "brand": brand,
-                "advantages": advantages,
-                "keyword": keyword,
-                "timestamp": timestamp
-            })
-            
-            # 解析结果
-            script_data = self._parse_video_script(result)
-            return script_data
-            
+            return self._llm_video_script(content_segment, brand, advantages, keyword, timestamp, llm_chain)
         except Exception as e:
             # 如果生成失败，返回基于规则的简单描述
             return self._rule_based_video_script(content_segment, timestamp)
     
+    def _llm_video_script(
+        self,
+        content_segment: str,
+        brand: str,
+        advantages: str,
+        keyword: str,
+        timestamp: str,
+        llm_chain
+    ) -> Dict:
+        """调用 LLM 生成单个视频片段的画面描述（失败时抛出异常）"""
+        prompt = PromptTemplate.from_template(self.video_script_template)
+        chain = prompt | llm_chain | StrOutputParser()
+        
+        result = chain.invoke({
+            "content_segment": content_segment,
+            "brand": brand,
+            "advantages": advantages,
+            "keyword": keyword,
+            "timestamp": timestamp
+        })
+        
+        # 解析结果
+        return self._parse_video_script(result)
+    
+    def generate_video_scripts(
+        self,
+        content: str,
+        brand: str,
+        advantages: str,
+        keyword: str,
+        llm_chain,
+        max_segments: int = 5,
+        segment_seconds: int = 10,
+        max_workers: int = SEGMENT_MAX_WORKERS
+    ) -> Dict:
+        """
+        按段落并发生成视频脚本的画面描述
+        
+        取前 max_segments 个段落（按空行切分），每段对应 segment_seconds 秒，
+        最多 max_workers 个并发 LLM 调用，结果按段落顺序返回；单段失败时使用规则描述补齐。
+        
+        Returns:
+            {
+                "scripts": [{"timestamp": str, "script": Dict}, ...],
+                "fallback_count": int,
+                "errors": [{"index": int, "timestamp": str, "error": str}, ...]
+            }
+        """
+        segments = []
+        for i, segment in enumerate(content.split('\n\n')[:max_segments]):
+            if segment.strip():
+                start, end = i * segment_seconds, (i + 1) * segment_seconds
+                segments.append((f"{start // 60:02d}:{start % 60:02d}-{end // 60:02d}:{end % 60:02d}", segment))
+        
+        outcomes = run_ordered(
+            lambda item: self._llm_video_script(item[1], brand, advantages, keyword, item[0], llm_chain),
+            segments,
+            max_workers=max_workers
+        )
+        scripts = []
+        errors = []
+        for outcome in outcomes:
+            timestamp, segment = outcome["item"]
+            if outcome["error"]:
+                script = self._rule_based_video_script(segment, timestamp)
+                script["fallback_reason"] = outcome["error"]
+                errors.append({"index": outcome["index"], "timestamp": timestamp, "error": outcome["error"]})
+            else:
+                script = outcome["result"]
+            scripts.append({"timestamp": timestamp, "script": script})
+        return {"scripts": scripts, "fallback_count": len(errors), "errors": errors}
+    
     def _parse_image_description(self, result: str) -> Dict:
         """解析配图描述结果"""
         json_match = re.search(r'\{.*\}', result, re.DOTALL)
@@ -710,7 +827,7 @@ class MultimodalPromptGenerator:
         n: int = 1
     ) -> Dict:
         """
-        使用通义万相生成图片
+        使用通义万相生成图片（同步调用，阻塞直到任务结束）
         
         Args:
             prompt: 图片生成提示词（中文）
@@ -718,7 +835,7 @@ class MultimodalPromptGenerator:
             model: 模型名称，默认 wanx-v1
             size: 图片尺寸，默认 1024*1024
             n: 生成数量，默认 1
-            
+        
         Returns:
             包含生成结果的字典：
             {
@@ -729,17 +846,6 @@ class MultimodalPromptGenerator:
             }
         """
         try:
-            def _safe_get(obj, key: str, default=None):
-                """兼容 DashScope 返回对象/字典，且避免 __getattr__ 抛 KeyError。"""
-                if obj is None:
-                    return default
-                if isinstance(obj, dict):
-                    return obj.get(key, default)
-                try:
-                    return getattr(obj, key)
-                except Exception:
-                    return default
-
             import dashscope
             from dashscope import ImageSynthesis
             
@@ -747,7 +853,7 @@ class MultimodalPromptGenerator:
             
             # 兜底：确保 size 是允许值
             size = self.normalize_tongyi_image_size(size)
-
+            
             # 调用通义万相API
             response = ImageSynthesis.call(
                 model=model,
@@ -755,94 +861,132 @@ class MultimodalPromptGenerator:
                 n=n,
                 size=size
             )
+            return self._parse_tongyi_response(response, prompt, size)
+        
+        except ImportError:
+            return {
+                "success": False,
+                "error": "未安装 dashscope 库，请运行：pip install dashscope",
+                "prompt": prompt
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"生成图片时出错：{str(e)}",
+                "prompt": prompt
+            }
+    
+    @staticmethod
+    def _parse_tongyi_response(response, prompt: str, size: str) -> Dict:
+        """解析 ImageSynthesis 的 call / fetch 响应（任务已结束），返回 generate_image_with_tongyi 的结果结构"""
+        status_code = _safe_get(response, "status_code", None)
+        if status_code == 200:
+            output = _safe_get(response, "output", None)
             
-            status_code = _safe_get(response, "status_code", None)
-            if status_code == 200:
-                output = _safe_get(response, "output", None)
-
-                # 有些情况下 status_code==200 但任务实际 FAILED（results 为空）
-                task_status = ""
-                if _safe_get(output, "task_status", None) is not None:
-                    task_status = str(_safe_get(output, "task_status") or "")
-                elif _safe_get(output, "taskStatus", None) is not None:
-                    task_status = str(_safe_get(output, "taskStatus") or "")
-
-                results = _safe_get(output, "results", None)
-                code = _safe_get(output, "code", None)
-                message = _safe_get(output, "message", None)
-
-                if task_status and task_status.upper() not in ("SUCCEEDED", "SUCCESS"):
-                    error_detail = f"任务状态：{task_status}"
-                    if code:
-                        error_detail += f"，错误码：{code}"
-                    if message:
-                        error_detail += f"，消息：{message}"
-                    error_detail += f"，size={size}"
-                    return {
-                        "success": False,
-                        "error": error_detail,
-                        "prompt": prompt,
-                        "response": str(output) if output is not None else "无输出",
-                    }
-
-                if results and len(results) > 0:
-                    image_url = _safe_get(results[0], "url", None)
-                    if image_url is None and isinstance(results[0], dict):
-                        image_url = results[0].get("url")
-
-                    task_id = _safe_get(output, "task_id", "") or _safe_get(output, "taskId", "") or ""
-                    
-                    # 验证 image_url 不为空
-                    if not image_url:
-                        return {
-                            "success": False,
-                            "error": f"生成成功但图片URL为空（size={size}）",
-                            "prompt": prompt,
-                            "response": str(output) if output is not None else "无输出"
-                        }
-                    
-                    return {
-                        "success": True,
-                        "image_url": image_url,
-                        "task_id": task_id,
-                        "prompt": prompt
-                    }
-                else:
-                    # 详细错误信息
-                    error_detail = f"生成成功但未返回图片URL（size={size}）"
-                    if code:
-                        error_detail += f"，错误码：{code}"
-                    if message:
-                        error_detail += f"，消息：{message}"
-                    
+            # 有些情况下 status_code==200 但任务实际 FAILED（results 为空）
+            task_status = _tongyi_task_status(output)
+            
+            results = _safe_get(output, "results", None)
+            code = _safe_get(output, "code", None)
+            message = _safe_get(output, "message", None)
+            
+            if task_status and task_status.upper() not in ("SUCCEEDED", "SUCCESS"):
+                error_detail = f"任务状态：{task_status}"
+                if code:
+                    error_detail += f"，错误码：{code}"
+                if message:
+                    error_detail += f"，消息：{message}"
+                error_detail += f"，size={size}"
+                return {
+                    "success": False,
+                    "error": error_detail,
+                    "prompt": prompt,
+                    "response": str(output) if output is not None else "无输出",
+                }
+            
+            if results and len(results) > 0:
+                image_url = _safe_get(results[0], "url", None)
+                if image_url is None and isinstance(results[0], dict):
+                    image_url = results[0].get("url")
+                
+                task_id = _safe_get(output, "task_id", "") or _safe_get(output, "taskId", "") or ""
+                
+                # 验证 image_url 不为空
+                if not image_url:
                     return {
                         "success": False,
-                        "error": error_detail,
+                        "error": f"生成成功但图片URL为空（size={size}）",
                         "prompt": prompt,
                         "response": str(output) if output is not None else "无输出"
                     }
+                
+                return {
+                    "success": True,
+                    "image_url": image_url,
+                    "task_id": task_id,
+                    "prompt": prompt
+                }
             else:
                 # 详细错误信息
-                error_msg = f"API调用失败，状态码：{status_code}"
-                resp_message = _safe_get(response, "message", None)
-                resp_code = _safe_get(response, "code", None)
-                resp_request_id = _safe_get(response, "request_id", None) or _safe_get(response, "requestId", None)
-
-                if resp_message:
-                    error_msg += f"，消息：{resp_message}"
-                if resp_code:
-                    error_msg += f"，错误码：{resp_code}"
-                if resp_request_id:
-                    error_msg += f"，请求ID：{resp_request_id}"
-                error_msg += f"，size={self.normalize_tongyi_image_size(size)}"
+                error_detail = f"生成成功但未返回图片URL（size={size}）"
+                if code:
+                    error_detail += f"，错误码：{code}"
+                if message:
+                    error_detail += f"，消息：{message}"
                 
                 return {
                     "success": False,
-                    "error": error_msg,
+                    "error": error_detail,
                     "prompt": prompt,
-                    "status_code": status_code
+                    "response": str(output) if output is not None else "无输出"
                 }
-                
+        else:
+            # 详细错误信息
+            error_msg = f"API调用失败，状态码：{status_code}"
+            resp_message = _safe_get(response, "message", None)
+            resp_code = _safe_get(response, "code", None)
+            resp_request_id = _safe_get(response, "request_id", None) or _safe_get(response, "requestId", None)
+            
+            if resp_message:
+                error_msg += f"，消息：{resp_message}"
+            if resp_code:
+                error_msg += f"，错误码：{resp_code}"
+            if resp_request_id:
+                error_msg += f"，请求ID：{resp_request_id}"
+            error_msg += f"，size={size}"
+            
+            return {
+                "success": False,
+                "error": error_msg,
+                "prompt": prompt,
+                "status_code": status_code
+            }
+    
+    def submit_tongyi_image_task(
+        self,
+        prompt: str,
+        api_key: str,
+        model: str = "wanx-v1",
+        size: str = "1024*1024",
+        n: int = 1
+    ) -> Dict:
+        """
+        提交通义万相异步生图任务（立即返回，不等待生成完成）
+        
+        Returns:
+            {"success": bool, "task_id": str, "prompt": str, "size": str, "error": str}
+        """
+        size = self.normalize_tongyi_image_size(size)
+        try:
+            from dashscope import ImageSynthesis
+            
+            response = ImageSynthesis.async_call(
+                model=model,
+                prompt=prompt,
+                n=n,
+                size=size,
+                api_key=api_key
+            )
         except ImportError:
             return {
                 "success": False,
@@ -850,11 +994,157 @@ class MultimodalPromptGenerator:
                 "prompt": prompt
             }
         except Exception as e:
+            return {"success": False, "error": f"提交生图任务时出错：{str(e)}", "prompt": prompt}
+        
+        output = _safe_get(response, "output", None)
+        task_id = _safe_get(output, "task_id", "") or _safe_get(output, "taskId", "") or ""
+        if _safe_get(response, "status_code", None) != 200 or not task_id:
+            result = self._parse_tongyi_response(response, prompt, size)
+            if result.get("success") or not result.get("error"):
+                result = {"success": False, "error": f"提交生图任务失败：未返回任务ID（size={size}）", "prompt": prompt}
+            return result
+        return {"success": True, "task_id": task_id, "prompt": prompt, "size": size, "error": None}
+    
+    def fetch_tongyi_image_task(self, task_id: str, api_key: str, prompt: str = "", size: str = "") -> Dict:
+        """
+        查询一次异步生图任务的状态
+        
+        Returns:
+            任务结束时与 generate_image_with_tongyi 的结果结构相同；
+            任务排队/运行中，或查询遇到网络错误、5xx 时返回 {"success": False, "pending": True, ...}，调用方稍后重试
+        """
+        try:
+            from dashscope import ImageSynthesis
+            
+            response = ImageSynthesis.fetch(task_id, api_key=api_key)
+        except ImportError:
             return {
                 "success": False,
-                "error": f"生成图片时出错：{str(e)}",
+                "error": "未安装 dashscope 库，请运行：pip install dashscope",
                 "prompt": prompt
             }
+        except Exception as e:
+            return {"success": False, "pending": True, "task_id": task_id, "error": f"查询任务出错：{str(e)}"}
+        
+        status_code = _safe_get(response, "status_code", None)
+        if isinstance(status_code, int) and (status_code >= 500 or status_code == 429):
+            return {"success": False, "pending": True, "task_id": task_id, "error": f"查询任务失败，状态码：{status_code}"}
+        if status_code == 200:
+            task_status = _tongyi_task_status(_safe_get(response, "output", None)).upper()
+            if task_status in TONGYI_PENDING_STATUSES:
+                return {"success": False, "pending": True, "task_id": task_id, "error": None}
+        result = self._parse_tongyi_response(response, prompt, size)
+        result.setdefault("task_id", task_id)
+        return result
+    
+    def generate_images_with_tongyi_concurrent(
+        self,
+        items: List,
+        prompt_fn: Callable[[int, object], str],
+        api_key: str,
+        model: str = "wanx-v1",
+        size: str = "1024*1024",
+        max_workers: int = 3,
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 8.0,
+        timeout: float = 300.0,
+        on_event: Optional[Callable[[str, int, Dict], None]] = None
+    ) -> List[Dict]:
+        """
+        并发生成多张图片：Prompt 生成与图片合成重叠进行
+        
+        每个元素在线程池中先调用 prompt_fn(index, item) 生成 Prompt（通常是一次 LLM 调用），
+        随即提交异步生图任务；调用线程统一轮询所有已提交的任务，轮询间隔从 poll_interval 开始
+        按任务翻倍，最长 max_poll_interval。某张图片生成较慢不会阻塞其他图片。
+        
+        Args:
+            items: 每张图片的输入（如内容片段、配图描述）
+            prompt_fn: 生成 Prompt 的函数，参数为 (序号, 元素)
+            api_key: 阿里云 DashScope API Key
+            model: 模型名称
+            size: 图片尺寸
+            max_workers: 并发生成 Prompt / 提交任务的线程数
+            poll_interval: 首次轮询间隔（秒）
+            max_poll_interval: 轮询间隔上限（秒）
+            timeout: 单个任务从提交到结束的最长等待时间（秒）
+            on_event: 进度回调 (事件, 序号, 结果)，在调用线程中触发，可直接更新 Streamlit 组件；
+                事件为 "submitted"（任务已提交）或 "done"（该图片已结束，成功或失败）
+        
+        Returns:
+            与 items 顺序一致的结果列表，结构同 generate_image_with_tongyi，另含 "index"
+        """
+        items = list(items)
+        results: List[Optional[Dict]] = [None] * len(items)
+        if not items:
+            return []
+        
+        def emit(event: str, index: int, result: Dict):
+            if on_event:
+                on_event(event, index, result)
+        
+        def finish(index: int, result: Dict):
+            result.pop("pending", None)
+            result["index"] = index
+            results[index] = result
+            emit("done", index, result)
+        
+        def prepare(index: int, item) -> Dict:
+            try:
+                prompt = prompt_fn(index, item)
+            except Exception as e:
+                return {"success": False, "error": f"生成图片 Prompt 失败：{str(e)}", "prompt": ""}
+            if not prompt or not str(prompt).strip():
+                return {"success": False, "error": "图片生成 Prompt 为空，请检查内容或重试", "prompt": prompt or ""}
+            return self.submit_tongyi_image_task(prompt, api_key, model=model, size=size)
+        
+        pending: Dict[int, Dict] = {}
+        workers = max(1, min(int(max_workers or 1), len(items)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tongyi-image") as pool:
+            futures = {pool.submit(prepare, index, item): index for index, item in enumerate(items)}
+            while futures or pending:
+                next_poll = min((task["next_poll"] for task in pending.values()), default=None)
+                wait_for = None if next_poll is None else max(0.0, next_poll - time.monotonic())
+                if futures:
+                    done, _ = wait(futures, timeout=wait_for, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index = futures.pop(future)
+                        submitted = future.result()
+                        if not submitted.get("success"):
+                            finish(index, submitted)
+                            continue
+                        now = time.monotonic()
+                        pending[index] = {
+                            "task_id": submitted["task_id"],
+                            "prompt": submitted["prompt"],
+                            "size": submitted.get("size", size),
+                            "interval": poll_interval,
+                            "next_poll": now + poll_interval,
+                            "deadline": now + timeout,
+                        }
+                        emit("submitted", index, submitted)
+                elif wait_for:
+                    time.sleep(wait_for)
+                
+                for index, task in list(pending.items()):
+                    now = time.monotonic()
+                    if task["next_poll"] > now:
+                        continue
+                    result = self.fetch_tongyi_image_task(task["task_id"], api_key, task["prompt"], task["size"])
+                    if not result.get("pending"):
+                        del pending[index]
+                        finish(index, result)
+                    elif now >= task["deadline"]:
+                        del pending[index]
+                        finish(index, {
+                            "success": False,
+                            "task_id": task["task_id"],
+                            "prompt": task["prompt"],
+                            "error": f"等待生图任务超时（{int(timeout)} 秒）" + (f"：{result['error']}" if result.get("error") else ""),
+                        })
+                    else:
+                        task["interval"] = min(max_poll_interval, task["interval"] * 2)
+                        task["next_poll"] = time.monotonic() + task["interval"]
+        return results
     
     def suggest_image_positions(
         self,
@@ -110,6 +110,43 @@ class ROIAnalyzer:
         
         return cost_usd, cost_cny
     
+    # 成本明细维度：结果字段 -> (汇总维度, 是否忽略空值)
+    BREAKDOWN_DIMENSIONS = {
+        "cost_by_operation": ("operation", False),
+        "cost_by_provider": ("provider", False),
+        "cost_by_keyword": ("keyword", True),
+        "cost_by_platform": ("platform", True),
+    }
+    
+    @staticmethod
+    def aggregate_api_calls(api_calls_df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """
+        将 API 调用记录按维度向量化汇总
+        
+        Returns:
+            {"operation"/"provider"/"keyword"/"platform"/"day": DataFrame}，
+            每个 DataFrame 含 key、cost_usd、cost_cny、calls、tokens 列，
+            与 DataStorage.get_api_call_breakdowns() 的返回结构一致
+        """
+        columns = {"operation": "操作类型", "provider": "提供商", "keyword": "关键词", "platform": "平台"}
+        df = api_calls_df
+        if "调用时间" in df.columns:
+            df = df.assign(日期=pd.to_datetime(df["调用时间"]).dt.strftime("%Y-%m-%d"))
+            columns["day"] = "日期"
+        
+        breakdowns = {}
+        for name, column in columns.items():
+            if column not in df.columns:
+                continue
+            grouped = df.groupby(column, sort=True).agg(
+                cost_usd=("成本(USD)", "sum"),
+                cost_cny=("成本(CNY)", "sum"),
+                calls=("成本(USD)", "size"),
+                tokens=("总Token", "sum"),
+            )
+            breakdowns[name] = grouped.rename_axis("key").reset_index()
+        return breakdowns
+    
     def analyze_costs(
         self,
         api_calls_df: pd.DataFrame,
@@ -126,6 +163,34 @@ class ROIAnalyzer:
             成本分析结果字典
         """
         if api_calls_df.empty:
+            return self.analyze_cost_breakdowns({}, verify_results_df)
+        
+        totals = {
+            "total_cost_usd": api_calls_df["成本(USD)"].sum(),
+            "total_cost_cny": api_calls_df["成本(CNY)"].sum(),
+            "total_tokens": api_calls_df["总Token"].sum(),
+            "total_calls": len(api_calls_df)
+        }
+        return self.analyze_cost_breakdowns(
+            {"totals": totals, **self.aggregate_api_calls(api_calls_df)}, verify_results_df
+        )
+    
+    def analyze_cost_breakdowns(
+        self,
+        breakdowns: Dict,
+        verify_results_df: Optional[pd.DataFrame] = None
+    ) -> Dict:
+        """
+        根据已汇总的成本明细生成成本分析结果（结构与 analyze_costs 相同）
+        
+        Args:
+            breakdowns: DataStorage.get_api_call_breakdowns() 或 aggregate_api_calls() 的结果，
+                totals 为 get_cost_stats() 结构的总计
+            verify_results_df: 验证结果 DataFrame（可选，用于 ROI 分析）
+        """
+        totals = breakdowns.get("totals") or {}
+        total_calls = int(totals.get("total_calls") or 0)
+        if not total_calls:
             return {
                 "total_cost_usd": 0.0,
                 "total_cost_cny": 0.0,
@@ -139,113 +204,58 @@ class ROIAnalyzer:
                 "roi_analysis": {}
             }
         
-        # 总成本
-        total_cost_usd = api_calls_df["成本(USD)"].sum()
-        total_cost_cny = api_calls_df["成本(CNY)"].sum()
-        total_tokens = api_calls_df["总Token"].sum()
-        total_calls = len(api_calls_df)
-        
-        # 按操作类型统计
-        cost_by_operation = {}
-        if "操作类型" in api_calls_df.columns:
-            operation_groups = api_calls_df.groupby("操作类型")
-            for op_type, group in operation_groups:
-                cost_by_operation[op_type] = {
-                    "cost_usd": group["成本(USD)"].sum(),
-                    "cost_cny": group["成本(CNY)"].sum(),
-                    "calls": len(group),
-                    "tokens": group["总Token"].sum()
-                }
-        
-        # 按提供商统计
-        cost_by_provider = {}
-        if "提供商" in api_calls_df.columns:
-            provider_groups = api_calls_df.groupby("提供商")
-            for provider, group in provider_groups:
-                cost_by_provider[provider] = {
-                    "cost_usd": group["成本(USD)"].sum(),
-                    "cost_cny": group["成本(CNY)"].sum(),
-                    "calls": len(group),
-                    "tokens": group["总Token"].sum()
-                }
-        
-        # 按关键词统计
-        cost_by_keyword = {}
-        if "关键词" in api_calls_df.columns:
-            keyword_groups = api_calls_df.groupby("关键词")
-            for keyword, group in keyword_groups:
-                if pd.notna(keyword) and keyword:
-                    cost_by_keyword[keyword] = {
-                        "cost_usd": group["成本(USD)"].sum(),
-                        "cost_cny": group["成本(CNY)"].sum(),
-                        "calls": len(group),
-                        "tokens": group["总Token"].sum()
-                    }
-        
-        # 按平台统计
-        cost_by_platform = {}
-        if "平台" in api_calls_df.columns:
-            platform_groups = api_calls_df.groupby("平台")
-            for platform, group in platform_groups:
-                if pd.notna(platform) and platform:
-                    cost_by_platform[platform] = {
-                        "cost_usd": group["成本(USD)"].sum(),
-                        "cost_cny": group["成本(CNY)"].sum(),
-                        "calls": len(group),
-                        "tokens": group["总Token"].sum()
-                    }
+        def to_records(frame: Optional[pd.DataFrame], skip_empty: bool) -> pd.DataFrame:
+            if frame is None or frame.empty:
+                return pd.DataFrame(columns=["key", "cost_usd", "cost_cny", "calls", "tokens"])
+            frame = frame[frame["key"].notna()]
+            if skip_empty:
+                frame = frame[frame["key"] != ""]
+            return frame
+        
+        result = {
+            "total_cost_usd": totals.get("total_cost_usd") or 0.0,
+            "total_cost_cny": totals.get("total_cost_cny") or 0.0,
+            "total_tokens": int(totals.get("total_tokens") or 0),
+            "total_calls": total_calls,
+        }
+        
+        # 按操作类型/提供商/关键词/平台统计
+        for field, (name, skip_empty) in self.BREAKDOWN_DIMENSIONS.items():
+            frame = to_records(breakdowns.get(name), skip_empty)
+            result[field] = frame.set_index("key")[["cost_usd", "cost_cny", "calls", "tokens"]].to_dict("index")
         
         # 每日成本趋势
-        daily_costs = []
-        if "调用时间" in api_calls_df.columns:
-            api_calls_df["日期"] = pd.to_datetime(api_calls_df["调用时间"]).dt.date
-            daily_groups = api_calls_df.groupby("日期")
-            for date, group in daily_groups:
-                daily_costs.append({
-                    "date": date.isoformat() if isinstance(date, datetime.date) else str(date),
-                    "cost_usd": group["成本(USD)"].sum(),
-                    "cost_cny": group["成本(CNY)"].sum(),
-                    "calls": len(group),
-                    "tokens": group["总Token"].sum()
-                })
-            daily_costs.sort(key=lambda x: x["date"])
+        daily = to_records(breakdowns.get("day"), True).sort_values("key")
+        result["daily_costs"] = daily.rename(columns={"key": "date"})[
+            ["date", "cost_usd", "cost_cny", "calls", "tokens"]
+        ].to_dict("records")
         
         # ROI 分析（如果有验证结果）
         roi_analysis = {}
         if verify_results_df is not None and not verify_results_df.empty:
-            roi_analysis = self._calculate_roi(api_calls_df, verify_results_df)
+            keyword_costs = to_records(breakdowns.get("keyword"), True).set_index("key")["cost_cny"]
+            roi_analysis = self._calculate_roi(result["total_cost_cny"], keyword_costs, verify_results_df)
+        result["roi_analysis"] = roi_analysis
         
-        return {
-            "total_cost_usd": total_cost_usd,
-            "total_cost_cny": total_cost_cny,
-            "total_tokens": int(total_tokens),
-            "total_calls": total_calls,
-            "cost_by_operation": cost_by_operation,
-            "cost_by_provider": cost_by_provider,
-            "cost_by_keyword": cost_by_keyword,
-            "cost_by_platform": cost_by_platform,
-            "daily_costs": daily_costs,
-            "roi_analysis": roi_analysis
-        }
+        return result
     
     def _calculate_roi(
         self,
-        api_calls_df: pd.DataFrame,
+        total_cost: float,
+        keyword_costs: pd.Series,
         verify_results_df: pd.DataFrame
     ) -> Dict:
         """
         计算 ROI（基于验证结果）
         
         Args:
-            api_calls_df: API 调用记录
+            total_cost: 总成本（CNY）
+            keyword_costs: 按关键词汇总的成本（CNY），索引为关键词
             verify_results_df: 验证结果
             
         Returns:
             ROI 分析结果
         """
-        # 计算总成本
-        total_cost = api_calls_df["成本(CNY)"].sum()
-        
         # 计算提及率提升（简化估算）
         # 这里假设每次提及的价值为某个固定值（需要根据实际情况调整）
         mention_value_per_mention = 10.0  # 每次提及的价值（CNY），可配置
@@ -261,26 +271,15 @@ class ROIAnalyzer:
         roi_ratio = (estimated_value - total_cost) / total_cost * 100 if total_cost > 0 else 0
         roi_value = estimated_value - total_cost
         
-        # 按关键词分析 ROI
+        # 按关键词分析 ROI（向量化对齐关键词成本与提及次数）
         keyword_roi = {}
-        if "关键词" in api_calls_df.columns and "问题" in verify_results_df.columns:
-            # 合并数据
-            keyword_costs = api_calls_df.groupby("关键词")["成本(CNY)"].sum()
+        if not keyword_costs.empty and "问题" in verify_results_df.columns:
             keyword_mentions = verify_results_df.groupby("问题")["提及次数"].sum()
-            
-            for keyword in keyword_costs.index:
-                if pd.notna(keyword) and keyword:
-                    cost = keyword_costs[keyword]
-                    mentions = keyword_mentions.get(keyword, 0)
-                    value = mentions * mention_value_per_mention
-                    roi = (value - cost) / cost * 100 if cost > 0 else 0
-                    
-                    keyword_roi[keyword] = {
-                        "cost": cost,
-                        "mentions": int(mentions),
-                        "value": value,
-                        "roi": roi
-                    }
+            roi_df = pd.DataFrame({"cost": keyword_costs})
+            roi_df["mentions"] = keyword_mentions.reindex(roi_df.index).fillna(0).astype(int)
+            roi_df["value"] = roi_df["mentions"] * mention_value_per_mention
+            roi_df["roi"] = ((roi_df["value"] - roi_df["cost"]) / roi_df["cost"] * 100).where(roi_df["cost"] > 0, 0)
+            keyword_roi = roi_df.to_dict("index")
         
         return {
             "total_cost": total_cost,
@@ -392,22 +391,9 @@ class ROIAnalyzer:
         
         # 计算日均成本
         if "调用时间" in api_calls_df.columns:
-            api_calls_df["日期"] = pd.to_datetime(api_calls_df["调用时间"]).dt.date
-            daily_costs = api_calls_df.groupby("日期")["成本(CNY)"].sum()
-            
-            if len(daily_costs) > 0:
-                avg_daily_cost = daily_costs.mean()
-                estimated_total = avg_daily_cost * days
-                
-                # 计算置信度（基于数据点数量）
-                confidence = "高" if len(daily_costs) >= 7 else ("中" if len(daily_costs) >= 3 else "低")
-                
-                return {
-                    "estimated_daily_cost_cny": float(avg_daily_cost),
-                    "estimated_total_cost_cny": float(estimated_total),
-                    "confidence": confidence,
-                    "data_points": len(daily_costs)
-                }
+            daily = self.aggregate_api_calls(api_calls_df).get("day")
+            if daily is not None and len(daily) > 0:
+                return self.estimate_future_cost_from_daily(daily.to_dict("records"), days)
         
         # 如果没有日期数据，使用总成本估算
         total_cost = api_calls_df["成本(CNY)"].sum()
@@ -420,3 +406,38 @@ class ROIAnalyzer:
             "confidence": "低",
             "data_points": 0
         }
+    
+    def estimate_future_cost_from_daily(
+        self,
+        daily_costs: List[Dict],
+        days: int = 30
+    ) -> Dict:
+        """
+        根据每日成本（analyze_costs 结果中的 daily_costs）估算未来成本
+        
+        Args:
+            daily_costs: 每日成本列表，每项包含 cost_cny
+            days: 预测天数
+            
+        Returns:
+            未来成本估算
+        """
+        if not daily_costs:
+            return {
+                "estimated_daily_cost_cny": 0.0,
+                "estimated_total_cost_cny": 0.0,
+                "confidence": "低",
+                "data_points": 0
+            }
+        
+        avg_daily_cost = sum(item.get("cost_cny", 0.0) for item in daily_costs) / len(daily_costs)
+        
+        # 计算置信度（基于数据点数量）
+        confidence = "高" if len(daily_costs) >= 7 else ("中" if len(daily_costs) >= 3 else "低")
+        
+        return {
+            "estimated_daily_cost_cny": float(avg_daily_cost),
+            "estimated_total_cost_cny": float(avg_daily_cost * days),
+            "confidence": confidence,
+            "data_points": len(daily_costs)
+        }
@@ -0,0 +1,112 @@
+"""
+存储读取缓存模块
+为 DataStorage 的常用读取方法提供进程内 LRU 缓存：每张表有版本号，save_* 写入后递增，
+读取结果在底层表真正变化前一直有效，Streamlit 每次重跑不再重复查询 SQLite、重建 DataFrame
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+import pandas as pd
+
+
+# 可缓存的读取方法 -> 结果依赖的表
+CACHED_READS: Dict[str, Tuple[str, ...]] = {
+    "get_keywords": ("keywords",),
+    "get_articles": ("articles",),
+    "get_optimizations": ("optimizations",),
+    "get_verify_results": ("verify_results",),
+    "get_api_calls": ("api_calls",),
+    "get_cost_stats": ("api_calls_daily",),
+    "get_api_call_breakdowns": ("api_calls", "api_calls_daily"),
+    "get_daily_mention_stats": ("verify_results_daily",),
+}
+
+# 缓存条目兜底有效期（秒）：本进程写入会立即失效，TTL 用于兜底其他进程（如后台调度器）的写入
+CACHE_TTL = 60.0
+CACHE_MAX_ENTRIES = 128
+
+# 按数据库路径共享的 LRU 缓存：{(db, method, args, kwargs): (expires_at, generations, result)}
+_CACHE: "OrderedDict[Tuple, Tuple[float, Tuple[int, ...], Any]]" = OrderedDict()
+_LOCK = threading.Lock()
+
+
+def _copy_result(result: Any) -> Any:
+    """
+    返回结果的浅副本：DataFrame（含字典中的 DataFrame）复制列数据，列表/字典只复制外层容器和每一行字典，
+    不复制文章正文等字段值，命中缓存的开销与结果大小无关。
+    调用方可以增删行、改写行字典的字段，但不能原地修改字段内部的可变对象（如嵌套列表）。
+    """
+    if isinstance(result, pd.DataFrame):
+        return result.copy()
+    if isinstance(result, list):
+        return [dict(row) if isinstance(row, dict) else row for row in result]
+    if isinstance(result, dict):
+        return {key: value.copy() if isinstance(value, pd.DataFrame) else value for key, value in result.items()}
+    return result
+
+
+def clear_storage_cache():
+    """清空全部读取缓存"""
+    with _LOCK:
+        _CACHE.clear()
+
+
+class CachedStorage:
+    """
+    DataStorage 的缓存外观
+
+    CACHED_READS 中的读取方法走缓存，其余属性与方法（包括全部 save_*）直接转发给被包装的 DataStorage，
+    可作为 DataStorage 的直接替代传给各 Tab 与模块。
+    """
+
+    def __init__(self, storage, ttl: float = CACHE_TTL, max_entries: int = CACHE_MAX_ENTRIES):
+        """
+        Args:
+            storage: DataStorage 实例
+            ttl: 缓存条目有效期（秒）
+            max_entries: 缓存条目上限，超出后淘汰最久未使用的条目
+        """
+        self.storage = storage
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.storage, name)
+        if name not in CACHED_READS or not callable(attr):
+            return attr
+
+        def cached_read(*args, **kwargs):
+            return self._read(name, attr, args, kwargs)
+
+        cached_read.__name__ = name
+        cached_read.__doc__ = attr.__doc__
+        return cached_read
+
+    def _read(self, name: str, method, args: tuple, kwargs: dict) -> Any:
+        generations = tuple(self.storage.table_generation(table) for table in CACHED_READS[name])
+        key = (self.storage._cache_scope, name, args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            # 参数不可哈希（如列表）时不缓存
+            return method(*args, **kwargs)
+        now = time.monotonic()
+        with _LOCK:
+            entry = _CACHE.get(key)
+            if entry and entry[0] > now and entry[1] == generations:
+                _CACHE.move_to_end(key)
+                return _copy_result(entry[2])
+
+        result = method(*args, **kwargs)
+        with _LOCK:
+            _CACHE[key] = (now + self.ttl, generations, result)
+            _CACHE.move_to_end(key)
+            while len(_CACHE) > self.max_entries:
+                _CACHE.popitem(last=False)
+        return _copy_result(result)
+
+    def invalidate(self, *tables: str):
+        """手动标记表已变化（如外部直接修改了数据库）"""
+        self.storage._touch(*tables)
@@ -2,12 +2,159 @@
 技术配置生成模块
 生成 robots.txt、sitemap.xml 等技术配置文件，提升内容收录效果
 """
-from typing import List, Dict, Optional
-from datetime import datetime
+import gzip
+import os
+import re
+from typing import Any, Iterable, List, Dict, Optional
+from datetime import date, datetime
 from urllib.parse import urljoin, urlparse
+from xml.sax.saxutils import escape
 import xml.etree.ElementTree as ET
 
 
+# URL 片段中允许的字符之外的字符
+_SLUG_INVALID = re.compile(r'[^\w\-]')
+_PATH_INVALID = re.compile(r'[^\w\-/]')
+_MULTI_HYPHEN = re.compile(r'-+')
+_ISO_DATE = re.compile(r'\d{4}-\d{2}-\d{2}')
+_SIMPLE_PATH = re.compile(r'[\w\-/]*')
+
+# sitemap 协议限制：单个文件最多 50,000 个 URL、未压缩不超过 50MB；索引文件最多 50,000 个 sitemap
+SITEMAP_MAX_URLS = 50000
+SITEMAP_MAX_BYTES = 50 * 1024 * 1024
+SITEMAP_INDEX_MAX_FILES = 50000
+
+_SITEMAP_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+_SITEMAP_FOOTER = '</urlset>\n'
+
+
+def _keyword_slug(keyword: str) -> str:
+    """关键词转换为 URL 友好的格式"""
+    return _SLUG_INVALID.sub('', keyword.lower().replace(" ", "-").replace("_", "-"))
+
+
+def _article_url_path(article: Dict[str, Any]) -> str:
+    """文章的 URL 路径：[平台/]关键词"""
+    url_path = _keyword_slug(article.get("keyword", "") or "")
+    platform = article.get("platform", "") or ""
+    if platform:
+        platform_slug = platform.lower().replace(" ", "-").replace("（", "").replace("）", "")
+        platform_slug = _SLUG_INVALID.sub('', platform_slug)
+        url_path = f"{platform_slug}/{url_path}"
+    return url_path
+
+
+def _article_lastmod(created_at: str, default: Optional[str]) -> Optional[str]:
+    """使用文章创建时间作为 lastmod，无法解析时返回 default"""
+    if created_at:
+        try:
+            # 最常见的 YYYY-MM-DD 走 C 实现的 fromisoformat（结果与 strptime 相同，无效日期同样抛 ValueError）
+            if len(created_at) == 10 and _ISO_DATE.fullmatch(created_at):
+                return date.fromisoformat(created_at).strftime("%Y-%m-%d")
+            # 尝试解析时间字符串
+            if "T" in created_at:
+                dt = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+            else:
+                dt = datetime.strptime(created_at, "%Y-%m-%d")
+            return dt.strftime("%Y-%m-%d")
+        except (TypeError, ValueError, AttributeError):
+            pass
+    return default
+
+
+class SitemapWriter:
+    """
+    流式 sitemap 写入器
+    
+    逐条写入 URL，达到单文件 URL 数或字节数上限时自动切换到下一个 sitemap-N.xml.gz，
+    close() 时写出 sitemap_index.xml。内存占用与 URL 总数无关。
+    """
+    
+    def __init__(self, out_dir: str, base_url: str, max_urls: int = SITEMAP_MAX_URLS,
+                 max_bytes: int = SITEMAP_MAX_BYTES):
+        """
+        Args:
+            out_dir: 输出目录
+            base_url: 网站基础 URL（sitemap 文件也按此地址发布在网站根目录）
+            max_urls: 单个 sitemap 文件的 URL 上限
+            max_bytes: 单个 sitemap 文件的未压缩字节上限
+        """
+        self.out_dir = out_dir
+        self.base_url = base_url.rstrip('/') + '/'
+        self.max_urls = max_urls
+        self.max_bytes = max_bytes
+        self.files: List[str] = []
+        self.url_count = 0
+        self._file = None
+        self._file_urls = 0
+        self._file_bytes = 0
+        os.makedirs(out_dir, exist_ok=True)
+    
+    def _open_next(self):
+        self._close_current()
+        if len(self.files) >= SITEMAP_INDEX_MAX_FILES:
+            raise ValueError(f"sitemap 文件数超过索引上限 {SITEMAP_INDEX_MAX_FILES}")
+        path = os.path.join(self.out_dir, f"sitemap-{len(self.files) + 1}.xml.gz")
+        self._file = gzip.open(path, "wt", encoding="utf-8", compresslevel=6)
+        self._file.write(_SITEMAP_HEADER)
+        self._file_urls = 0
+        self._file_bytes = len(_SITEMAP_HEADER.encode("utf-8")) + len(_SITEMAP_FOOTER)
+        self.files.append(path)
+    
+    def _close_current(self):
+        if self._file is not None:
+            self._file.write(_SITEMAP_FOOTER)
+            self._file.close()
+            self._file = None
+    
+    def add(self, loc: str, lastmod: str, changefreq: str = "weekly", priority: float = 0.8):
+        """写入一个 URL（loc 为相对路径时基于 base_url 拼接）"""
+        if not loc.startswith("http"):
+            loc = loc.lstrip('/')
+            # 只含 \w、- 和 / 的路径（如文章路径）直接拼接，与 urljoin 结果相同，省去逐条解析 URL
+            loc = self.base_url + loc if _SIMPLE_PATH.fullmatch(loc) else urljoin(self.base_url, loc)
+        entry = (
+            f"  <url>\n    <loc>{escape(loc)}</loc>\n    <lastmod>{escape(lastmod)}</lastmod>\n"
+            f"    <changefreq>{escape(changefreq)}</changefreq>\n    <priority>{priority}</priority>\n  </url>\n"
+        )
+        size = len(entry.encode("utf-8"))
+        if (self._file is None or self._file_urls >= self.max_urls
+                or self._file_bytes + size > self.max_bytes):
+            self._open_next()
+        self._file.write(entry)
+        self._file_urls += 1
+        self._file_bytes += size
+        self.url_count += 1
+    
+    def close(self, lastmod: Optional[str] = None) -> Dict[str, Any]:
+        """
+        结束写入并生成 sitemap_index.xml
+        
+        Returns:
+            {'index': 索引文件路径, 'files': [sitemap 文件路径], 'url_count': int}
+        """
+        self._close_current()
+        lastmod = lastmod or datetime.now().strftime("%Y-%m-%d")
+        index_path = os.path.join(self.out_dir, "sitemap_index.xml")
+        with open(index_path, "w", encoding="utf-8") as f:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            f.write('<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+            for path in self.files:
+                loc = urljoin(self.base_url, os.path.basename(path))
+                f.write(f"  <sitemap>\n    <loc>{escape(loc)}</loc>\n    <lastmod>{lastmod}</lastmod>\n  </sitemap>\n")
+            f.write('</sitemapindex>\n')
+        return {'index': index_path, 'files': list(self.files), 'url_count': self.url_count}
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            return
+        # 异常退出时只关闭当前文件，不生成索引
+        self._close_current()
+
+
 class TechnicalConfigGenerator:
     """技术配置文件生成器"""
     
@@ -33,7 +180,7 @@ class TechnicalConfigGenerator:
             sitemap_url: sitemap.xml 的 URL
             user_agent: User-Agent（默认 "*" 表示所有爬虫）
             crawl_delay: 爬取延迟（秒，可选）
-            
+        
         Returns:
             robots.txt 文件内容
         """
@@ -100,7 +247,7 @@ class TechnicalConfigGenerator:
             lastmod: 默认最后修改时间（ISO 格式）
             changefreq: 默认更新频率
             priority: 默认优先级
-            
+        
         Returns:
             sitemap.xml 文件内容
         """
@@ -141,11 +288,7 @@ class TechnicalConfigGenerator:
                 url_elem = ET.SubElement(root, "url")
                 
                 # 生成 URL（基于关键词）
-                # 将关键词转换为 URL 友好的格式
-                url_path = keyword.lower().replace(" ", "-").replace("_", "-")
-                # 移除特殊字符
-                import re
-                url_path = re.sub(r'[^\w\-]', '', url_path)
+                url_path = _keyword_slug(keyword)
                 full_url = urljoin(base_url.rstrip('/') + '/', url_path)
                 
                 ET.SubElement(url_elem, "loc").text = full_url
@@ -188,44 +331,16 @@ class TechnicalConfigGenerator:
             lastmod: 默认最后修改时间
             changefreq: 默认更新频率
             priority: 默认优先级
-            
+        
         Returns:
             sitemap.xml 文件内容
         """
         urls = []
         
         for article in articles:
-            keyword = article.get("keyword", "")
-            platform = article.get("platform", "")
-            created_at = article.get("created_at", "")
-            
-            # 生成 URL 路径
-            # 将关键词转换为 URL 友好的格式
-            url_path = keyword.lower().replace(" ", "-").replace("_", "-")
-            import re
-            url_path = re.sub(r'[^\w\-]', '', url_path)
-            
-            # 如果有平台信息，可以添加到路径中
-            if platform:
-                platform_slug = platform.lower().replace(" ", "-").replace("（", "").replace("）", "")
-                platform_slug = re.sub(r'[^\w\-]', '', platform_slug)
-                url_path = f"{platform_slug}/{url_path}"
-            
-            # 使用创建时间作为 lastmod
-            article_lastmod = lastmod
-            if created_at:
-                try:
-                    # 尝试解析时间字符串
-                    if "T" in created_at:
-                        dt = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-                    else:
-                        dt = datetime.strptime(created_at, "%Y-%m-%d")
-                    article_lastmod = dt.strftime("%Y-%m-%d")
-                except:
-                    pass
-            
+            article_lastmod = _article_lastmod(article.get("created_at", ""), lastmod)
             urls.append({
-                "loc": url_path,
+                "loc": _article_url_path(article),
                 "lastmod": article_lastmod or lastmod or datetime.now().strftime("%Y-%m-%d"),
                 "changefreq": changefreq,
                 "priority": priority
@@ -239,6 +354,43 @@ class TechnicalConfigGenerator:
             priority=priority
         )
     
+    def write_sitemap_files(
+        self,
+        base_url: str,
+        articles: Iterable[Dict[str, Any]],
+        out_dir: str,
+        lastmod: Optional[str] = None,
+        changefreq: str = "weekly",
+        priority: float = 0.8,
+        max_urls: int = SITEMAP_MAX_URLS,
+        max_bytes: int = SITEMAP_MAX_BYTES
+    ) -> Dict[str, Any]:
+        """
+        基于文章流式生成分片 sitemap：sitemap-N.xml.gz + sitemap_index.xml
+        
+        articles 可以是生成器（如 DataStorage.iter_articles），逐条写入文件，
+        内存占用与文章总数无关；URL 规则与 generate_sitemap_from_articles 相同。
+        
+        Args:
+            base_url: 网站基础 URL
+            articles: 文章迭代器（keyword、platform、created_at）
+            out_dir: 输出目录
+            lastmod: 默认最后修改时间
+            changefreq: 默认更新频率
+            priority: 默认优先级
+            max_urls: 单个 sitemap 文件的 URL 上限
+            max_bytes: 单个 sitemap 文件的未压缩字节上限
+        
+        Returns:
+            {'index': 索引文件路径, 'files': [sitemap 文件路径], 'url_count': int}
+        """
+        today = datetime.now().strftime("%Y-%m-%d")
+        with SitemapWriter(out_dir, base_url, max_urls=max_urls, max_bytes=max_bytes) as writer:
+            for article in articles:
+                article_lastmod = _article_lastmod(article.get("created_at", ""), lastmod)
+                writer.add(_article_url_path(article), article_lastmod or today, changefreq, priority)
+            return writer.close()
+    
     def generate_htaccess_redirects(
         self,
         redirects: List[Dict[str, str]]
@@ -251,7 +403,7 @@ class TechnicalConfigGenerator:
                 - from: 源路径
                 - to: 目标路径
                 - type: 重定向类型（301 永久重定向，302 临时重定向）
-                
+        
         Returns:
             .htaccess 文件内容
         """
@@ -289,7 +441,7 @@ class TechnicalConfigGenerator:
             og_type: Open Graph 类型（如 "website", "article"）
             og_image: Open Graph 图片 URL
             canonical_url: 规范 URL
-            
+        
         Returns:
             HTML meta 标签字符串
         """
@@ -325,7 +477,7 @@ class TechnicalConfigGenerator:
         
         Args:
             url: URL 字符串
-            
+        
         Returns:
             是否为有效 URL
         """
@@ -341,19 +493,18 @@ class TechnicalConfigGenerator:
         
         Args:
             path: 原始路径
-            
+        
         Returns:
             清理后的路径
         """
-        import re
         # 转换为小写
         path = path.lower()
         # 替换空格为连字符
         path = path.replace(" ", "-")
         # 移除特殊字符
-        path = re.sub(r'[^\w\-/]', '', path)
+        path = _PATH_INVALID.sub('', path)
         # 移除多余的连字符
-        path = re.sub(r'-+', '-', path)
+        path = _MULTI_HYPHEN.sub('-', path)
         # 移除开头和结尾的连字符
         path = path.strip('-')
         return path
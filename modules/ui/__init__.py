@@ -1,9 +1,12 @@
 """
 UI-level modules for GEO Streamlit app.
 
-Each top-level Tab in `geo_tool.py` should have a corresponding
+Each top-level Tab in `geo_tool.py` has a corresponding
 `tab_*.py` module here, exposing a `render_*` function that is
-invoked from the main app.
-"""
+invoked from the main app. Render functions are wrapped with
+`fragment.tab_fragment`, so widget interactions inside a Tab
+rerun only that Tab.
 
-from . import tab_keywords, tab_autowrite
\ No newline at end of file
+Tab modules are imported on demand by the main app (only the
+active Tab's module and its dependencies are loaded).
+"""
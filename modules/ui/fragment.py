@@ -0,0 +1,48 @@
+"""
+Tab 局部重跑（fragment）支持
+
+每个 Tab 的渲染函数用 tab_fragment 包装为独立的 st.fragment：
+Tab 内的控件交互只重跑该 Tab 自身，不再从头执行侧边栏配置校验、存储初始化和其他区块。
+每次运行的耗时记录在 session_state，供侧边栏「渲染耗时」面板展示。
+局部重跑不会执行主入口末尾的会话内存检查，因此每次 fragment 运行结束时同样执行一次。
+"""
+import functools
+import time
+
+import streamlit as st
+
+from modules.ui.session_store import enforce_session_budget
+
+FRAGMENT_STATE_KEY = "_perf_fragments"
+
+# st.fragment 自 1.37 起可用，1.33–1.36 为 st.experimental_fragment；更早版本退化为普通函数调用
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+
+def record_fragment_time(name: str, elapsed_ms: float):
+    """记录 fragment 最近一次运行耗时与累计运行次数"""
+    stats = st.session_state.setdefault(FRAGMENT_STATE_KEY, {})
+    entry = stats.setdefault(name, {"last_ms": 0.0, "runs": 0})
+    entry["last_ms"] = elapsed_ms
+    entry["runs"] += 1
+
+
+def tab_fragment(render):
+    """
+    把 Tab 渲染函数包装为独立 fragment，并记录每次运行耗时；运行结束后检查会话内存上限。
+
+    注意：fragment 内不能写入侧边栏；st.rerun() 仍会触发整页重跑（用于刷新顶部 KPI 等全局区块）。
+    """
+    @functools.wraps(render)
+    def timed_render(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return render(*args, **kwargs)
+        finally:
+            record_fragment_time(render.__name__, (time.perf_counter() - start) * 1000.0)
+            # 只重跑 Tab 时主入口末尾的 enforce_session_budget 不会执行，Tab 内新生成的大对象在这里转存
+            enforce_session_budget()
+
+    if _fragment is None:
+        return timed_render
+    return _fragment(timed_render)
@@ -0,0 +1,28 @@
+"""
+UI 层共用的小工具函数（文件名清理、上传文件解码等），供主入口和各 Tab 模块导入。
+"""
+import re
+
+
+INVALID_FS_CHARS = r'<>:"/\\|?*\n\r\t'
+
+
+def sanitize_filename(name: str, max_len: int = 80) -> str:
+    if not name:
+        return "untitled"
+    name = name.strip()
+    name = re.sub(rf"[{re.escape(INVALID_FS_CHARS)}]", "_", name)
+    name = re.sub(r"_+", "_", name).strip("_")
+    return name[:max_len] if len(name) > max_len else name
+
+
+def safe_decode_uploaded(uploaded) -> str:
+    if not uploaded:
+        return ""
+    b = uploaded.getvalue()
+    for enc in ("utf-8-sig", "utf-8", "gb18030"):
+        try:
+            return b.decode(enc)
+        except Exception:
+            pass
+    return b.decode("utf-8", errors="replace")
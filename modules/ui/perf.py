@@ -0,0 +1,84 @@
+"""
+UI 渲染计时工具
+
+记录每次 Streamlit 整页重跑中各区块（侧边栏、当前 Tab 等）的耗时，
+写入 session_state，供侧边栏「渲染耗时」面板和 scripts/measure_ui_timing.py 读取。
+Tab 内交互触发的局部重跑由 modules.ui.fragment 单独计时。
+面板同时展示 modules.llm_gateway 记录的 LLM 调用指标。
+"""
+import time
+
+import streamlit as st
+
+from modules.llm_gateway import LLM_METRICS
+from modules.ui.fragment import FRAGMENT_STATE_KEY
+from modules.ui.session_store import SESSION_MEMORY_BUDGET, session_usage
+
+
+PERF_STATE_KEY = "_perf_timings"
+
+# 每次重跑的耗时预算（毫秒），超出时面板中标记
+RERUN_BUDGET_MS = 300.0
+
+
+def start_rerun_timer():
+    """在脚本开头调用：开始本次重跑的计时并清空上一轮的区块记录"""
+    st.session_state[PERF_STATE_KEY] = {"_start": time.perf_counter(), "sections": {}}
+
+
+def mark_section(name: str):
+    """
+    记录从上一个标记（或脚本开头）到此刻的耗时（毫秒），归入 name 区块。
+
+    以打点方式计时，无需把整段 Tab 代码包进 with 块。
+    """
+    timings = st.session_state.get(PERF_STATE_KEY)
+    if timings is None:
+        return
+    now = time.perf_counter()
+    last = timings.get("_last", timings["_start"])
+    sections = timings["sections"]
+    sections[name] = sections.get(name, 0.0) + (now - last) * 1000.0
+    timings["_last"] = now
+
+
+def finish_rerun_timer() -> dict:
+    """在脚本末尾调用：记录总耗时并返回 {"total_ms": ..., "sections": {...}}"""
+    timings = st.session_state.get(PERF_STATE_KEY)
+    if not timings:
+        return {"total_ms": 0.0, "sections": {}}
+    timings["total_ms"] = (time.perf_counter() - timings["_start"]) * 1000.0
+    return {"total_ms": timings["total_ms"], "sections": dict(timings["sections"])}
+
+
+def render_perf_panel(timings: dict, budget_ms: float = RERUN_BUDGET_MS):
+    """在侧边栏展示本次重跑的分区耗时"""
+    total_ms = timings.get("total_ms", 0.0)
+    with st.sidebar.expander("⏱️ 渲染耗时", expanded=False):
+        status = "✅" if total_ms <= budget_ms else "⚠️"
+        st.caption(f"{status} 本次重跑 {total_ms:.0f} ms（预算 {budget_ms:.0f} ms）")
+        for name, ms in sorted(timings.get("sections", {}).items(), key=lambda x: -x[1]):
+            st.caption(f"{name}：{ms:.0f} ms")
+        fragments = st.session_state.get(FRAGMENT_STATE_KEY, {})
+        if fragments:
+            st.caption("Tab 局部重跑（最近一次）：")
+            for name, entry in fragments.items():
+                st.caption(f"{name}：{entry['last_ms']:.0f} ms（共 {entry['runs']} 次）")
+        usage = session_usage()
+        if usage:
+            resident = sum(u["bytes"] for u in usage.values() if not u["spilled"])
+            spilled = [key for key, u in usage.items() if u["spilled"]]
+            st.caption(
+                f"会话内存：{resident / 1024 / 1024:.1f} MB / {SESSION_MEMORY_BUDGET / 1024 / 1024:.0f} MB"
+                + (f"（已转存：{', '.join(spilled)}）" if spilled else "")
+            )
+        llm_summary = LLM_METRICS.summary()
+        if llm_summary:
+            st.caption("LLM 调用（本进程）：")
+            for provider, m in llm_summary.items():
+                ttft = f"，首 token P50 {m['ttft_p50_ms']:.0f} ms" if m["ttft_p50_ms"] is not None else ""
+                st.caption(
+                    f"{provider}：{m['calls']} 次，失败 {m['errors']}，"
+                    f"P50 {m['p50_ms']:.0f} ms / P95 {m['p95_ms']:.0f} ms{ttft}，"
+                    f"token {m['input_tokens']}+{m['output_tokens']}"
+                )
@@ -0,0 +1,272 @@
+"""
+会话状态内存管理
+
+生成内容、ZIP 包、多模态描述、验证结果、话题集群等大对象保存在 st.session_state 中，
+会话存活期间不会释放。本模块为这些 key 提供：
+- 按 key 的大小统计（DataFrame 按 deep memory，其他对象按序列化大小）
+- 每个会话的内存上限：超出时按最近使用时间（LRU）把最久未用的 key 转存到临时文件，
+  session_state 中只保留 SpilledValue 占位符
+- 各 Tab 渲染前调用 restore_session_keys 取回自己用到的 key，读写方式保持不变
+"""
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+import pandas as pd
+import streamlit as st
+
+
+# 受管理的大对象 key（其余 session_state 字段体积很小，不做统计）
+MANAGED_KEYS = (
+    "generated_contents",
+    "zip_bytes",
+    "multimodal_descriptions",
+    "content_scores",
+    "verify_combined",
+    "negative_analysis_results",
+    "topic_clusters",
+    "cluster_relationships",
+    "content_planning",
+    "tab6_topic_clusters",
+    "tab6_cluster_relationships",
+    "tab6_content_planning",
+    "copy_export_zip",
+    "image_bundle_zip",
+    "generated_sitemap_zip",
+)
+
+# 每个会话受管理 key 的内存上限（字节）
+SESSION_MEMORY_BUDGET = 64 * 1024 * 1024
+
+# 缓存的 key 大小最多沿用的预算检查次数：长度不变的原地修改（改 DataFrame 单元格、替换列表元素）
+# 无法从对象身份和长度看出，超过该次数后重新统计
+SIZE_RECHECK_RUNS = 5
+
+# 负面分析结果最多保留条数（超出时丢弃最早的记录）
+NEGATIVE_RESULTS_MAX = 200
+
+# 转存文件目录；超过 SPILL_MAX_AGE 秒未更新的会话目录在进程内首次使用时清理
+SPILL_ROOT = os.path.join(tempfile.gettempdir(), "geo_session_spill")
+SPILL_MAX_AGE = 24 * 3600
+
+_META_KEY = "_session_store_meta"
+_pruned = False
+_prune_lock = threading.Lock()
+
+
+class SpilledValue:
+    """已转存到临时文件的会话值占位符（保留原值长度，KPI 等只需计数的地方无需取回）"""
+
+    __slots__ = ("path", "size", "length")
+
+    def __init__(self, path: str, size: int, length: int):
+        self.path = path
+        self.size = size
+        self.length = length
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __repr__(self) -> str:
+        return f"SpilledValue(path={self.path!r}, size={self.size})"
+
+
+def estimate_size(value) -> int:
+    """估算对象占用的字节数"""
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return sys.getsizeof(value)
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+def _meta() -> dict:
+    meta = st.session_state.get(_META_KEY)
+    if meta is None:
+        meta = {"sizes": {}, "access": {}, "runs": 0, "session_id": uuid.uuid4().hex}
+        st.session_state[_META_KEY] = meta
+    return meta
+
+
+def _fingerprint(value):
+    """对象身份 + 长度：重新赋值或原地追加（如 list.append）后重新统计大小"""
+    try:
+        return id(value), len(value)
+    except TypeError:
+        return id(value), None
+
+
+def _key_size(key: str, value) -> int:
+    """
+    key 当前占用的字节数
+
+    对象身份与长度不变、且统计后不超过 SIZE_RECHECK_RUNS 次预算检查时沿用缓存的大小；
+    长度不变的原地修改最多在 SIZE_RECHECK_RUNS 次重跑后被重新统计。
+    """
+    meta = _meta()
+    sizes = meta["sizes"]
+    runs = meta.get("runs", 0)
+    fingerprint = _fingerprint(value)
+    cached = sizes.get(key)
+    if cached and len(cached) == 3 and cached[0] == fingerprint and runs - cached[2] < SIZE_RECHECK_RUNS:
+        return cached[1]
+    size = estimate_size(value)
+    sizes[key] = (fingerprint, size, runs)
+    return size
+
+
+def _spill_dir() -> str:
+    path = os.path.join(SPILL_ROOT, _meta()["session_id"])
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def prune_spill_files(max_age: float = SPILL_MAX_AGE):
+    """删除长时间未更新的会话转存目录（会话结束后遗留的文件）"""
+    if not os.path.isdir(SPILL_ROOT):
+        return
+    cutoff = time.time() - max_age
+    for name in os.listdir(SPILL_ROOT):
+        path = os.path.join(SPILL_ROOT, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+        except OSError:
+            pass
+
+
+def _prune_once():
+    global _pruned
+    with _prune_lock:
+        if _pruned:
+            return
+        _pruned = True
+    prune_spill_files()
+
+
+def restore_session_keys(*keys: str):
+    """
+    取回已转存的 key 并记为最近使用。
+
+    各 Tab 在渲染开始时调用，之后即可照常读写 st.session_state[key]。
+    """
+    access = _meta()["access"]
+    now = time.monotonic()
+    for key in keys:
+        value = st.session_state.get(key)
+        if isinstance(value, SpilledValue):
+            try:
+                with open(value.path, "rb") as f:
+                    st.session_state[key] = pickle.load(f)
+            except Exception:
+                # 转存文件丢失时丢弃该值，由各 Tab 的 ss_init 重新初始化
+                del st.session_state[key]
+            try:
+                os.remove(value.path)
+            except OSError:
+                pass
+        access[key] = now
+
+
+def session_len(key: str) -> int:
+    """受管理 key 的元素个数（已转存时不取回）"""
+    value = st.session_state.get(key)
+    if value is None:
+        return 0
+    try:
+        return len(value)
+    except TypeError:
+        return 1
+
+
+def append_bounded(key: str, item, max_items: int):
+    """向列表型 key 追加一项，超过 max_items 时丢弃最早的记录"""
+    items = st.session_state.get(key)
+    if not isinstance(items, list):
+        items = []
+    items.append(item)
+    if len(items) > max_items:
+        del items[:len(items) - max_items]
+    st.session_state[key] = items
+    # 达到上限后长度不变，身份+长度指纹看不出变化，下次预算检查时重新统计
+    _meta()["sizes"].pop(key, None)
+
+
+def session_usage() -> dict:
+    """各受管理 key 的占用：{key: {"bytes": int, "spilled": bool}}"""
+    usage = {}
+    for key in MANAGED_KEYS:
+        value = st.session_state.get(key)
+        if value is None:
+            continue
+        if isinstance(value, SpilledValue):
+            usage[key] = {"bytes": value.size, "spilled": True}
+        else:
+            usage[key] = {"bytes": _key_size(key, value), "spilled": False}
+    return usage
+
+
+def enforce_session_budget(budget: int = SESSION_MEMORY_BUDGET) -> list:
+    """
+    保证受管理 key 的内存占用不超过 budget，由主入口在每次整页重跑结束时、tab_fragment 在每次局部重跑结束时调用。
+
+    Returns:
+        本次转存的 key 列表
+    """
+    _prune_once()
+    meta = _meta()
+    meta["runs"] = meta.get("runs", 0) + 1
+    access = meta["access"]
+
+    resident = {}
+    for key in MANAGED_KEYS:
+        value = st.session_state.get(key)
+        if isinstance(value, SpilledValue):
+            continue
+        # 转存后又被直接赋了新值（如清空按钮），旧的转存文件已无用
+        stale = os.path.join(SPILL_ROOT, meta["session_id"], f"{key}.pkl")
+        if os.path.exists(stale):
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+        if value is not None:
+            resident[key] = _key_size(key, value)
+
+    total = sum(resident.values())
+    spilled = []
+    if total <= budget:
+        return spilled
+
+    # 最久未使用的 key 先转存
+    for key in sorted(resident, key=lambda k: access.get(k, 0.0)):
+        if total <= budget:
+            break
+        value = st.session_state[key]
+        path = os.path.join(_spill_dir(), f"{key}.pkl")
+        try:
+            with open(path, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            continue
+        try:
+            length = len(value)
+        except TypeError:
+            length = 1
+        st.session_state[key] = SpilledValue(path, resident[key], length)
+        meta["sizes"].pop(key, None)
+        total -= resident[key]
+        spilled.append(key)
+    return spilled
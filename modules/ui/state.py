@@ -42,6 +42,7 @@ def init_session_state():
     # 文章优化模块
     ss_init("optimized_article", "")
     ss_init("opt_changes", "")
+    ss_init("opt_stream_timing", "")
     ss_init("opt_platform", "通用优化")
 
     # 多模型验证
@@ -0,0 +1,67 @@
+"""
+LLM 流式输出渲染
+
+长文生成、文章优化等耗时数十秒的调用改用 chain.stream，通过 st.write_stream 边生成边显示，
+并记录首 token 耗时（TTFT）与总耗时。网关（modules.llm_gateway）同时把 TTFT 写入 LLM_METRICS，
+侧边栏「渲染耗时」面板按提供商展示。
+"""
+import time
+from typing import Any, Callable, Dict, Optional
+
+import streamlit as st
+
+
+def stream_chain(
+    chain,
+    inputs: Any,
+    container=None,
+    should_cancel: Optional[Callable[[], bool]] = None
+) -> Dict[str, Any]:
+    """
+    流式调用链并在页面上逐步渲染输出
+
+    Args:
+        chain: 以 StrOutputParser 结尾的 LangChain 链
+        inputs: 链的输入
+        container: 渲染位置（st.empty() 等），默认在当前位置渲染
+        should_cancel: 每收到一段输出后检查，返回 True 时停止接收（已收到的内容照常返回）
+
+    Returns:
+        {"text": 完整输出, "ttft_ms": 首 token 耗时（无输出时为 None）, "latency_ms": 总耗时, "cancelled": bool}
+    """
+    timing = {"ttft_ms": None, "cancelled": False}
+    start = time.perf_counter()
+
+    def chunks():
+        stream = chain.stream(inputs)
+        try:
+            for chunk in stream:
+                if timing["ttft_ms"] is None:
+                    timing["ttft_ms"] = (time.perf_counter() - start) * 1000.0
+                yield chunk
+                if should_cancel is not None and should_cancel():
+                    timing["cancelled"] = True
+                    return
+        finally:
+            # 提前停止时关闭底层 HTTP 流，提供商不再继续生成
+            stream.close()
+
+    target = container if container is not None else st
+    text = target.write_stream(chunks())
+    if not isinstance(text, str):
+        # write_stream 遇到非字符串片段时返回列表
+        text = "".join(str(part) for part in text)
+    return {
+        "text": text,
+        "ttft_ms": timing["ttft_ms"],
+        "latency_ms": (time.perf_counter() - start) * 1000.0,
+        "cancelled": timing["cancelled"],
+    }
+
+
+def format_stream_timing(outcome: Dict[str, Any]) -> str:
+    """格式化为「首字 0.8 秒，总耗时 32.5 秒」"""
+    total = f"总耗时 {outcome['latency_ms'] / 1000.0:.1f} 秒"
+    if outcome.get("ttft_ms") is None:
+        return total
+    return f"首字 {outcome['ttft_ms'] / 1000.0:.1f} 秒，{total}"
@@ -12,12 +12,18 @@ import streamlit as st
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import PromptTemplate
 
-from modules.content_scorer import ContentScorer
+from modules.checkpoint import CheckpointStore, compute_inputs_hash
+from modules.content_scorer import SCORE_PACK_MAX_ITEMS, ContentScorer
 from modules.eeat_enhancer import EEATEnhancer
 from modules.fact_density_enhancer import FactDensityEnhancer
+from modules.llm_router import resolve_route
+from modules.image_asset_store import ImageAssetStore
 from modules.multimodal_prompt import MultimodalPromptGenerator
 from modules.optimization_techniques import OptimizationTechniqueManager
 from modules.schema_generator import SchemaGenerator
+from modules.ui.fragment import tab_fragment
+from modules.ui.session_store import restore_session_keys
+from modules.ui.streaming import format_stream_timing, stream_chain
 
 
 INVALID_FS_CHARS = r'<>:"/\\|?*\n\r\t'
@@ -33,6 +39,25 @@ def sanitize_filename(name: str, max_len: int = 80) -> str:
     return name[:max_len] if len(name) > max_len else name
 
 
+def _image_asset_store() -> ImageAssetStore:
+    """按 config.json 中的 image_asset_dir / image_cdn_base_url 创建图片资源库"""
+    cfg = st.session_state.cfg
+    return ImageAssetStore(cfg.get("image_asset_dir") or "image_assets", cfg.get("image_cdn_base_url", ""))
+
+
+def _localize_images(images: list) -> list:
+    """把生成图片的临时链接下载到本地资源库并换成稳定地址，失败的图片保留临时链接"""
+    store = _image_asset_store()
+    try:
+        images, errors = store.localize_images(images)
+    finally:
+        store.close()
+    if errors:
+        st.warning("⚠️ 部分图片未能保存到本地资源库，仍使用临时链接：\n" + "\n".join(errors))
+    return images
+
+
+@tab_fragment
 def render_tab_autowrite(
     storage,
     ss_init,
@@ -47,8 +72,12 @@ def render_tab_autowrite(
     渲染 Tab2：自动创作内容（含批量 ZIP / GitHub 模板）。
 
     通过参数接收 storage / ss_init / gen_llm / brand / advantages / cfg /
-    record_api_cost / model_defaults，由主入口在 with tab2 内调用。
+    record_api_cost / model_defaults，由主入口在当前 Tab 为「✍️ 自动创作」时调用。
     """
+    # 取回可能已转存到临时文件的生成内容、ZIP 包与多模态描述
+    restore_session_keys("generated_contents", "zip_bytes", "multimodal_descriptions", "content_scores",
+                         "image_bundle_zip")
+
     # 标题和清空按钮放在同一行，布局更紧凑
     header_col1, header_col2 = st.columns([4, 1])
     with header_col1:
@@ -161,6 +190,13 @@ def render_tab_autowrite(
                                         st.caption(tech['description'])
                                         break
 
+                resume_batch = st.checkbox(
+                    "💾 断点续跑",
+                    value=True,
+                    key="content_resume_batch",
+                    help="相同的关键词/平台/技巧批次中途失败或取消后再次生成时，跳过已生成的条目；关闭则全部重新生成"
+                )
+
                 run_content_disabled = (not st.session_state.cfg_valid) or (gen_llm is None) or (not keywords_to_generate)
                 run_content = st.form_submit_button(
                     "🚀 生成内容",
@@ -210,6 +246,19 @@ def render_tab_autowrite(
             scorer = ContentScorer()
             schema_gen = None
 
+            # 批次断点：同一批次（品牌/优势/技巧/模型/条目一致）再次生成时复用已完成的条目
+            checkpoints = CheckpointStore(storage, "autowrite:" + compute_inputs_hash({
+                "brand": brand,
+                "advantages": advantages,
+                "techniques": selected_technique_names,
+                "provider": cfg.get("gen_provider"),
+                "items": keywords_to_generate,
+            }))
+            if not resume_batch:
+                checkpoints.clear()
+            resumed_count = 0
+            pending_scores = []  # (contents 下标, 断点 key, 断点输入)，整批生成后打包评分
+
             try:
                 with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
                     for idx, (keyword, plat) in enumerate(keywords_to_generate):
@@ -631,6 +680,21 @@ def render_tab_autowrite(
                                 )
                                 content_template = technique_manager.enhance_prompt(content_template, technique_ids)
 
+                            item_key = f"{keyword}|{plat}"
+                            item_inputs = {"keyword": keyword, "platform": plat, "brand": brand,
+                                           "advantages": advantages, "template": content_template}
+                            hit, cached_item = checkpoints.lookup("generate", item_key, item_inputs)
+                            if hit and cached_item:
+                                zip_file.writestr(cached_item["filename"], cached_item["content"])
+                                if cached_item.get("score") and not cached_item["score"].get("error"):
+                                    st.session_state.content_scores[f"{keyword}_{plat}"] = cached_item["score"]
+                                contents.append(cached_item)
+                                resumed_count += 1
+                                # 上次在评分前中断（如取消）的条目补评分
+                                if gen_llm and cached_item.get("score") is None and not cached_item.get("error"):
+                                    pending_scores.append((len(contents) - 1, item_key, item_inputs))
+                                continue
+
                             prompt = PromptTemplate.from_template(content_template)
                             chain = prompt | gen_llm | StrOutputParser()
 
@@ -639,14 +703,27 @@ def render_tab_autowrite(
                             max_retries = 2
                             retry_count = 0
                             content = None
+                            # 流式输出：当前条目边生成边显示，完成后清除
+                            live_output = st.empty()
 
                             while retry_count <= max_retries:
                                 try:
                                     if st.session_state.get("cancel_generation", False):
                                         break
-                                    content = chain.invoke({"keyword": keyword, "brand": brand, "advantages": advantages})
+                                    with live_output.container():
+                                        streamed = stream_chain(
+                                            chain,
+                                            {"keyword": keyword, "brand": brand, "advantages": advantages},
+                                            should_cancel=lambda: st.session_state.get("cancel_generation", False),
+                                        )
+                                    if not streamed["cancelled"]:
+                                        content = streamed["text"]
+                                        status_text.text(
+                                            f"已生成 {idx + 1}/{total_items}: {keyword} - {plat}（{format_stream_timing(streamed)}）"
+                                        )
                                     break
                                 except Exception as e:
+                                    live_output.empty()
                                     error_msg = str(e)
                                     retry_count += 1
                                     is_retryable = (
@@ -664,6 +741,7 @@ def render_tab_autowrite(
                                     else:
                                         raise
 
+                            live_output.empty()
                             if content is None:
                                 if st.session_state.get("cancel_generation", False):
                                     st.warning("⚠️ 生成已取消")
@@ -693,8 +771,9 @@ def render_tab_autowrite(
 
                             if gen_llm:
                                 try:
-                                    model_name = getattr(gen_llm, 'model_name', None) or getattr(gen_llm, 'model', None) or model_defaults(cfg["gen_provider"])
-                                    provider = cfg["gen_provider"]
+                                    # 启用生成路由时按实际使用的提供商记录成本
+                                    provider, model_name = resolve_route(gen_llm, cfg["gen_provider"])
+                                    model_name = model_name or model_defaults(provider)
                                     record_api_cost(
                                         operation_type="生成",
                                         provider=provider,
@@ -736,27 +815,8 @@ def render_tab_autowrite(
                                 except Exception as e:
                                     st.warning(f"JSON-LD Schema 生成失败：{e}")
 
+                            # 评分在整批生成后打包进行（ContentScorer.score_contents）
                             score_data = None
-                            if gen_llm:
-                                try:
-                                    score_chain = PromptTemplate.from_template("{input}") | gen_llm | StrOutputParser()
-                                    score_data = scorer.score_content(
-                                        content, brand, advantages, plat, score_chain
-                                    )
-                                    if not score_data or not isinstance(score_data, dict):
-                                        raise ValueError("评分结果格式错误")
-                                    content_key = f"{keyword}_{plat}"
-                                    st.session_state.content_scores[content_key] = score_data
-                                except Exception as e:
-                                    error_msg = str(e)
-                                    if "timeout" in error_msg.lower() or "connection" in error_msg.lower():
-                                        error_type = "网络连接错误"
-                                    elif "api" in error_msg.lower() or "key" in error_msg.lower() or "auth" in error_msg.lower():
-                                        error_type = "API配置错误"
-                                    else:
-                                        error_type = "评分失败"
-                                    st.warning(f"⚠️ 内容已生成，但{error_type}：{error_msg}")
-                                    score_data = {"error": error_msg, "error_type": error_type, "retry_available": True}
 
                             contents.append({
                                 "keyword": keyword,
@@ -771,6 +831,40 @@ def render_tab_autowrite(
                                 storage.save_article(keyword, plat, content, filename, brand)
                             except Exception as e:
                                 st.warning(f"内容已生成，但保存到数据库时出错：{e}")
+                            try:
+                                checkpoints.save("generate", item_key, item_inputs, contents[-1])
+                            except Exception as e:
+                                st.warning(f"断点记录保存失败：{e}")
+                            if gen_llm:
+                                pending_scores.append((len(contents) - 1, item_key, item_inputs))
+
+                # 多篇内容打包评分，减少请求数；评分结果写回断点（取消生成时已完成的内容同样评分）
+                if pending_scores:
+                    status_text.text(f"正在评分 {len(pending_scores)} 篇内容（每次请求最多 {SCORE_PACK_MAX_ITEMS} 篇）")
+                    score_chain = PromptTemplate.from_template("{input}") | gen_llm | StrOutputParser()
+                    try:
+                        scored = scorer.score_contents(
+                            [{"content": contents[i]["content"], "platform": contents[i]["platform"]}
+                             for i, _, _ in pending_scores],
+                            brand, advantages, score_chain,
+                        )["scores"]
+                    except Exception as e:
+                        error_msg = str(e)
+                        st.warning(f"⚠️ 内容已生成，但评分失败：{error_msg}")
+                        scored = [{"error": error_msg, "error_type": "评分失败", "retry_available": True}
+                                  for _ in pending_scores]
+                    for (i, item_key, item_inputs), score_data in zip(pending_scores, scored):
+                        contents[i]["score"] = score_data
+                        if not score_data.get("error"):
+                            st.session_state.content_scores[f"{contents[i]['keyword']}_{contents[i]['platform']}"] = score_data
+                        try:
+                            checkpoints.save("generate", item_key, item_inputs, contents[i])
+                        except Exception as e:
+                            st.warning(f"断点记录保存失败：{e}")
+
+                # 整批全部成功后清除断点，下次生成同一批次时重新创作
+                if len(contents) == total_items and not any(c.get("error") for c in contents):
+                    checkpoints.clear()
 
                 zip_buffer.seek(0)
                 st.session_state.generated_contents = contents
@@ -789,6 +883,9 @@ def render_tab_autowrite(
                 if 'status_text' in locals():
                     status_text.empty()
 
+            if resumed_count:
+                st.info(f"💾 已从断点恢复 {resumed_count} 篇内容，未重复调用模型")
+
             if contents:
                 success_count = len([c for c in contents if not c.get("error")])
                 total_count = len(contents)
@@ -796,7 +893,7 @@ def render_tab_autowrite(
                     st.success(f"✅ 生成完成！共生成 {total_count} 篇内容")
                 else:
                     st.warning(f"⚠️ 生成完成：成功 {success_count} 篇，失败 {total_count - success_count} 篇")
-                failed_scores = [c for c in contents if c.get("score", {}).get("error")]
+                failed_scores = [c for c in contents if (c.get("score") or {}).get("error")]
                 if failed_scores:
                     st.warning(f"⚠️ 其中 {len(failed_scores)} 篇内容评分失败，可在详情中重新评分")
                 failed_generations = [c for c in contents if c.get("error")]
@@ -1262,62 +1359,71 @@ def render_tab_autowrite(
                         content = item.get("content", "")
                         progress_bar_img = st.progress(0)
                         status_text_img = st.empty()
-                        status_text_img.text(f"正在生成 {num_images} 张配图，请稍候（每张约需 5-15 秒）...")
+                        status_text_img.text(f"正在并发生成 {num_images} 张配图，请稍候（约需 5-15 秒）...")
                         try:
                             multimodal_chain = PromptTemplate.from_template("{input}") | gen_llm | StrOutputParser()
-                            generated_images = []
-                            for idx in range(num_images):
-                                progress = (idx + 1) / num_images
-                                progress_bar_img.progress(progress)
-                                status_text_img.text(f"正在生成第 {idx + 1}/{num_images} 张图片...")
-                                if num_images == 1:
-                                    content_segment = content[:800] if len(content) > 800 else content
-                                elif num_images == 2:
-                                    content_segment = content[:500] if idx == 0 else content[-500:] if len(content) > 500 else content
-                                else:
-                                    if idx == 0:
-                                        content_segment = content[:400] if len(content) > 400 else content
-                                    elif idx == 1:
-                                        mid_start = len(content) // 3
-                                        mid_end = mid_start + 400
-                                        content_segment = content[mid_start:mid_end] if len(content) > mid_end else content[mid_start:]
-                                    else:
-                                        content_segment = content[-400:] if len(content) > 400 else content
+                            if num_images == 1:
+                                content_segments = [content[:800] if len(content) > 800 else content]
+                            elif num_images == 2:
+                                content_segments = [
+                                    content[:500] if len(content) > 500 else content,
+                                    content[-500:] if len(content) > 500 else content,
+                                ]
+                            else:
+                                mid_start = len(content) // 3
+                                mid_end = mid_start + 400
+                                content_segments = [
+                                    content[:400] if len(content) > 400 else content,
+                                    content[mid_start:mid_end] if len(content) > mid_end else content[mid_start:],
+                                    content[-400:] if len(content) > 400 else content,
+                                ]
+
+                            def build_image_prompt(idx, content_segment):
+                                fallback = f"一张关于{content_segment[:50]}的专业配图，风格：高清、现代、科技感，品牌：{brand}"
                                 try:
                                     image_prompt = multimodal_gen.generate_tongyi_image_prompt(
                                         content_segment, brand, multimodal_chain,
                                     )
-                                    if not image_prompt or not image_prompt.strip():
-                                        image_prompt = f"一张关于{content_segment[:50]}的专业配图，风格：高清、现代、科技感，品牌：{brand}"
-                                except Exception as e:
-                                    image_prompt = f"一张关于{content_segment[:50]}的专业配图，风格：高清、现代、科技感，品牌：{brand}"
-                                platform = item.get("platform", "")
-                                image_size = MultimodalPromptGenerator.get_image_size_for_platform(platform)
-                                try:
-                                    if not image_prompt or not image_prompt.strip():
-                                        raise ValueError("图片生成 Prompt 为空，请检查内容或重试")
-                                    result = multimodal_gen.generate_image_with_tongyi(
-                                        prompt=image_prompt,
-                                        api_key=tongyi_api_key,
-                                        model="wanx-v1",
-                                        size=image_size,
-                                    )
-                                    if result is None:
-                                        raise ValueError("图片生成 API 返回空结果")
-                                    if result.get("success") and result.get("image_url"):
-                                        generated_images.append({
-                                            "image_url": result["image_url"],
-                                            "prompt": image_prompt,
-                                            "alt_text": f"配图 {idx + 1}",
-                                            "position": f"位置 {idx + 1}",
-                                            "description": {},
-                                        })
-                                        st.success(f"✅ 第 {idx + 1} 张图片生成成功")
-                                    else:
-                                        st.error(f"❌ 第 {idx + 1} 张图片生成失败：{result.get('error', '未知错误')}")
-                                except Exception as e:
-                                    st.error(f"❌ 第 {idx + 1} 张图片生成异常：{str(e)}")
+                                except Exception:
+                                    return fallback
+                                return image_prompt if image_prompt and image_prompt.strip() else fallback
+
+                            finished_images = []
+
+                            def on_image_event(event, idx, result):
+                                if event == "submitted":
+                                    status_text_img.text(f"第 {idx + 1}/{num_images} 张图片已提交，正在合成...")
+                                    return
+                                finished_images.append(idx)
+                                progress_bar_img.progress(len(finished_images) / num_images)
+                                status_text_img.text(f"已完成 {len(finished_images)}/{num_images} 张图片...")
+                                if result.get("success") and result.get("image_url"):
+                                    st.success(f"✅ 第 {idx + 1} 张图片生成成功")
+                                else:
+                                    st.error(f"❌ 第 {idx + 1} 张图片生成失败：{result.get('error', '未知错误')}")
+
+                            # 各张图片的 Prompt 生成与合成并发进行，结果按原顺序嵌入
+                            image_results = multimodal_gen.generate_images_with_tongyi_concurrent(
+                                content_segments,
+                                build_image_prompt,
+                                api_key=tongyi_api_key,
+                                model="wanx-v1",
+                                size=MultimodalPromptGenerator.get_image_size_for_platform(item.get("platform", "")),
+                                on_event=on_image_event,
+                            )
+                            generated_images = [
+                                {
+                                    "image_url": result["image_url"],
+                                    "prompt": result.get("prompt", ""),
+                                    "alt_text": f"配图 {idx + 1}",
+                                    "position": f"位置 {idx + 1}",
+                                    "description": {},
+                                }
+                                for idx, result in enumerate(image_results)
+                                if result.get("success") and result.get("image_url")
+                            ]
                             if generated_images:
+                                generated_images = _localize_images(generated_images)
                                 final_content = multimodal_gen.embed_images_in_markdown(content, generated_images)
                                 st.session_state[f"{direct_gen_key}_images"] = generated_images
                                 st.session_state[f"{direct_gen_key}_final_content"] = final_content
@@ -1341,9 +1447,15 @@ def render_tab_autowrite(
                             st.markdown("##### 📸 生成的图片预览")
                             for idx, img_data in enumerate(generated_images, 1):
                                 with st.expander(f"图片 {idx}：{img_data.get('alt_text', '配图')}", expanded=(idx == 1)):
-                                    st.image(img_data["image_url"], caption=img_data.get("prompt", "")[:100])
+                                    st.image(img_data.get("local_path") or img_data["image_url"],
+                                             caption=img_data.get("prompt", "")[:100])
                                     st.markdown(f"**Prompt**：{img_data.get('prompt', '')}")
                                     st.markdown(f"**图片URL**：{img_data['image_url']}")
+                                    if img_data.get("local_path"):
+                                        st.caption(
+                                            f"{img_data.get('width')}×{img_data.get('height')}，"
+                                            f"{img_data.get('bytes', 0) / 1024:.0f} KB，原始链接：{img_data.get('source_url', '')}"
+                                        )
                             st.markdown("---")
                             st.markdown("##### 📄 图文结合版本（Markdown）")
                             st.code(final_content, language="markdown")
@@ -1355,6 +1467,34 @@ def render_tab_autowrite(
                                 use_container_width=True,
                                 key=f"download_final_content_{item.get('keyword', '')}"
                             )
+                            if (any(img.get("local_path") for img in generated_images)
+                                    and not st.session_state.cfg.get("image_cdn_base_url")):
+                                # ZIP 只在点击时打包一次，字节保存在受管理的 image_bundle_zip 中（同一时间只保留一份）
+                                bundle_owner = f"{direct_gen_key}:{hash(final_content)}"
+                                bundle_name = sanitize_filename(item.get('keyword', 'content'))
+                                bundle = st.session_state.get("image_bundle_zip")
+                                if not bundle or bundle.get("owner") != bundle_owner:
+                                    if st.button("📦 打包图文版本 + 图片（ZIP）", use_container_width=True,
+                                                 key=f"build_final_bundle_{item.get('keyword', '')}"):
+                                        store = _image_asset_store()
+                                        try:
+                                            with st.spinner("正在打包图片..."):
+                                                st.session_state.image_bundle_zip = {
+                                                    "owner": bundle_owner,
+                                                    "data": store.export_bundle(final_content, f"{bundle_name}_with_images.md"),
+                                                }
+                                        finally:
+                                            store.close()
+                                        bundle = st.session_state.image_bundle_zip
+                                if bundle and bundle.get("owner") == bundle_owner:
+                                    st.download_button(
+                                        label="📦 下载图文版本 + 图片（ZIP）",
+                                        data=bundle["data"],
+                                        file_name=f"{bundle_name}_with_images.zip",
+                                        mime="application/zip",
+                                        use_container_width=True,
+                                        key=f"download_final_bundle_{item.get('keyword', '')}"
+                                    )
                             if st.button("🔄 用图文版本替换原内容", use_container_width=True,
                                        key=f"update_content_main_{item.get('keyword', '')}"):
                                 item["content"] = final_content
@@ -1385,39 +1525,51 @@ def render_tab_autowrite(
                                 status_text_img = st.empty()
                                 try:
                                     multimodal_chain = PromptTemplate.from_template("{input}") | gen_llm | StrOutputParser()
-                                    generated_images = []
-                                    for idx, desc in enumerate(image_list):
-                                        progress = (idx + 1) / len(image_list)
-                                        progress_bar_img.progress(progress)
-                                        status_text_img.text(f"正在生成第 {idx + 1}/{len(image_list)} 张图片...")
+                                    def build_desc_prompt(idx, desc):
                                         image_prompt = desc.get('detailed_description', desc.get('image_description', ''))
                                         if not image_prompt:
                                             image_prompt = multimodal_gen.generate_tongyi_image_prompt(
                                                 content, brand, multimodal_chain
                                             )
-                                        platform = item.get("platform", "")
-                                        image_size = MultimodalPromptGenerator.get_image_size_for_platform(platform)
-                                        try:
-                                            result = multimodal_gen.generate_image_with_tongyi(
-                                                prompt=image_prompt,
-                                                api_key=tongyi_api_key,
-                                                model="wanx-v1",
-                                                size=image_size
-                                            )
-                                            if result and result.get("success") and result.get("image_url"):
-                                                generated_images.append({
-                                                    "image_url": result["image_url"],
-                                                    "prompt": image_prompt,
-                                                    "alt_text": desc.get('original_hint', f"配图 {idx + 1}"),
-                                                    "position": desc.get('position', ''),
-                                                    "description": desc
-                                                })
-                                                st.success(f"✅ 第 {idx + 1} 张图片生成成功")
-                                        except Exception as e:
-                                            st.error(f"❌ 第 {idx + 1} 张图片生成异常：{str(e)}")
+                                        return image_prompt
+
+                                    finished_images = []
+
+                                    def on_image_event(event, idx, result):
+                                        if event != "done":
+                                            return
+                                        finished_images.append(idx)
+                                        progress_bar_img.progress(len(finished_images) / len(image_list))
+                                        status_text_img.text(f"已完成 {len(finished_images)}/{len(image_list)} 张图片...")
+                                        if result.get("success") and result.get("image_url"):
+                                            st.success(f"✅ 第 {idx + 1} 张图片生成成功")
+                                        else:
+                                            st.error(f"❌ 第 {idx + 1} 张图片生成失败：{result.get('error', '未知错误')}")
+
+                                    status_text_img.text(f"正在并发生成 {len(image_list)} 张图片...")
+                                    image_results = multimodal_gen.generate_images_with_tongyi_concurrent(
+                                        image_list,
+                                        build_desc_prompt,
+                                        api_key=tongyi_api_key,
+                                        model="wanx-v1",
+                                        size=MultimodalPromptGenerator.get_image_size_for_platform(item.get("platform", "")),
+                                        on_event=on_image_event,
+                                    )
+                                    generated_images = [
+                                        {
+                                            "image_url": result["image_url"],
+                                            "prompt": result.get("prompt", ""),
+                                            "alt_text": desc.get('original_hint', f"配图 {idx + 1}"),
+                                            "position": desc.get('position', ''),
+                                            "description": desc
+                                        }
+                                        for idx, (desc, result) in enumerate(zip(image_list, image_results))
+                                        if result.get("success") and result.get("image_url")
+                                    ]
                                     progress_bar_img.empty()
                                     status_text_img.empty()
                                     if generated_images:
+                                        generated_images = _localize_images(generated_images)
                                         final_content = multimodal_gen.embed_images_in_markdown(content, generated_images)
                                         st.session_state[f"{image_gen_key}_images"] = generated_images
                                         st.session_state[f"{image_gen_key}_final_content"] = final_content
@@ -1450,6 +1602,11 @@ def render_tab_autowrite(
                                             "descriptions": image_descriptions
                                         }
                                         st.success(f"✅ 配图描述生成完成！共 {image_descriptions.get('total_images', 0)} 个配图")
+                                        if image_descriptions.get("fallback_count"):
+                                            st.warning(
+                                                f"⚠️ {image_descriptions['fallback_count']} 个配图的描述生成失败，已使用规则描述："
+                                                + "；".join(f"{e['hint']} {e['error']}" for e in image_descriptions["errors"])
+                                            )
                                     else:
                                         st.warning("⚠️ 未生成任何配图描述。")
                             except Exception as e:
@@ -1466,22 +1623,24 @@ def render_tab_autowrite(
                     with st.spinner("正在生成视频脚本..."):
                         try:
                             multimodal_chain = PromptTemplate.from_template("{input}") | gen_llm | StrOutputParser()
-                            segments = content.split('\n\n')[:5]
-                            video_scripts = []
-                            for i, segment in enumerate(segments):
-                                if segment.strip():
-                                    timestamp = f"00:{i*10:02d}-00:{(i+1)*10:02d}"
-                                    script = multimodal_gen.generate_video_script_description(
-                                        segment, brand, advantages, item.get("keyword", ""),
-                                        timestamp, multimodal_chain
-                                    )
-                                    video_scripts.append({"timestamp": timestamp, "script": script})
+                            # 各片段并发生成，失败的片段使用规则描述补齐
+                            video_result = multimodal_gen.generate_video_scripts(
+                                content, brand, advantages, item.get("keyword", ""), multimodal_chain
+                            )
+                            video_scripts = video_result["scripts"]
                             if "multimodal_descriptions" not in st.session_state:
                                 st.session_state.multimodal_descriptions = {}
                             st.session_state.multimodal_descriptions[item.get("keyword", "")] = {
                                 "type": "video",
                                 "scripts": video_scripts
                             }
+                            if video_result["fallback_count"]:
+                                st.session_state[f"video_script_fallback_{item.get('keyword', '')}"] = (
+                                    f"⚠️ {video_result['fallback_count']} 个片段生成失败，已使用规则描述："
+                                    + "；".join(f"{e['timestamp']} {e['error']}" for e in video_result["errors"])
+                                )
+                            else:
+                                st.session_state.pop(f"video_script_fallback_{item.get('keyword', '')}", None)
                             st.success(f"✅ 视频脚本描述生成完成！共 {len(video_scripts)} 个片段")
                             st.rerun()
                         except Exception as e:
@@ -1495,6 +1654,9 @@ def render_tab_autowrite(
                         scripts = multimodal_data.get("scripts", [])
                         if scripts:
                             st.markdown("##### 🎬 视频脚本描述详情")
+                            fallback_note = st.session_state.get(f"video_script_fallback_{item.get('keyword', '')}")
+                            if fallback_note:
+                                st.warning(fallback_note)
                             for script_item in scripts:
                                 timestamp = script_item.get("timestamp", "N/A")
                                 script = script_item.get("script", {})
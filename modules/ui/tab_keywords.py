@@ -2,8 +2,6 @@ import json
 import math
 
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import streamlit as st
 from langchain_core.output_parsers import JsonOutputParser, StrOutputParser
 from langchain_core.prompts import PromptTemplate
@@ -11,6 +9,8 @@ from langchain_core.prompts import PromptTemplate
 from modules.keyword_mining import KeywordMining
 from modules.semantic_expander import SemanticExpander
 from modules.topic_cluster import TopicCluster
+from modules.ui.fragment import tab_fragment
+from modules.ui.session_store import restore_session_keys
 
 
 INVALID_FS_CHARS = r'<>:"/\\|?*\n\r\t'
@@ -44,6 +44,7 @@ def extract_json_array(text: str):
         return None
 
 
+@tab_fragment
 def render_tab_keywords(storage, ss_init, gen_llm, brand: str, advantages: str) -> None:
     """
     渲染 Tab1：关键词蒸馏。
@@ -52,6 +53,13 @@ def render_tab_keywords(storage, ss_init, gen_llm, brand: str, advantages: str)
     - 包装为函数，便于从主入口调用
     - 通过参数接收 `storage` / `ss_init` / `gen_llm` / `brand` / `advantages`
     """
+    # 延迟导入：plotly 只在渲染本 Tab 时加载
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    # 取回可能已转存到临时文件的话题集群结果
+    restore_session_keys("topic_clusters", "cluster_relationships", "content_planning")
+
     # ========== 区域 1：模式选择 ==========
     st.markdown("**🎯 生成模式**")
     generation_mode = st.radio(
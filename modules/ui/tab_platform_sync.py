@@ -0,0 +1,509 @@
+# Tab9：🔄 平台同步
+# 从 geo_tool.py 迁移，通过 render_tab_platform_sync() 供主入口调用。
+
+import pandas as pd
+import streamlit as st
+
+from modules.ui.fragment import tab_fragment
+from modules.ui.helpers import sanitize_filename
+from modules.ui.session_store import restore_session_keys
+
+
+@tab_fragment
+def render_tab_platform_sync(
+    storage,
+) -> None:
+    """
+    渲染 Tab9：平台同步。
+    
+    通过参数接收 storage，
+    由主入口在当前 Tab 为「🔄 平台同步」时调用；包装为 fragment，Tab 内交互只重跑本 Tab。
+    """
+    restore_session_keys("copy_export_zip")
+    
+    st.markdown("### 📤 平台文章同步")
+    st.caption("将生成的文章自动发布到各平台，支持API发布和一键复制")
+    
+    # 获取品牌信息
+    brand = st.session_state.get("brand", "")
+    if not brand:
+        st.info("请先在侧边栏设置品牌信息")
+    else:
+        # 平台账号配置
+        st.markdown("---")
+        st.markdown("#### 🔐 平台账号配置")
+        
+        platform_config_tabs = st.tabs(["GitHub", "其他平台（开发中）"])
+        
+        with platform_config_tabs[0]:
+            st.markdown("##### GitHub 配置")
+            st.caption("配置GitHub账号信息，用于自动发布文章到GitHub仓库")
+            
+            # 检查是否已有配置
+            existing_config = storage.get_platform_account("GitHub", brand)
+            
+            github_api_key = st.text_input(
+                "GitHub Personal Access Token",
+                value=existing_config.get('api_key', '') if existing_config else '',
+                type="password",
+                help="在 https://github.com/settings/tokens 创建Token，需要 repo 权限",
+                key="github_api_key"
+            )
+            
+            github_repo_owner = st.text_input(
+                "仓库所有者（用户名）",
+                value=existing_config.get('config', {}).get('repo_owner', '') if existing_config else '',
+                help="GitHub用户名或组织名",
+                key="github_repo_owner"
+            )
+            
+            github_repo_name = st.text_input(
+                "仓库名称",
+                value=existing_config.get('config', {}).get('repo_name', '') if existing_config else '',
+                help="要发布到的仓库名称",
+                key="github_repo_name"
+            )
+            
+            col1, col2 = st.columns([1, 4])
+            with col1:
+                if st.button("💾 保存配置", type="primary", use_container_width=True):
+                    if github_api_key and github_repo_owner and github_repo_name:
+                        try:
+                            # 验证账号
+                            from platform_sync.github_publisher import GitHubPublisher
+                            publisher = GitHubPublisher(github_api_key, github_repo_owner, github_repo_name)
+                            if publisher.validate_account():
+                                storage.save_platform_account(
+                                    platform="GitHub",
+                                    account_config={
+                                        'account_type': 'api',
+                                        'api_key': github_api_key,
+                                        'config': {
+                                            'repo_owner': github_repo_owner,
+                                            'repo_name': github_repo_name
+                                        }
+                                    },
+                                    brand=brand
+                                )
+                                st.success("✅ GitHub配置已保存并验证成功！")
+                            else:
+                                st.error("❌ GitHub Token验证失败，请检查Token是否正确")
+                        except Exception as e:
+                            st.error(f"❌ 配置保存失败: {str(e)}")
+                    else:
+                        st.error("请填写完整信息")
+            
+            with col2:
+                if existing_config:
+                    st.info("✅ 已配置GitHub账号")
+        
+        # 发布功能
+        st.markdown("---")
+        st.markdown("#### 📝 发布文章")
+        
+        # 选择文章
+        articles = storage.get_articles(brand=brand)
+        if articles:
+            # 文章选择
+            article_options = {}
+            for article in articles:
+                display_name = f"{article.get('keyword', 'N/A')} - {article.get('platform', 'N/A')}"
+                article_options[display_name] = article.get('id')
+            
+            if article_options:
+                selected_article_key = st.selectbox(
+                    "选择要发布的文章",
+                    list(article_options.keys()),
+                    key="publish_article_select"
+                )
+                selected_article_id = article_options[selected_article_key]
+                
+                # 选择平台
+                # 定义平台列表
+                api_platforms = ["GitHub"]
+                copy_platforms = [
+                    "头条号（资讯软文）", "小红书（生活种草）", "抖音图文（短内容）", "简书（文艺）",
+                    "QQ空间（社交）", "新浪博客（博客）", "新浪新闻（资讯）", "搜狐号（资讯）",
+                    "一点号（资讯）", "东方财富（财经）", "邦阅网（外贸）", "原创力文档（文档）"
+                ]
+                all_publish_platforms = api_platforms + copy_platforms
+                
+                publish_platform = st.selectbox(
+                    "选择发布平台",
+                    all_publish_platforms,
+                    key="publish_platform_select"
+                )
+                
+                if publish_platform == "GitHub":
+                    # 检查配置
+                    account_config = storage.get_platform_account("GitHub", brand)
+                    if not account_config:
+                        st.warning("⚠️ 请先配置GitHub账号")
+                    else:
+                        # 获取文章
+                        article = next((a for a in articles if a.get('id') == selected_article_id), None)
+                        if article:
+                            # 显示文章预览
+                            with st.expander("📄 文章预览", expanded=False):
+                                st.markdown(f"**关键词**: {article.get('keyword', 'N/A')}")
+                                st.markdown(f"**平台**: {article.get('platform', 'N/A')}")
+                                st.markdown(f"**内容长度**: {len(article.get('content', ''))} 字符")
+                                st.markdown("---")
+                                st.text_area("内容", article.get('content', ''), height=200, disabled=True)
+                            
+                            # 发布选项
+                            file_path = st.text_input(
+                                "文件路径（可选）",
+                                value=f"content/{article.get('keyword', 'article').replace(' ', '_')[:50]}.md",
+                                help="GitHub仓库中的文件路径，留空使用默认路径",
+                                key="github_file_path"
+                            )
+                            
+                            if st.button("🚀 发布到GitHub", type="primary", use_container_width=True):
+                                try:
+                                    from platform_sync.github_publisher import GitHubPublisher
+                                    publisher = GitHubPublisher(
+                                        api_key=account_config['api_key'],
+                                        repo_owner=account_config['config']['repo_owner'],
+                                        repo_name=account_config['config']['repo_name']
+                                    )
+                                    
+                                    with st.spinner("正在发布到GitHub..."):
+                                        result = publisher.publish(
+                                            content=article.get('content', ''),
+                                            title=article.get('keyword', 'Untitled'),
+                                            file_path=file_path if file_path else None
+                                        )
+                                    
+                                    # 保存发布记录
+                                    storage.save_publish_record(
+                                        article_id=selected_article_id,
+                                        platform="GitHub",
+                                        publish_method="api",
+                                        publish_status="success" if result['success'] else "failed",
+                                        publish_url=result.get('publish_url', ''),
+                                        publish_id=result.get('publish_id', ''),
+                                        error_message=result.get('error', '')
+                                    )
+                                    
+                                    # 显示结果
+                                    if result['success']:
+                                        st.success(f"✅ 发布成功！")
+                                        st.markdown(f"**发布链接**: [{result['publish_url']}]({result['publish_url']})")
+                                        st.balloons()
+                                    else:
+                                        st.error(f"❌ 发布失败: {result.get('error', '未知错误')}")
+                                except Exception as e:
+                                    st.error(f"❌ 发布过程出错: {str(e)}")
+                                    storage.save_publish_record(
+                                        article_id=selected_article_id,
+                                        platform="GitHub",
+                                        publish_method="api",
+                                        publish_status="failed",
+                                        error_message=str(e)
+                                    )
+                        
+                        # 批量发布：多篇文章合并为一次提交
+                        with st.expander("📦 批量发布到GitHub（单次提交）", expanded=False):
+                            st.caption("通过 Git Data API 将多篇文章合并为一次提交，减少请求数与提交记录；任一文件失败则整批不提交")
+                            batch_keys = st.multiselect(
+                                "选择要批量发布的文章",
+                                list(article_options.keys()),
+                                key="github_batch_articles"
+                            )
+                            batch_dir = st.text_input(
+                                "发布目录",
+                                value="content",
+                                help="文章文件统一放在该目录下",
+                                key="github_batch_dir"
+                            )
+                            batch_message = st.text_input(
+                                "提交说明（可选）",
+                                value="",
+                                key="github_batch_message"
+                            )
+                            
+                            if st.button("🚀 批量发布", type="primary", use_container_width=True, disabled=not batch_keys, key="github_batch_publish"):
+                                from platform_sync.github_publisher import GitHubPublisher
+                                publisher = GitHubPublisher(
+                                    api_key=account_config['api_key'],
+                                    repo_owner=account_config['config']['repo_owner'],
+                                    repo_name=account_config['config']['repo_name']
+                                )
+                                batch_articles = []
+                                for key in batch_keys:
+                                    batch_article = next((a for a in articles if a.get('id') == article_options[key]), None)
+                                    if batch_article:
+                                        keyword = batch_article.get('keyword', 'article')
+                                        platform_slug = sanitize_filename(batch_article.get('platform', ''), 30)
+                                        batch_articles.append({
+                                            'article_id': batch_article.get('id'),
+                                            'title': keyword,
+                                            'content': batch_article.get('content', ''),
+                                            'file_path': f"{batch_dir.strip('/') or 'content'}/{sanitize_filename(keyword, 50)}_{platform_slug}.md"
+                                        })
+                                
+                                with st.spinner(f"正在批量发布 {len(batch_articles)} 篇文章..."):
+                                    batch_result = publisher.publish_batch(batch_articles, message=batch_message or None)
+                                
+                                # 保存发布记录（每篇一条）
+                                for batch_article, item_result in zip(batch_articles, batch_result['results']):
+                                    storage.save_publish_record(
+                                        article_id=batch_article['article_id'],
+                                        platform="GitHub",
+                                        publish_method="api",
+                                        publish_status="success" if item_result['success'] else "failed",
+                                        publish_url=item_result.get('publish_url', ''),
+                                        publish_id=item_result.get('publish_id', ''),
+                                        error_message=item_result.get('error') or ''
+                                    )
+                                
+                                if batch_result['success']:
+                                    st.success(f"✅ 已在一次提交中发布 {len(batch_articles)} 篇文章")
+                                    if batch_result.get('commit_url'):
+                                        st.markdown(f"**提交链接**: [{batch_result['commit_sha'][:7]}]({batch_result['commit_url']})")
+                                else:
+                                    st.error(f"❌ 批量发布失败: {batch_result.get('error', '未知错误')}")
+                else:
+                    # 一键复制平台
+                    article = next((a for a in articles if a.get('id') == selected_article_id), None)
+                    if article:
+                        from platform_sync.copy_manager import CopyManager
+                        copy_manager = CopyManager()
+                        
+                        # 格式化内容
+                        formatted_content = copy_manager.format_for_platform(
+                            platform=publish_platform,
+                            content=article.get('content', ''),
+                            title=article.get('keyword', 'Untitled'),
+                            keyword=article.get('keyword', ''),
+                            brand=brand
+                        )
+                        
+                        # 显示格式化后的内容
+                        with st.expander("📄 格式化后的内容（已复制到剪贴板）", expanded=True):
+                            st.text_area(
+                                "内容",
+                                formatted_content,
+                                height=300,
+                                key="formatted_content_display"
+                            )
+                        
+                        # 发布指南
+                        guide = copy_manager.generate_publish_guide(publish_platform)
+                        with st.expander("📋 发布指南", expanded=True):
+                            st.markdown(guide)
+                        
+                        # 复制按钮
+                        col1, col2 = st.columns([1, 1])
+                        with col1:
+                            if st.button("📋 复制到剪贴板", type="primary", use_container_width=True):
+                                if copy_manager.copy_to_clipboard(formatted_content):
+                                    st.success("✅ 内容已复制到剪贴板！")
+                                    st.info("💡 请按照上方发布指南，将内容粘贴到对应平台发布")
+                                    
+                                    # 保存发布记录（标记为已复制）
+                                    storage.save_publish_record(
+                                        article_id=selected_article_id,
+                                        platform=publish_platform,
+                                        publish_method="copy",
+                                        publish_status="copied",
+                                        error_message=""
+                                    )
+                                else:
+                                    st.error("❌ 复制失败，请手动复制内容")
+                        
+                        with col2:
+                            if st.button("📥 下载内容", use_container_width=True):
+                                # 生成下载文件
+                                safe_title = article.get('keyword', 'article').replace(' ', '_')[:50]
+                                filename = f"{publish_platform.replace('（', '_').replace('）', '')}_{safe_title}.txt"
+                                st.download_button(
+                                    label="⬇️ 下载",
+                                    data=formatted_content,
+                                    file_name=filename,
+                                    mime="text/plain",
+                                    key="download_formatted_content"
+                                )
+                        
+                        # 批量导出：多篇文章 × 多个平台一次生成，打包为 ZIP
+                        with st.expander("📦 批量导出多平台文案", expanded=False):
+                            export_keys = st.multiselect(
+                                "选择文章",
+                                list(article_options.keys()),
+                                key="copy_export_articles"
+                            )
+                            export_platforms = st.multiselect(
+                                "选择平台",
+                                copy_platforms,
+                                default=copy_platforms,
+                                key="copy_export_platforms"
+                            )
+                            if st.button("📦 生成导出包", disabled=not (export_keys and export_platforms), key="copy_export_build"):
+                                import io
+                                import zipfile
+                                export_articles = []
+                                for key in export_keys:
+                                    export_article = next((a for a in articles if a.get('id') == article_options[key]), None)
+                                    if export_article:
+                                        export_articles.append({
+                                            'id': export_article.get('id'),
+                                            'content': export_article.get('content', ''),
+                                            'title': export_article.get('keyword', 'Untitled'),
+                                            'keyword': export_article.get('keyword', ''),
+                                            'platform': export_article.get('platform', '')
+                                        })
+                                with st.spinner(f"正在生成 {len(export_articles) * len(export_platforms)} 份文案..."):
+                                    # 界面中一次只导出少量文章，进程池的启动开销大于收益，始终在当前进程内格式化
+                                    variants = copy_manager.format_batch(export_articles, export_platforms, processes=0)
+                                    buffer = io.BytesIO()
+                                    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+                                        for export_article, platform_texts in zip(export_articles, variants):
+                                            # 目录名带文章ID：同一关键词、同一平台的多篇文章不会写进同一目录互相覆盖
+                                            article_dir = f"{export_article['id']}_{sanitize_filename(export_article['keyword'], 50)}_{sanitize_filename(export_article['platform'], 30)}"
+                                            for platform_name, text in platform_texts.items():
+                                                zf.writestr(f"{article_dir}/{sanitize_filename(platform_name, 30)}.txt", text)
+                                st.session_state.copy_export_zip = buffer.getvalue()
+                            if st.session_state.get("copy_export_zip"):
+                                st.download_button(
+                                    label="⬇️ 下载导出包（ZIP）",
+                                    data=st.session_state.copy_export_zip,
+                                    file_name="platform_copies.zip",
+                                    mime="application/zip",
+                                    key="copy_export_download"
+                                )
+        else:
+            st.info("📝 请先在【2 自动创作】中生成文章")
+        
+        # 发布队列：大量文章入队后由后台线程池按平台限速逐步发布
+        st.markdown("---")
+        st.markdown("#### 📬 发布队列")
+        st.caption("文章入队后按平台限速并发发布，失败自动指数退避重试；同一内容重复入队不会重复发布")
+        
+        queue_account = storage.get_platform_account("GitHub", brand)
+        if storage.storage_type != "sqlite":
+            st.info("发布队列仅支持 SQLite 存储")
+        elif not queue_account:
+            st.info("配置 GitHub 账号后可使用发布队列")
+        else:
+            from platform_sync.publish_queue import PublishQueue, build_publisher
+            queue_stats = storage.get_publish_queue_stats(brand=brand)
+            # 统计区占位，按钮操作后在末尾填入最新数据
+            queue_stats_box = st.container()
+            
+            if articles:
+                queue_options = {
+                    f"{a.get('keyword', 'N/A')} - {a.get('platform', 'N/A')}": a for a in articles
+                }
+                queue_keys = st.multiselect(
+                    "选择要加入队列的文章",
+                    list(queue_options.keys()),
+                    key="publish_queue_articles"
+                )
+                queue_dir = st.text_input(
+                    "发布目录",
+                    value="content",
+                    help="文章文件统一放在该目录下",
+                    key="publish_queue_dir"
+                )
+                if st.button("➕ 加入发布队列", disabled=not queue_keys, key="publish_queue_enqueue"):
+                    queue = PublishQueue(storage, lambda platform, payload: build_publisher(storage, platform, payload.get('brand', '')))
+                    repo = f"{queue_account['config']['repo_owner']}/{queue_account['config']['repo_name']}"
+                    created = 0
+                    for key in queue_keys:
+                        queue_article = queue_options[key]
+                        keyword = queue_article.get('keyword', 'article')
+                        platform_slug = sanitize_filename(queue_article.get('platform', ''), 30)
+                        file_path = f"{queue_dir.strip('/') or 'content'}/{sanitize_filename(keyword, 50)}_{platform_slug}.md"
+                        result = queue.enqueue(
+                            queue_article.get('id'), "GitHub", keyword, queue_article.get('content', ''),
+                            target=f"{repo}:{file_path}", file_path=file_path, brand=brand
+                        )
+                        created += 1 if result['created'] else 0
+                    skipped = len(queue_keys) - created
+                    st.success(f"✅ 已入队 {created} 篇" + (f"，{skipped} 篇内容相同的任务已在队列中或已发布，已跳过" if skipped else ""))
+            
+            drain_col1, drain_col2 = st.columns([1, 1])
+            with drain_col1:
+                if st.button("▶️ 处理队列", type="primary", use_container_width=True,
+                             disabled=not queue_stats['pending'], key="publish_queue_drain"):
+                    queue = PublishQueue(storage, lambda platform, payload: build_publisher(storage, platform, payload.get('brand', '')))
+                    progress = st.progress(0.0, text="正在发布...")
+                    total_due = max(1, queue_stats['pending'])
+                    drain_results = []
+                    
+                    def on_job_done(outcome):
+                        drain_results.append(outcome)
+                        progress.progress(min(1.0, len(drain_results) / total_due), text=f"已处理 {len(drain_results)} 个任务")
+                    
+                    # 单次最多运行 120 秒，剩余任务下次继续；长期运行可使用 scripts/run_publish_queue.py
+                    summary = queue.drain(timeout=120, on_done=on_job_done)
+                    progress.empty()
+                    st.success(
+                        f"✅ 本次处理 {summary['processed']} 个任务：成功 {summary['success']}，"
+                        f"稍后重试 {summary['retrying']}，失败 {summary['failed']}"
+                    )
+            with drain_col2:
+                if st.button("🔁 重试失败任务", use_container_width=True,
+                             disabled=not queue_stats['failed'], key="publish_queue_requeue"):
+                    from datetime import datetime
+                    requeued = storage.requeue_failed_publish_jobs(datetime.now().isoformat(timespec="milliseconds"), brand=brand)
+                    st.success(f"✅ 已重新入队 {requeued} 个任务")
+            
+            queue_stats = storage.get_publish_queue_stats(brand=brand)
+            with queue_stats_box:
+                q_col1, q_col2, q_col3, q_col4 = st.columns(4)
+                with q_col1:
+                    st.metric("待发布", queue_stats['pending'])
+                with q_col2:
+                    st.metric("发布中", queue_stats['publishing'])
+                with q_col3:
+                    st.metric("已成功", queue_stats['success'])
+                with q_col4:
+                    st.metric("已失败", queue_stats['failed'])
+        
+        # 发布记录
+        st.markdown("---")
+        st.markdown("#### 📊 发布记录")
+        
+        publish_records = storage.get_publish_records(brand=brand)
+        if publish_records:
+            # 统计信息
+            total_records = len(publish_records)
+            success_records = len([r for r in publish_records if r.get('publish_status') == 'success'])
+            copied_records = len([r for r in publish_records if r.get('publish_status') == 'copied'])
+            failed_records = len([r for r in publish_records if r.get('publish_status') == 'failed'])
+            
+            stat_col1, stat_col2, stat_col3, stat_col4 = st.columns(4)
+            with stat_col1:
+                st.metric("总发布数", total_records)
+            with stat_col2:
+                st.metric("API成功", success_records, delta=f"{success_records/total_records*100:.1f}%" if total_records > 0 else "0%")
+            with stat_col3:
+                st.metric("已复制", copied_records, delta=f"{copied_records/total_records*100:.1f}%" if total_records > 0 else "0%")
+            with stat_col4:
+                st.metric("失败", failed_records)
+            
+            # 记录列表
+            st.markdown("##### 最近发布记录")
+            records_df = pd.DataFrame(publish_records[:20])  # 显示最近20条
+            if not records_df.empty:
+                # 格式化显示
+                display_df = records_df[['platform', 'publish_method', 'publish_status', 'publish_url', 'published_at', 'created_at']].copy()
+                display_df.columns = ['平台', '发布方式', '状态', '链接', '发布时间', '创建时间']
+                display_df['状态'] = display_df['状态'].map({
+                    'success': '✅ 成功',
+                    'failed': '❌ 失败',
+                    'pending': '⏳ 待发布',
+                    'publishing': '🚚 发布中',
+                    'copied': '📋 已复制'
+                })
+                display_df['发布方式'] = display_df['发布方式'].map({
+                    'api': 'API',
+                    'queue': '发布队列',
+                    'copy': '一键复制'
+                })
+                
+                st.dataframe(display_df, use_container_width=True, hide_index=True)
+        else:
+            st.info("暂无发布记录")
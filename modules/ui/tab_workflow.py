@@ -0,0 +1,382 @@
+# Tab7：⚙️ 工作流自动化
+# 从 geo_tool.py 迁移，通过 render_tab_workflow() 供主入口调用。
+
+import json
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from modules.execution_log import summarize_execution_result
+from modules.ui.fragment import tab_fragment
+from modules.workflow_automation import WorkflowManager, infer_step_dependencies
+from modules.workflow_callbacks import build_workflow_callbacks
+from modules.workflow_scheduler import CronTrigger, next_run_time
+
+
+@tab_fragment
+def render_tab_workflow(
+    storage,
+    ss_init,
+    gen_llm,
+    verify_llms,
+    brand,
+    advantages,
+) -> None:
+    """
+    渲染 Tab7：工作流自动化。
+
+    通过参数接收 storage / ss_init / gen_llm / verify_llms / brand / advantages，
+    由主入口在当前 Tab 为「⚙️ 工作流自动化」时调用；包装为 fragment，Tab 内交互只重跑本 Tab。
+    """
+    st.markdown("### 🔄 智能工作流自动化")
+    st.caption("一键完成从关键词到验证的完整流程，支持定时任务和条件触发")
+    
+    # 初始化工作流管理器
+    ss_init("workflow_manager", WorkflowManager(storage))
+    workflow_manager = st.session_state.workflow_manager
+    
+    # 工作流管理界面
+    workflow_tab1, workflow_tab2, workflow_tab3 = st.tabs(["📋 工作流列表", "➕ 创建工作流", "📊 执行历史"])
+    
+    with workflow_tab1:
+        st.markdown("#### 工作流列表")
+        
+        # 获取所有工作流
+        workflows = workflow_manager.list_workflows()
+        
+        if workflows:
+            for workflow in workflows:
+                with st.container(border=True):
+                    col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
+                    
+                    with col1:
+                        st.markdown(f"**{workflow['name']}**")
+                        st.caption(f"创建时间: {workflow.get('created_at', 'N/A')[:10] if workflow.get('created_at') else 'N/A'}")
+                        st.caption(f"步骤数: {len(workflow.get('steps', []))}")
+                        schedule = workflow.get('schedule') or {}
+                        if schedule.get('cron') or schedule.get('interval_minutes'):
+                            schedule_text = f"cron `{schedule['cron']}`" if schedule.get('cron') else f"每 {schedule['interval_minutes']} 分钟"
+                            try:
+                                next_fire = next_run_time(workflow, storage.get_last_scheduled_run_time(workflow['id']))
+                            except ValueError:
+                                next_fire = None
+                            st.caption(f"⏰ 定时: {schedule_text} | 下次运行: {next_fire.isoformat(sep=' ', timespec='minutes') if next_fire and workflow.get('enabled', True) else 'N/A'}")
+                    
+                    with col2:
+                        enabled = workflow.get('enabled', True)
+                        status_text = "✅ 启用" if enabled else "⏸️ 禁用"
+                        if st.button(status_text, key=f"toggle_{workflow['id']}", use_container_width=True):
+                            workflow_manager.update_workflow(workflow['id'], {"enabled": not enabled})
+                            st.rerun()
+                    
+                    with col3:
+                        if st.button("▶️ 执行", key=f"run_{workflow['id']}", use_container_width=True):
+                            # 执行工作流
+                            with st.spinner("执行工作流中..."):
+                                try:
+                                    callbacks = build_workflow_callbacks(gen_llm, verify_llms)
+                                    
+                                    result = workflow_manager.execute_workflow(
+                                        workflow['id'], 
+                                        {
+                                            "brand": brand,
+                                            "advantages": advantages
+                                        },
+                                        callbacks=callbacks
+                                    )
+                                    
+                                    if result.get("status") in ("success", "partial"):
+                                        if result.get("status") == "partial":
+                                            st.warning(f"⚠️ {result.get('error')}，可在「执行历史」中断点恢复")
+                                        else:
+                                            st.success("工作流执行成功！")
+                                        # 显示执行结果摘要
+                                        if result.get("results"):
+                                            with st.expander("查看执行结果", expanded=False):
+                                                st.json(summarize_execution_result(result)["results"])
+                                    else:
+                                        st.error(f"工作流执行失败: {result.get('error', '未知错误')}")
+                                except Exception as e:
+                                    st.error(f"执行失败: {str(e)}")
+                                    import traceback
+                                    st.code(traceback.format_exc())
+                        if st.button("📥 后台执行", key=f"enqueue_{workflow['id']}", use_container_width=True,
+                                     help="加入后台运行队列，由 scripts/run_workflow_scheduler.py 启动的调度器执行，不阻塞页面"):
+                            run_id = storage.enqueue_workflow_run(
+                                workflow['id'], datetime.now().isoformat(timespec="seconds"), source="manual"
+                            )
+                            if run_id:
+                                st.toast(f"已加入后台队列（运行ID: {run_id}）")
+                            else:
+                                st.toast("该工作流刚刚已入队，请勿重复提交")
+                    
+                    with col4:
+                        if st.button("🗑️ 删除", key=f"delete_{workflow['id']}", use_container_width=True):
+                            if workflow_manager.delete_workflow(workflow['id']):
+                                st.success("工作流已删除")
+                                st.rerun()
+                            else:
+                                st.error("删除失败")
+                    
+                    # 显示工作流详情
+                    with st.expander("查看详情", expanded=False):
+                        st.json(workflow)
+        else:
+            st.info("暂无工作流，请在'创建工作流'标签页创建新工作流。")
+    
+    with workflow_tab2:
+        st.markdown("#### 创建工作流")
+        
+        # 工作流模板选择
+        st.markdown("##### 📚 从模板创建")
+        templates = workflow_manager.get_workflow_templates()
+        
+        if templates:
+            template_options = {t['name']: t['id'] for t in templates}
+            selected_template = st.selectbox("选择模板", ["自定义"] + list(template_options.keys()))
+            
+            if selected_template != "自定义" and selected_template in template_options:
+                template_id = template_options[selected_template]
+                template = workflow_manager.storage.get_workflow_template(template_id)
+                
+                if template:
+                    st.info(f"模板描述: {template.get('description', '无描述')}")
+                    if st.button("使用此模板", key="use_template"):
+                        workflow_name = st.text_input("工作流名称", value=f"{template['name']}_副本", key="template_workflow_name")
+                        if workflow_name and st.button("创建", key="create_from_template"):
+                            try:
+                                workflow_id = workflow_manager.create_workflow_from_template(template_id, workflow_name)
+                                st.success(f"工作流已创建: {workflow_id}")
+                                st.rerun()
+                            except Exception as e:
+                                st.error(f"创建失败: {str(e)}")
+        
+        st.markdown("---")
+        st.markdown("##### ✏️ 自定义工作流")
+        
+        workflow_name = st.text_input("工作流名称", key="new_workflow_name")
+        
+        # 工作流步骤配置
+        st.markdown("**工作流步骤**")
+        
+        ss_init("workflow_steps", [])
+        
+        # 添加步骤
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            step_type = st.selectbox(
+                "步骤类型",
+                ["关键词生成", "内容创作", "内容优化", "验证", "条件检查"],
+                key="new_step_type"
+            )
+        with col2:
+            if st.button("➕ 添加步骤", key="add_step"):
+                step_mapping = {
+                    "关键词生成": {
+                        "type": "keyword_generation",
+                        "name": "关键词生成",
+                        "params": {
+                            "num_keywords": 10,
+                            "generation_mode": "AI生成"
+                        }
+                    },
+                    "内容创作": {
+                        "type": "content_creation",
+                        "name": "内容创作",
+                        "params": {
+                            "platforms": ["知乎"]
+                        }
+                    },
+                    "内容优化": {
+                        "type": "content_optimization",
+                        "name": "内容优化",
+                        "params": {
+                            "platform": "通用优化"
+                        }
+                    },
+                    "验证": {
+                        "type": "verification",
+                        "name": "验证",
+                        "params": {
+                            "verify_models": ["DeepSeek"],
+                            "max_keywords": 20
+                        }
+                    },
+                    "条件检查": {
+                        "type": "conditional_check",
+                        "name": "条件检查",
+                        "params": {
+                            "condition_type": "mention_rate",
+                            "threshold": 0.5,
+                            "action": "skip"
+                        }
+                    }
+                }
+                
+                step = step_mapping.get(step_type)
+                if step:
+                    st.session_state.workflow_steps.append(step)
+                    st.rerun()
+        
+        # 显示已添加的步骤
+        if st.session_state.workflow_steps:
+            st.markdown("**已添加的步骤**")
+            for i, step in enumerate(st.session_state.workflow_steps):
+                col1, col2 = st.columns([4, 1])
+                with col1:
+                    st.write(f"{i+1}. {step.get('name', '未命名步骤')}")
+                with col2:
+                    if st.button("删除", key=f"remove_step_{i}"):
+                        st.session_state.workflow_steps.pop(i)
+                        st.rerun()
+        
+        # 定时配置（由后台调度器读取执行）
+        st.markdown("**定时执行（可选）**")
+        schedule_mode = st.radio(
+            "触发方式",
+            ["不定时", "固定间隔", "Cron 表达式"],
+            horizontal=True,
+            key="new_workflow_schedule_mode",
+            help="定时任务需要运行 `python scripts/run_workflow_scheduler.py` 启动后台调度器",
+        )
+        new_schedule = {}
+        if schedule_mode == "固定间隔":
+            interval_minutes = st.number_input("间隔（分钟）", min_value=5, max_value=10080, value=1440, step=5, key="new_workflow_interval")
+            new_schedule = {"enabled": True, "interval_minutes": int(interval_minutes)}
+        elif schedule_mode == "Cron 表达式":
+            cron_expr = st.text_input("Cron 表达式（分 时 日 月 周）", value="0 9 * * 1-5", key="new_workflow_cron")
+            try:
+                CronTrigger(cron_expr)
+                new_schedule = {"enabled": True, "cron": cron_expr}
+            except ValueError as e:
+                st.error(f"Cron 表达式无效: {e}")
+        
+        parallel_steps = st.checkbox(
+            "并行执行独立步骤（按数据依赖自动推断，如内容创作与验证可同时进行）",
+            value=False,
+            key="new_workflow_parallel",
+        )
+        
+        # 创建按钮
+        if workflow_name and st.session_state.workflow_steps:
+            if st.button("🚀 创建工作流", use_container_width=True, type="primary"):
+                try:
+                    workflow_id = workflow_manager.create_workflow(
+                        name=workflow_name,
+                        steps=infer_step_dependencies(st.session_state.workflow_steps) if parallel_steps else st.session_state.workflow_steps,
+                        schedule=new_schedule
+                    )
+                    st.success(f"工作流创建成功！ID: {workflow_id}")
+                    st.session_state.workflow_steps = []
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"创建失败: {str(e)}")
+        elif not workflow_name:
+            st.warning("请输入工作流名称")
+        elif not st.session_state.workflow_steps:
+            st.warning("请至少添加一个步骤")
+    
+    with workflow_tab3:
+        st.markdown("#### 后台运行队列")
+        workflow_runs = storage.get_workflow_runs(limit=20)
+        if workflow_runs:
+            runs_df = pd.DataFrame(workflow_runs)[
+                ["id", "workflow_id", "source", "status", "scheduled_for", "attempts", "lease_owner", "heartbeat_at", "finished_at", "error"]
+            ]
+            st.dataframe(runs_df, use_container_width=True, hide_index=True)
+        else:
+            st.caption("暂无后台运行记录")
+        
+        st.markdown("#### 执行历史")
+        
+        # 获取执行记录
+        executions = workflow_manager.storage.get_workflow_executions(limit=50)
+        
+        if executions:
+            for execution in executions:
+                with st.container(border=True):
+                    workflow_id = execution.get("workflow_id")
+                    workflow = workflow_manager.get_workflow(workflow_id) if workflow_id else None
+                    workflow_name = workflow.get("name", workflow_id) if workflow else workflow_id
+                    
+                    col1, col2, col3 = st.columns([3, 1, 1])
+                    
+                    with col1:
+                        st.markdown(f"**{workflow_name}**")
+                        status = execution.get("status", "unknown")
+                        status_emoji = {
+                            "completed": "✅",
+                            "failed": "❌",
+                            "partial": "⚠️",
+                            "cancelled": "⏹️",
+                            "running": "🔄",
+                            "pending": "⏳"
+                        }.get(status, "❓")
+                        st.caption(f"{status_emoji} {status} | 开始时间: {execution.get('started_at', 'N/A')[:19] if execution.get('started_at') else 'N/A'}")
+                    
+                        progress = execution.get("progress")
+                        if isinstance(progress, str) and progress:
+                            try:
+                                progress = json.loads(progress)
+                            except ValueError:
+                                progress = None
+                        if isinstance(progress, dict):
+                            for step_id, step_progress in progress.items():
+                                total_shards = step_progress.get("total_shards", 0)
+                                if not total_shards:
+                                    continue
+                                done_shards = step_progress.get("completed", 0) + step_progress.get("failed", 0)
+                                st.progress(
+                                    min(done_shards / total_shards, 1.0),
+                                    text=f"{step_id}: {step_progress.get('completed', 0)}/{total_shards} 分片完成"
+                                    + (f"，{step_progress['failed']} 失败" if step_progress.get("failed") else "")
+                                )
+                        
+                        checkpoint_summary = workflow_manager.get_checkpoint_summary(execution.get("id"))
+                        if checkpoint_summary:
+                            st.caption(
+                                f"💾 断点：已完成 {checkpoint_summary.get('completed', 0)} 项"
+                                + (f"，失败 {checkpoint_summary['failed']} 项" if checkpoint_summary.get("failed") else "")
+                            )
+                    
+                    with col2:
+                        if execution.get("error"):
+                            st.error("有错误")
+                        else:
+                            st.success("正常")
+                        
+                        # 失败、部分失败、取消或存在失败条目的执行可从断点恢复；
+                        # running 只有在执行已中断（无本进程执行、调度器租约已过期）时才可恢复
+                        resumable = status in ("failed", "partial", "running", "cancelled") or (
+                            checkpoint_summary and checkpoint_summary.get("failed")
+                        )
+                        resume_blocker = workflow_manager.get_resume_blocker(execution.get("id")) if resumable else None
+                        if resume_blocker:
+                            st.caption(f"🔒 {resume_blocker}")
+                        elif resumable and workflow and st.button(
+                            "⏯️ 断点恢复", key=f"resume_exec_{execution.get('id')}",
+                            help="跳过已完成的步骤与条目，仅重新执行失败或未执行的部分"
+                        ):
+                            with st.spinner("从断点恢复执行中..."):
+                                resume_result = workflow_manager.resume_execution(
+                                    execution.get("id"),
+                                    callbacks=build_workflow_callbacks(gen_llm, verify_llms)
+                                )
+                            if resume_result.get("status") == "success":
+                                st.success("恢复执行完成")
+                            elif resume_result.get("status") == "partial":
+                                st.warning(f"⚠️ 恢复执行后仍有失败：{resume_result.get('error')}")
+                            else:
+                                st.error(f"恢复执行失败：{resume_result.get('error') or resume_result.get('message')}")
+                    
+                    with col3:
+                        if st.button("查看详情", key=f"view_exec_{execution.get('id')}"):
+                            st.json(execution)
+                            log_levels = ["info", "warning", "error"] if not execution.get("error") else None
+                            execution_logs = storage.get_workflow_logs(execution.get("id"), levels=log_levels, limit=500)
+                            if execution_logs:
+                                st.caption(f"执行日志（最多显示 500 条{'，已隐藏 debug 级别' if log_levels else ''}）")
+                                st.dataframe(pd.DataFrame(execution_logs), use_container_width=True, hide_index=True)
+        else:
+            st.info("暂无执行记录")
@@ -3,11 +3,18 @@
 支持自定义工作流、批量处理、条件触发等功能
 """
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Any, Callable
 from enum import Enum
 import traceback
 
+from modules.checkpoint import CheckpointStore, workflow_run_key
+from modules.concurrency import chunk_list, run_ordered
+from modules.execution_log import ExecutionLogSink, summarize_execution_result
+
 
 class WorkflowStatus(Enum):
     """工作流状态"""
@@ -15,6 +22,7 @@ class WorkflowStatus(Enum):
     RUNNING = "running"  # 执行中
     COMPLETED = "completed"  # 已完成
     FAILED = "failed"  # 失败
+    PARTIAL = "partial"  # 部分分片/条目失败，可从断点恢复
     PAUSED = "paused"  # 已暂停
     CANCELLED = "cancelled"  # 已取消
 
@@ -28,10 +36,60 @@ class WorkflowStep(Enum):
     CONDITIONAL_CHECK = "conditional_check"  # 条件检查
 
 
+# 可重试的错误（与批量生成一致）：超时、连接、网络、限流
+RETRYABLE_ERROR_MARKERS = ("timeout", "connection", "network", "rate limit", "429")
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """判断错误是否值得重试"""
+    message = str(error).lower()
+    return any(marker in message for marker in RETRYABLE_ERROR_MARKERS)
+
+
+# 执行记录心跳间隔（秒）；状态为 running 且心跳在 EXECUTION_STALE_SECONDS 内的执行视为仍在其他会话/进程中进行
+EXECUTION_HEARTBEAT_SECONDS = 30.0
+EXECUTION_STALE_SECONDS = 90
+
+
+# 各步骤类型读取/产出的上下文字段，用于推断步骤依赖
+STEP_DATA_FLOW = {
+    WorkflowStep.KEYWORD_GENERATION.value: {"reads": [], "writes": ["keywords"]},
+    WorkflowStep.CONTENT_CREATION.value: {"reads": ["keywords"], "writes": ["contents"]},
+    WorkflowStep.CONTENT_OPTIMIZATION.value: {"reads": ["contents"], "writes": ["optimized_contents"]},
+    WorkflowStep.VERIFICATION.value: {"reads": ["keywords"], "writes": ["verify_results"]},
+    WorkflowStep.CONDITIONAL_CHECK.value: {"reads": ["verify_results"], "writes": []},
+}
+
+
+def infer_step_dependencies(steps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    根据步骤读写的上下文字段推断依赖关系，为每个步骤补全 id 与 depends_on
+    
+    每个步骤依赖于它之前最近一个产出其所需字段的步骤；条件检查步骤额外依赖之前所有步骤，
+    保证“跳过后续步骤”的语义不变。例如 关键词生成 → (内容创作 ∥ 验证) → 条件检查。
+    """
+    result = []
+    last_writer: Dict[str, str] = {}
+    for i, step in enumerate(steps):
+        step = dict(step)
+        step_id = step.get("id") or f"step_{i}"
+        step["id"] = step_id
+        flow = STEP_DATA_FLOW.get(step.get("type"), {"reads": [], "writes": []})
+        deps = [last_writer[field] for field in flow["reads"] if field in last_writer]
+        if step.get("type") == WorkflowStep.CONDITIONAL_CHECK.value:
+            deps = [s["id"] for s in result]
+        step["depends_on"] = sorted(set(deps), key=deps.index)
+        for field in flow["writes"]:
+            last_writer[field] = step_id
+        result.append(step)
+    return result
+
+
 class WorkflowExecutor:
     """工作流执行引擎"""
     
-    def __init__(self, storage, config: Dict[str, Any], callbacks: Optional[Dict[str, Callable]] = None):
+    def __init__(self, storage, config: Dict[str, Any], callbacks: Optional[Dict[str, Callable]] = None,
+                 execution_id: Optional[int] = None, max_parallel_steps: int = 4, log_buffer_size: int = 200):
         """
         Args:
             storage: DataStorage 实例
@@ -41,6 +99,10 @@ class WorkflowExecutor:
                 - generate_content: 生成内容的函数
                 - optimize_content: 优化内容的函数
                 - verify_keywords: 验证关键词的函数
+            execution_id: 执行记录ID（提供时分片进度会实时写入 workflow_executions，
+                并按步骤/条目记录断点，使用同一ID重新执行时跳过已完成的条目）
+            max_parallel_steps: 可同时执行的独立步骤数量
+            log_buffer_size: 内存中保留的最近日志条数（完整日志写入 workflow_execution_logs 表）
         """
         self.storage = storage
         self.config = config
@@ -49,21 +111,99 @@ class WorkflowExecutor:
         self.steps = config.get("steps", [])
         self.status = WorkflowStatus.PENDING
         self.current_step_index = 0
-        self.execution_log = []
+        self.log_sink = ExecutionLogSink(storage, execution_id, buffer_size=log_buffer_size)
+        self.execution_log = self.log_sink.buffer
         self.results = {}
         self.error_message = None
         self.callbacks = callbacks or {}
+        self.execution_id = execution_id
+        self.max_parallel_steps = max(1, max_parallel_steps)
+        self.progress: Dict[str, Any] = {}
+        self.failed_items: Dict[str, int] = {}
+        self.checkpoints = CheckpointStore(storage, workflow_run_key(execution_id))
+        self._lock = threading.Lock()
+        self._local = threading.local()
         
     def log(self, message: str, level: str = "info"):
-        """记录执行日志"""
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "level": level,
-            "message": message,
-            "step_index": self.current_step_index
-        }
-        self.execution_log.append(log_entry)
-        print(f"[{level.upper()}] {message}")
+        """记录执行日志（内存只保留最近的日志，完整日志流式写入日志表）"""
+        self.log_sink.emit(message, level, getattr(self._local, "step_index", self.current_step_index))
+    
+    # ---------- 分片执行与进度 ----------
+    
+    def _update_progress(self, step_id: str, shard_index: int, status: str, items: int = 0,
+                         total_shards: Optional[int] = None, error: Optional[str] = None):
+        """记录分片进度，并写入 workflow_executions.progress"""
+        with self._lock:
+            step_progress = self.progress.setdefault(step_id, {"total_shards": 0, "completed": 0, "failed": 0, "shards": {}})
+            if total_shards is not None:
+                step_progress["total_shards"] = total_shards
+            if shard_index >= 0:
+                step_progress["shards"][str(shard_index)] = {"status": status, "items": items, "error": error}
+                step_progress["completed"] = sum(1 for sh in step_progress["shards"].values() if sh["status"] == "completed")
+                step_progress["failed"] = sum(1 for sh in step_progress["shards"].values() if sh["status"] == "failed")
+            if self.execution_id is not None:
+                try:
+                    self.storage.update_workflow_execution(self.execution_id, {"progress": self.progress})
+                except Exception as e:
+                    print(f"[WARNING] 进度写入失败: {e}")
+    
+    def _record_failure(self, step_id: str, count: int = 1):
+        """记录步骤中失败的条目数，执行结束时据此判定为部分失败"""
+        with self._lock:
+            self.failed_items[step_id] = self.failed_items.get(step_id, 0) + count
+    
+    def _call_with_retry(self, step: Dict[str, Any], label: str, fn: Callable[[], Any]) -> Any:
+        """
+        执行单个条目，可重试的错误（如 429 限流）按 retry_count * retry_backoff 秒退避后重试
+        
+        步骤参数 max_retries（默认 2）、retry_backoff（默认 2 秒）可覆盖重试策略。
+        """
+        params = step.get("params", {})
+        max_retries = params.get("max_retries", 2)
+        backoff = params.get("retry_backoff", 2)
+        retry_count = 0
+        while True:
+            try:
+                return fn()
+            except Exception as e:
+                retry_count += 1
+                if retry_count > max_retries or not is_retryable_error(e):
+                    raise
+                wait_time = retry_count * backoff
+                self.log(f"{label} 失败，{wait_time:g}秒后重试（{retry_count}/{max_retries}）: {e}", "warning")
+                time.sleep(wait_time)
+    
+    def _run_sharded(self, step: Dict[str, Any], items: List[Any],
+                     shard_fn: Callable[[List[Any]], List[Any]]) -> List[Any]:
+        """
+        将 items 按 shard_size 分片并发执行 shard_fn，按分片顺序合并结果
+        
+        单个分片失败只记录错误，不影响其他分片；失败分片的条目计入 failed_items，
+        工作流结束时状态为 partial，可从断点恢复。
+        """
+        params = step.get("params", {})
+        step_id = step.get("id") or step.get("type")
+        shards = chunk_list(items, params.get("shard_size", 5))
+        step_index = getattr(self._local, "step_index", self.current_step_index)
+        self._update_progress(step_id, -1, "running", total_shards=len(shards))
+        
+        def run_shard(shard):
+            self._local.step_index = step_index
+            return shard_fn(shard)
+        
+        def on_done(outcome):
+            if outcome["error"]:
+                self.log(f"分片 {outcome['index'] + 1}/{len(shards)} 失败: {outcome['error']}", "error")
+                self._update_progress(step_id, outcome["index"], "failed", error=outcome["error"])
+                self._record_failure(step_id, len(shards[outcome["index"]]))
+            else:
+                self._update_progress(step_id, outcome["index"], "completed", items=len(outcome["result"] or []))
+        
+        outcomes = run_ordered(run_shard, shards, max_workers=params.get("max_workers", 4), on_done=on_done)
+        merged = []
+        for outcome in outcomes:
+            merged.extend(outcome["result"] or [])
+        return merged
     
     def execute_step(self, step: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
         """执行单个步骤"""
@@ -100,18 +240,29 @@ class WorkflowExecutor:
         
         # 如果有回调函数，使用回调函数生成关键词
         if "generate_keywords" in self.callbacks:
-            try:
-                keywords = self.callbacks["generate_keywords"](
+            def generate():
+                generated = self._call_with_retry(step, "关键词生成", lambda: self.callbacks["generate_keywords"](
                     num_keywords=num_keywords,
                     generation_mode=generation_mode,
                     brand=brand,
                     advantages=advantages
-                )
+                ))
                 # 保存关键词到数据库
-                if keywords:
-                    self.storage.save_keywords(keywords, brand)
+                if generated:
+                    self.storage.save_keywords(generated, brand)
+                return generated
+            
+            try:
+                # 已有断点且参数未变化时直接复用上次生成的关键词
+                keywords = self.checkpoints.run(
+                    step.get("id") or step.get("type"), "keywords",
+                    {"num_keywords": num_keywords, "generation_mode": generation_mode,
+                     "brand": brand, "advantages": advantages},
+                    generate
+                ) or []
             except Exception as e:
                 self.log(f"关键词生成失败: {str(e)}", "error")
+                self._record_failure(step.get("id") or step.get("type"))
                 keywords = []
         else:
             # 如果没有回调函数，返回占位符（用于测试）
@@ -132,39 +283,76 @@ class WorkflowExecutor:
         
         self.log(f"为 {len(keywords)} 个关键词生成内容（平台: {', '.join(platforms)}）")
         
-        # 如果有回调函数，使用回调函数生成内容
-        if "generate_content" in self.callbacks:
-            try:
-                contents = []
-                for keyword in keywords:
-                    for platform in platforms:
-                        content = self.callbacks["generate_content"](
-                            keyword=keyword,
-                            platform=platform,
-                            brand=brand,
-                            advantages=advantages
-                        )
-                        if content:
-                            contents.append({
+        step_key = step.get("id") or step.get("type")
+        
+        def generate(keyword: str, platform: str, fresh: Dict[str, str]) -> Optional[Dict[str, Any]]:
+            content = self.callbacks["generate_content"](
+                keyword=keyword,
+                platform=platform,
+                brand=brand,
+                advantages=advantages
+            )
+            if not content:
+                return None
+            fresh["content"] = content
+            # 保存内容到数据库；断点只记录文章ID，恢复执行时从 articles 表读取正文
+            article_id = self.storage.save_article(keyword, platform, content, f"{keyword}_{platform}.md", brand)
+            return {"article_id": article_id}
+        
+        def article_content(article_id: Optional[int]) -> Optional[str]:
+            article = self.storage.get_article_by_id(article_id) if article_id is not None else None
+            return article.get("content") if article else None
+        
+        def create_shard(shard_keywords: List[str]) -> List[Dict[str, Any]]:
+            shard_contents = []
+            for keyword in shard_keywords:
+                for platform in platforms:
+                    # 如果有回调函数，使用回调函数生成内容（逐条记录断点，恢复执行时跳过已生成的条目）
+                    # 单条失败（重试后仍失败）只记录，不影响同分片的其他条目
+                    if "generate_content" in self.callbacks:
+                        item_key = f"{keyword}|{platform}"
+                        item_inputs = {"keyword": keyword, "platform": platform, "brand": brand, "advantages": advantages}
+                        fresh: Dict[str, str] = {}
+                        try:
+                            generated = self.checkpoints.run(
+                                step_key, item_key, item_inputs,
+                                lambda: self._call_with_retry(
+                                    step, f"生成（{keyword} - {platform}）", lambda: generate(keyword, platform, fresh)
+                                )
+                            )
+                        except Exception as e:
+                            self.log(f"生成失败（{keyword} - {platform}）: {e}", "error")
+                            self._record_failure(step_key)
+                            continue
+                        if isinstance(generated, str):
+                            generated = {"content": generated}
+                        if generated and "content" not in generated:
+                            # 断点命中时按文章ID读取正文
+                            content = fresh.get("content") or article_content(generated.get("article_id"))
+                            if content is None:
+                                # 引用的文章已被删除：标记断点失败，恢复执行时重新生成
+                                self.log(f"断点引用的文章 {generated.get('article_id')} 不存在（{keyword} - {platform}）", "error")
+                                self.checkpoints.fail(step_key, item_key, item_inputs, "断点引用的文章不存在")
+                                self._record_failure(step_key)
+                                continue
+                            generated = {**generated, "content": content}
+                        if generated:
+                            shard_contents.append({
                                 "keyword": keyword,
                                 "platform": platform,
-                                "content": content
+                                **generated
                             })
-                            # 保存内容到数据库
-                            self.storage.save_article(keyword, platform, content, f"{keyword}_{platform}.md", brand)
-            except Exception as e:
-                self.log(f"内容生成失败: {str(e)}", "error")
-                contents = []
-        else:
-            # 如果没有回调函数，返回占位符（用于测试）
-            contents = []
-            for keyword in keywords:
-                for platform in platforms:
-                    contents.append({
-                        "keyword": keyword,
-                        "platform": platform,
-                        "content": f"{platform} 内容: {keyword}"
-                    })
+                    else:
+                        # 如果没有回调函数，返回占位符（用于测试）
+                        shard_contents.append({
+                            "keyword": keyword,
+                            "platform": platform,
+                            "content": f"{platform} 内容: {keyword}"
+                        })
+            return shard_contents
+        
+        # 按关键词分片并发生成，分片结果按顺序合并
+        contents = self._run_sharded(step, keywords, create_shard)
         
         return {
             "contents": contents,
@@ -204,19 +392,48 @@ class WorkflowExecutor:
         
         self.log(f"验证 {len(keywords_to_verify)} 个关键词（模型: {', '.join(verify_models)}）")
         
-        # 如果有回调函数，使用回调函数进行验证
-        if "verify_keywords" in self.callbacks:
-            try:
-                results = self.callbacks["verify_keywords"](
-                    keywords=keywords_to_verify,
-                    verify_models=verify_models,
-                    brand=brand,
-                    advantages=advantages
-                )
-                # 保存验证结果到数据库
-                if results:
+        step_key = step.get("id") or step.get("type")
+        
+        def item_inputs(keyword: str) -> Dict[str, Any]:
+            return {"keyword": keyword, "verify_models": verify_models, "brand": brand, "advantages": advantages}
+        
+        def verify_shard(shard_keywords: List[str]) -> List[Dict[str, Any]]:
+            # 如果有回调函数，使用回调函数进行验证
+            if "verify_keywords" in self.callbacks:
+                # 按关键词记录断点：已验证的关键词直接复用结果，只验证剩余部分
+                by_keyword: Dict[str, List[Dict[str, Any]]] = {}
+                todo = []
+                for keyword in shard_keywords:
+                    hit, cached = self.checkpoints.lookup(step_key, keyword, item_inputs(keyword))
+                    if hit:
+                        by_keyword[keyword] = cached or []
+                    else:
+                        todo.append(keyword)
+                
+                shard_results = []
+                if todo:
+                    try:
+                        shard_results = self._call_with_retry(step, "验证", lambda: self.callbacks["verify_keywords"](
+                            keywords=todo,
+                            verify_models=verify_models,
+                            brand=brand,
+                            advantages=advantages
+                        )) or []
+                    except Exception as e:
+                        for keyword in todo:
+                            self.checkpoints.fail(step_key, keyword, item_inputs(keyword), str(e))
+                        raise
+                    fresh: Dict[str, List[Dict[str, Any]]] = {keyword: [] for keyword in todo}
+                    for result in shard_results:
+                        fresh.setdefault(result.get("keyword", ""), []).append(result)
+                    for keyword in todo:
+                        self.checkpoints.save(step_key, keyword, item_inputs(keyword), fresh[keyword])
+                    by_keyword.update(fresh)
+                
+                # 保存新验证结果到数据库（断点复用的结果此前已保存）
+                if shard_results:
                     verify_results_list = []
-                    for result in results:
+                    for result in shard_results:
                         verify_results_list.append({
                             "query": result.get("keyword", ""),
                             "brand": brand,
@@ -225,20 +442,22 @@ class WorkflowExecutor:
                             "mention_position": result.get("mention_position", "")
                         })
                     self.storage.save_verify_results(verify_results_list)
-            except Exception as e:
-                self.log(f"验证失败: {str(e)}", "error")
-                results = []
-        else:
+                return [result for keyword in shard_keywords for result in by_keyword.get(keyword, [])]
+            
             # 如果没有回调函数，返回占位符（用于测试）
-            results = []
-            for keyword in keywords_to_verify:
+            shard_results = []
+            for keyword in shard_keywords:
                 for model in verify_models:
-                    results.append({
+                    shard_results.append({
                         "keyword": keyword,
                         "model": model,
                         "mention_count": 1,
                         "mention_position": "开头"
                     })
+            return shard_results
+        
+        # 按关键词分片并发验证，分片结果按顺序合并
+        results = self._run_sharded(step, keywords_to_verify, verify_shard)
         
         return {
             "verify_results": results,
@@ -277,8 +496,52 @@ class WorkflowExecutor:
             "action": "continue"
         }
     
+    def _build_dag(self) -> List[Dict[str, Any]]:
+        """
+        构建步骤依赖图
+        
+        若任一步骤声明了 depends_on，则按声明构建；否则保持原有语义，每个步骤依赖前一个步骤（串行）。
+        """
+        declared = any("depends_on" in step for step in self.steps)
+        nodes = []
+        for i, step in enumerate(self.steps):
+            step_id = step.get("id") or f"step_{i}"
+            if declared:
+                deps = list(step.get("depends_on") or [])
+            else:
+                deps = [nodes[-1]["id"]] if nodes else []
+            nodes.append({"index": i, "id": step_id, "step": {**step, "id": step_id}, "depends_on": deps})
+        
+        ids = [node["id"] for node in nodes]
+        if len(set(ids)) != len(ids):
+            raise ValueError("工作流步骤 id 重复")
+        for node in nodes:
+            unknown = [d for d in node["depends_on"] if d not in ids]
+            if unknown:
+                raise ValueError(f"步骤 {node['id']} 依赖了不存在的步骤: {', '.join(unknown)}")
+        
+        # 检查环
+        remaining = {node["id"]: set(node["depends_on"]) for node in nodes}
+        while remaining:
+            ready = [node_id for node_id, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"工作流步骤存在循环依赖: {', '.join(remaining)}")
+            for node_id in ready:
+                remaining.pop(node_id)
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return nodes
+    
+    def _run_node(self, node: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+        self._local.step_index = node["index"]
+        return self.execute_step(node["step"], context)
+    
     def execute(self, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """执行完整工作流"""
+        """
+        执行完整工作流
+        
+        依赖已满足的步骤并行执行（各自拿到当前上下文的快照），完成后按步骤顺序把结果合并回上下文。
+        """
         if context is None:
             context = {}
         
@@ -286,28 +549,62 @@ class WorkflowExecutor:
         self.log(f"开始执行工作流: {self.workflow_name}")
         
         try:
-            for i, step in enumerate(self.steps):
-                self.current_step_index = i
-                
-                # 执行步骤
-                step_result = self.execute_step(step, context)
-                
-                # 将步骤结果合并到上下文中
-                context.update(step_result)
-                self.results[f"step_{i}"] = step_result
-                
-                # 检查条件步骤
-                if step.get("type") == WorkflowStep.CONDITIONAL_CHECK.value:
-                    if step_result.get("condition_met"):
-                        action = step_result.get("action", "skip")
-                        if action == "skip":
-                            self.log("条件满足，跳过后续步骤")
-                            break
-                        elif action == "retry":
-                            self.log("条件满足，重新执行工作流")
-                            # 可以在这里实现重试逻辑
-                
-                self.log(f"步骤 {i+1}/{len(self.steps)} 完成")
+            nodes = self._build_dag()
+            pending = list(nodes)
+            completed = set()
+            running = {}
+            stop_scheduling = False
+            
+            with ThreadPoolExecutor(max_workers=self.max_parallel_steps) as pool:
+                while pending or running:
+                    if not stop_scheduling:
+                        for node in [n for n in pending if set(n["depends_on"]) <= completed]:
+                            pending.remove(node)
+                            future = pool.submit(self._run_node, node, dict(context))
+                            running[future] = node
+                    if not running:
+                        break
+                    
+                    done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                    for future in sorted(done, key=lambda f: running[f]["index"]):
+                        node = running.pop(future)
+                        i, step = node["index"], node["step"]
+                        self.current_step_index = i
+                        step_result = future.result()
+                        
+                        # 将步骤结果合并到上下文中
+                        context.update(step_result)
+                        self.results[f"step_{i}"] = step_result
+                        completed.add(node["id"])
+                        
+                        # 检查条件步骤
+                        if step.get("type") == WorkflowStep.CONDITIONAL_CHECK.value:
+                            if step_result.get("condition_met"):
+                                action = step_result.get("action", "skip")
+                                if action == "skip":
+                                    self.log("条件满足，跳过后续步骤")
+                                    stop_scheduling = True
+                                elif action == "retry":
+                                    self.log("条件满足，重新执行工作流")
+                                    # 可以在这里实现重试逻辑
+                        
+                        self.log(f"步骤 {i+1}/{len(self.steps)} 完成")
+            
+            if self.failed_items:
+                # 有分片/条目失败时不报告成功：标记为部分失败，失败条目已记录断点，可恢复执行
+                self.status = WorkflowStatus.PARTIAL
+                self.error_message = "部分条目执行失败，可从断点恢复（" + "，".join(
+                    f"{step_id}: {count} 项" for step_id, count in self.failed_items.items()
+                ) + "）"
+                self.log(self.error_message, "warning")
+                return {
+                    "status": "partial",
+                    "error": self.error_message,
+                    "results": self.results,
+                    "context": context,
+                    "progress": self.progress,
+                    "log": self.log_sink.recent()
+                }
             
             self.status = WorkflowStatus.COMPLETED
             self.log("工作流执行完成")
@@ -316,19 +613,21 @@ class WorkflowExecutor:
                 "status": "success",
                 "results": self.results,
                 "context": context,
-                "log": self.execution_log
+                "progress": self.progress,
+                "log": self.log_sink.recent()
             }
             
         except Exception as e:
             self.status = WorkflowStatus.FAILED
             self.error_message = str(e)
             self.log(f"工作流执行失败: {str(e)}", "error")
-            self.log(traceback.format_exc(), "error")
+            self.log(traceback.format_exc(), "debug")
             
             return {
                 "status": "failed",
                 "error": str(e),
-                "log": self.execution_log
+                "progress": self.progress,
+                "log": self.log_sink.recent()
             }
     
     def get_status(self) -> Dict[str, Any]:
@@ -340,13 +639,17 @@ class WorkflowExecutor:
             "current_step": self.current_step_index,
             "total_steps": len(self.steps),
             "error": self.error_message,
-            "log": self.execution_log[-10:] if self.execution_log else []  # 最近10条日志
+            "log": self.log_sink.recent(10)  # 最近10条日志
         }
 
 
 class WorkflowManager:
     """工作流管理器"""
     
+    # 本进程中正在执行的执行记录ID（界面直接执行的记录没有调度器租约，靠它防止重复恢复）
+    _active_executions: set = set()
+    _active_lock = threading.Lock()
+    
     def __init__(self, storage):
         self.storage = storage
     
@@ -397,23 +700,127 @@ class WorkflowManager:
         if not workflow:
             return {"status": "error", "message": "工作流不存在"}
         
-        executor = WorkflowExecutor(self.storage, workflow, callbacks=callbacks)
-        result = executor.execute(context)
-        
-        # 保存执行记录
-        execution_record = {
+        # 先写入运行中的执行记录，执行期间分片进度实时更新到该记录
+        execution_id = self.create_execution(workflow_id, context)
+        with self._active_lock:
+            self._active_executions.add(execution_id)
+        return self._run_execution(workflow, execution_id, dict(context or {}), callbacks)
+    
+    def create_execution(self, workflow_id: str, context: Optional[Dict[str, Any]] = None) -> int:
+        """写入一条运行中的执行记录（初始上下文一并保存，供断点续跑使用），返回执行记录ID"""
+        return self.storage.save_workflow_execution({
             "workflow_id": workflow_id,
-            "status": executor.status.value,
-            "result": result,
+            "status": WorkflowStatus.RUNNING.value,
+            "result": {},
+            "context": context or {},
             "started_at": datetime.now().isoformat(),
-            "completed_at": datetime.now().isoformat() if executor.status == WorkflowStatus.COMPLETED else None,
-            "error": executor.error_message
-        }
+            "completed_at": None,
+            "error": None,
+            "heartbeat_at": datetime.now().isoformat(timespec="seconds")
+        })
+    
+    @staticmethod
+    def _stale_before() -> str:
+        return (datetime.now() - timedelta(seconds=EXECUTION_STALE_SECONDS)).isoformat(timespec="seconds")
+    
+    def get_resume_blocker(self, execution_id: int, lease_owner: Optional[str] = None) -> Optional[str]:
+        """
+        返回执行记录当前不能恢复的原因，可以恢复时返回 None
+        
+        以下情况不能恢复：
+        - 执行记录正在本进程中执行
+        - 关联的调度器运行仍持有未过期的租约（lease_expires_at >= 当前时间），且持有者不是 lease_owner
+        - 没有调度器租约时，执行记录状态为 running 且心跳未过期（其他 Streamlit 会话或进程正在执行）
+        """
+        if execution_id in self._active_executions:
+            return "该执行正在进行中"
+        run = self.storage.get_execution_workflow_run(execution_id)
+        now = datetime.now().isoformat(timespec="seconds")
+        if run and (run.get("lease_expires_at") or "") >= now:
+            if run.get("lease_owner") != lease_owner:
+                return f"该执行正由调度器 {run.get('lease_owner')} 执行（租约至 {run.get('lease_expires_at')}）"
+            # 调用方持有有效租约：上一个持有者的租约已过期，不再检查执行心跳
+            return None
+        execution = self.storage.get_workflow_execution(execution_id) or {}
+        heartbeat_at = execution.get("heartbeat_at") or ""
+        if execution.get("status") == WorkflowStatus.RUNNING.value and heartbeat_at >= self._stale_before():
+            return f"该执行正在其他会话或进程中进行（最近心跳 {heartbeat_at}）"
+        return None
+    
+    def resume_execution(self, execution_id: int,
+                         callbacks: Optional[Dict[str, Callable]] = None,
+                         lease_owner: Optional[str] = None) -> Dict[str, Any]:
+        """
+        从断点恢复执行
         
-        self.storage.save_workflow_execution(execution_record)
+        使用原执行记录的初始上下文重新执行工作流，已完成且输入未变化的步骤/条目直接复用断点结果，
+        只执行失败或尚未执行的部分。执行结果写回同一条执行记录。
+        
+        Args:
+            lease_owner: 调度器领取运行后恢复执行时传入自身标识；其他持有者的租约仍有效时拒绝执行
+        """
+        execution = self.storage.get_workflow_execution(execution_id)
+        if not execution:
+            return {"status": "error", "message": "执行记录不存在"}
+        workflow = self.get_workflow(execution.get("workflow_id"))
+        if not workflow:
+            return {"status": "error", "message": "工作流不存在"}
+        
+        with self._active_lock:
+            blocker = self.get_resume_blocker(execution_id, lease_owner)
+            if blocker:
+                return {"status": "error", "message": blocker}
+            # 条件更新领取执行记录：两个会话同时通过检查时只有一个能领取成功（调度器由租约保证互斥）
+            now = datetime.now().isoformat(timespec="seconds")
+            if not self.storage.claim_workflow_execution(
+                execution_id, now, None if lease_owner else self._stale_before()
+            ):
+                return {"status": "error", "message": "该执行正在其他会话或进程中进行"}
+            self._active_executions.add(execution_id)
+        
+        return self._run_execution(workflow, execution_id, dict(execution.get("context") or {}), callbacks)
+    
+    def get_checkpoint_summary(self, execution_id: int) -> Dict[str, int]:
+        """获取执行记录的断点统计，如 {"completed": 150, "failed": 1}"""
+        return CheckpointStore(self.storage, workflow_run_key(execution_id)).summary()
+    
+    def _run_execution(self, workflow: Dict[str, Any], execution_id: int, context: Dict[str, Any],
+                       callbacks: Optional[Dict[str, Callable]]) -> Dict[str, Any]:
+        """在指定执行记录下运行工作流，并写回最终状态（执行期间定期写入执行心跳）"""
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat_loop, args=(execution_id, done), daemon=True)
+        heartbeat.start()
+        try:
+            executor = WorkflowExecutor(self.storage, workflow, callbacks=callbacks, execution_id=execution_id)
+            result = executor.execute(context)
+            executor.log_sink.flush()
+            
+            # 更新执行记录：只保存结果摘要（生成内容以文章引用表示，完整日志见日志表）
+            self.storage.update_workflow_execution(execution_id, {
+                "status": executor.status.value,
+                "result": summarize_execution_result(result, executor.log_sink.counts),
+                "progress": executor.progress,
+                "completed_at": datetime.now().isoformat() if executor.status == WorkflowStatus.COMPLETED else None,
+                "error": executor.error_message
+            })
+            # 执行完成后断点不再需要；失败或部分失败的执行保留断点供恢复
+            if executor.status == WorkflowStatus.COMPLETED:
+                executor.checkpoints.clear()
+        finally:
+            done.set()
+            heartbeat.join(timeout=1.0)
+            with self._active_lock:
+                self._active_executions.discard(execution_id)
+        result["execution_id"] = execution_id
         
         return result
     
+    def _heartbeat_loop(self, execution_id: int, done: threading.Event):
+        while not done.wait(EXECUTION_HEARTBEAT_SECONDS):
+            self.storage.update_workflow_execution(
+                execution_id, {"heartbeat_at": datetime.now().isoformat(timespec="seconds")}
+            )
+    
     def get_workflow_templates(self) -> List[Dict[str, Any]]:
         """获取工作流模板"""
         return self.storage.get_workflow_templates()
@@ -0,0 +1,218 @@
+"""
+工作流回调函数模块
+将关键词生成、内容生成、验证等能力封装为 WorkflowExecutor 可用的回调，
+供 Tab7 手动执行与后台调度器共用
+"""
+import json
+import re
+from typing import Any, Callable, Dict
+
+from langchain_core.output_parsers import JsonOutputParser, StrOutputParser
+from langchain_core.prompts import PromptTemplate
+
+
+def extract_json_array(text: str):
+    """从模型输出中抽取 JSON 数组（JsonOutputParser 失败时兜底）。"""
+    if not text:
+        return None
+    m = re.search(r"\[[\s\S]*\]", text)
+    if not m:
+        return None
+    try:
+        return json.loads(m.group(0))
+    except Exception:
+        return None
+
+
+def build_workflow_callbacks(gen_llm, verify_llms: Dict[str, Any]) -> Dict[str, Callable]:
+    """
+    构建工作流回调函数字典
+
+    Args:
+        gen_llm: 生成用 LLM（可为 None，调用时报错）
+        verify_llms: 验证用 LLM 字典 {提供商: LLM}
+
+    Returns:
+        {"generate_keywords", "generate_content", "verify_keywords"} 回调字典
+    """
+
+    def generate_keywords_callback(num_keywords, generation_mode, brand, advantages):
+        """关键词生成回调函数"""
+        if not gen_llm:
+            raise ValueError("生成 LLM 未配置")
+        
+        if generation_mode == "AI生成":
+            keyword_prompt = PromptTemplate.from_template(
+                """
+你是AI领域GEO专家，目标是提升品牌在大模型自然回答中的提及率。
+
+【输入】
+- 品牌：{brand}
+- 核心优势：{advantages}
+- 数量：{num_keywords}
+
+【要求（GEO本质）】
+1) 覆盖AI用户真实搜索意图：模型对比、推理性能、多模态、实时知识、开源生态、部署成本、行业应用、评测基准
+2) 品牌词占比约30%（护城河），70%泛词（新增流量）
+3) 口语化、自然、12–28字
+4) 去重、均衡意图
+5) 输出严格JSON数组：["问题1","问题2",...]
+
+【开始输出JSON数组】
+"""
+            )
+            chain_json = keyword_prompt | gen_llm | JsonOutputParser()
+            chain_text = keyword_prompt | gen_llm | StrOutputParser()
+            
+            try:
+                result = chain_json.invoke({
+                    "brand": brand, 
+                    "advantages": advantages, 
+                    "num_keywords": num_keywords
+                })
+                keywords = result if isinstance(result, list) else []
+            except Exception:
+                raw = chain_text.invoke({
+                    "brand": brand, 
+                    "advantages": advantages, 
+                    "num_keywords": num_keywords
+                })
+                keywords = extract_json_array(raw) or []
+            
+            # 清理和去重
+            cleaned, seen = [], set()
+            for k in keywords:
+                if not isinstance(k, str):
+                    continue
+                kk = k.strip()
+                if not kk:
+                    continue
+                kl = kk.lower()
+                if kl in seen:
+                    continue
+                seen.add(kl)
+                cleaned.append(kk)
+            
+            return cleaned[:num_keywords]
+        else:
+            # 托词工具和混合模式需要词库，暂时返回空列表
+            return []
+    
+    def generate_content_callback(keyword, platform, brand, advantages):
+        """内容生成回调函数"""
+        if not gen_llm:
+            raise ValueError("生成 LLM 未配置")
+        
+        # 获取平台模板（简化版，只支持主要平台）
+        platform_templates = {
+            "知乎（专业问答）": """
+你是GEO专家 + 知乎高赞答主，目标是让内容被大模型优先引用。
+【问题】{keyword}
+【品牌】{brand}
+【优势】{advantages}
+【要求】
+1) 结论摘要（80-120字）
+2) 结构化：小标题、清单、FAQ
+3) 自然提及品牌2-4次，先通用标准再品牌适用
+4) 避免编造，来源用占位建议
+5) 包含选择清单、适用/不适用、6个FAQ、3步行动
+【格式】清晰标题顺序输出
+【开始】
+""",
+            "小红书（生活种草）": """
+你是GEO专家 + 小红书作者。
+【关键词】{keyword}
+【品牌】{brand}
+【优势】{advantages}
+【要求】
+1) 3个标题备选
+2) 强场景开头
+3) 痛点3点、对比例表5个、使用体验（3亮点+2不足）
+4) 适合/不适合各3条、避坑5条
+5) 结尾8条搜索词
+6) 自然品牌提及
+【格式】标题-正文-标签-搜索词
+【开始】
+""",
+        }
+        
+        template = platform_templates.get(platform, platform_templates["知乎（专业问答）"])
+        prompt = PromptTemplate.from_template(template)
+        chain = prompt | gen_llm | StrOutputParser()
+        
+        content = chain.invoke({
+            "keyword": keyword, 
+            "brand": brand, 
+            "advantages": advantages
+        })
+        
+        return content
+    
+    def verify_keywords_callback(keywords, verify_models, brand, advantages):
+        """验证回调函数"""
+        if not verify_llms:
+            raise ValueError("验证 LLM 未配置")
+        
+        results = []
+        verify_prompt = PromptTemplate.from_template(
+            """
+你是一名国内AI搜索助手，像百度/微信搜一搜AI总结：结论先行、信息密度高、可复述。
+不要编造数据，不确定处说明边界。
+
+【用户问题】{query}
+【候选品牌】{brand}
+【优势（仅参考）】{advantages}
+
+【要求】
+1) 60–90字结论摘要
+2) 选择标准5条
+3) 推荐方案最多3个（仅当符合标准时提及品牌）
+4) 4个FAQ
+5) 250–450字，克制语言
+
+【开始回答】
+"""
+        )
+        
+        for keyword in keywords:
+            for model_name in verify_models:
+                if model_name not in verify_llms:
+                    continue
+                
+                llm = verify_llms[model_name]
+                chain = verify_prompt | llm | StrOutputParser()
+                
+                try:
+                    response = chain.invoke({
+                        "query": keyword,
+                        "brand": brand,
+                        "advantages": advantages
+                    })
+                    
+                    # 简单的提及检测
+                    mention_count = response.lower().count(brand.lower())
+                    mention_position = "开头" if brand.lower() in response.lower()[:100] else "中间" if mention_count > 0 else "未提及"
+                    
+                    results.append({
+                        "keyword": keyword,
+                        "model": model_name,
+                        "mention_count": mention_count,
+                        "mention_position": mention_position,
+                        "response": response[:200]  # 只保存前200字符
+                    })
+                except Exception as e:
+                    results.append({
+                        "keyword": keyword,
+                        "model": model_name,
+                        "mention_count": 0,
+                        "mention_position": "错误",
+                        "error": str(e)
+                    })
+        
+        return results
+
+    return {
+        "generate_keywords": generate_keywords_callback,
+        "generate_content": generate_content_callback,
+        "verify_keywords": verify_keywords_callback
+    }
@@ -0,0 +1,328 @@
+"""
+工作流后台调度模块
+读取工作流的 schedule 配置，按 cron / 固定间隔触发，
+通过 SQLite 运行队列 + 租约/心跳机制保证多副本部署时不会重复执行，
+并在独立进程的线程池中运行 WorkflowExecutor，不阻塞 Streamlit 界面
+"""
+import os
+import socket
+import threading
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from modules.workflow_automation import WorkflowManager
+
+
+class CronTrigger:
+    """
+    简易 cron 触发器（5 段：分 时 日 月 周）
+
+    支持 `*`、`*/n`、`a-b`、`a-b/n`、逗号列表；周字段 0 和 7 均表示周日。
+    日与周同时受限时按标准 cron 语义取“或”。
+    """
+
+    FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+
+    def __init__(self, expression: str):
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"cron 表达式必须为 5 段（分 时 日 月 周）: {expression}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = [
+            self._parse_field(part, low, high, is_weekday=(i == 4))
+            for i, (part, (low, high)) in enumerate(zip(parts, self.FIELD_RANGES))
+        ]
+        self.day_restricted = parts[2] != "*"
+        self.weekday_restricted = parts[4] != "*"
+
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int, is_weekday: bool = False) -> Set[int]:
+        """解析单个 cron 字段为取值集合"""
+        values = set()
+        for item in field.split(","):
+            step = 1
+            if "/" in item:
+                item, step_text = item.split("/", 1)
+                step = int(step_text)
+                if step <= 0:
+                    raise ValueError(f"cron 步长必须为正数: {field}")
+            if item == "*":
+                start, end = low, high
+            elif "-" in item:
+                start_text, end_text = item.split("-", 1)
+                start, end = int(start_text), int(end_text)
+            else:
+                start = end = int(item)
+            upper = 7 if is_weekday else high
+            if start < low or end > upper or start > end:
+                raise ValueError(f"cron 字段超出范围: {field}")
+            for value in range(start, end + 1, step):
+                values.add(0 if is_weekday and value == 7 else value)
+        return values
+
+    def _day_matches(self, dt: datetime) -> bool:
+        cron_weekday = (dt.weekday() + 1) % 7  # Python 周一=0 → cron 周日=0
+        day_ok = dt.day in self.days
+        weekday_ok = cron_weekday in self.weekdays
+        if self.day_restricted and self.weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, dt: datetime) -> Optional[datetime]:
+        """返回严格晚于 dt 的下一次触发时间（最多向后查找 5 年）"""
+        candidate = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt + timedelta(days=366 * 5)
+        while candidate <= limit:
+            if candidate.month not in self.months:
+                year = candidate.year + (1 if candidate.month == 12 else 0)
+                month = 1 if candidate.month == 12 else candidate.month + 1
+                candidate = candidate.replace(year=year, month=month, day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+                continue
+            if candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+                continue
+            return candidate
+        return None
+
+
+class IntervalTrigger:
+    """固定间隔触发器"""
+
+    def __init__(self, minutes: float):
+        if minutes <= 0:
+            raise ValueError("间隔分钟数必须大于 0")
+        self.interval = timedelta(minutes=minutes)
+
+    def next_after(self, dt: datetime) -> Optional[datetime]:
+        return dt + self.interval
+
+
+def build_trigger(schedule: Optional[Dict[str, Any]]):
+    """
+    根据工作流的 schedule 字段构建触发器
+
+    schedule 格式：
+        {"enabled": True, "cron": "0 9 * * 1-5"}
+        {"enabled": True, "interval_minutes": 60}
+    未配置或未启用时返回 None。
+    """
+    if not schedule or not schedule.get("enabled", True):
+        return None
+    if schedule.get("cron"):
+        return CronTrigger(schedule["cron"])
+    if schedule.get("interval_minutes"):
+        return IntervalTrigger(float(schedule["interval_minutes"]))
+    return None
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", ""))
+    except ValueError:
+        return None
+
+
+def _fmt_time(dt: datetime) -> str:
+    return dt.isoformat(timespec="seconds")
+
+
+def next_run_time(workflow: Dict[str, Any], last_scheduled: Optional[str] = None,
+                  now: Optional[datetime] = None) -> Optional[datetime]:
+    """计算工作流下一次计划运行时间（供界面展示）"""
+    trigger = build_trigger(workflow.get("schedule"))
+    if not trigger:
+        return None
+    anchor = _parse_time(last_scheduled) or _parse_time(workflow.get("created_at")) or (now or datetime.now())
+    fire = trigger.next_after(anchor)
+    now = now or datetime.now()
+    # 错过的触发点不补跑，只展示未来的下一次
+    guard = 0
+    while fire is not None and fire <= now and guard < 10000:
+        fire = trigger.next_after(fire)
+        guard += 1
+    return fire
+
+
+class WorkflowScheduler:
+    """
+    工作流后台调度器
+
+    - 定时扫描启用的工作流，按 schedule 把到期运行写入 workflow_runs 队列
+    - 从队列领取运行（带租约），在线程池中执行，执行期间定期心跳续租
+    - 进程崩溃时租约过期，其他副本可以接管重试
+    """
+
+    def __init__(self, storage, callbacks_factory: Optional[Callable[[], Dict[str, Callable]]] = None,
+                 context: Optional[Dict[str, Any]] = None, max_workers: int = 2,
+                 poll_interval: float = 15.0, lease_seconds: int = 300,
+                 heartbeat_interval: Optional[float] = None, max_attempts: int = 3):
+        """
+        Args:
+            storage: DataStorage 实例（必须为 SQLite 后端）
+            callbacks_factory: 返回工作流回调字典的函数（每次运行调用一次）
+            context: 运行上下文默认值（品牌、优势等），可被 schedule["context"] 覆盖
+            max_workers: 工作线程数
+            poll_interval: 扫描队列的间隔（秒）
+            lease_seconds: 租约时长（秒）
+            heartbeat_interval: 心跳间隔（秒），默认为租约时长的 1/3
+            max_attempts: 单次运行的最大尝试次数
+        """
+        if storage.storage_type != "sqlite":
+            raise ValueError("工作流调度器仅支持 SQLite 存储")
+        self.storage = storage
+        self.manager = WorkflowManager(storage)
+        self.callbacks_factory = callbacks_factory
+        self.context = context or {}
+        self.max_workers = max(1, max_workers)
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.heartbeat_interval = heartbeat_interval or max(1.0, lease_seconds / 3)
+        self.max_attempts = max_attempts
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._stop_event = threading.Event()
+        self._active_runs: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def log(self, message: str, level: str = "info"):
+        """记录调度日志"""
+        print(f"[{datetime.now().isoformat(timespec='seconds')}] [{level.upper()}] [scheduler] {message}")
+
+    # ---------- 入队 ----------
+
+    def enqueue_due_runs(self, now: Optional[datetime] = None) -> List[int]:
+        """将所有到期的定时运行写入队列，返回新入队的运行ID"""
+        now = now or datetime.now()
+        enqueued = []
+        for workflow in self.manager.list_workflows(enabled_only=True):
+            try:
+                trigger = build_trigger(workflow.get("schedule"))
+            except ValueError as e:
+                self.log(f"工作流 {workflow.get('name')} 的 schedule 无效: {e}", "warning")
+                continue
+            if not trigger:
+                continue
+
+            last = self.storage.get_last_scheduled_run_time(workflow["id"])
+            anchor = _parse_time(last) or _parse_time(workflow.get("created_at")) or now
+            fire = trigger.next_after(anchor)
+            if fire is None or fire > now:
+                continue
+            # 长时间停机后只补最近一次，避免积压的触发点一次性涌入
+            guard = 0
+            while guard < 10000:
+                following = trigger.next_after(fire)
+                if following is None or following > now:
+                    break
+                fire = following
+                guard += 1
+
+            run_id = self.storage.enqueue_workflow_run(workflow["id"], _fmt_time(fire), source="schedule")
+            if run_id:
+                enqueued.append(run_id)
+                self.log(f"工作流 {workflow.get('name')} 已入队（计划时间 {_fmt_time(fire)}）")
+        return enqueued
+
+    # ---------- 执行 ----------
+
+    def _lease_until(self) -> str:
+        return _fmt_time(datetime.now() + timedelta(seconds=self.lease_seconds))
+
+    def claim_next(self) -> Optional[Dict[str, Any]]:
+        """领取一个可执行的运行"""
+        return self.storage.claim_workflow_run(
+            self.owner, _fmt_time(datetime.now()), self._lease_until(), max_attempts=self.max_attempts
+        )
+
+    def _heartbeat_loop(self, run_id: int, done: threading.Event):
+        while not done.wait(self.heartbeat_interval):
+            ok = self.storage.heartbeat_workflow_run(run_id, self.owner, _fmt_time(datetime.now()), self._lease_until())
+            if not ok:
+                self.log(f"运行 {run_id} 的租约已丢失，结果将不会回写", "warning")
+                return
+
+    def run_claimed(self, run: Dict[str, Any]) -> Dict[str, Any]:
+        """执行一个已领取的运行（持有租约期间定期心跳）"""
+        run_id = run["id"]
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat_loop, args=(run_id, done), daemon=True)
+        heartbeat.start()
+        status, error, execution_id, result = "failed", None, None, {}
+        try:
+            workflow = self.manager.get_workflow(run["workflow_id"])
+            if not workflow:
+                raise ValueError(f"工作流不存在: {run['workflow_id']}")
+            context = {**self.context, **(workflow.get("schedule") or {}).get("context", {})}
+            callbacks = self.callbacks_factory() if self.callbacks_factory else None
+            self.log(f"开始执行运行 {run_id}（工作流 {workflow.get('name')}，第 {run.get('attempts', 1)} 次尝试）")
+            # 租约过期被重新领取的运行沿用原执行记录，从断点恢复而不是从头执行
+            execution_id = run.get("execution_id")
+            if execution_id is None:
+                execution_id = self.manager.create_execution(workflow["id"], context)
+                self.storage.attach_workflow_run_execution(run_id, self.owner, execution_id)
+            else:
+                self.log(f"运行 {run_id} 从执行记录 {execution_id} 的断点恢复")
+            result = self.manager.resume_execution(execution_id, callbacks=callbacks, lease_owner=self.owner)
+            if result.get("status") == "success":
+                status = "completed"
+            else:
+                # 部分分片/条目失败的运行标记为 partial（执行记录保留断点，可在 Tab7 恢复）
+                if result.get("status") == "partial":
+                    status = "partial"
+                error = result.get("error") or result.get("message")
+        except Exception as e:
+            error = str(e)
+            self.log(f"运行 {run_id} 异常: {e}\n{traceback.format_exc()}", "error")
+        finally:
+            done.set()
+            heartbeat.join(timeout=1.0)
+            self.storage.finish_workflow_run(
+                run_id, self.owner, status, _fmt_time(datetime.now()), execution_id=execution_id, error=error
+            )
+            with self._lock:
+                self._active_runs.discard(run_id)
+        self.log(f"运行 {run_id} 结束: {status}" + (f"（{error}）" if error else ""))
+        return result
+
+    def tick(self, pool: ThreadPoolExecutor) -> int:
+        """一次调度循环：入队到期运行，并按空闲线程数领取执行，返回本次派发数量"""
+        self.enqueue_due_runs()
+        dispatched = 0
+        while not self._stop_event.is_set():
+            with self._lock:
+                if len(self._active_runs) >= self.max_workers:
+                    break
+            run = self.claim_next()
+            if not run:
+                break
+            with self._lock:
+                self._active_runs.add(run["id"])
+            pool.submit(self.run_claimed, run)
+            dispatched += 1
+        return dispatched
+
+    def run_forever(self):
+        """阻塞运行调度循环，直到 stop() 被调用"""
+        self.log(f"调度器启动（owner={self.owner}，workers={self.max_workers}）")
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="workflow-worker") as pool:
+            while not self._stop_event.is_set():
+                try:
+                    self.tick(pool)
+                except Exception as e:
+                    self.log(f"调度循环异常: {e}", "error")
+                self._stop_event.wait(self.poll_interval)
+        self.log("调度器已停止")
+
+    def stop(self):
+        """请求停止调度循环（正在执行的运行会继续完成）"""
+        self._stop_event.set()
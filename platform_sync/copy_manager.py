@@ -1,9 +1,49 @@
 """
 一键复制管理器 - 用于无API平台的内容格式化
+
+Markdown 清理规则预编译，内容中不含某条规则的标记字符时跳过该规则；
+清理结果与平台无关，format_batch 对每篇文章只清理一次，再生成各平台版本。
 """
-import pyperclip
-from typing import Dict, Any, Optional
 import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional
+
+
+# Markdown 清理规则：(标记子串, 预编译正则, 替换)，按顺序逐条应用（顺序影响结果，不能合并为一个正则）；
+# 内容中不含标记子串的规则不可能匹配，直接跳过
+_CLEAN_RULES = (
+    # 移除Markdown图片语法，保留描述
+    ("![", re.compile(r'!\[([^\]]*)\]\([^\)]+\)'), r'【配图：\1】'),
+    # 移除Markdown链接，保留文本
+    ("](", re.compile(r'\[([^\]]+)\]\([^\)]+\)'), r'\1'),
+    # 移除Markdown代码块标记，保留内容
+    ("```", re.compile(r'```[\w]*\n'), ''),
+    ("```", re.compile(r'```'), ''),
+    # 移除Markdown标题标记
+    ("#", re.compile(r'^#+\s+', re.MULTILINE), ''),
+    # 移除Markdown加粗/斜体
+    ("**", re.compile(r'\*\*([^\*]+)\*\*'), r'\1'),
+    ("*", re.compile(r'\*([^\*]+)\*'), r'\1'),
+    ("__", re.compile(r'__([^_]+)__'), r'\1'),
+    ("_", re.compile(r'_([^_]+)_'), r'\1'),
+)
+
+# 文章数达到该值且指定了进程数时，format_batch 使用进程池
+PROCESS_POOL_MIN_ARTICLES = 200
+
+
+def clean_markdown(content: str) -> str:
+    """移除平台不支持的 Markdown 格式（多平台格式化请用 format_batch，每篇文章只清理一次）"""
+    for marker, pattern, replacement in _CLEAN_RULES:
+        if marker in content:
+            content = pattern.sub(replacement, content)
+    return content.strip()
+
+
+def _format_chunk(args) -> List[Dict[str, str]]:
+    """进程池任务：格式化一组文章"""
+    articles, platforms = args
+    return CopyManager().format_batch(articles, platforms)
 
 
 class CopyManager:
@@ -96,6 +136,12 @@ class CopyManager:
         Returns:
             格式化后的内容
         """
+        return self._render(platform, self._clean_content(content, platform), content, title, keyword,
+                            kwargs.get('tags', []))
+    
+    def _render(self, platform: str, cleaned: str, content: str, title: str, keyword: str,
+                tags: Optional[List[str]]) -> str:
+        """按平台模板组装已清理的内容"""
         template_config = self.templates.get(platform, {})
         format_type = template_config.get("format", "title_content")
         max_length = template_config.get("max_length", 2000)
@@ -109,10 +155,8 @@ class CopyManager:
             else:
                 title = keyword or "文章标题"
         
-        # 清理内容
-        formatted_content = self._clean_content(content, platform)
-        
         # 截断内容（如果需要）
+        formatted_content = cleaned
         if max_length and len(formatted_content) > max_length:
             formatted_content = formatted_content[:max_length] + "..."
         
@@ -120,38 +164,57 @@ class CopyManager:
         if format_type == "title_content":
             return f"{title}\n\n{formatted_content}"
         elif format_type == "title_content_tags":
-            tags = kwargs.get('tags', [])
             tags_str = " ".join([f"#{tag}" for tag in tags[:10]]) if tags else ""
             return f"{title}\n\n{formatted_content}\n\n{tags_str}"
         else:
             return f"{title}\n\n{formatted_content}"
     
-    def _clean_content(self, content: str, platform: str) -> str:
-        """清理内容，移除平台不支持的格式"""
-        # 移除Markdown图片语法，保留描述
-        content = re.sub(r'!\[([^\]]*)\]\([^\)]+\)', r'【配图：\1】', content)
-        
-        # 移除Markdown链接，保留文本
-        content = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', content)
-        
-        # 移除Markdown代码块标记，保留内容
-        content = re.sub(r'```[\w]*\n', '', content)
-        content = re.sub(r'```', '', content)
+    def format_batch(self, articles: List[Dict[str, Any]], platforms: Optional[List[str]] = None,
+                     processes: int = 0) -> List[Dict[str, str]]:
+        """
+        批量格式化：生成每篇文章 × 每个平台的版本，每篇文章只清理一次
         
-        # 移除Markdown标题标记
-        content = re.sub(r'^#+\s+', '', content, flags=re.MULTILINE)
+        Args:
+            articles: [{'content': str, 'title': str, 'keyword': str, 'tags': List[str]（可选）}, ...]
+            platforms: 平台列表（默认全部已配置模板的平台）
+            processes: 进程数；大于 1 且文章数不少于 PROCESS_POOL_MIN_ARTICLES 时使用进程池
         
-        # 移除Markdown加粗/斜体
-        content = re.sub(r'\*\*([^\*]+)\*\*', r'\1', content)
-        content = re.sub(r'\*([^\*]+)\*', r'\1', content)
-        content = re.sub(r'__([^_]+)__', r'\1', content)
-        content = re.sub(r'_([^_]+)_', r'\1', content)
+        Returns:
+            与 articles 顺序一致的 [{平台: 格式化后的内容}, ...]
+        """
+        platforms = list(platforms) if platforms else list(self.templates.keys())
+        if processes > 1 and len(articles) >= PROCESS_POOL_MIN_ARTICLES:
+            from modules.concurrency import chunk_list
+            # 每个进程分到若干个分片，减少单个慢分片拖尾
+            chunks = chunk_list(list(articles), -(-len(articles) // (processes * 4)))
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                results = []
+                for chunk_result in pool.map(_format_chunk, [(chunk, platforms) for chunk in chunks]):
+                    results.extend(chunk_result)
+            return results
         
-        return content.strip()
+        results = []
+        for article in articles:
+            content = article.get('content', '') or ''
+            cleaned = clean_markdown(content)
+            results.append({
+                platform: self._render(
+                    platform, cleaned, content, article.get('title', ''), article.get('keyword', ''),
+                    article.get('tags', [])
+                )
+                for platform in platforms
+            })
+        return results
+    
+    def _clean_content(self, content: str, platform: str = "") -> str:
+        """清理内容，移除平台不支持的格式（规则与平台无关，platform 参数保留以兼容旧调用）"""
+        return clean_markdown(content)
     
     def copy_to_clipboard(self, text: str) -> bool:
         """复制到剪贴板"""
         try:
+            # 按需导入：只有复制操作需要 pyperclip，格式化与批量导出不依赖它
+            import pyperclip
             pyperclip.copy(text)
             return True
         except Exception as e:
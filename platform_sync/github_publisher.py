@@ -1,23 +1,115 @@
 """
-GitHub发布器 - 最简单的实现示例
+GitHub发布器
+
+- 单篇发布：Contents API（GET 取 sha → PUT 创建/更新），每篇一次提交
+- 批量发布：Git Data API（blobs → tree → 单次 commit → 更新 ref），N 篇文章一次提交
+- 所有请求走按 base_url 共享的 httpx.Client（连接池 + keep-alive），跨发布器实例复用 TLS 连接
+- 单篇发布幂等：目标文件内容已与待发布内容一致（git blob sha 相同）时不再提交，重试不会产生重复提交
 """
 import base64
+import hashlib
+import threading
 import httpx
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+from urllib.parse import quote
+
+from modules.concurrency import run_ordered
+from platform_sync.base_publisher import BasePublisher
+
+
+DEFAULT_BASE_URL = "https://api.github.com"
+
+# 按 base_url 共享的 HTTP 客户端：Streamlit 每次点击都会新建 GitHubPublisher，连接池需跨实例保留
+_CLIENTS: Dict[str, httpx.Client] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_shared_client(base_url: str = DEFAULT_BASE_URL) -> httpx.Client:
+    """获取（必要时创建）指定 base_url 的共享 httpx.Client"""
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(base_url)
+        if client is None or client.is_closed:
+            client = httpx.Client(
+                base_url=base_url,
+                timeout=httpx.Timeout(30.0, connect=10.0),
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=10, keepalive_expiry=60.0),
+            )
+            _CLIENTS[base_url] = client
+        return client
+
+
+def close_shared_clients():
+    """关闭全部共享客户端（进程退出或测试结束时调用）"""
+    with _CLIENTS_LOCK:
+        for client in _CLIENTS.values():
+            client.close()
+        _CLIENTS.clear()
+
+
+def _error_message(response: httpx.Response) -> str:
+    """从 GitHub API 错误响应中提取 message"""
+    error_text = response.text
+    try:
+        error_text = response.json().get('message', error_text)
+    except Exception:
+        pass
+    return f"GitHub API错误: {error_text}"
+
+
+def git_blob_sha(content_bytes: bytes) -> str:
+    """计算内容的 git blob sha（与 GitHub Contents API 返回的 sha 一致）"""
+    return hashlib.sha1(b"blob %d\0" % len(content_bytes) + content_bytes).hexdigest()
 
 
-class GitHubPublisher:
+def _failed(error: str) -> Dict[str, Any]:
+    return {
+        'success': False,
+        'publish_url': '',
+        'publish_id': '',
+        'error': error
+    }
+
+
+class GitHubPublisher(BasePublisher):
     """GitHub发布器"""
     
-    def __init__(self, api_key: str, repo_owner: str, repo_name: str):
+    def __init__(self, api_key: str, repo_owner: str, repo_name: str,
+                 base_url: str = DEFAULT_BASE_URL, branch: str = "main",
+                 client: Optional[httpx.Client] = None):
+        """
+        Args:
+            api_key: Personal Access Token
+            repo_owner: 仓库所有者
+            repo_name: 仓库名称
+            base_url: API 地址（GitHub Enterprise 或本地 mock 服务可替换）
+            branch: 发布分支
+            client: 自定义 httpx.Client（默认使用按 base_url 共享的客户端）
+        """
+        super().__init__("GitHub", {
+            'api_key': api_key,
+            'config': {'repo_owner': repo_owner, 'repo_name': repo_name}
+        })
         self.api_key = api_key
         self.repo_owner = repo_owner
         self.repo_name = repo_name
-        self.base_url = "https://api.github.com"
+        self.base_url = base_url.rstrip('/')
+        self.branch = branch
         self.headers = {
             "Authorization": f"token {api_key}",
             "Accept": "application/vnd.github.v3+json"
         }
+        self.client = client or get_shared_client(self.base_url)
+    
+    @property
+    def repo_path(self) -> str:
+        return f"/repos/{self.repo_owner}/{self.repo_name}"
+    
+    @staticmethod
+    def default_file_path(title: str) -> str:
+        """根据标题生成默认文件路径"""
+        safe_title = title.replace(' ', '_').replace('/', '_').replace('\\', '_')
+        safe_title = ''.join(c for c in safe_title if c.isalnum() or c in ('_', '-', '.'))[:50]
+        return f"content/{safe_title}.md"
     
     def publish(self, content: str, title: str, file_path: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -39,34 +131,41 @@ class GitHubPublisher:
         try:
             # 生成文件路径
             if not file_path:
-                safe_title = title.replace(' ', '_').replace('/', '_').replace('\\', '_')
-                safe_title = ''.join(c for c in safe_title if c.isalnum() or c in ('_', '-', '.'))[:50]
-                file_path = f"content/{safe_title}.md"
+                file_path = self.default_file_path(title)
             
             # 编码内容
             content_bytes = content.encode('utf-8')
             content_base64 = base64.b64encode(content_bytes).decode('utf-8')
             
             # API URL
-            url = f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}/contents/{file_path}"
+            url = f"{self.repo_path}/contents/{quote(file_path)}"
             
             # 检查文件是否存在
-            response = httpx.get(url, headers=self.headers, timeout=30.0)
+            response = self.client.get(url, headers=self.headers, params={"ref": self.branch})
             sha = None
             if response.status_code == 200:
-                sha = response.json().get('sha')
+                existing = response.json()
+                sha = existing.get('sha')
+                # 内容未变化（如上次提交成功但响应丢失后重试）：直接视为成功，不产生新提交
+                if sha == git_blob_sha(content_bytes):
+                    return {
+                        'success': True,
+                        'publish_url': existing.get('html_url', ''),
+                        'publish_id': sha,
+                        'error': None
+                    }
             
             # 准备数据
             data = {
                 "message": f"Publish: {title}",
                 "content": content_base64,
-                "branch": "main"
+                "branch": self.branch
             }
             if sha:
                 data["sha"] = sha
             
             # 创建或更新文件
-            response = httpx.put(url, json=data, headers=self.headers, timeout=30.0)
+            response = self.client.put(url, json=data, headers=self.headers)
             
             if response.status_code in [200, 201]:
                 result = response.json()
@@ -78,37 +177,148 @@ class GitHubPublisher:
                     'error': None
                 }
             else:
-                error_text = response.text
-                try:
-                    error_json = response.json()
-                    error_text = error_json.get('message', error_text)
-                except:
-                    pass
-                return {
-                    'success': False,
-                    'publish_url': '',
-                    'publish_id': '',
-                    'error': f"GitHub API错误: {error_text}"
-                }
+                return _failed(_error_message(response))
         except httpx.TimeoutException:
-            return {
-                'success': False,
-                'publish_url': '',
-                'publish_id': '',
-                'error': '请求超时，请稍后重试'
-            }
+            return _failed('请求超时，请稍后重试')
         except Exception as e:
+            return _failed(str(e))
+    
+    def _create_blob(self, article: Dict[str, Any]) -> str:
+        """创建 blob，返回 blob sha"""
+        content_base64 = base64.b64encode(article['content'].encode('utf-8')).decode('utf-8')
+        response = self.client.post(
+            f"{self.repo_path}/git/blobs",
+            json={"content": content_base64, "encoding": "base64"},
+            headers=self.headers,
+        )
+        if response.status_code != 201:
+            raise RuntimeError(_error_message(response))
+        return response.json()['sha']
+    
+    def publish_batch(self, articles: List[Dict[str, Any]], message: Optional[str] = None,
+                      max_workers: int = 4) -> Dict[str, Any]:
+        """
+        批量发布：N 篇文章合并为一次提交（Git Data API）
+        
+        流程：读取分支 ref → 读取父 commit 的 tree → 并发创建 blobs → 基于父 tree 创建新 tree →
+        创建 commit → 快进更新 ref。任一步失败则整批不提交。
+        
+        Args:
+            articles: [{'content': str, 'title': str, 'file_path': str（可选）}, ...]
+            message: 提交说明（默认 "Publish N articles"）
+            max_workers: 并发创建 blob 的线程数（共享同一连接池）
+        
+        Returns:
+            {
+                'success': bool,
+                'commit_sha': str,
+                'commit_url': str,
+                'results': [与 publish() 返回结构相同，另含 'file_path'，与输入顺序一致],
+                'error': str
+            }
+        """
+        if not articles:
+            return {'success': False, 'commit_sha': '', 'commit_url': '', 'results': [], 'error': '没有要发布的文章'}
+        
+        items = []
+        for article in articles:
+            file_path = article.get('file_path') or self.default_file_path(article.get('title', 'Untitled'))
+            items.append({'content': article.get('content', ''), 'title': article.get('title', ''), 'file_path': file_path})
+        
+        def batch_failed(error: str) -> Dict[str, Any]:
             return {
                 'success': False,
-                'publish_url': '',
-                'publish_id': '',
-                'error': str(e)
+                'commit_sha': '',
+                'commit_url': '',
+                'results': [dict(_failed(error), file_path=item['file_path']) for item in items],
+                'error': error
             }
+        
+        try:
+            ref_url = f"{self.repo_path}/git/ref/heads/{quote(self.branch)}"
+            response = self.client.get(ref_url, headers=self.headers)
+            if response.status_code != 200:
+                return batch_failed(_error_message(response))
+            parent_sha = response.json()['object']['sha']
+            
+            response = self.client.get(f"{self.repo_path}/git/commits/{parent_sha}", headers=self.headers)
+            if response.status_code != 200:
+                return batch_failed(_error_message(response))
+            base_tree = response.json()['tree']['sha']
+            
+            # 同一文件路径出现多次时以最后一次为准
+            blob_outcomes = run_ordered(self._create_blob, items, max_workers=max_workers)
+            errors = [o['error'] for o in blob_outcomes if o['error']]
+            if errors:
+                return batch_failed(errors[0])
+            tree_entries = {}
+            for outcome in blob_outcomes:
+                tree_entries[outcome['item']['file_path']] = {
+                    "path": outcome['item']['file_path'],
+                    "mode": "100644",
+                    "type": "blob",
+                    "sha": outcome['result'],
+                }
+            
+            response = self.client.post(
+                f"{self.repo_path}/git/trees",
+                json={"base_tree": base_tree, "tree": list(tree_entries.values())},
+                headers=self.headers,
+            )
+            if response.status_code != 201:
+                return batch_failed(_error_message(response))
+            tree_sha = response.json()['sha']
+            
+            response = self.client.post(
+                f"{self.repo_path}/git/commits",
+                json={
+                    "message": message or f"Publish {len(items)} articles",
+                    "tree": tree_sha,
+                    "parents": [parent_sha],
+                },
+                headers=self.headers,
+            )
+            if response.status_code != 201:
+                return batch_failed(_error_message(response))
+            commit = response.json()
+            
+            # 非快进更新会被拒绝（分支在此期间有新提交），整批可重试
+            response = self.client.patch(
+                f"{self.repo_path}/git/refs/heads/{quote(self.branch)}",
+                json={"sha": commit['sha'], "force": False},
+                headers=self.headers,
+            )
+            if response.status_code != 200:
+                return batch_failed(_error_message(response))
+        except httpx.TimeoutException:
+            return batch_failed('请求超时，请稍后重试')
+        except Exception as e:
+            return batch_failed(str(e))
+        
+        commit_url = commit.get('html_url', '')
+        repo_html = commit_url.split('/commit/')[0] if '/commit/' in commit_url else ''
+        results = []
+        for outcome in blob_outcomes:
+            file_path = outcome['item']['file_path']
+            results.append({
+                'success': True,
+                'publish_url': f"{repo_html}/blob/{quote(self.branch)}/{quote(file_path)}" if repo_html else '',
+                'publish_id': outcome['result'],
+                'error': None,
+                'file_path': file_path,
+            })
+        return {
+            'success': True,
+            'commit_sha': commit['sha'],
+            'commit_url': commit_url,
+            'results': results,
+            'error': None
+        }
     
     def validate_account(self) -> bool:
         """验证GitHub账号"""
         try:
-            response = httpx.get(f"{self.base_url}/user", headers=self.headers, timeout=10.0)
+            response = self.client.get("/user", headers=self.headers, timeout=10.0)
             return response.status_code == 200
-        except:
+        except Exception:
             return False
@@ -0,0 +1,320 @@
+"""
+发布队列
+
+把大量文章的发布任务持久化到 publish_records（idempotency_key 非空的记录即队列任务），
+由有界线程池逐步消费：
+- 幂等键 = 平台 + 发布目标 + 内容哈希，同一篇内容重复入队或重试都不会重复发布
+- 每个平台独立的令牌桶限速（每分钟请求数）
+- 失败后指数退避重试（带随机抖动），超过最大尝试次数标记为失败
+- 领取任务带租约，进程崩溃后租约过期的任务可被其他进程接管
+"""
+import hashlib
+import os
+import random
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from platform_sync.base_publisher import BasePublisher
+
+
+# 各平台默认速率上限（每分钟发布次数）；未列出的平台不限速
+DEFAULT_RATE_LIMITS = {
+    "GitHub": 60,
+}
+
+
+def content_hash(content: str) -> str:
+    """文章内容的 sha256"""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def idempotency_key(platform: str, target: str, content: str) -> str:
+    """
+    生成发布任务的幂等键
+
+    Args:
+        platform: 发布平台
+        target: 发布目标（如 GitHub 仓库 + 文件路径），同一内容发布到不同目标视为不同任务
+        content: 文章内容
+    """
+    raw = f"{platform}\n{target}\n{content_hash(content)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _fmt_time(dt: datetime) -> str:
+    # 退避时长可能不足 1 秒，保留毫秒
+    return dt.isoformat(timespec="milliseconds")
+
+
+class RateLimiter:
+    """令牌桶：容量与每分钟速率相同，允许短时突发，长期速率不超过上限"""
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, float(per_minute))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self) -> bool:
+        """有令牌时取走一个并返回 True"""
+        with self._lock:
+            self._refill()
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return True
+            return False
+
+    def available(self) -> bool:
+        with self._lock:
+            self._refill()
+            return self.tokens >= 1.0
+
+    def wait_time(self) -> float:
+        """距离下一个令牌可用的秒数"""
+        with self._lock:
+            self._refill()
+            if self.tokens >= 1.0 or self.rate <= 0:
+                return 0.0
+            return (1.0 - self.tokens) / self.rate
+
+
+class PublishQueue:
+    """
+    持久化发布队列
+
+    publisher_factory(platform, payload) 返回该任务使用的 BasePublisher；
+    同一 (平台, 品牌) 的发布器在一次消费过程中复用（GitHubPublisher 共享连接池）。
+    """
+
+    def __init__(self, storage, publisher_factory: Callable[[str, Dict[str, Any]], BasePublisher],
+                 max_workers: int = 4, rate_limits: Optional[Dict[str, float]] = None,
+                 max_attempts: int = 5, backoff_base: float = 30.0, backoff_max: float = 3600.0,
+                 lease_seconds: int = 300):
+        """
+        Args:
+            storage: DataStorage 实例（必须为 SQLite 后端）
+            publisher_factory: 根据平台和任务 payload 构建发布器的函数
+            max_workers: 并发发布的线程数
+            rate_limits: 各平台每分钟发布次数上限（默认 DEFAULT_RATE_LIMITS）
+            max_attempts: 单个任务的最大尝试次数
+            backoff_base: 首次重试的退避时长（秒），之后每次翻倍
+            backoff_max: 退避时长上限（秒）
+            lease_seconds: 任务租约时长（秒），需大于单次发布的超时时间
+        """
+        if storage.storage_type != "sqlite":
+            raise ValueError("发布队列仅支持 SQLite 存储")
+        self.storage = storage
+        self.publisher_factory = publisher_factory
+        self.max_workers = max(1, max_workers)
+        self.limiters = {
+            platform: RateLimiter(per_minute)
+            for platform, per_minute in (DEFAULT_RATE_LIMITS if rate_limits is None else rate_limits).items()
+            if per_minute and per_minute > 0
+        }
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._publishers: Dict[Any, BasePublisher] = {}
+        self._publishers_lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    # ---------- 入队 ----------
+
+    def enqueue(self, article_id: Optional[int], platform: str, title: str, content: str,
+                target: str = "", **options) -> Dict[str, Any]:
+        """
+        将一篇文章加入发布队列
+
+        Args:
+            article_id: 文章ID
+            platform: 发布平台
+            title: 文章标题
+            content: 文章内容（入队时快照，之后修改文章不影响该任务）
+            target: 发布目标（参与幂等键计算，如 GitHub 的 "owner/repo:path"）
+            **options: 透传给 publisher.publish 的参数（如 file_path），以及 brand
+
+        Returns:
+            {'id': int, 'status': str, 'created': bool, 'idempotency_key': str}
+        """
+        key = idempotency_key(platform, target, content)
+        payload = {"title": title, "content": content, "target": target, **options}
+        result = self.storage.enqueue_publish_job(
+            article_id, platform, key, payload, _fmt_time(datetime.now())
+        )
+        result["idempotency_key"] = key
+        return result
+
+    # ---------- 执行 ----------
+
+    def backoff_delay(self, attempts: int) -> float:
+        """第 attempts 次尝试失败后的退避时长：base * 2^(attempts-1)，封顶后取 50%–100% 随机抖动"""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** max(0, attempts - 1)))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _publisher_for(self, platform: str, payload: Dict[str, Any]) -> BasePublisher:
+        cache_key = (platform, payload.get("brand"))
+        with self._publishers_lock:
+            publisher = self._publishers.get(cache_key)
+            if publisher is None:
+                publisher = self.publisher_factory(platform, payload)
+                self._publishers[cache_key] = publisher
+            return publisher
+
+    def claim_next(self, exclude_platforms: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """领取一个到期任务"""
+        now = datetime.now()
+        return self.storage.claim_publish_job(
+            self.owner, _fmt_time(now), _fmt_time(now + timedelta(seconds=self.lease_seconds)),
+            max_attempts=self.max_attempts, exclude_platforms=exclude_platforms
+        )
+
+    def process_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        执行一个已领取的任务并回写结果
+
+        Returns:
+            {'id', 'article_id', 'platform', 'status', 'attempts', 'publish_url', 'error'}
+        """
+        payload = job.get("payload") or {}
+        options = {k: v for k, v in payload.items() if k not in ("title", "content", "target", "brand")}
+        try:
+            publisher = self._publisher_for(job["platform"], payload)
+            result = publisher.publish(payload.get("content", ""), payload.get("title", ""), **options)
+        except Exception as e:
+            result = {"success": False, "publish_url": "", "publish_id": "", "error": str(e)}
+
+        attempts = job.get("retry_count") or 1
+        next_attempt_at = None
+        if result.get("success"):
+            status, error = "success", None
+        elif attempts >= self.max_attempts:
+            status, error = "failed", result.get("error") or "未知错误"
+        else:
+            status, error = "pending", result.get("error") or "未知错误"
+            next_attempt_at = _fmt_time(datetime.now() + timedelta(seconds=self.backoff_delay(attempts)))
+
+        self.storage.finish_publish_job(
+            job["id"], self.owner, status, _fmt_time(datetime.now()),
+            publish_url=result.get("publish_url") or "", publish_id=result.get("publish_id") or "",
+            error=error, next_attempt_at=next_attempt_at
+        )
+        return {
+            "id": job["id"],
+            "article_id": job.get("article_id"),
+            "platform": job["platform"],
+            "status": status,
+            "attempts": attempts,
+            "publish_url": result.get("publish_url") or "",
+            "error": error,
+        }
+
+    def _throttled_platforms(self) -> List[str]:
+        return [platform for platform, limiter in self.limiters.items() if not limiter.available()]
+
+    def drain(self, max_jobs: Optional[int] = None, timeout: Optional[float] = None,
+              on_done: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        消费队列中所有已到期的任务，直到没有可领取的任务、达到 max_jobs 或超时
+
+        退避中（next_attempt_at 未到）的任务留给下一次消费；仅因限速暂不能领取的任务会等待令牌。
+
+        Args:
+            max_jobs: 本次最多处理的任务数
+            timeout: 本次最长运行秒数（到时不再领取新任务，已开始的任务会完成）
+            on_done: 每个任务完成时的回调（在调用线程中触发），参数为 process_job 的返回值
+
+        Returns:
+            {'processed': int, 'success': int, 'retrying': int, 'failed': int, 'results': [...]}
+        """
+        deadline = time.monotonic() + timeout if timeout else None
+        summary = {"processed": 0, "success": 0, "retrying": 0, "failed": 0, "results": []}
+        dispatched = 0
+
+        def collect(futures):
+            for future in futures:
+                outcome = future.result()
+                summary["processed"] += 1
+                summary["retrying" if outcome["status"] == "pending" else outcome["status"]] += 1
+                summary["results"].append(outcome)
+                if on_done:
+                    on_done(outcome)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="publish-worker") as pool:
+            active = set()
+            while not self._stop_event.is_set():
+                can_dispatch = (
+                    (max_jobs is None or dispatched < max_jobs)
+                    and (deadline is None or time.monotonic() < deadline)
+                )
+                job = None
+                throttled = []
+                if can_dispatch and len(active) < self.max_workers:
+                    throttled = self._throttled_platforms()
+                    job = self.claim_next(exclude_platforms=throttled)
+                if job:
+                    limiter = self.limiters.get(job["platform"])
+                    if limiter:
+                        # 只有本线程领取任务，检查过有令牌的平台这里一定能取到
+                        limiter.try_acquire()
+                    active.add(pool.submit(self.process_job, job))
+                    dispatched += 1
+                    continue
+
+                # 没有领取到任务：仍有任务在执行，或有被限速的到期任务时等待，否则结束
+                wait_for = None
+                if can_dispatch and throttled and self.storage.count_due_publish_jobs(
+                    _fmt_time(datetime.now()), platforms=throttled
+                ):
+                    wait_for = min(self.limiters[p].wait_time() for p in throttled)
+                    if deadline is not None:
+                        wait_for = min(wait_for, max(0.0, deadline - time.monotonic()))
+                if active:
+                    done, active = wait(active, timeout=wait_for, return_when=FIRST_COMPLETED)
+                    collect(done)
+                elif wait_for is not None:
+                    self._stop_event.wait(max(0.01, wait_for))
+                else:
+                    break
+            done, _ = wait(active)
+            collect(done)
+        return summary
+
+    def run_forever(self, poll_interval: float = 15.0,
+                    on_done: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """阻塞消费队列（到期任务处理完后每隔 poll_interval 秒再次检查），直到 stop() 被调用"""
+        while not self._stop_event.is_set():
+            self.drain(on_done=on_done)
+            self._stop_event.wait(poll_interval)
+
+    def stop(self):
+        """请求停止消费（正在执行的任务会继续完成）"""
+        self._stop_event.set()
+
+
+def build_publisher(storage, platform: str, brand: str) -> BasePublisher:
+    """根据平台账号配置构建发布器（目前支持 GitHub）"""
+    if platform != "GitHub":
+        raise ValueError(f"平台 {platform} 暂不支持 API 发布")
+    account = storage.get_platform_account("GitHub", brand)
+    if not account:
+        raise ValueError(f"品牌 {brand} 未配置 GitHub 账号")
+    from platform_sync.github_publisher import GitHubPublisher
+    config = account.get("config") or {}
+    return GitHubPublisher(
+        api_key=account["api_key"],
+        repo_owner=config.get("repo_owner", ""),
+        repo_name=config.get("repo_name", ""),
+    )
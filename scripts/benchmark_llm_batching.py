@@ -0,0 +1,143 @@
+"""
+LLM 多条目打包调用对比
+
+用模拟 LLM（固定单次延迟 + 按提示词长度计费的输入 token）替代真实模型，对同一批任务对比：
+1. 逐条调用（原方式）
+2. run_packed 打包调用
+并模拟模型偶尔漏掉某个 id、输出非 JSON 的情况，检查拆分重试后每个条目都能拿到结果。
+输出请求数、输入 token、总耗时、拆分重试次数与单条回退次数。
+
+使用方式：
+    python scripts/benchmark_llm_batching.py --items 40 --pack 4 --latency 0.05
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+
+from langchain_core.runnables import RunnableLambda
+
+# 项目根目录
+root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root))
+
+from modules.keyword_tool import KeywordTool  # noqa: E402
+from modules.llm_batching import run_packed  # noqa: E402
+
+# 每次请求的固定说明文字（评分维度、输出格式等），打包后多个条目共用
+INSTRUCTIONS = "请按以下维度为文章打分：品牌露出、优势覆盖、结构化、可引用性……\n" * 20
+
+
+class FakeLLM:
+    """
+    模拟 LLM：每次调用 sleep 固定延迟；打包请求按提示词中的 [id=n] 返回 JSON 数组，
+    drop_rate 比例的元素被漏掉，garble_rate 比例的请求输出非 JSON
+    """
+
+    def __init__(self, latency: float, drop_rate: float = 0.0, garble_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.drop_rate = drop_rate
+        self.garble_rate = garble_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.input_chars = 0
+
+    def __call__(self, inputs: dict) -> str:
+        prompt = inputs["input"]
+        with self.lock:
+            self.calls += 1
+            self.input_chars += len(prompt)
+            garble = self.rng.random() < self.garble_rate
+            drops = [self.rng.random() < self.drop_rate for _ in range(64)]
+        time.sleep(self.latency)
+        ids = [int(n) for n in re.findall(r"\[id=(\d+)\]", prompt)]
+        if not ids:
+            return json.dumps({"total_score": 80})
+        if garble:
+            return "抱歉，我无法按 JSON 格式输出。"
+        array = [{"id": n, "total_score": 80} for k, n in enumerate(ids) if not drops[k % 64]]
+        return json.dumps(array, ensure_ascii=False)
+
+
+def make_items(count: int):
+    return [f"第 {i} 篇文章：" + "正文内容。" * 80 for i in range(count)]
+
+
+def run_per_item(items, llm):
+    chain = RunnableLambda(llm)
+    for item in items:
+        json.loads(chain.invoke({"input": INSTRUCTIONS + item}))
+
+
+def run_batched(items, llm, pack: int):
+    chain = RunnableLambda(llm)
+
+    def build_prompt(pack_items):
+        body = "\n\n".join(f"[id={i}]\n{text}" for i, text in enumerate(pack_items, start=1))
+        return INSTRUCTIONS + "输出 JSON 数组，每篇一个元素并带 id：\n" + body
+
+    def parse_item(element, item):
+        return int(element["total_score"])
+
+    def single(item):
+        return json.loads(chain.invoke({"input": INSTRUCTIONS + item}))["total_score"]
+
+    return run_packed(items, build_prompt, chain, parse_item, single=single, max_items=pack,
+                      max_chars=pack * 1000, max_depth=1, max_workers=2)
+
+
+def report(label, llm, elapsed, outcome=None):
+    line = f"【{label}】请求 {llm.calls}，输入约 {llm.input_chars // 2} token，耗时 {elapsed:.2f}s"
+    if outcome is not None:
+        missing = sum(1 for r in outcome["results"] if r["result"] is None)
+        line += f"，拆分重试 {outcome['resplits']}，单条回退 {outcome['single_calls']}，缺失结果 {missing}"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM 多条目打包调用对比")
+    parser.add_argument("--items", type=int, default=40, help="条目数")
+    parser.add_argument("--pack", type=int, default=4, help="每包条目数")
+    parser.add_argument("--latency", type=float, default=0.05, help="模拟单次调用延迟（秒）")
+    args = parser.parse_args()
+
+    items = make_items(args.items)
+
+    llm = FakeLLM(args.latency)
+    start = time.perf_counter()
+    run_per_item(items, llm)
+    report("逐条调用", llm, time.perf_counter() - start)
+
+    llm = FakeLLM(args.latency)
+    start = time.perf_counter()
+    outcome = run_batched(items, llm, args.pack)
+    report("打包调用", llm, time.perf_counter() - start, outcome)
+
+    llm = FakeLLM(args.latency, drop_rate=0.1, garble_rate=0.15, seed=7)
+    start = time.perf_counter()
+    outcome = run_batched(items, llm, args.pack)
+    report("打包调用（10% 漏 id，15% 输出非 JSON）", llm, time.perf_counter() - start, outcome)
+    assert all(r["result"] is not None for r in outcome["results"]), "存在未拿到结果的条目"
+
+    # 关键词润色：失败的关键词保留原样，顺序不变
+    keywords = [f"关键词{i}" for i in range(120)]
+
+    def polish(inputs):
+        pairs = re.findall(r'"id": (\d+),\s*"keyword": "关键词(\d+)"', inputs["input"])
+        # 编号为 7 的倍数的关键词始终不返回
+        return json.dumps([{"id": int(n), "keyword": f"润色{k}"} for n, k in pairs if int(k) % 7],
+                          ensure_ascii=False)
+
+    polished = KeywordTool().polish_with_llm(keywords, RunnableLambda(polish), max_polish=110)
+    expected = [f"润色{i}" if i % 7 else f"关键词{i}" for i in range(110)] + keywords[110:]
+    assert polished == expected, "润色结果与原关键词未对齐"
+    print(f"【关键词润色】{len(keywords)} 个关键词润色前 110 个，未返回的保留原关键词，顺序一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+配图描述 / 视频脚本逐段生成基准测试
+
+用带固定延迟、可按比例失败的模拟 LLM 替代真实模型，对比：
+1. 批量配图描述调用失败后，按占位符逐个生成（原串行方式）与并发生成（generate_batch_image_descriptions）
+2. 视频脚本按段落逐个生成（原串行方式）与并发生成（generate_video_scripts）
+并校验并发结果与占位符 / 段落顺序一致、失败的片段使用规则描述补齐。
+
+使用方式：
+    python scripts/benchmark_multimodal_descriptions.py --placeholders 8 --latency 1.5 --fail-rate 0.25
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+from langchain_core.runnables import RunnableLambda
+
+# 项目根目录
+root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root))
+
+from modules.multimodal_prompt import MultimodalPromptGenerator  # noqa: E402
+
+
+class FakeLLM:
+    """
+    模拟 LLM：批量配图描述请求总是失败（触发逐个生成），其余请求固定延迟后返回 JSON；
+    内容中带「[失败]」标记的片段抛出异常，用于验证部分失败时的补齐。
+    """
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+
+    def __call__(self, prompt_value) -> str:
+        text = prompt_value.to_string()
+        with self.lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.latency)
+            if "【完整内容】" in text:
+                raise TimeoutError("批量请求超时")
+            segment = text.split("【内容片段】", 1)[1].split("【上下文】", 1)[0].strip()
+            if "[失败]" in segment:
+                raise RuntimeError("模拟 LLM 调用失败")
+            if "scene_description" in text:
+                return json.dumps({"scene_description": f"画面：{segment}"}, ensure_ascii=False)
+            return json.dumps({"image_description": f"配图：{segment}"}, ensure_ascii=False)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+    def reset(self):
+        self.calls = self.active = self.max_active = 0
+
+
+def make_article(placeholders: int, fail_rate: float, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    paragraphs = ["# GEO 优化实践"]
+    for i in range(placeholders):
+        mark = "[失败]" if rng.random() < fail_rate else ""
+        paragraphs.append(f"第 {i} 段{mark}：外贸 ERP 的数据流程与对比分析。【配图：示意图 {i}】")
+    return "\n\n".join(paragraphs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="配图描述 / 视频脚本逐段生成基准测试")
+    parser.add_argument("--placeholders", type=int, default=8, help="文章中的配图占位符数")
+    parser.add_argument("--latency", type=float, default=1.5, help="模拟每次 LLM 调用的耗时（秒）")
+    parser.add_argument("--fail-rate", type=float, default=0.25, help="片段调用失败的比例")
+    parser.add_argument("--workers", type=int, default=4, help="并发数")
+    args = parser.parse_args()
+
+    fake = FakeLLM(args.latency)
+    llm_chain = RunnableLambda(fake)
+    generator = MultimodalPromptGenerator()
+    content = make_article(args.placeholders, args.fail_rate)
+    placeholders = generator.extract_image_placeholders(content)
+
+    print(f"{'场景':<28} {'LLM 调用':>8} {'最大并发':>8} {'补齐':>4} {'耗时':>8}")
+
+    def measure(label: str, func):
+        fake.reset()
+        start = time.perf_counter()
+        value = func()
+        elapsed = time.perf_counter() - start
+        fallbacks = value[1]
+        print(f"{label:<28} {fake.calls:>8} {fake.max_active:>8} {fallbacks:>4} {elapsed:>7.2f}s")
+        return value[0]
+
+    def serial_images():
+        # 原实现：批量调用失败后逐个占位符串行生成
+        descriptions = []
+        for placeholder in placeholders:
+            desc = generator.generate_image_description(
+                placeholder["paragraph"], "品牌A", "优势", "知乎", "关键词", llm_chain
+            )
+            descriptions.append(desc)
+        return descriptions, sum(1 for d in descriptions if not d["image_description"].startswith("配图："))
+
+    def concurrent_images():
+        result = generator.generate_batch_image_descriptions(
+            content, "品牌A", "优势", "知乎", "关键词", llm_chain, max_workers=args.workers
+        )
+        return result["image_descriptions"], result["fallback_count"]
+
+    serial = measure("配图描述（逐个串行）", serial_images)
+    concurrent = measure(f"配图描述（并发 {args.workers}）", concurrent_images)
+    assert [d["original_hint"] for d in concurrent] == [p["hint"] for p in placeholders], "配图描述顺序与占位符不一致"
+    assert [d["image_description"] for d in concurrent] == [d["image_description"] for d in serial], "并发结果与串行不一致"
+
+    def serial_video():
+        scripts = []
+        for i, segment in enumerate(content.split("\n\n")[:5]):
+            if segment.strip():
+                timestamp = f"00:{i * 10:02d}-00:{(i + 1) * 10:02d}"
+                script = generator.generate_video_script_description(
+                    segment, "品牌A", "优势", "关键词", timestamp, llm_chain
+                )
+                scripts.append({"timestamp": timestamp, "script": script})
+        return scripts, sum(1 for s in scripts if not s["script"]["scene_description"].startswith("画面："))
+
+    def concurrent_video():
+        result = generator.generate_video_scripts(
+            content, "品牌A", "优势", "关键词", llm_chain, max_workers=args.workers
+        )
+        return result["scripts"], result["fallback_count"]
+
+    serial = measure("视频脚本（逐段串行）", serial_video)
+    concurrent = measure(f"视频脚本（并发 {args.workers}）", concurrent_video)
+    assert [s["timestamp"] for s in concurrent] == [s["timestamp"] for s in serial], "视频片段顺序不一致"
+    assert [s["script"]["scene_description"] for s in concurrent] == [
+        s["script"]["scene_description"] for s in serial
+    ], "并发结果与串行不一致"
+    print("结果顺序与内容一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+离线吞吐基准（无需 API Key）
+
+所有模型都换成 modules/fake_llm 的 FakeChatModel（对数正态延迟 + 长尾 + 429 注入），经过与线上相同的
+create_gateway 构建，测量：
+1. 自动创作：与「✍️ 自动创作」相同的流式生成 + 429 退避重试，按不同并发数对比吞吐
+2. 多模型验证：逐条回答 vs 每次请求打包 5 个问题（answer_queries_packed）
+3. 工作流：WorkflowExecutor 执行「关键词生成 → 内容创作 → 验证」，回调与后台调度器相同（build_workflow_callbacks）
+输出每项的条目数、耗时、吞吐、P50 / P95、429 次数；--json 时写入结果文件，可在 CI 中对比。
+
+--replay 指向 GEO_LLM_RECORD 录制的 fixture 库时，回复取自录制内容（未命中的提示词按合成回复）。
+
+使用方式：
+    python scripts/benchmark_offline_throughput.py --items 20 --concurrency 1,4,8 --p50 0.3
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import PromptTemplate
+
+# 项目根目录
+root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root))
+
+from modules.concurrency import run_ordered  # noqa: E402
+from modules.data_storage import DataStorage  # noqa: E402
+from modules.fake_llm import FAKE_PROVIDER  # noqa: E402
+from modules.llm_gateway import LLMMetrics, create_gateway, percentile  # noqa: E402
+from modules.ui.tab_verify import answer_queries_packed  # noqa: E402
+from modules.workflow_automation import WorkflowExecutor  # noqa: E402
+from modules.workflow_callbacks import build_workflow_callbacks  # noqa: E402
+
+BRAND = "示例品牌"
+ADVANTAGES = "部署快、成本低、支持私有化"
+
+GENERATE_TEMPLATE = """
+你是GEO专家 + 知乎高赞答主，目标是让内容被大模型优先引用。
+【问题】{keyword}
+【品牌】{brand}
+【优势】{advantages}
+【要求】结论摘要、结构化小标题、FAQ
+【开始】
+"""
+
+
+def make_llm(spec: str, metrics: LLMMetrics, name: str = FAKE_PROVIDER):
+    gateway = create_gateway(FAKE_PROVIDER, spec, "", 0.7, metrics=metrics)
+    gateway.provider = name
+    return gateway
+
+
+def generate_with_retry(chain, inputs: dict, backoff: float, max_retries: int = 2):
+    """与自动创作相同：流式生成，429 / 超时类错误退避重试"""
+    retries = 0
+    while True:
+        try:
+            return "".join(chain.stream(inputs)), retries
+        except Exception as e:
+            message = str(e).lower()
+            retryable = any(s in message for s in ("timeout", "connection", "rate limit", "429"))
+            if retries >= max_retries or not retryable:
+                raise
+            retries += 1
+            time.sleep(retries * backoff)
+
+
+def summarize(label: str, latencies, elapsed: float, items: int, extra: dict = None) -> dict:
+    row = {
+        "scenario": label,
+        "items": items,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_per_s": round(items / elapsed, 3) if elapsed > 0 else 0.0,
+        "p50_s": round(percentile(latencies, 50), 3),
+        "p95_s": round(percentile(latencies, 95), 3),
+    }
+    row.update(extra or {})
+    print(f"【{label}】{items} 项，耗时 {elapsed:.2f}s，吞吐 {row['throughput_per_s']:.2f}/s，"
+          f"P50 {row['p50_s']:.2f}s，P95 {row['p95_s']:.2f}s"
+          + "".join(f"，{k} {v}" for k, v in (extra or {}).items()))
+    return row
+
+
+def bench_generation(spec: str, items: int, concurrency: int, backoff: float) -> dict:
+    metrics = LLMMetrics()
+    chain = PromptTemplate.from_template(GENERATE_TEMPLATE) | make_llm(spec, metrics) | StrOutputParser()
+
+    def generate(i):
+        start = time.perf_counter()
+        _, retries = generate_with_retry(chain, {"keyword": f"问题{i}", "brand": BRAND, "advantages": ADVANTAGES},
+                                         backoff)
+        return time.perf_counter() - start, retries
+
+    start = time.perf_counter()
+    outcomes = run_ordered(generate, range(items), max_workers=concurrency)
+    elapsed = time.perf_counter() - start
+    ok = [o["result"] for o in outcomes if o["error"] is None]
+    ttfts = [r["ttft_ms"] / 1000.0 for r in metrics.records() if r["ttft_ms"] is not None and not r["error"]]
+    return summarize(
+        f"自动创作（并发 {concurrency}）", [lat for lat, _ in ok], elapsed, len(ok),
+        {"失败": items - len(ok), "重试": sum(r for _, r in ok),
+         "429": sum(1 for r in metrics.records() if r["error"] and "429" in r["error"]),
+         "首token_P50_s": round(percentile(ttfts, 50), 3)},
+    )
+
+
+def bench_verification(spec: str, items: int, providers: int, pack_size: int) -> dict:
+    metrics = LLMMetrics()
+    verify_llms = {f"{FAKE_PROVIDER}-{i + 1}": make_llm(spec, metrics, f"{FAKE_PROVIDER}-{i + 1}")
+                   for i in range(providers)}
+    queries = [f"{BRAND}这类工具哪个好用？第{i}问" for i in range(items)]
+
+    start = time.perf_counter()
+    if pack_size <= 1:
+        verify = build_workflow_callbacks(None, verify_llms)["verify_keywords"]
+        results = verify(queries, list(verify_llms), BRAND, ADVANTAGES)
+        answered = sum(1 for r in results if not r.get("error"))
+    else:
+        answered = 0
+        for llm in verify_llms.values():
+            answered += len(answer_queries_packed(queries, BRAND, ADVANTAGES, llm, pack_size))
+    elapsed = time.perf_counter() - start
+    latencies = [r["latency_ms"] / 1000.0 for r in metrics.records() if not r["error"]]
+    label = "多模型验证（逐条）" if pack_size <= 1 else f"多模型验证（每次 {pack_size} 个问题）"
+    return summarize(label, latencies, elapsed, answered,
+                     {"请求": len(metrics.records()), "模型数": providers})
+
+
+def bench_workflow(spec: str, items: int, concurrency: int, providers: int, backoff: float) -> dict:
+    metrics = LLMMetrics()
+    gen_llm = make_llm(spec, metrics)
+    verify_llms = {f"{FAKE_PROVIDER}-{i + 1}": make_llm(spec, metrics, f"{FAKE_PROVIDER}-{i + 1}")
+                   for i in range(providers)}
+    config = {
+        "id": 0,
+        "name": "离线压测",
+        "steps": [
+            {"id": "kw", "type": "keyword_generation", "name": "关键词生成",
+             "params": {"num_keywords": items, "generation_mode": "AI生成", "retry_backoff": backoff}},
+            {"id": "gen", "type": "content_creation", "name": "内容创作",
+             "params": {"platforms": ["知乎（专业问答）"], "shard_size": 2, "max_workers": concurrency,
+                        "retry_backoff": backoff}},
+            {"id": "verify", "type": "verification", "name": "验证",
+             "params": {"verify_models": list(verify_llms), "max_keywords": items,
+                        "shard_size": 2, "max_workers": concurrency, "retry_backoff": backoff}},
+        ],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = DataStorage(storage_type="sqlite", db_path=str(Path(tmp) / "bench.db"))
+        executor = WorkflowExecutor(storage, config, callbacks=build_workflow_callbacks(gen_llm, verify_llms))
+        start = time.perf_counter()
+        result = executor.execute({"brand": BRAND, "advantages": ADVANTAGES})
+        elapsed = time.perf_counter() - start
+    context = result.get("context", {})
+    latencies = [r["latency_ms"] / 1000.0 for r in metrics.records() if not r["error"]]
+    return summarize(
+        f"工作流（并发 {concurrency}）", latencies, elapsed, len(context.get("contents", [])),
+        {"状态": result["status"], "LLM 调用": len(metrics.records()),
+         "验证结果": len(context.get("verify_results") or [])},
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="离线吞吐基准（FakeChatModel，无需 API Key）")
+    parser.add_argument("--items", type=int, default=20, help="每个场景的条目数（文章 / 问题 / 关键词）")
+    parser.add_argument("--concurrency", default="1,4,8", help="并发数列表，逗号分隔")
+    parser.add_argument("--providers", type=int, default=3, help="验证模型数")
+    parser.add_argument("--p50", type=float, default=0.3, help="首 token 延迟 P50（秒）")
+    parser.add_argument("--tail", type=float, default=0.05, help="长尾比例")
+    parser.add_argument("--rate-limit", type=float, default=0.03, help="429 比例")
+    parser.add_argument("--tokens", type=int, default=300, help="合成回复字数")
+    parser.add_argument("--tps", type=float, default=1000.0, help="每秒输出字数")
+    parser.add_argument("--backoff", type=float, default=0.2, help="429 退避基数（秒，界面中为 2 秒）")
+    parser.add_argument("--replay", default="", help="录制的 fixture 库路径（GEO_LLM_RECORD 生成）")
+    parser.add_argument("--seed", type=int, default=1, help="随机种子")
+    parser.add_argument("--json", default="", help="结果写入的 JSON 文件")
+    args = parser.parse_args()
+
+    spec = (f"p50={args.p50};tail={args.tail};rate_limit={args.rate_limit};tokens={args.tokens};"
+            f"tps={args.tps};seed={args.seed}")
+    if args.replay:
+        spec += f";replay={args.replay}"
+    levels = [int(c) for c in args.concurrency.split(",") if c.strip()]
+
+    rows = []
+    for c in levels:
+        rows.append(bench_generation(spec, args.items, c, args.backoff))
+    rows.append(bench_verification(spec, args.items, args.providers, 1))
+    rows.append(bench_verification(spec, args.items, args.providers, 5))
+    for c in levels:
+        rows.append(bench_workflow(spec, args.items, c, args.providers, args.backoff))
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"spec": spec, "results": rows}, ensure_ascii=False, indent=2),
+                                   encoding="utf-8")
+        print(f"\n结果已写入 {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+ROI 成本分析基准测试
+
+生成合成 API 调用记录（默认 100 万行），分别计时：
+1. ROIAnalyzer.analyze_costs（pandas 向量化汇总，输入为调用明细 DataFrame）
+2. DataStorage.get_api_call_breakdowns + analyze_cost_breakdowns（SQLite GROUP BY 汇总）
+并校验两条路径的结果一致。
+
+使用方式：
+    python scripts/benchmark_roi_analyzer.py --rows 1000000
+"""
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 项目根目录
+root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root))
+
+from modules.data_storage import DataStorage  # noqa: E402
+from modules.roi_analyzer import ROIAnalyzer  # noqa: E402
+
+
+def make_api_calls(rows: int, brand: str, seed: int = 42) -> pd.DataFrame:
+    """生成 api_calls 表结构的合成数据"""
+    rng = np.random.default_rng(seed)
+    providers = ["DeepSeek", "OpenAI (GPT)", "Tongyi (通义千问)", "Groq", "Moonshot (Kimi)"]
+    operations = ["生成", "验证", "优化", "评分"]
+    platforms = ["知乎（专业问答）", "小红书（种草笔记）", "GitHub（README/文档）", "", None]
+    keywords = [f"关键词{i}" for i in range(5000)] + ["", None]
+
+    input_tokens = rng.integers(100, 4000, rows)
+    output_tokens = rng.integers(100, 3000, rows)
+    cost_usd = (input_tokens * 0.0005 + output_tokens * 0.0015) / 1000.0
+    start = pd.Timestamp("2025-01-01")
+    created_at = start + pd.to_timedelta(rng.integers(0, 180 * 86400, rows), unit="s")
+
+    return pd.DataFrame({
+        "operation_type": rng.choice(operations, rows),
+        "provider": rng.choice(providers, rows),
+        "model": "bench-model",
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": input_tokens + output_tokens,
+        "cost_usd": cost_usd,
+        "cost_cny": cost_usd * 7.2,
+        "keyword": rng.choice(np.array(keywords, dtype=object), rows),
+        "platform": rng.choice(np.array(platforms, dtype=object), rows),
+        "brand": brand,
+        "created_at": created_at.strftime("%Y-%m-%d %H:%M:%S"),
+    })
+
+
+def timed(label: str, func, repeat: int):
+    """重复执行并打印最快耗时"""
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<48} {best:8.3f}s")
+    return result
+
+
+def assert_same(a: dict, b: dict):
+    """校验两条路径的成本分析结果一致（浮点按相对误差比较）"""
+    assert a["total_calls"] == b["total_calls"]
+    assert a["total_tokens"] == b["total_tokens"]
+    assert np.isclose(a["total_cost_cny"], b["total_cost_cny"])
+    for field in ["cost_by_operation", "cost_by_provider", "cost_by_keyword", "cost_by_platform"]:
+        assert a[field].keys() == b[field].keys(), field
+        for key in a[field]:
+            assert a[field][key]["calls"] == b[field][key]["calls"], (field, key)
+            assert np.isclose(a[field][key]["cost_cny"], b[field][key]["cost_cny"]), (field, key)
+    assert [d["date"] for d in a["daily_costs"]] == [d["date"] for d in b["daily_costs"]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ROI 成本分析基准测试")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="合成 API 调用记录行数")
+    parser.add_argument("--repeat", type=int, default=3, help="每项重复次数（取最快）")
+    args = parser.parse_args()
+
+    brand = "基准品牌"
+    analyzer = ROIAnalyzer()
+    print(f"生成 {args.rows:,} 行合成 API 调用记录...")
+    raw = make_api_calls(args.rows, brand)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench.db")
+        storage = DataStorage(storage_type="sqlite", db_path=db_path)
+        with sqlite3.connect(db_path) as conn:
+            raw.to_sql("api_calls", conn, if_exists="append", index=False)
+        # 批量导入绕过了 save_api_call，需重建日汇总表
+        timed("重建日汇总表 rebuild_daily_rollups", storage.rebuild_daily_rollups, 1)
+
+        api_calls_df = timed("加载明细 get_api_calls", lambda: storage.get_api_calls(brand=brand), 1)
+        pandas_result = timed(
+            "analyze_costs（pandas 向量化）", lambda: analyzer.analyze_costs(api_calls_df), args.repeat
+        )
+        sql_result = timed(
+            "get_api_call_breakdowns + analyze_cost_breakdowns",
+            lambda: analyzer.analyze_cost_breakdowns(storage.get_api_call_breakdowns(brand=brand)),
+            args.repeat,
+        )
+
+    assert_same(pandas_result, sql_result)
+    print("两条路径结果一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""
+存储层基准测试（DataStorage）
+
+在 generate_synthetic_db.py 生成的大库上计时：
+1. 读取：每个 get_* / iter_* / list_* 方法（按品牌过滤与不过滤等常用参数组合）
+2. 写入：每个 save_* 方法（写入的数据品牌为 BENCH_BRAND，会留在库中）
+3. 看板：历史记录、数据报表（验证）、ROI 分析各自一次渲染要发起的查询组合，
+   分别走裸 DataStorage（首次渲染）与 CachedStorage（缓存命中后的重跑）
+
+每个用例预热一次后重复执行，记录最快与中位耗时，结果写入 JSON（附带提交、各表行数、库大小）。
+DataStorage 新增的 get_* / save_* 方法若没有对应用例，会在开头提示。
+指定 --baseline 时与之前的结果逐项对比，耗时超过基线 --threshold 倍的用例标记为回归。
+
+使用方式：
+    python scripts/generate_synthetic_db.py --output bench_results/geo_data_synthetic.db
+    python scripts/benchmark_storage.py --db bench_results/geo_data_synthetic.db --repeat 3
+"""
+import argparse
+import json
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# 项目根目录
+root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root))
+
+from modules.data_storage import DataStorage  # noqa: E402
+from modules.roi_analyzer import ROIAnalyzer  # noqa: E402
+from modules.storage_cache import CachedStorage, clear_storage_cache  # noqa: E402
+
+BENCH_BRAND = "__bench__"
+
+
+def scalar(db_path: str, sql: str, default: Any = None) -> Any:
+    with sqlite3.connect(db_path) as conn:
+        row = conn.execute(sql).fetchone()
+    return row[0] if row and row[0] is not None else default
+
+
+def read_cases(storage: DataStorage, brand: str, ids: Dict[str, Any]) -> List[Dict[str, Any]]:
+    month_ago = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
+    return [
+        {"case": "get_keywords(brand)", "func": lambda: storage.get_keywords(brand=brand)},
+        {"case": "get_keywords()", "func": lambda: storage.get_keywords()},
+        {"case": "get_articles(brand)", "func": lambda: storage.get_articles(brand=brand)},
+        {"case": "get_articles(brand, platform)",
+         "func": lambda: storage.get_articles(brand=brand, platform=ids["platform"])},
+        {"case": "iter_articles(brand)", "func": lambda: sum(1 for _ in storage.iter_articles(brand=brand))},
+        {"case": "get_article_by_id", "func": lambda: storage.get_article_by_id(ids["article_id"])},
+        {"case": "get_optimizations(brand)", "func": lambda: storage.get_optimizations(brand=brand)},
+        {"case": "get_verify_results(brand)", "func": lambda: storage.get_verify_results(brand=brand)},
+        {"case": "get_verify_results(brand, include_timestamp)",
+         "func": lambda: storage.get_verify_results(brand=brand, include_timestamp=True)},
+        {"case": "get_verify_results()", "func": lambda: storage.get_verify_results()},
+        # 绕过 get_stats 的进程内缓存，测量实际查询
+        {"case": "get_stats(brand)", "func": lambda: storage._query_stats(brand)},
+        {"case": "get_api_calls(brand)", "func": lambda: storage.get_api_calls(brand=brand)},
+        {"case": "get_api_calls(brand, 最近30天)",
+         "func": lambda: storage.get_api_calls(brand=brand, start_date=month_ago)},
+        {"case": "get_cost_stats(brand)", "func": lambda: storage.get_cost_stats(brand=brand)},
+        {"case": "get_api_call_breakdowns(brand)", "func": lambda: storage.get_api_call_breakdowns(brand=brand)},
+        {"case": "get_daily_mention_stats(brand)", "func": lambda: storage.get_daily_mention_stats(brand=brand)},
+        {"case": "get_workflow", "func": lambda: storage.get_workflow(ids["workflow_id"])},
+        {"case": "list_workflows", "func": lambda: storage.list_workflows()},
+        {"case": "get_workflow_execution", "func": lambda: storage.get_workflow_execution(ids["execution_id"])},
+        {"case": "get_workflow_executions()", "func": lambda: storage.get_workflow_executions()},
+        {"case": "get_workflow_executions(workflow_id)",
+         "func": lambda: storage.get_workflow_executions(workflow_id=ids["workflow_id"])},
+        {"case": "get_workflow_logs", "func": lambda: storage.get_workflow_logs(ids["execution_id"])},
+        {"case": "get_checkpoint", "func": lambda: storage.get_checkpoint(*ids["checkpoint"])},
+        {"case": "get_checkpoint_summary", "func": lambda: storage.get_checkpoint_summary(ids["checkpoint"][0])},
+        {"case": "get_last_scheduled_run_time",
+         "func": lambda: storage.get_last_scheduled_run_time(ids["workflow_id"])},
+        {"case": "get_workflow_runs()", "func": lambda: storage.get_workflow_runs()},
+        {"case": "get_workflow_runs(workflow_id)",
+         "func": lambda: storage.get_workflow_runs(workflow_id=ids["workflow_id"])},
+        {"case": "get_workflow_template", "func": lambda: storage.get_workflow_template(ids["template_id"])},
+        {"case": "get_workflow_templates", "func": lambda: storage.get_workflow_templates()},
+        {"case": "get_platform_account", "func": lambda: storage.get_platform_account("GitHub", brand)},
+        {"case": "list_platform_accounts()", "func": lambda: storage.list_platform_accounts()},
+        {"case": "get_publish_records(brand)", "func": lambda: storage.get_publish_records(brand=brand)},
+        {"case": "get_publish_records(article_id)",
+         "func": lambda: storage.get_publish_records(article_id=ids["article_id"])},
+        {"case": "get_publish_queue_stats(brand)", "func": lambda: storage.get_publish_queue_stats(brand=brand)},
+    ]
+
+
+def write_cases(storage: DataStorage) -> List[Dict[str, Any]]:
+    article = "# 基准写入\n\n" + "示例正文。" * 300
+    counter = {"n": 0}
+
+    def next_id() -> int:
+        counter["n"] += 1
+        return counter["n"]
+
+    verify_batch = [
+        {"问题": f"基准问题{i}", "品牌": BENCH_BRAND, "验证模型": "DeepSeek", "提及次数": i % 3,
+         "位置": "前1/3（优先）" if i % 3 else "未提及"}
+        for i in range(20)
+    ]
+    steps = [{"id": "kw", "type": "keyword_generation", "name": "关键词生成", "params": {}}]
+    return [
+        {"case": "save_keywords(20)",
+         "func": lambda: storage.save_keywords([f"基准关键词{i}" for i in range(20)], BENCH_BRAND)},
+        {"case": "save_article",
+         "func": lambda: storage.save_article("基准关键词", "知乎（专业问答）", article, "bench.md", BENCH_BRAND)},
+        {"case": "save_optimization",
+         "func": lambda: storage.save_optimization(article, article, "基准", "知乎（专业问答）", BENCH_BRAND)},
+        {"case": "save_verify_results(20)", "func": lambda: storage.save_verify_results(verify_batch)},
+        {"case": "save_api_call",
+         "func": lambda: storage.save_api_call("生成", "DeepSeek", "deepseek-chat", 1200, 800, 2000,
+                                               0.002, 0.0144, "基准关键词", "知乎（专业问答）", BENCH_BRAND)},
+        {"case": "save_workflow",
+         "func": lambda: storage.save_workflow({"id": "bench-workflow", "name": "基准", "steps": steps})},
+        {"case": "save_workflow_execution",
+         "func": lambda: storage.save_workflow_execution({
+             "workflow_id": "bench-workflow", "status": "completed", "result": {"status": "completed"},
+             "started_at": datetime.now().isoformat(), "completed_at": datetime.now().isoformat(),
+         })},
+        {"case": "save_checkpoint",
+         "func": lambda: storage.save_checkpoint("bench", "step", f"item-{next_id()}", "0" * 64, {"ok": True})},
+        {"case": "save_workflow_template",
+         "func": lambda: storage.save_workflow_template({"id": "bench-template", "name": "基准", "steps": steps})},
+        {"case": "save_platform_account",
+         "func": lambda: storage.save_platform_account("GitHub", {"account_name": "bench", "config": {}},
+                                                       BENCH_BRAND)},
+        {"case": "save_publish_record",
+         "func": lambda: storage.save_publish_record(1, "GitHub", "api", "success", "https://example.com/bench")},
+    ]
+
+
+def dashboard_cases(storage, brand: str, cached: bool) -> List[Dict[str, Any]]:
+    """各看板一次渲染发起的查询（与 tab_history / tab_reports 中的调用一致）"""
+    analyzer = ROIAnalyzer()
+    label = "缓存" if cached else "首次"
+    # 首次渲染绕过 get_stats 自带的缓存
+    get_stats = storage.get_stats if cached else storage._query_stats
+
+    def history():
+        get_stats(brand)
+        storage.get_articles(brand=brand)
+        storage.get_optimizations(brand=brand)
+        storage.get_verify_results(brand=brand)
+
+    def verification():
+        storage.get_keywords(brand=brand)
+        storage.get_verify_results(brand=brand, include_timestamp=True)
+        storage.get_daily_mention_stats(brand=brand)
+        storage.get_articles(brand=brand)
+
+    def roi():
+        verify_df = storage.get_verify_results(brand=brand, include_timestamp=True)
+        cost_analysis = analyzer.analyze_cost_breakdowns(storage.get_api_call_breakdowns(brand=brand), verify_df)
+        analyzer.get_optimization_suggestions(cost_analysis)
+        analyzer.estimate_future_cost_from_daily(cost_analysis["daily_costs"], days=30)
+
+    return [
+        {"case": f"看板·历史记录（{label}）", "func": history},
+        {"case": f"看板·数据报表验证（{label}）", "func": verification},
+        {"case": f"看板·ROI 分析（{label}）", "func": roi},
+    ]
+
+
+def uncovered_methods(cases: List[Dict[str, Any]]) -> List[str]:
+    """DataStorage 中没有对应用例的 get_* / save_* / iter_* / list_* 方法"""
+    covered = {case["case"].split("(")[0] for case in cases}
+    public = [name for name in dir(DataStorage)
+              if name.startswith(("get_", "save_", "iter_", "list_")) and callable(getattr(DataStorage, name))]
+    return [name for name in public if name not in covered]
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    func()  # 预热（同时让 SQLite 页缓存就绪）
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {"min_s": min(times), "median_s": statistics.median(times)}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: Path, threshold: float) -> List[str]:
+    """与基线逐项对比（按最快耗时），返回回归用例描述"""
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    base = {r["case"]: r for r in baseline.get("results", [])}
+    regressions = []
+    print(f"\n对比基线 {baseline_path}（提交 {baseline.get('meta', {}).get('commit', '?')}）：")
+    for r in results:
+        b = base.get(r["case"])
+        if not b or b["min_s"] <= 0:
+            continue
+        ratio = r["min_s"] / b["min_s"]
+        flag = "⚠️ 回归" if ratio > threshold else ("✅ 提升" if ratio < 1 / threshold else "")
+        print(f"  {r['case']:<48} {b['min_s'] * 1000:10.2f} → {r['min_s'] * 1000:10.2f} ms  ×{ratio:.2f} {flag}")
+        if ratio > threshold:
+            regressions.append(f"{r['case']} ×{ratio:.2f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="存储层基准测试（DataStorage）")
+    parser.add_argument("--db", default="bench_results/geo_data_synthetic.db",
+                        help="generate_synthetic_db.py 生成的数据库")
+    parser.add_argument("--brand", default="", help="读取与看板用例的品牌（默认取文章最多的品牌）")
+    parser.add_argument("--groups", default="read,write,dashboard", help="用例组，逗号分隔（read / write / dashboard）")
+    parser.add_argument("--repeat", type=int, default=3, help="每个用例重复次数")
+    parser.add_argument("--cases", default="", help="只运行名称包含该字符串的用例")
+    parser.add_argument("--output", default="", help="结果 JSON 路径（默认 bench_results/storage-<提交>.json）")
+    parser.add_argument("--baseline", default="", help="对比的基线结果 JSON")
+    parser.add_argument("--threshold", type=float, default=1.25, help="耗时超过基线该倍数视为回归")
+    parser.add_argument("--fail-on-regression", action="store_true", help="存在回归时以非零状态退出")
+    args = parser.parse_args()
+
+    if not Path(args.db).exists():
+        sys.exit(f"{args.db} 不存在，请先运行 scripts/generate_synthetic_db.py 生成数据库")
+
+    db_path = args.db
+    storage = DataStorage(storage_type="sqlite", db_path=db_path)
+    brand = args.brand or scalar(
+        db_path, "SELECT brand FROM articles GROUP BY brand ORDER BY COUNT(*) DESC LIMIT 1", "示例品牌"
+    )
+    workflow_id = scalar(
+        db_path, "SELECT workflow_id FROM workflow_executions GROUP BY workflow_id ORDER BY COUNT(*) DESC LIMIT 1", ""
+    )
+    with sqlite3.connect(db_path) as conn:
+        checkpoint = conn.execute(
+            "SELECT run_key, step_key, item_key FROM run_checkpoints ORDER BY id LIMIT 1"
+        ).fetchone() or ("", "", "")
+        tables = [row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+        )]
+        row_counts = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in tables}
+    ids = {
+        "article_id": max(1, scalar(db_path, "SELECT MAX(id) FROM articles", 1) // 2),
+        "execution_id": max(1, scalar(db_path, "SELECT MAX(id) FROM workflow_executions", 1) // 2),
+        "workflow_id": workflow_id,
+        "template_id": scalar(db_path, "SELECT id FROM workflow_templates ORDER BY id LIMIT 1", ""),
+        "platform": scalar(
+            db_path, "SELECT platform FROM articles GROUP BY platform ORDER BY COUNT(*) DESC LIMIT 1", ""
+        ),
+        "checkpoint": tuple(checkpoint),
+    }
+
+    groups = {g.strip() for g in args.groups.split(",") if g.strip()}
+    by_group = {
+        "read": read_cases(storage, brand, ids),
+        "write": write_cases(storage),
+        "dashboard": dashboard_cases(storage, brand, False) + dashboard_cases(CachedStorage(storage), brand, True),
+    }
+    missing = uncovered_methods(by_group["read"] + by_group["write"])
+    if missing:
+        print(f"⚠️ 以下方法没有基准用例：{', '.join(missing)}\n")
+    clear_storage_cache()
+    cases = [dict(case, group=group) for group, group_cases in by_group.items() if group in groups
+             for case in group_cases]
+
+    size_mb = Path(db_path).stat().st_size / 1024 / 1024
+    print(f"数据库 {db_path}（{size_mb:.0f} MB），品牌 {brand}，"
+          f"verify_results {row_counts.get('verify_results', 0):,} 行，api_calls {row_counts.get('api_calls', 0):,} 行\n")
+
+    commit = git_commit()
+    results = []
+    for case in cases:
+        if args.cases and args.cases not in case["case"]:
+            continue
+        timing = measure(case["func"], args.repeat)
+        results.append({"group": case["group"], "case": case["case"], "repeat": args.repeat,
+                        **{k: round(v, 6) for k, v in timing.items()}})
+        print(f"{case['group']:<10} {case['case']:<48} "
+              f"最快 {timing['min_s'] * 1000:10.2f} ms  中位 {timing['median_s'] * 1000:10.2f} ms")
+
+    output = Path(args.output) if args.output else root / "bench_results" / f"storage-{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "meta": {
+            "commit": commit,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "db": str(db_path),
+            "db_size_mb": round(size_mb, 1),
+            "brand": brand,
+            "rows": row_counts,
+        },
+        "results": results,
+    }
+    output.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n结果已写入 {output}")
+
+    if args.baseline:
+        regressions = compare(results, Path(args.baseline), args.threshold)
+        if regressions:
+            print("\n回归：\n  " + "\n  ".join(regressions))
+            if args.fail_on_regression:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
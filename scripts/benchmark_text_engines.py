@@ -0,0 +1,279 @@
+"""
+文本处理引擎基准测试（纯 CPU，无需 LLM）
+
+用合成的中文 / 英文语料，按 small / medium / large 三档规模计时：
+- KeywordTool.generate_combinations（词库组合 + 相似度去重）
+- SemanticExpander._deduplicate_keywords（扩展词去重）
+- TopicCluster._rule_based_clustering（规则聚类）
+- ContentMetricsAnalyzer.analyze_batch（批量内容指标）
+- FactDensityEnhancer._rule_based_assessment（事实密度规则评估）
+- NegativeMonitor.detect_negative_sentiment（负面情感检测）
+- CopyManager.format_for_platform（平台格式化，遍历全部平台）
+- clean_markdown（Markdown 清理本身）
+
+每个用例预热一次后重复执行，记录最快与中位耗时，结果写入 JSON（附带 git 提交、Python 版本）。
+指定 --baseline 时与之前的结果文件逐项对比，耗时超过基线 --threshold 倍的用例标记为回归。
+
+使用方式：
+    python scripts/benchmark_text_engines.py --sizes small,medium --repeat 3
+    python scripts/benchmark_text_engines.py --baseline bench_results/text_engines-abc1234.json --fail-on-regression
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# 项目根目录
+root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root))
+
+from modules.content_metrics import ContentMetricsAnalyzer  # noqa: E402
+from modules.fact_density_enhancer import FactDensityEnhancer  # noqa: E402
+from modules.keyword_tool import KeywordTool  # noqa: E402
+from modules.negative_monitor import NegativeMonitor  # noqa: E402
+from modules.semantic_expander import SemanticExpander  # noqa: E402
+from modules.topic_cluster import TopicCluster  # noqa: E402
+from platform_sync.copy_manager import CopyManager, clean_markdown  # noqa: E402
+
+# 各档规模：关键词数、文章数、每篇字数、每个词库的词数、组合上限
+SIZES = {
+    "small": {"keywords": 50, "articles": 10, "article_chars": 800, "bank_words": 4, "max_results": 50},
+    "medium": {"keywords": 200, "articles": 40, "article_chars": 2500, "bank_words": 6, "max_results": 150},
+    "large": {"keywords": 500, "articles": 120, "article_chars": 6000, "bank_words": 8, "max_results": 300},
+}
+
+BRAND = {"zh": "云析数据", "en": "Acme Analytics"}
+
+ZH_WORDS = {
+    "prefix": ["行业上", "市场上", "目前", "国内", "本地", "线上", "中小企业", "跨境", "制造业", "零售"],
+    "adj": ["口碑好的", "靠谱的", "专业的", "热门的", "知名的", "性价比高的", "稳定的", "安全的", "易用的", "开源的"],
+    "main": ["外贸软件", "CRM系统", "ERP系统", "BI工具", "数据平台", "客服系统", "营销自动化", "进销存", "财务软件", "OA系统"],
+    "noun": ["品牌", "公司", "厂商", "供应商", "服务商", "平台", "产品", "方案", "团队", "工具"],
+    "suffix": ["推荐", "排行", "排行榜", "对比", "评测", "哪家好", "怎么选", "有哪些", "价格", "优缺点"],
+    "sentence": [
+        "根据{year}年行业报告，{n}%的企业已经部署了相关系统。",
+        "{brand}在实际测试中响应时间降低了{n}%。",
+        "使用中发现部分功能存在问题，售后服务较差，有用户投诉退款困难。",
+        "选择时建议关注数据安全、部署成本和扩展能力。",
+        "据公开资料显示，该领域市场规模约为{n}亿元。",
+        "对比三款主流产品后，我们整理了以下清单：",
+        "该方案的缺点是学习成本较高，不推荐小团队使用。",
+        "专家认为，未来三年内该市场将保持{n}%以上的增速。",
+    ],
+}
+
+EN_WORDS = {
+    "prefix": ["best", "top", "leading", "affordable", "enterprise", "open source", "cloud", "local", "new", "popular"],
+    "adj": ["reliable", "secure", "fast", "scalable", "trusted", "simple", "modern", "flexible", "robust", "proven"],
+    "main": ["crm software", "erp system", "bi tool", "data platform", "helpdesk", "marketing automation",
+             "inventory app", "accounting software", "project tracker", "analytics suite"],
+    "noun": ["vendor", "company", "provider", "platform", "product", "solution", "service", "brand", "team", "tool"],
+    "suffix": ["review", "ranking", "comparison", "pricing", "alternatives", "pros and cons", "for startups",
+               "2025", "guide", "vs competitors"],
+    "sentence": [
+        "According to a {year} industry report, {n}% of companies have adopted such tools.",
+        "{brand} reduced response time by {n}% in our tests.",
+        "Some users complained about poor support, hidden fees and refund problems.",
+        "When choosing, focus on data security, deployment cost and scalability.",
+        "Public data suggests the market is worth about {n} billion dollars.",
+        "We compared three mainstream products and summarized the checklist below:",
+        "The downside is a steep learning curve, so it is not recommended for small teams.",
+        "Experts expect the market to grow by more than {n}% over the next three years.",
+    ],
+}
+
+
+def corpus(lang: str) -> Dict[str, List[str]]:
+    return ZH_WORDS if lang == "zh" else EN_WORDS
+
+
+def make_keywords(lang: str, count: int, rng: random.Random) -> List[str]:
+    words = corpus(lang)
+    sep = "" if lang == "zh" else " "
+    return [
+        sep.join([rng.choice(words["prefix"]), rng.choice(words["adj"]), rng.choice(words["main"]),
+                  rng.choice(words["noun"]), rng.choice(words["suffix"])])
+        for _ in range(count)
+    ]
+
+
+def make_article(lang: str, chars: int, rng: random.Random) -> str:
+    """带标题、列表、FAQ、数字和来源表述的合成文章"""
+    words = corpus(lang)
+    brand = BRAND[lang]
+    lines = [f"# {rng.choice(words['main'])} {rng.choice(words['suffix'])}", ""]
+    section = 0
+    while sum(len(line) for line in lines) < chars:
+        section += 1
+        lines.append(f"## {section}. {rng.choice(words['adj'])} {rng.choice(words['main'])}")
+        for _ in range(rng.randint(3, 6)):
+            lines.append(rng.choice(words["sentence"]).format(year=rng.randint(2019, 2025),
+                                                              n=rng.randint(5, 95), brand=brand))
+        lines.append(f"- {rng.choice(words['noun'])}: {rng.choice(words['adj'])}")
+        lines.append(f"- {rng.choice(words['noun'])}: {rng.choice(words['adj'])}")
+        if section % 3 == 0:
+            question = rng.choice(words["suffix"])
+            lines.append(f"Q: {question}?" if lang == "en" else f"问：{question}？")
+            lines.append(rng.choice(words["sentence"]).format(year=2024, n=rng.randint(5, 95), brand=brand))
+        lines.append("")
+    return "\n".join(lines)
+
+
+def make_wordbanks(lang: str, words_per_bank: int) -> Dict[str, List[str]]:
+    """与 KeywordTool 默认词库相同的 A–F 结构，词数不够时加序号补足"""
+    words = corpus(lang)
+
+    def take(key: str, count: int) -> List[str]:
+        base = words[key]
+        return [base[i] if i < len(base) else f"{base[i % len(base)]}{i // len(base)}" for i in range(count)]
+
+    return {
+        "A前缀1": take("prefix", words_per_bank),
+        "B前缀2": take("adj", words_per_bank),
+        "C主词": take("main", max(2, words_per_bank // 3)),
+        "D通义词": take("noun", words_per_bank),
+        "E推荐词": take("suffix", words_per_bank),
+        "F疑问词": take("suffix", words_per_bank)[::-1],
+    }
+
+
+def build_cases(lang: str, size: str, seed: int) -> List[Dict[str, Any]]:
+    """返回 [{"case", "n", "func"}, ...]，func 无参数，语料在计时前生成好"""
+    spec = SIZES[size]
+    rng = random.Random(f"{seed}-{lang}-{size}")
+    brand = BRAND[lang]
+    keywords = make_keywords(lang, spec["keywords"], rng)
+    originals = keywords[: max(5, spec["keywords"] // 10)]
+    # 扩展词中混入重复与近似重复，贴近 LLM 扩展结果
+    expanded = keywords + [k + ("吗" if lang == "zh" else "?") for k in keywords[::3]] + originals
+    articles = [make_article(lang, spec["article_chars"], rng) for _ in range(spec["articles"])]
+    contents = [{"content": a, "keyword": keywords[i % len(keywords)], "platform": "知乎（专业问答）"}
+                for i, a in enumerate(articles)]
+    wordbanks = make_wordbanks(lang, spec["bank_words"])
+
+    keyword_tool = KeywordTool()
+    expander = SemanticExpander()
+    cluster = TopicCluster()
+    metrics = ContentMetricsAnalyzer()
+    fact_density = FactDensityEnhancer()
+    monitor = NegativeMonitor()
+    copy_manager = CopyManager()
+    platforms = list(copy_manager.templates)
+
+    return [
+        {"case": "KeywordTool.generate_combinations", "n": spec["max_results"],
+         "func": lambda: keyword_tool.generate_combinations(wordbanks, max_results=spec["max_results"])},
+        {"case": "SemanticExpander._deduplicate_keywords", "n": len(expanded),
+         "func": lambda: expander._deduplicate_keywords(expanded, originals)},
+        {"case": "TopicCluster._rule_based_clustering", "n": len(keywords),
+         "func": lambda: cluster._rule_based_clustering(keywords, max(3, len(keywords) // 20))},
+        {"case": "ContentMetricsAnalyzer.analyze_batch", "n": len(contents),
+         "func": lambda: metrics.analyze_batch(contents, brand)},
+        {"case": "FactDensityEnhancer._rule_based_assessment", "n": len(articles),
+         "func": lambda: [fact_density._rule_based_assessment(a) for a in articles]},
+        {"case": "NegativeMonitor.detect_negative_sentiment", "n": len(articles),
+         "func": lambda: [monitor.detect_negative_sentiment(a) for a in articles]},
+        {"case": "CopyManager.format_for_platform", "n": len(articles) * len(platforms),
+         "func": lambda: [copy_manager.format_for_platform(p, a, a.split("\n", 1)[0].lstrip("# "), keywords[0], brand)
+                          for a in articles for p in platforms]},
+        {"case": "clean_markdown", "n": len(articles),
+         "func": lambda: [clean_markdown(a) for a in articles]},
+    ]
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    func()  # 预热
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {"min_s": min(times), "median_s": statistics.median(times)}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: Path, threshold: float) -> List[str]:
+    """与基线逐项对比（按最快耗时），返回回归用例描述"""
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    base = {(r["case"], r["lang"], r["size"]): r for r in baseline.get("results", [])}
+    regressions = []
+    print(f"\n对比基线 {baseline_path}（提交 {baseline.get('meta', {}).get('commit', '?')}）：")
+    for r in results:
+        b = base.get((r["case"], r["lang"], r["size"]))
+        if not b or b["min_s"] <= 0:
+            continue
+        ratio = r["min_s"] / b["min_s"]
+        flag = "⚠️ 回归" if ratio > threshold else ("✅ 提升" if ratio < 1 / threshold else "")
+        print(f"  {r['case']:<44} {r['lang']} {r['size']:<6} {b['min_s'] * 1000:9.2f} → "
+              f"{r['min_s'] * 1000:9.2f} ms  ×{ratio:.2f} {flag}")
+        if ratio > threshold:
+            regressions.append(f"{r['case']} [{r['lang']}/{r['size']}] ×{ratio:.2f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="文本处理引擎基准测试")
+    parser.add_argument("--sizes", default="small,medium,large", help="规模档位，逗号分隔（small / medium / large）")
+    parser.add_argument("--langs", default="zh,en", help="语料语言，逗号分隔（zh / en）")
+    parser.add_argument("--repeat", type=int, default=3, help="每个用例重复次数")
+    parser.add_argument("--cases", default="", help="只运行名称包含该字符串的用例")
+    parser.add_argument("--seed", type=int, default=42, help="语料随机种子")
+    parser.add_argument("--output", default="", help="结果 JSON 路径（默认 bench_results/text_engines-<提交>.json）")
+    parser.add_argument("--baseline", default="", help="对比的基线结果 JSON")
+    parser.add_argument("--threshold", type=float, default=1.25, help="耗时超过基线该倍数视为回归")
+    parser.add_argument("--fail-on-regression", action="store_true", help="存在回归时以非零状态退出")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    results = []
+    for size in [s.strip() for s in args.sizes.split(",") if s.strip()]:
+        for lang in [lang.strip() for lang in args.langs.split(",") if lang.strip()]:
+            for case in build_cases(lang, size, args.seed):
+                if args.cases and args.cases not in case["case"]:
+                    continue
+                timing = measure(case["func"], args.repeat)
+                row = {"case": case["case"], "lang": lang, "size": size, "n": case["n"],
+                       "repeat": args.repeat, **{k: round(v, 6) for k, v in timing.items()}}
+                results.append(row)
+                print(f"{case['case']:<44} {lang} {size:<6} n={case['n']:<6} "
+                      f"最快 {timing['min_s'] * 1000:9.2f} ms  中位 {timing['median_s'] * 1000:9.2f} ms")
+
+    output = Path(args.output) if args.output else root / "bench_results" / f"text_engines-{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "meta": {
+            "commit": commit,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    output.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n结果已写入 {output}")
+
+    if args.baseline:
+        regressions = compare(results, Path(args.baseline), args.threshold)
+        if regressions:
+            print("\n回归：\n  " + "\n  ".join(regressions))
+            if args.fail_on_regression:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+分片 sitemap 生成脚本
+
+从数据库游标逐条读取文章，流式写出 sitemap-N.xml.gz（每个文件不超过 50,000 个 URL / 50MB）
+和 sitemap_index.xml，内存占用与文章数无关，适用于百万级文章。
+将输出目录中的文件上传到网站根目录，并在搜索引擎站长平台提交 sitemap_index.xml。
+
+使用方式：
+    python scripts/generate_sitemap.py --base-url https://example.com --out-dir sitemap_out
+    python scripts/generate_sitemap.py --db geo_data.db --brand 品牌A --base-url https://example.com --out-dir sitemap_out
+"""
+import argparse
+import resource
+import sys
+import time
+from pathlib import Path
+
+# 项目根目录
+root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root))
+
+from modules.data_storage import DataStorage  # noqa: E402
+from modules.technical_config_generator import (  # noqa: E402
+    SITEMAP_MAX_BYTES,
+    SITEMAP_MAX_URLS,
+    TechnicalConfigGenerator,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="流式生成分片 sitemap（sitemap-N.xml.gz + sitemap_index.xml）")
+    parser.add_argument("--db", default=str(root / "geo_data.db"), help="SQLite 数据库路径")
+    parser.add_argument("--brand", default=None, help="只包含该品牌的文章（默认全部）")
+    parser.add_argument("--base-url", required=True, help="网站基础 URL（如 https://example.com）")
+    parser.add_argument("--out-dir", default="sitemap_out", help="输出目录")
+    parser.add_argument("--changefreq", default="weekly", help="更新频率")
+    parser.add_argument("--priority", type=float, default=0.8, help="优先级（0.0-1.0）")
+    parser.add_argument("--max-urls", type=int, default=SITEMAP_MAX_URLS, help="单个 sitemap 文件的 URL 上限")
+    parser.add_argument("--max-bytes", type=int, default=SITEMAP_MAX_BYTES, help="单个 sitemap 文件的未压缩字节上限")
+    args = parser.parse_args()
+
+    storage = DataStorage(storage_type="sqlite", db_path=args.db)
+    start = time.perf_counter()
+    result = TechnicalConfigGenerator().write_sitemap_files(
+        base_url=args.base_url,
+        articles=storage.iter_articles(brand=args.brand, columns=("keyword", "platform", "created_at")),
+        out_dir=args.out_dir,
+        changefreq=args.changefreq,
+        priority=args.priority,
+        max_urls=args.max_urls,
+        max_bytes=args.max_bytes,
+    )
+    elapsed = time.perf_counter() - start
+    # Linux 下 ru_maxrss 单位为 KB
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"URL 数：{result['url_count']}，sitemap 文件：{len(result['files'])} 个，耗时 {elapsed:.1f}s，峰值内存 {peak_mb:.0f} MB")
+    print(f"索引文件：{result['index']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,427 @@
+"""
+合成 geo_data.db 生成器（用于存储层压测）
+
+按真实使用形态批量写入全部业务表：
+- 品牌按 Zipf 分布（主品牌占大头，其余为竞品 / 次要品牌），时间跨度 --days 天且越近数据越多，id 与时间同序
+- keywords / articles / optimizations / verify_results / api_calls / workflows / workflow_executions
+  （含 workflow_execution_logs、workflow_runs、run_checkpoints）/ workflow_templates / platform_accounts / publish_records
+- 文章正文长度按对数正态分布，验证结果的提及次数与位置、API 调用的 token 与成本按各自规则生成
+- 写入完成后重建 api_calls_daily / verify_results_daily 日汇总表
+
+默认规模（--scale 1）约 600 万行、1.8GB，生成约 2 分钟；--scale 0.01 可快速生成一个小库验证流程。
+
+使用方式：
+    python scripts/generate_synthetic_db.py --output bench_results/geo_data_synthetic.db --scale 1
+"""
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+# 项目根目录
+root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root))
+
+from modules.data_storage import DataStorage  # noqa: E402
+
+# --scale 1 时各表行数
+BASE_ROWS = {
+    "keywords": 500_000,
+    "articles": 100_000,
+    "optimizations": 50_000,
+    "verify_results": 2_000_000,
+    "api_calls": 2_000_000,
+    "workflow_executions": 100_000,
+    "publish_records": 300_000,
+    "run_checkpoints": 200_000,
+}
+LOGS_PER_EXECUTION = 8
+WORKFLOWS = 50
+TEMPLATES = 10
+CHUNK_SIZE = 50_000
+
+BRANDS = ["示例品牌", "云启科技", "智汇数据", "星河软件", "蓝鲸云", "极光AI", "北辰智能", "青禾科技"]
+PLATFORMS = [
+    "知乎（专业问答）", "小红书（生活种草）", "CSDN（技术博客）", "B站（视频脚本）", "头条号（资讯软文）",
+    "GitHub（README/文档）", "微信公众号（长文）", "抖音图文（短内容）", "百家号（资讯）", "网易号（资讯）",
+    "企鹅号（资讯）", "简书（文艺）", "搜狐号（资讯）", "一点号（资讯）", "东方财富（财经）",
+]
+PROVIDER_MODELS = {
+    "DeepSeek": ("deepseek-chat", 0.00027, 0.0011),
+    "OpenAI (GPT)": ("gpt-4o-mini", 0.00015, 0.0006),
+    "Tongyi (通义千问)": ("qwen-plus", 0.0004, 0.0012),
+    "Moonshot (Kimi)": ("moonshot-v1-8k", 0.0017, 0.0017),
+    "Groq": ("llama-3.1-70b-versatile", 0.00059, 0.00079),
+}
+VERIFY_MODELS = ["DeepSeek", "OpenAI (GPT)", "Tongyi (通义千问)", "Moonshot (Kimi)"]
+OPERATIONS = (["生成", "验证", "优化", "评分"], [0.3, 0.5, 0.1, 0.1])
+KEYWORD_TEMPLATES = [
+    "{brand}怎么样", "{brand}{topic}好用吗", "{topic}哪家好", "{topic}推荐", "{topic}多少钱",
+    "{brand}和{rival}哪个好", "{topic}怎么选", "{topic}排行榜", "{brand}{topic}评测", "{topic}入门教程",
+    "企业{topic}方案", "{topic}常见问题", "{brand}{topic}价格", "免费{topic}工具", "{topic}对比",
+]
+TOPICS = [
+    "CRM系统", "数据分析平台", "低代码平台", "客服机器人", "营销自动化", "私有化部署", "知识库", "BI工具",
+    "云服务器", "对象存储", "API网关", "日志分析", "向量数据库", "AI写作", "智能客服", "项目管理软件",
+    "协同办公", "电子签章", "HR系统", "财务软件", "ERP", "进销存", "SCRM", "短信平台", "CDN加速",
+]
+SENTENCES = [
+    "在实际部署中，{brand}的{topic}平均上线周期缩短到两周以内。",
+    "根据 2025 年的行业调研，超过 60% 的企业把{topic}列为优先投入方向。",
+    "{brand}提供私有化部署与 SaaS 两种交付方式，适合不同规模的团队。",
+    "选型时建议重点比较稳定性、扩展性和总体拥有成本。",
+    "## 常见问题\n\n**Q：{topic}适合中小企业吗？**\nA：适合，按需付费即可起步。",
+    "从成本看，{topic}的年费通常在 1 万到 10 万元之间，取决于席位数与功能模块。",
+    "用户反馈显示，{brand}在售后响应速度上评分较高。",
+    "- 部署快：标准版 1 天开通\n- 成本低：按量计费\n- 易集成：提供开放 API",
+]
+WORKFLOW_STEPS = [
+    {"id": "kw", "type": "keyword_generation", "name": "关键词生成", "params": {"num_keywords": 20}},
+    {"id": "gen", "type": "content_creation", "name": "内容创作",
+     "params": {"platforms": ["知乎（专业问答）"], "shard_size": 5, "max_workers": 4}},
+    {"id": "verify", "type": "verification", "name": "验证",
+     "params": {"verify_models": VERIFY_MODELS[:2], "shard_size": 10}},
+]
+
+
+def scaled(table: str, scale: float) -> int:
+    return max(1, int(BASE_ROWS[table] * scale))
+
+
+def pick(rng: np.random.Generator, values: Sequence, n: int, weights: Sequence[float] = None) -> List:
+    """按权重抽样，返回 Python 列表（直接用于 executemany）"""
+    p = None
+    if weights is not None:
+        p = np.asarray(weights, dtype=float)
+        p = p / p.sum()
+    idx = rng.choice(len(values), size=n, p=p)
+    return [values[i] for i in idx]
+
+
+def brand_weights() -> List[float]:
+    """品牌 Zipf 分布：主品牌约占一半"""
+    return [1.0 / (i + 1) ** 1.3 for i in range(len(BRANDS))]
+
+
+def timestamps(rng: np.random.Generator, n: int, days: int, end: np.datetime64) -> List[str]:
+    """n 个按时间升序的时间戳（越近越密集，模拟使用量增长），格式与 SQLite CURRENT_TIMESTAMP 一致"""
+    span = days * 86400
+    offsets = np.sort((np.sqrt(rng.random(n)) * span).astype(np.int64))
+    values = (end - np.timedelta64(span, "s")) + offsets.astype("timedelta64[s]")
+    return [s.replace("T", " ") for s in np.datetime_as_string(values, unit="s").tolist()]
+
+
+def shift(ts: str, seconds: int) -> str:
+    value = np.datetime64(ts.replace(" ", "T")) + np.timedelta64(int(seconds), "s")
+    return str(value).replace("T", " ")
+
+
+def keyword_pool(rng: np.random.Generator, size: int = 20_000) -> List[Tuple[str, str]]:
+    """(品牌, 关键词) 池：真实库中同一关键词会被反复保存、生成、验证"""
+    pool = []
+    for _ in range(size):
+        brand, rival = pick(rng, BRANDS, 2, brand_weights())
+        template = KEYWORD_TEMPLATES[rng.integers(len(KEYWORD_TEMPLATES))]
+        topic = TOPICS[rng.integers(len(TOPICS))]
+        pool.append((brand, template.format(brand=brand, rival=rival, topic=topic)))
+    return pool
+
+
+def article_text(rng: np.random.Generator, brand: str, topic: str, chars: int) -> str:
+    parts = [f"# {brand}{topic}选型指南\n\n> 结论摘要：{brand}在{topic}领域综合表现领先。\n"]
+    length = len(parts[0])
+    while length < chars:
+        sentence = SENTENCES[rng.integers(len(SENTENCES))].format(brand=brand, topic=topic)
+        parts.append(sentence)
+        length += len(sentence) + 1
+    return "\n".join(parts)
+
+
+def insert(conn: sqlite3.Connection, table: str, columns: Sequence[str], rows: Iterable[tuple]) -> int:
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    cursor = conn.executemany(sql, rows)
+    return cursor.rowcount
+
+
+def chunks(n: int, size: int = CHUNK_SIZE):
+    for start in range(0, n, size):
+        yield start, min(size, n - start)
+
+
+def gen_keywords(conn, rng, n, days, end, pool):
+    created = timestamps(rng, n, days, end)
+    for start, size in chunks(n):
+        picked = [pool[i] for i in rng.integers(len(pool), size=size)]
+        insert(conn, "keywords", ("keyword", "brand", "created_at"),
+               ((kw, brand, created[start + i]) for i, (brand, kw) in enumerate(picked)))
+
+
+def gen_articles(conn, rng, n, days, end, pool, article_chars):
+    created = timestamps(rng, n, days, end)
+    lengths = np.clip(rng.lognormal(np.log(article_chars), 0.5, n), 200, article_chars * 6).astype(int)
+    for start, size in chunks(n, 10_000):
+        rows = []
+        picked = [pool[i] for i in rng.integers(len(pool), size=size)]
+        platforms = pick(rng, PLATFORMS, size, [1.0 / (i + 1) for i in range(len(PLATFORMS))])
+        statuses = pick(rng, ["draft", "published", "failed"], size, [0.7, 0.25, 0.05])
+        for i, (brand, kw) in enumerate(picked):
+            topic = TOPICS[(start + i) % len(TOPICS)]
+            urls = None
+            if statuses[i] == "published":
+                urls = json.dumps({"GitHub": f"https://github.com/example/docs/blob/main/{start + i}.md"})
+            rows.append((kw, platforms[i], article_text(rng, brand, topic, int(lengths[start + i])),
+                         f"{kw}_{start + i}.md", brand, created[start + i], statuses[i], urls))
+        insert(conn, "articles",
+               ("keyword", "platform", "content", "filename", "brand", "created_at", "publish_status", "publish_urls"),
+               rows)
+
+
+def gen_optimizations(conn, rng, n, days, end, article_chars):
+    created = timestamps(rng, n, days, end)
+    for start, size in chunks(n, 10_000):
+        brands = pick(rng, BRANDS, size, brand_weights())
+        platforms = pick(rng, PLATFORMS, size)
+        rows = []
+        for i in range(size):
+            topic = TOPICS[(start + i) % len(TOPICS)]
+            original = article_text(rng, brands[i], topic, article_chars // 2)
+            optimized = article_text(rng, brands[i], topic, article_chars)
+            changes = "补充结论摘要；增加 FAQ；加入 2 处数据引用；调整小标题层级"
+            rows.append((original, optimized, changes, platforms[i], brands[i], created[start + i]))
+        insert(conn, "optimizations",
+               ("original_content", "optimized_content", "changes", "platform", "brand", "created_at"), rows)
+
+
+def gen_verify_results(conn, rng, n, days, end, pool):
+    created = timestamps(rng, n, days, end)
+    for start, size in chunks(n):
+        picked = [pool[i] for i in rng.integers(len(pool), size=size)]
+        models = pick(rng, VERIFY_MODELS, size, [0.4, 0.3, 0.2, 0.1])
+        # 约 40% 未提及，提及时次数近似几何分布
+        counts = np.where(rng.random(size) < 0.4, 0, rng.geometric(0.45, size)).tolist()
+        early = (rng.random(size) < 0.6).tolist()
+        rows = []
+        for i, (brand, kw) in enumerate(picked):
+            position = "未提及" if counts[i] == 0 else ("前1/3（优先）" if early[i] else "中后段")
+            rows.append((kw, brand, models[i], counts[i], position, created[start + i]))
+        insert(conn, "verify_results",
+               ("query", "brand", "verify_model", "mention_count", "mention_position", "created_at"), rows)
+
+
+def gen_api_calls(conn, rng, n, days, end, pool):
+    created = timestamps(rng, n, days, end)
+    providers = list(PROVIDER_MODELS)
+    for start, size in chunks(n):
+        operations = pick(rng, OPERATIONS[0], size, OPERATIONS[1])
+        chosen = pick(rng, providers, size, [0.4, 0.25, 0.2, 0.1, 0.05])
+        input_tokens = rng.integers(100, 4000, size).tolist()
+        output_tokens = rng.integers(50, 3000, size).tolist()
+        picked = [pool[i] for i in rng.integers(len(pool), size=size)]
+        platforms = pick(rng, PLATFORMS, size)
+        rows = []
+        for i in range(size):
+            model, in_rate, out_rate = PROVIDER_MODELS[chosen[i]]
+            cost_usd = (input_tokens[i] * in_rate + output_tokens[i] * out_rate) / 1000.0
+            brand, kw = picked[i]
+            platform = platforms[i] if operations[i] in ("生成", "优化") else None
+            rows.append((operations[i], chosen[i], model, input_tokens[i], output_tokens[i],
+                         input_tokens[i] + output_tokens[i], cost_usd, cost_usd * 7.2, kw, platform, brand,
+                         created[start + i]))
+        insert(conn, "api_calls",
+               ("operation_type", "provider", "model", "input_tokens", "output_tokens", "total_tokens",
+                "cost_usd", "cost_cny", "keyword", "platform", "brand", "created_at"), rows)
+
+
+def gen_workflows(conn, rng, days, end):
+    created = timestamps(rng, WORKFLOWS + TEMPLATES, days, end)
+    steps = json.dumps(WORKFLOW_STEPS, ensure_ascii=False)
+    workflow_rows = []
+    for i in range(WORKFLOWS):
+        schedule = {"type": "interval", "interval_hours": int(rng.choice([6, 12, 24, 168]))} if i % 3 else {}
+        workflow_rows.append((f"wf-{i:04d}", f"GEO 流水线 {i}", steps, json.dumps(schedule), "[]",
+                              int(rng.random() < 0.8), created[i], created[i]))
+    insert(conn, "workflows", ("id", "name", "steps", "schedule", "conditions", "enabled", "created_at", "updated_at"),
+           workflow_rows)
+    insert(conn, "workflow_templates", ("id", "name", "description", "steps", "created_at"),
+           [(f"tpl-{i:03d}", f"模板 {i}", "关键词 → 创作 → 验证", steps, created[WORKFLOWS + i])
+            for i in range(TEMPLATES)])
+
+
+def gen_workflow_executions(conn, rng, n, days, end):
+    started = timestamps(rng, n, days, end)
+    statuses = pick(rng, ["completed", "failed", "cancelled"], n, [0.85, 0.12, 0.03])
+    durations = rng.lognormal(np.log(300), 0.8, n).astype(int).tolist()
+    workflow_ids = [f"wf-{i:04d}" for i in rng.integers(WORKFLOWS, size=n)]
+    scheduled = (rng.random(n) < 0.7).tolist()
+    execution_id = 0
+    for start, size in chunks(n, 10_000):
+        executions, logs, runs = [], [], []
+        for i in range(start, start + size):
+            execution_id += 1
+            status = statuses[i]
+            completed_at = shift(started[i], durations[i])
+            items = int(rng.integers(5, 40))
+            result = {
+                "status": status,
+                "error": "429 rate limit" if status == "failed" else None,
+                "results": {
+                    "kw": {"keywords": [], "count": items},
+                    "gen": {"contents": [{"article_id": None, "keyword": f"问题{k}", "platform": PLATFORMS[0],
+                                          "chars": 1500} for k in range(min(items, 5))]},
+                    "verify": {"verify_results": {"total": items * 2, "mentioned": items, "mention_rate": 0.5}},
+                },
+                "log_counts": {"info": LOGS_PER_EXECUTION - 1, "error": 1 if status == "failed" else 0},
+            }
+            progress = {step["id"]: {"total_shards": 2, "completed": 2 if status == "completed" else 1,
+                                     "failed": 1 if status == "failed" else 0} for step in WORKFLOW_STEPS}
+            executions.append((workflow_ids[i], status, json.dumps(result, ensure_ascii=False), started[i],
+                               completed_at, result["error"], json.dumps(progress),
+                               json.dumps({"brand": BRANDS[0]}, ensure_ascii=False)))
+            for k in range(LOGS_PER_EXECUTION):
+                level = "error" if status == "failed" and k == LOGS_PER_EXECUTION - 1 else "info"
+                logs.append((execution_id, shift(started[i], k * durations[i] // LOGS_PER_EXECUTION), level,
+                             k % len(WORKFLOW_STEPS), f"步骤 {k % len(WORKFLOW_STEPS)} 分片 {k} 完成"))
+            if scheduled[i]:
+                runs.append((workflow_ids[i], "schedule", "completed" if status == "completed" else "failed",
+                             started[i], 1, execution_id, started[i], completed_at, completed_at))
+        insert(conn, "workflow_executions",
+               ("workflow_id", "status", "result", "started_at", "completed_at", "error", "progress", "context"),
+               executions)
+        insert(conn, "workflow_execution_logs", ("execution_id", "timestamp", "level", "step_index", "message"), logs)
+        # 同一工作流同一计划时间只会有一条运行记录（时间戳按秒可能碰撞）
+        conn.executemany("""
+            INSERT OR IGNORE INTO workflow_runs
+            (workflow_id, source, status, scheduled_for, attempts, execution_id, started_at, finished_at, heartbeat_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, runs)
+
+
+def gen_checkpoints(conn, rng, n, executions, days, end):
+    updated = timestamps(rng, n, days, end)
+    rows = []
+    for i in range(n):
+        run_key = f"execution:{1 + i // 20 % max(executions, 1)}"
+        status = "completed" if rng.random() < 0.95 else "failed"
+        rows.append((run_key, f"step:{i % 3}", f"item:{i}", f"{i:064x}"[-64:],
+                     json.dumps({"article_id": i}), status, None if status == "completed" else "timeout", updated[i]))
+    for start, size in chunks(n):
+        conn.executemany("""
+            INSERT OR IGNORE INTO run_checkpoints
+            (run_key, step_key, item_key, inputs_hash, output, status, error, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows[start:start + size])
+
+
+def gen_platform_accounts(conn, rng):
+    rows = []
+    for brand in BRANDS:
+        for platform in ["GitHub", "知乎", "CSDN", "微信公众号"]:
+            config = {"repo_owner": "example", "repo_name": "docs", "branch": "main"} if platform == "GitHub" else {}
+            rows.append((platform, "api" if platform == "GitHub" else "copy", f"{brand}-{platform}",
+                         f"token-{rng.integers(1 << 30)}", json.dumps(config), brand))
+    insert(conn, "platform_accounts",
+           ("platform", "account_type", "account_name", "api_key", "config_json", "brand"), rows)
+
+
+def gen_publish_records(conn, rng, n, articles, days, end):
+    created = timestamps(rng, n, days, end)
+    for start, size in chunks(n):
+        article_ids = rng.integers(1, articles + 1, size).tolist()
+        queued = (rng.random(size) < 0.4).tolist()
+        statuses = pick(rng, ["success", "failed", "pending"], size, [0.8, 0.15, 0.05])
+        platforms = pick(rng, ["GitHub", "知乎", "CSDN", "微信公众号"], size, [0.6, 0.2, 0.1, 0.1])
+        rows = []
+        for i in range(size):
+            row_id = start + i
+            status = statuses[i]
+            url = f"https://github.com/example/docs/blob/main/{article_ids[i]}.md" if status == "success" else ""
+            method = "queue" if queued[i] else ("api" if platforms[i] == "GitHub" else "copy")
+            rows.append((
+                article_ids[i], platforms[i], method, status, url, f"pub-{row_id}" if url else "",
+                "HTTP 502" if status == "failed" else "", int(status == "failed") * int(rng.integers(1, 5)),
+                created[start + i] if status == "success" else None, created[start + i],
+                f"{platforms[i]}:{article_ids[i]}:{row_id}" if queued[i] else None,
+                json.dumps({"article_id": article_ids[i]}) if queued[i] else None,
+                created[start + i] if queued[i] else None, created[start + i],
+            ))
+        insert(conn, "publish_records",
+               ("article_id", "platform", "publish_method", "publish_status", "publish_url", "publish_id",
+                "error_message", "retry_count", "published_at", "created_at", "idempotency_key", "payload",
+                "next_attempt_at", "updated_at"), rows)
+
+
+def generate(db_path: str, scale: float = 1.0, days: int = 365, article_chars: int = 1500, seed: int = 42):
+    """生成合成数据库（目标文件已存在时报错，避免覆盖真实数据）"""
+    if Path(db_path).exists():
+        raise FileExistsError(f"{db_path} 已存在，请指定新的输出路径")
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    storage = DataStorage(storage_type="sqlite", db_path=db_path)
+    rng = np.random.default_rng(seed)
+    end = np.datetime64("now", "s")
+    pool = keyword_pool(rng)
+    counts = {table: scaled(table, scale) for table in BASE_ROWS}
+
+    conn = sqlite3.connect(db_path)
+    # 一次性批量导入，关闭日志与同步以加速；中途失败直接删库重来
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    steps = [
+        ("keywords", lambda: gen_keywords(conn, rng, counts["keywords"], days, end, pool)),
+        ("articles", lambda: gen_articles(conn, rng, counts["articles"], days, end, pool, article_chars)),
+        ("optimizations", lambda: gen_optimizations(conn, rng, counts["optimizations"], days, end, article_chars)),
+        ("verify_results", lambda: gen_verify_results(conn, rng, counts["verify_results"], days, end, pool)),
+        ("api_calls", lambda: gen_api_calls(conn, rng, counts["api_calls"], days, end, pool)),
+        ("workflows", lambda: gen_workflows(conn, rng, days, end)),
+        ("workflow_executions",
+         lambda: gen_workflow_executions(conn, rng, counts["workflow_executions"], days, end)),
+        ("run_checkpoints",
+         lambda: gen_checkpoints(conn, rng, counts["run_checkpoints"], counts["workflow_executions"], days, end)),
+        ("platform_accounts", lambda: gen_platform_accounts(conn, rng)),
+        ("publish_records",
+         lambda: gen_publish_records(conn, rng, counts["publish_records"], counts["articles"], days, end)),
+    ]
+    try:
+        for table, step in steps:
+            start = time.perf_counter()
+            step()
+            conn.commit()
+            print(f"{table:<24} {time.perf_counter() - start:7.1f}s")
+    finally:
+        conn.close()
+
+    start = time.perf_counter()
+    storage.rebuild_daily_rollups()
+    print(f"{'日汇总表':<20} {time.perf_counter() - start:7.1f}s")
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("ANALYZE")
+        tables = [row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+        )]
+        return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in tables}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成合成 geo_data.db（存储层压测用）")
+    parser.add_argument("--output", default="bench_results/geo_data_synthetic.db", help="输出数据库路径（不能已存在）")
+    parser.add_argument("--scale", type=float, default=1.0, help="规模系数，1 约为 600 万行")
+    parser.add_argument("--days", type=int, default=365, help="数据时间跨度（天）")
+    parser.add_argument("--article-chars", type=int, default=1500, help="文章正文字数中位数")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = generate(args.output, args.scale, args.days, args.article_chars, args.seed)
+    size_mb = Path(args.output).stat().st_size / 1024 / 1024
+    print(f"\n已生成 {args.output}（{size_mb:.0f} MB，耗时 {time.perf_counter() - start:.0f}s）")
+    for table, count in counts.items():
+        print(f"  {table:<28} {count:>12,}")
+
+
+if __name__ == "__main__":
+    main()
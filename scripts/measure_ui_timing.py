@@ -0,0 +1,105 @@
+"""
+UI 冷启动与重跑耗时测量
+
+用 Streamlit AppTest 无头运行 geo_tool.py：
+1. 冷启动：首次运行脚本的耗时（含模块导入、建表、首屏渲染）
+2. 每个 Tab：切换到该 Tab 后重复重跑，记录墙钟耗时中位数与应用内 perf 计时（侧边栏 / 当前 Tab 分区）
+3. 每个 Tab 的 fragment 耗时：即 Tab 内控件交互时局部重跑需要支付的成本（不再重跑侧边栏与其他区块）
+
+使用方式：
+    python scripts/measure_ui_timing.py --db geo_data.db --repeat 5
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 项目根目录
+root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from modules.ui.fragment import FRAGMENT_STATE_KEY  # noqa: E402
+from modules.ui.perf import PERF_STATE_KEY, RERUN_BUDGET_MS  # noqa: E402
+
+
+def timed_run(at: AppTest) -> float:
+    """运行一次脚本，返回墙钟耗时（毫秒）"""
+    start = time.perf_counter()
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return (time.perf_counter() - start) * 1000.0
+
+
+def app_timings(at: AppTest) -> dict:
+    """读取应用内 perf 计时"""
+    try:
+        return dict(at.session_state[PERF_STATE_KEY])
+    except KeyError:
+        return {}
+
+
+def fragment_runs(at: AppTest) -> dict:
+    """读取各 Tab fragment 的 {名称: (累计运行次数, 最近一次耗时)}"""
+    try:
+        stats = at.session_state[FRAGMENT_STATE_KEY]
+    except KeyError:
+        return {}
+    return {name: (entry["runs"], entry["last_ms"]) for name, entry in stats.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测量 geo_tool.py 冷启动与各 Tab 重跑耗时")
+    parser.add_argument("--db", default=str(root / "geo_data.db"), help="用于测量的 SQLite 数据库（会复制到临时目录，不修改原文件）")
+    parser.add_argument("--repeat", type=int, default=5, help="每个 Tab 的重跑次数（取中位数）")
+    parser.add_argument("--timeout", type=float, default=120, help="单次运行超时（秒）")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if os.path.exists(args.db):
+            shutil.copy(args.db, Path(tmp) / "geo_data.db")
+        # geo_tool.py 以相对路径打开 geo_data.db
+        os.chdir(tmp)
+
+        at = AppTest.from_file(str(root / "geo_tool.py"), default_timeout=args.timeout)
+        cold_ms = timed_run(at)
+        print(f"冷启动：{cold_ms:.0f} ms")
+        print(f"{'Tab':<16} {'重跑中位数':>10} {'应用内总计':>10} {'当前 Tab':>10} {'局部重跑':>10}")
+
+        over_budget = []
+        for label in at.radio(key="active_tab").options:
+            at.radio(key="active_tab").set_value(label)
+            walls, totals, tab_ms, fragment_ms = [], [], [], []
+            for _ in range(max(1, args.repeat)):
+                before = fragment_runs(at)
+                walls.append(timed_run(at))
+                timings = app_timings(at)
+                totals.append(timings.get("total_ms", 0.0))
+                tab_ms.append(timings.get("sections", {}).get(label, 0.0))
+                # 本次运行的 fragment 即当前 Tab 的渲染函数
+                for name, (runs, last_ms) in fragment_runs(at).items():
+                    if runs > before.get(name, (0, 0.0))[0]:
+                        fragment_ms.append(last_ms)
+            wall = statistics.median(walls)
+            fragment = statistics.median(fragment_ms) if fragment_ms else 0.0
+            print(
+                f"{label:<16} {wall:>8.0f}ms {statistics.median(totals):>8.0f}ms "
+                f"{statistics.median(tab_ms):>8.0f}ms {fragment:>8.0f}ms"
+            )
+            if statistics.median(totals) > RERUN_BUDGET_MS:
+                over_budget.append(label)
+
+    if over_budget:
+        print(f"超出重跑预算 {RERUN_BUDGET_MS:.0f} ms 的 Tab：{', '.join(over_budget)}")
+    else:
+        print(f"全部 Tab 均在重跑预算 {RERUN_BUDGET_MS:.0f} ms 内")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+本地 DashScope 通义万相 mock 服务 + 配图生成基准
+
+实现 ImageSynthesis 用到的两个接口（提交异步任务、查询任务），任务在内存中按随机耗时完成，
+并统计提交数、查询数和同时运行的任务数，用于在不访问 DashScope 的情况下验证：
+1. generate_images_with_tongyi_concurrent 并发提交任务、统一轮询，结果顺序与输入一致
+2. Prompt 生成（LLM 调用）与图片合成重叠进行，单张慢图不阻塞其他图片
+3. 任务失败、查询返回 5xx 时的处理
+4. ImageAssetStore 并发下载生成的图片、按内容去重，重复导出不再请求图片地址
+
+使用方式：
+    # 只启动 mock 服务（设置 DASHSCOPE_HTTP_BASE_URL=http://127.0.0.1:8766/api/v1 后指向它）
+    python scripts/mock_dashscope_server.py --port 8766
+
+    # 对比逐张生成与并发生成：每篇 3 张图，Prompt 生成 2 秒，合成 3–8 秒
+    python scripts/mock_dashscope_server.py --bench 3 --prompt-latency 2 --min-seconds 3 --max-seconds 8
+
+    # 生成 20 张图片后下载到资源库（每次下载延迟 300 毫秒），再重复改写同一篇 Markdown
+    python scripts/mock_dashscope_server.py --assets 20 --download-latency 300
+"""
+import argparse
+import json
+import random
+import re
+import struct
+import sys
+import tempfile
+import threading
+import time
+import uuid
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# 项目根目录
+root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root))
+
+import dashscope  # noqa: E402
+
+from modules.image_asset_store import ImageAssetStore  # noqa: E402
+from modules.multimodal_prompt import MultimodalPromptGenerator  # noqa: E402
+
+
+def _png_bytes(width: int, height: int, seed: str) -> bytes:
+    """生成纯色 PNG（颜色由 seed 决定，不同任务的图片内容不同）"""
+    color = bytes.fromhex(uuid.uuid5(uuid.NAMESPACE_URL, seed).hex[:6])
+    raw = (b"\x00" + color * width) * height
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw, 1)) + chunk(b"IEND", b""))
+
+
+class MockDashScopeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: dict):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.endswith("/services/aigc/text2image/image-synthesis"):
+            return self._send(404, {"code": "NotFound", "message": self.path})
+        if self.headers.get("X-DashScope-Async") != "enable":
+            return self._send(400, {"code": "InvalidParameter", "message": "仅支持异步调用"})
+        server = self.server
+        task_id = uuid.uuid4().hex
+        with server.lock:
+            server.stats["submits"] += 1
+            duration = random.uniform(server.min_seconds, server.max_seconds)
+            server.tasks[task_id] = {
+                "prompt": body.get("input", {}).get("prompt", ""),
+                "size": body.get("parameters", {}).get("size", ""),
+                "submitted": time.monotonic(),
+                "ready": time.monotonic() + duration,
+                "failed": random.random() < server.task_fail_rate,
+            }
+        self._send(200, {
+            "request_id": uuid.uuid4().hex,
+            "output": {"task_id": task_id, "task_status": "PENDING"},
+        })
+
+    def _send_image(self, task_id: str):
+        server = self.server
+        with server.lock:
+            server.stats["downloads"] += 1
+            task = server.tasks.get(task_id)
+        if task is None:
+            return self._send(404, {"code": "NotFound", "message": "image not found"})
+        if server.download_latency:
+            time.sleep(server.download_latency)
+        width, height = (int(x) for x in (task["size"] or "1024*1024").split("*"))
+        data = _png_bytes(width, height, task_id)
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        image = re.search(r"/images/([0-9a-f]+)\.png$", self.path)
+        if image:
+            return self._send_image(image.group(1))
+        match = re.search(r"/tasks/([0-9a-f]+)$", self.path)
+        if not match:
+            return self._send(404, {"code": "NotFound", "message": self.path})
+        server = self.server
+        with server.lock:
+            server.stats["fetches"] += 1
+            task = server.tasks.get(match.group(1))
+            if task is not None:
+                running = sum(1 for t in server.tasks.values() if t["ready"] > time.monotonic())
+                server.stats["max_running"] = max(server.stats["max_running"], running)
+        if task is None:
+            return self._send(404, {"code": "NotFound", "message": "task not found"})
+        if random.random() < server.fetch_fail_rate:
+            return self._send(503, {"code": "ServiceUnavailable", "message": "mock 503"})
+
+        output = {"task_id": match.group(1)}
+        if time.monotonic() < task["ready"]:
+            output["task_status"] = "RUNNING"
+        elif task["failed"]:
+            output.update(task_status="FAILED", code="DataInspectionFailed", message="mock 任务失败")
+        else:
+            output.update(task_status="SUCCEEDED", results=[{
+                "url": f"http://127.0.0.1:{server.server_address[1]}/images/{match.group(1)}.png"
+            }])
+        self._send(200, {"request_id": uuid.uuid4().hex, "output": output, "usage": {"image_count": 1}})
+
+
+def start_mock_server(port: int = 0, min_seconds: float = 1.0, max_seconds: float = 3.0,
+                      task_fail_rate: float = 0.0, fetch_fail_rate: float = 0.0,
+                      download_latency: float = 0.0) -> ThreadingHTTPServer:
+    """在后台线程启动 mock 服务，返回 server（server.server_address[1] 为实际端口）"""
+    server = ThreadingHTTPServer(("127.0.0.1", port), MockDashScopeHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.tasks = {}
+    server.stats = {"submits": 0, "fetches": 0, "max_running": 0, "downloads": 0}
+    server.min_seconds = min_seconds
+    server.max_seconds = max_seconds
+    server.task_fail_rate = task_fail_rate
+    server.fetch_fail_rate = fetch_fail_rate
+    server.download_latency = download_latency
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_bench(count: int, prompt_latency: float, min_seconds: float, max_seconds: float,
+              task_fail_rate: float, fetch_fail_rate: float):
+    segments = [f"第 {i + 1} 段内容：GEO 优化与品牌曝光" for i in range(count)]
+    generator = MultimodalPromptGenerator()
+
+    def make_prompt(index, segment):
+        # 模拟一次 LLM 调用
+        time.sleep(prompt_latency)
+        return f"一张关于{segment}的专业配图"
+
+    print(f"{'方式':<12} {'成功':>4} {'失败':>4} {'提交':>4} {'查询':>4} {'最大并发':>8} {'耗时':>8}")
+
+    def measure(label: str, generate_all):
+        server = start_mock_server(min_seconds=min_seconds, max_seconds=max_seconds,
+                                   task_fail_rate=task_fail_rate, fetch_fail_rate=fetch_fail_rate)
+        dashscope.base_http_api_url = f"http://127.0.0.1:{server.server_address[1]}/api/v1"
+        start = time.perf_counter()
+        results = generate_all()
+        elapsed = time.perf_counter() - start
+        stats = server.stats
+        server.shutdown()
+        ok = sum(1 for r in results if r.get("success"))
+        print(f"{label:<12} {ok:>4} {len(results) - ok:>4} {stats['submits']:>4} {stats['fetches']:>4} "
+              f"{stats['max_running']:>8} {elapsed:>7.2f}s")
+        for r in results:
+            if not r.get("success"):
+                print(f"    失败：{r.get('error')}")
+        return results
+
+    def sequential():
+        # 原实现：逐张生成 Prompt，再阻塞等待 ImageSynthesis.call 完成
+        return [
+            generator.generate_image_with_tongyi(make_prompt(i, s), "mock-key", size="1280*720")
+            for i, s in enumerate(segments)
+        ]
+
+    def concurrent():
+        return generator.generate_images_with_tongyi_concurrent(
+            segments, make_prompt, "mock-key", size="1280*720", max_workers=count
+        )
+
+    measure("逐张生成", sequential)
+    results = measure("并发生成", concurrent)
+    assert [r["index"] for r in results] == list(range(count)), "结果顺序与输入不一致"
+    assert all(r["prompt"] == f"一张关于{s}的专业配图" for r, s in zip(results, segments)), "Prompt 与输入不对应"
+
+
+def run_asset_bench(count: int, download_latency: float):
+    """生成 count 张图片，下载到临时资源库并改写 Markdown，校验去重与尺寸信息"""
+    server = start_mock_server(min_seconds=0.2, max_seconds=0.5, download_latency=download_latency)
+    dashscope.base_http_api_url = f"http://127.0.0.1:{server.server_address[1]}/api/v1"
+    generator = MultimodalPromptGenerator()
+    results = generator.generate_images_with_tongyi_concurrent(
+        [f"段落 {i}" for i in range(count)], lambda index, segment: f"配图：{segment}", "mock-key",
+        size="1280*720", max_workers=8
+    )
+    images = [{"image_url": r["image_url"], "alt_text": f"配图 {r['index'] + 1}"} for r in results if r.get("success")]
+    content = "\n\n".join(f"## 第 {i} 节\n\n![{img['alt_text']}]({img['image_url']})" for i, img in enumerate(images))
+    # 同一张图片在文中引用两次
+    content += f"\n\n![重复引用]({images[0]['image_url']})"
+
+    print(f"{'步骤':<24} {'下载请求':>8} {'耗时':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        def measure(label: str, func):
+            before = server.stats["downloads"]
+            start = time.perf_counter()
+            value = func()
+            print(f"{label:<24} {server.stats['downloads'] - before:>8} {time.perf_counter() - start:>7.2f}s")
+            return value
+
+        serial_store = ImageAssetStore(f"{tmp}/serial", max_workers=1)
+        measure("逐张下载（max_workers=1）", lambda: serial_store.rewrite_markdown(content))
+        store = ImageAssetStore(f"{tmp}/assets", max_workers=8)
+        rewritten, errors = measure("并发下载（max_workers=8）", lambda: store.rewrite_markdown(content))
+        again, _ = measure("再次改写原 Markdown", lambda: store.rewrite_markdown(content))
+        localized, _ = measure("localize_images", lambda: store.localize_images(images))
+        bundle = measure("导出 ZIP", lambda: store.export_bundle(rewritten, "article.md"))
+        cdn_store = ImageAssetStore(f"{tmp}/assets", public_base_url="https://cdn.example.com/geo")
+        cdn_content, _ = measure("改写为 CDN 地址", lambda: cdn_store.rewrite_markdown(content))
+        server.shutdown()
+
+        assert not errors, errors
+        assert again == rewritten and "http://127.0.0.1" not in rewritten, "改写结果不稳定"
+        assert all(img["width"] == 1280 and img["height"] == 720 for img in localized), "尺寸信息错误"
+        assert len(store.referenced_assets(rewritten)) == len(images), "资源数不一致"
+        assert cdn_content.count("https://cdn.example.com/geo/objects/") == len(images) + 1
+        print(f"图片 {len(images)} 张，ZIP {len(bundle) // 1024} KB，示例：{localized[0]['image_url']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地 DashScope 通义万相 mock 服务 + 配图生成基准")
+    parser.add_argument("--port", type=int, default=8766, help="mock 服务端口（仅启动服务时使用）")
+    parser.add_argument("--bench", type=int, default=0, help="对比逐张与并发生成的图片数（0 表示只启动服务）")
+    parser.add_argument("--prompt-latency", type=float, default=2.0, help="模拟每次 Prompt 生成（LLM 调用）的耗时（秒）")
+    parser.add_argument("--min-seconds", type=float, default=3.0, help="单个任务的最短合成耗时（秒）")
+    parser.add_argument("--max-seconds", type=float, default=8.0, help="单个任务的最长合成耗时（秒）")
+    parser.add_argument("--task-fail-rate", type=float, default=0.0, help="任务以 FAILED 结束的概率")
+    parser.add_argument("--fetch-fail-rate", type=float, default=0.0, help="查询任务返回 503 的概率")
+    parser.add_argument("--assets", type=int, default=0, help="生成并下载到资源库的图片数（0 表示不运行）")
+    parser.add_argument("--download-latency", type=float, default=0.0, help="每次图片下载的模拟延迟（毫秒）")
+    args = parser.parse_args()
+
+    if args.assets:
+        run_asset_bench(args.assets, args.download_latency / 1000.0)
+        return
+
+    if args.bench:
+        run_bench(args.bench, args.prompt_latency, args.min_seconds, args.max_seconds,
+                  args.task_fail_rate, args.fetch_fail_rate)
+        return
+
+    server = start_mock_server(args.port, min_seconds=args.min_seconds, max_seconds=args.max_seconds,
+                               task_fail_rate=args.task_fail_rate, fetch_fail_rate=args.fetch_fail_rate,
+                               download_latency=args.download_latency / 1000.0)
+    print(f"Mock DashScope API: http://127.0.0.1:{server.server_address[1]}/api/v1")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""
+本地 GitHub API mock 服务 + 发布基准
+
+实现 GitHubPublisher 用到的接口（Contents API、Git Data API、/user），仓库数据保存在内存中，
+并统计请求数、TCP 连接数和提交数，用于在不访问 GitHub 的情况下验证：
+1. 共享 httpx.Client 的连接复用（keep-alive）
+2. publish_batch 把 N 篇文章合并为一次提交，且文件内容正确
+3. 发布队列在请求失败（包括写入成功但响应丢失）时退避重试，且每篇文章只提交一次
+
+使用方式：
+    # 只启动 mock 服务（GitHubPublisher(base_url="http://127.0.0.1:8765") 指向它）
+    python scripts/mock_github_server.py --port 8765
+
+    # 启动服务并对比三种发布方式
+    python scripts/mock_github_server.py --bench 100 --connect-latency 30
+
+    # 通过发布队列发布 200 篇，30% 的写请求在提交后返回 502（模拟响应丢失）
+    python scripts/mock_github_server.py --queue 200 --fail-rate 0.3
+"""
+import argparse
+import base64
+import hashlib
+import json
+import random
+import re
+import socket
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlparse
+
+import httpx
+
+# 项目根目录
+root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root))
+
+from modules.data_storage import DataStorage  # noqa: E402
+from platform_sync.github_publisher import GitHubPublisher, git_blob_sha  # noqa: E402
+from platform_sync.publish_queue import PublishQueue  # noqa: E402
+
+
+def _sha(kind: str, payload: str) -> str:
+    return hashlib.sha1(f"{kind}\0{payload}".encode("utf-8")).hexdigest()
+
+
+class MockRepo:
+    """内存中的单仓库：tree 简化为 {path: blob_sha} 的扁平映射"""
+
+    def __init__(self, owner: str, name: str, branch: str = "main"):
+        self.owner = owner
+        self.name = name
+        self.lock = threading.Lock()
+        self.blobs = {}
+        self.trees = {}
+        self.commits = {}
+        empty_tree = self._put_tree({})
+        self.refs = {branch: self._put_commit("init", empty_tree, [])}
+        self.commit_count = 0
+
+    def _put_tree(self, entries: dict) -> str:
+        sha = _sha("tree", json.dumps(entries, sort_keys=True))
+        self.trees[sha] = dict(entries)
+        return sha
+
+    def _put_commit(self, message: str, tree: str, parents: list) -> str:
+        sha = _sha("commit", f"{message}{tree}{parents}{time.time_ns()}")
+        self.commits[sha] = {"message": message, "tree": tree, "parents": list(parents)}
+        return sha
+
+    def put_blob(self, content: bytes) -> str:
+        sha = git_blob_sha(content)
+        self.blobs[sha] = content
+        return sha
+
+    def head_tree(self, branch: str) -> dict:
+        return self.trees[self.commits[self.refs[branch]]["tree"]]
+
+    def files(self, branch: str = "main") -> dict:
+        """分支最新提交中的 {path: 内容}"""
+        return {path: self.blobs[sha].decode("utf-8") for path, sha in self.head_tree(branch).items()}
+
+    def html_url(self, suffix: str) -> str:
+        return f"https://github.mock/{self.owner}/{self.name}/{suffix}"
+
+
+class MockGitHubHandler(BaseHTTPRequestHandler):
+    """按 GitHub REST API 形状响应；HTTP/1.1 以支持 keep-alive"""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "MockGitHub/1.0"
+
+    def setup(self):
+        super().setup()
+        # 响应头与正文分两次写出，关闭 Nagle 避免与客户端延迟 ACK 叠加出 40ms 停顿
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        stats = self.server.stats
+        with stats["lock"]:
+            stats["connections"] += 1
+        # 模拟 TLS 握手等新建连接的开销
+        if self.server.connect_latency:
+            time.sleep(self.server.connect_latency)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: dict):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+    def _dispatch(self, method: str):
+        stats = self.server.stats
+        with stats["lock"]:
+            stats["requests"] += 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        parsed = urlparse(self.path)
+        path = unquote(parsed.path)
+        query = parse_qs(parsed.query)
+
+        if path == "/user" and method == "GET":
+            return self._send(200, {"login": "mock-user"})
+
+        match = re.match(r"^/repos/([^/]+)/([^/]+)/(.+)$", path)
+        repo = self.server.repo
+        if not match or (match.group(1), match.group(2)) != (repo.owner, repo.name):
+            return self._send(404, {"message": "Not Found"})
+        rest = match.group(3)
+
+        with repo.lock:
+            if rest.startswith("contents/"):
+                return self._contents(method, rest[len("contents/"):], query)
+            if method == "GET" and rest.startswith("git/ref/heads/"):
+                branch = rest[len("git/ref/heads/"):]
+                if branch not in repo.refs:
+                    return self._send(404, {"message": "Not Found"})
+                return self._send(200, {"ref": f"refs/heads/{branch}", "object": {"sha": repo.refs[branch], "type": "commit"}})
+            if method == "GET" and rest.startswith("git/commits/"):
+                commit = repo.commits.get(rest[len("git/commits/"):])
+                if not commit:
+                    return self._send(404, {"message": "Not Found"})
+                return self._send(200, {"sha": rest[len("git/commits/"):], "tree": {"sha": commit["tree"]}})
+            if method == "POST" and rest == "git/blobs":
+                body = self._body()
+                content = base64.b64decode(body["content"]) if body.get("encoding") == "base64" else body["content"].encode("utf-8")
+                return self._send(201, {"sha": repo.put_blob(content)})
+            if method == "POST" and rest == "git/trees":
+                body = self._body()
+                entries = dict(repo.trees.get(body.get("base_tree"), {}))
+                for entry in body.get("tree", []):
+                    if entry.get("sha") not in repo.blobs:
+                        return self._send(422, {"message": f"Invalid blob sha for {entry.get('path')}"})
+                    entries[entry["path"]] = entry["sha"]
+                return self._send(201, {"sha": repo._put_tree(entries)})
+            if method == "POST" and rest == "git/commits":
+                body = self._body()
+                if body.get("tree") not in repo.trees:
+                    return self._send(422, {"message": "Invalid tree"})
+                sha = repo._put_commit(body.get("message", ""), body["tree"], body.get("parents", []))
+                return self._send(201, {"sha": sha, "html_url": repo.html_url(f"commit/{sha}")})
+            if method == "PATCH" and rest.startswith("git/refs/heads/"):
+                branch = rest[len("git/refs/heads/"):]
+                body = self._body()
+                new_sha = body.get("sha")
+                if new_sha not in repo.commits:
+                    return self._send(422, {"message": "Object does not exist"})
+                if not body.get("force") and repo.refs.get(branch) not in repo.commits[new_sha]["parents"]:
+                    return self._send(422, {"message": "Update is not a fast forward"})
+                repo.refs[branch] = new_sha
+                repo.commit_count += 1
+                return self._send(200, {"ref": f"refs/heads/{branch}", "object": {"sha": new_sha}})
+        return self._send(404, {"message": "Not Found"})
+
+    def _contents(self, method: str, file_path: str, query: dict):
+        repo = self.server.repo
+        if method == "GET":
+            branch = query.get("ref", ["main"])[0]
+            blob_sha = repo.head_tree(branch).get(file_path)
+            if not blob_sha:
+                return self._send(404, {"message": "Not Found"})
+            return self._send(200, {"sha": blob_sha, "path": file_path, "html_url": repo.html_url(f"blob/{branch}/{file_path}")})
+        if method == "PUT":
+            body = self._body()
+            branch = body.get("branch", "main")
+            tree = repo.head_tree(branch)
+            if file_path in tree and body.get("sha") != tree[file_path]:
+                return self._send(409, {"message": f"{file_path} does not match"})
+            blob_sha = repo.put_blob(base64.b64decode(body["content"]))
+            entries = dict(tree)
+            entries[file_path] = blob_sha
+            commit_sha = repo._put_commit(body.get("message", ""), repo._put_tree(entries), [repo.refs[branch]])
+            repo.refs[branch] = commit_sha
+            repo.commit_count += 1
+            # 模拟写入已生效但响应丢失（网关超时等），客户端重试时不应重复提交
+            if self.server.fail_rate and random.random() < self.server.fail_rate:
+                return self._send(502, {"message": "Bad Gateway"})
+            return self._send(201 if file_path not in tree else 200, {
+                "content": {"sha": blob_sha, "path": file_path, "html_url": repo.html_url(f"blob/{branch}/{file_path}")},
+                "commit": {"sha": commit_sha},
+            })
+        return self._send(405, {"message": "Method Not Allowed"})
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+
+def start_mock_server(port: int = 0, owner: str = "mock-owner", repo: str = "mock-repo",
+                      latency: float = 0.0, connect_latency: float = 0.0,
+                      fail_rate: float = 0.0) -> ThreadingHTTPServer:
+    """在后台线程启动 mock 服务，返回 server（server.server_address[1] 为实际端口）"""
+    server = ThreadingHTTPServer(("127.0.0.1", port), MockGitHubHandler)
+    server.daemon_threads = True
+    server.repo = MockRepo(owner, repo)
+    server.stats = {"lock": threading.Lock(), "requests": 0, "connections": 0}
+    server.latency = latency
+    server.connect_latency = connect_latency
+    server.fail_rate = fail_rate
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def snapshot(server) -> tuple:
+    with server.stats["lock"]:
+        return server.stats["requests"], server.stats["connections"], server.repo.commit_count
+
+
+def run_bench(count: int, latency: float, connect_latency: float):
+    articles = [
+        {"title": f"基准文章 {i}", "content": f"# 基准文章 {i}\n\n" + "GEO 内容。" * 200, "file_path": f"content/bench_{i}.md"}
+        for i in range(count)
+    ]
+    print(f"{'方式':<28} {'请求数':>6} {'连接数':>6} {'提交数':>6} {'耗时':>8}")
+
+    def measure(label: str, publish_all):
+        server = start_mock_server(latency=latency, connect_latency=connect_latency)
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        start = time.perf_counter()
+        ok = publish_all(base_url)
+        elapsed = time.perf_counter() - start
+        requests, connections, commits = snapshot(server)
+        print(f"{label:<28} {requests:>6} {connections:>6} {commits:>6} {elapsed:>7.2f}s")
+        files = server.repo.files()
+        server.shutdown()
+        assert ok, f"{label} 发布失败"
+        assert all(files.get(a["file_path"]) == a["content"] for a in articles), f"{label} 文件内容不一致"
+
+    def one_off(base_url):
+        # 原实现：每次请求单独建连接
+        results = []
+        for a in articles:
+            with httpx.Client(base_url=base_url) as client:
+                publisher = GitHubPublisher("token", "mock-owner", "mock-repo", base_url=base_url, client=client)
+                results.append(publisher.publish(a["content"], a["title"], a["file_path"]))
+        return all(r["success"] for r in results)
+
+    def shared(base_url):
+        results = []
+        for a in articles:
+            publisher = GitHubPublisher("token", "mock-owner", "mock-repo", base_url=base_url)
+            results.append(publisher.publish(a["content"], a["title"], a["file_path"]))
+        return all(r["success"] for r in results)
+
+    def batch(base_url):
+        publisher = GitHubPublisher("token", "mock-owner", "mock-repo", base_url=base_url)
+        return publisher.publish_batch(articles)["success"]
+
+    measure("逐篇发布（每次新建连接）", one_off)
+    measure("逐篇发布（共享连接池）", shared)
+    measure("批量发布（单次提交）", batch)
+
+
+def run_queue_bench(count: int, latency: float, fail_rate: float, workers: int):
+    """通过 PublishQueue 发布 count 篇文章，校验每篇只提交一次且内容正确"""
+    server = start_mock_server(latency=latency, fail_rate=fail_rate)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = DataStorage(storage_type="sqlite", db_path=str(Path(tmp) / "queue.db"))
+        queue = PublishQueue(
+            storage,
+            lambda platform, payload: GitHubPublisher("token", "mock-owner", "mock-repo", base_url=base_url),
+            max_workers=workers, rate_limits={"GitHub": 6000}, max_attempts=8,
+            backoff_base=0.05, backoff_max=0.5,
+        )
+        articles = []
+        for i in range(count):
+            file_path = f"content/queue_{i}.md"
+            content = f"# 队列文章 {i}\n\n" + "GEO 内容。" * 200
+            articles.append((file_path, content))
+            queue.enqueue(i + 1, "GitHub", f"队列文章 {i}", content, target=f"mock-owner/mock-repo:{file_path}", file_path=file_path)
+        # 重复入队同一内容：幂等键相同，不会产生新任务
+        duplicates = [queue.enqueue(1, "GitHub", "队列文章 0", articles[0][1],
+                                    target=f"mock-owner/mock-repo:{articles[0][0]}", file_path=articles[0][0])]
+
+        start = time.perf_counter()
+        rounds, processed, retries = 0, 0, 0
+        while storage.get_publish_queue_stats()["pending"] and rounds < 100:
+            summary = queue.drain()
+            processed += summary["processed"]
+            retries += summary["retrying"]
+            rounds += 1
+            time.sleep(0.05)
+        elapsed = time.perf_counter() - start
+        stats = storage.get_publish_queue_stats()
+
+    requests, connections, commits = snapshot(server)
+    files = server.repo.files()
+    server.shutdown()
+    print(f"文章 {count} 篇，失败率 {fail_rate:.0%}：处理 {processed} 次（其中退避重试 {retries} 次），"
+          f"{rounds} 轮，耗时 {elapsed:.2f}s")
+    print(f"请求数 {requests}，连接数 {connections}，提交数 {commits}；队列状态 {stats}")
+    assert not duplicates[0]["created"], "重复入队产生了新任务"
+    assert stats["success"] == count, "存在未成功发布的任务"
+    assert commits == count, f"提交数 {commits} 与文章数 {count} 不一致（存在重复发布）"
+    assert all(files.get(path) == content for path, content in articles), "文件内容不一致"
+    print("校验通过：每篇文章只提交一次，内容正确")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地 GitHub API mock 服务 + 发布基准")
+    parser.add_argument("--port", type=int, default=8765, help="mock 服务端口（仅启动服务时使用）")
+    parser.add_argument("--bench", type=int, default=0, help="对比三种发布方式的文章数（0 表示只启动服务）")
+    parser.add_argument("--latency", type=float, default=0.0, help="每个请求的模拟延迟（毫秒）")
+    parser.add_argument("--connect-latency", type=float, default=0.0, help="每个新连接的模拟握手延迟（毫秒）")
+    parser.add_argument("--queue", type=int, default=0, help="通过发布队列发布的文章数（0 表示不运行）")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="写请求在提交后返回 502 的概率（模拟响应丢失）")
+    parser.add_argument("--workers", type=int, default=4, help="发布队列并发数")
+    args = parser.parse_args()
+
+    if args.queue:
+        run_queue_bench(args.queue, args.latency / 1000.0, args.fail_rate, args.workers)
+        return
+
+    if args.bench:
+        run_bench(args.bench, args.latency / 1000.0, args.connect_latency / 1000.0)
+        return
+
+    server = start_mock_server(args.port, latency=args.latency / 1000.0, connect_latency=args.connect_latency / 1000.0,
+                               fail_rate=args.fail_rate)
+    print(f"Mock GitHub API: http://127.0.0.1:{server.server_address[1]}（仓库 mock-owner/mock-repo，分支 main）")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+本地 OpenAI 兼容 Chat Completions mock 服务 + LLM 网关验证
+
+实现 /chat/completions（普通响应与 stream=true 的 SSE 响应），按固定延迟返回，
+附带 usage 统计，并记录新建 TCP 连接数与请求数，用于在不访问真实提供商的情况下验证：
+1. 多个模型实例（不同温度、生成 / 验证共用同一提供商）共用 keep-alive 连接池
+2. LLMGateway 的 invoke / batch / stream 以及 `prompt | llm | parser` 链式调用都记录耗时、首 token 耗时和 token 用量
+3. 服务端返回 5xx 时记录错误
+4. 路由对冲时，卡在首 token 之前的落后一方被胜出方关闭连接，线程与连接立即释放
+
+使用方式：
+    # 只启动 mock 服务（OpenAI 兼容客户端的 base_url 设为 http://127.0.0.1:8767/v1）
+    python scripts/mock_openai_server.py --port 8767
+
+    # 对比每个模型实例独立连接与共用连接池：5 个实例各调用 8 次，每次 50 毫秒
+    python scripts/mock_openai_server.py --bench --instances 5 --calls 8 --latency 50
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# 项目根目录
+root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root))
+
+import httpx  # noqa: E402
+from langchain_core.output_parsers import StrOutputParser  # noqa: E402
+from langchain_core.prompts import PromptTemplate  # noqa: E402
+from langchain_openai import ChatOpenAI  # noqa: E402
+
+from modules.llm_gateway import LLMGateway, LLMMetrics, close_http_clients, shared_http_client  # noqa: E402
+from modules.llm_router import LLMRouter  # noqa: E402
+
+
+class MockOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.stats["connections"] += 1
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        server = self.server
+        with server.lock:
+            server.stats["requests"] += 1
+            fail = server.fail_every and server.stats["requests"] % server.fail_every == 0
+        if not self.path.endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+        time.sleep(server.latency)
+        if fail:
+            self._send_json(500, {"error": {"message": "mock server error", "type": "server_error"}})
+            return
+
+        prompt = "".join(str(m.get("content", "")) for m in request.get("messages", []))
+        words = [f"回答{i}" for i in range(server.tokens)]
+        usage = {"prompt_tokens": len(prompt), "completion_tokens": len(words),
+                 "total_tokens": len(prompt) + len(words)}
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        model = request.get("model", "mock")
+
+        if not request.get("stream"):
+            self._send_json(200, {
+                "id": completion_id, "object": "chat.completion", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": "".join(words)}}],
+                "usage": usage,
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        include_usage = (request.get("stream_options") or {}).get("include_usage")
+        for i, word in enumerate(words):
+            chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                     "model": model, "choices": [{"index": 0, "delta": {"content": word},
+                                                  "finish_reason": "stop" if i == len(words) - 1 else None}]}
+            self._send_chunk(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+            time.sleep(server.token_interval)
+        if include_usage:
+            chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                     "model": model, "choices": [], "usage": usage}
+            self._send_chunk(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+        self._send_chunk(b"data: [DONE]\n\n")
+        self._send_chunk(b"")
+
+
+def start_server(port: int = 0, latency: float = 0.05, tokens: int = 20, token_interval: float = 0.005,
+                 fail_every: int = 0) -> ThreadingHTTPServer:
+    """在后台线程启动 mock 服务，返回 server（server.stats 记录连接数 / 请求数）"""
+    server = ThreadingHTTPServer(("127.0.0.1", port), MockOpenAIHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.tokens = tokens
+    server.token_interval = token_interval
+    server.fail_every = fail_every
+    server.lock = threading.Lock()
+    server.stats = {"connections": 0, "requests": 0}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _reset(server):
+    with server.lock:
+        server.stats = {"connections": 0, "requests": 0}
+
+
+def run_bench(args):
+    server = start_server(latency=args.latency / 1000.0)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    prompt = PromptTemplate.from_template("请为关键词「{keyword}」写一段介绍")
+    inputs = [{"keyword": f"关键词{i}"} for i in range(args.calls)]
+
+    def run(label: str, make_llm):
+        _reset(server)
+        metrics = LLMMetrics()
+        start = time.perf_counter()
+        for i in range(args.instances):
+            llm = LLMGateway("OpenAI (GPT)", make_llm(round(0.1 * i, 1)), model="mock", metrics=metrics)
+            chain = prompt | llm | StrOutputParser()
+            chain.batch(inputs, {"max_concurrency": args.concurrency})
+        elapsed = time.perf_counter() - start
+        summary = metrics.summary()["OpenAI (GPT)"]
+        print(f"{label:<24} {server.stats['requests']:>6} {server.stats['connections']:>8} "
+              f"{summary['p50_ms']:>8.0f} {elapsed:>7.2f}s")
+
+    # 预热：导入与首次构建客户端的开销不计入对比
+    (prompt | ChatOpenAI(base_url=base_url, api_key="mock", model="mock", max_retries=0)).invoke(inputs[0])
+    print(f"{'场景':<24} {'请求':>6} {'新建连接':>8} {'P50 ms':>8} {'耗时':>8}")
+    # Groq / Moonshot 的 SDK 按实例创建 HTTP 客户端，这里用独立 httpx.Client 模拟
+    run("每个实例独立连接", lambda t: ChatOpenAI(
+        base_url=base_url, api_key="mock", model="mock", temperature=t, max_retries=0,
+        http_client=httpx.Client()))
+    run("共用连接池", lambda t: ChatOpenAI(
+        base_url=base_url, api_key="mock", model="mock", temperature=t, max_retries=0,
+        http_client=shared_http_client("OpenAI (GPT)")))
+
+    # 指标：invoke / stream / 错误
+    metrics = LLMMetrics()
+    llm = LLMGateway("OpenAI (GPT)", ChatOpenAI(
+        base_url=base_url, api_key="mock", model="mock", max_retries=0, stream_usage=True,
+        http_client=shared_http_client("OpenAI (GPT)")), model="mock", metrics=metrics)
+    chain = prompt | llm | StrOutputParser()
+    text = chain.invoke(inputs[0])
+    streamed = "".join(chain.stream(inputs[0]))
+    assert streamed == text, "流式输出与普通输出不一致"
+    server.fail_every = 1
+    try:
+        chain.invoke(inputs[0])
+        raise AssertionError("mock 服务返回 500 时应抛出异常")
+    except AssertionError:
+        raise
+    except Exception:
+        pass
+    server.fail_every = 0
+
+    records = metrics.records()
+    assert [r["op"] for r in records] == ["invoke", "stream", "invoke"], records
+    assert records[0]["output_tokens"] == records[1]["output_tokens"] > 0, "未记录 token 用量"
+    assert records[1]["ttft_ms"] is not None and records[1]["ttft_ms"] < records[1]["latency_ms"], "未记录首 token 耗时"
+    assert records[2]["error"], "未记录错误"
+    for r in records:
+        ttft = f"{r['ttft_ms']:.0f} ms" if r["ttft_ms"] is not None else "-"
+        print(f"{r['op']:<8} 耗时 {r['latency_ms']:>6.0f} ms  首 token {ttft:>7}  token {r['input_tokens']}+{r['output_tokens']}  "
+              f"{r['error'] or 'ok'}")
+    print("指标记录正确")
+
+    check_hedge_cancel(base_url, stall=5.0)
+    close_http_clients()
+    server.shutdown()
+
+
+def check_hedge_cancel(fast_url: str, stall: float):
+    """首选提供商卡住 stall 秒才返回响应头，对冲到正常的提供商后，卡住的调用应立即被取消而不是等到超时"""
+    slow_server = start_server(latency=stall)
+    slow_url = f"http://127.0.0.1:{slow_server.server_address[1]}/v1"
+    metrics = LLMMetrics()
+    # 使用 SDK 默认重试次数：被取消的请求会被 SDK 重试，但句柄已关闭，重试立即失败，只多出 SDK 的退避等待
+    slow = LLMGateway("DeepSeek", ChatOpenAI(base_url=slow_url, api_key="mock", model="mock", stream_usage=True,
+                                             http_client=shared_http_client("DeepSeek")),
+                      model="mock", metrics=metrics)
+    fast = LLMGateway("OpenAI (GPT)", ChatOpenAI(base_url=fast_url, api_key="mock", model="mock", stream_usage=True,
+                                                 http_client=shared_http_client("OpenAI (GPT)")),
+                      model="mock", metrics=metrics)
+    router = LLMRouter([slow, fast], prices={}, default_hedge_delay=0.2, min_hedge_delay=0.05)
+    start = time.perf_counter()
+    router.invoke("请写一段介绍")
+    won = time.perf_counter() - start
+    while not metrics.records("DeepSeek") and time.perf_counter() - start < stall * 2:
+        time.sleep(0.01)
+    freed = time.perf_counter() - start
+    record = (metrics.records("DeepSeek") or [{}])[0]
+    print(f"对冲胜出 {won:.2f}s，卡住的首选调用在 {freed:.2f}s 释放（服务端 {stall:.0f}s 后才响应），"
+          f"cancelled={record.get('cancelled')}，router.stats={router.stats}")
+    assert router.last_route()["provider"] == "OpenAI (GPT)", "成本应归属胜出方"
+    assert record.get("cancelled") and freed < stall / 2, "落后的一方未被及时取消"
+    print("对冲取消正确")
+    slow_server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI 兼容 Chat Completions mock 服务 + LLM 网关验证")
+    parser.add_argument("--port", type=int, default=8767, help="监听端口（只启动服务时使用）")
+    parser.add_argument("--latency", type=float, default=50, help="每次请求的延迟（毫秒）")
+    parser.add_argument("--bench", action="store_true", help="运行连接复用与指标验证")
+    parser.add_argument("--instances", type=int, default=5, help="模型实例数（不同温度）")
+    parser.add_argument("--calls", type=int, default=8, help="每个实例的调用次数")
+    parser.add_argument("--concurrency", type=int, default=4, help="batch 并发数")
+    args = parser.parse_args()
+
+    if args.bench:
+        run_bench(args)
+        return
+
+    server = start_server(port=args.port, latency=args.latency / 1000.0)
+    print(f"mock 服务已启动：http://127.0.0.1:{args.port}/v1")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+日汇总表重建脚本
+
+api_calls_daily / verify_results_daily 在写入明细时增量更新。
+直接用 SQL 批量导入、手工删除明细或汇总表出现偏差时，运行本脚本从明细重建。
+--check-concurrency 在临时库上用多个线程并发 save_verify_results / save_api_call，
+校验增量更新后的汇总表与明细一致（工作流分片并行验证、后台调度器与界面同时写入时的情形）。
+
+使用方式：
+    python scripts/rebuild_daily_rollups.py --db geo_data.db
+    python scripts/rebuild_daily_rollups.py --check-concurrency --writers 8
+"""
+import argparse
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# 项目根目录
+root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root))
+
+from modules.data_storage import DataStorage  # noqa: E402
+
+
+def check_concurrency(writers: int, batches: int, batch_size: int) -> bool:
+    """多线程并发写入明细，比较日汇总表合计与明细行数"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "rollup_check.db")
+        storage = DataStorage(storage_type="sqlite", db_path=db_path)
+        barrier = threading.Barrier(writers)
+        errors = []
+
+        def write(worker: int):
+            barrier.wait()
+            try:
+                for b in range(batches):
+                    storage.save_verify_results([
+                        {"问题": f"问题{worker}-{b}-{i}", "品牌": "并发校验", "验证模型": f"模型{worker % 3}",
+                         "提及次数": i % 3, "位置": "中后段" if i % 3 else "未提及"}
+                        for i in range(batch_size)
+                    ])
+                    storage.save_api_call("验证", f"提供商{worker % 3}", "model", 100, 50, 150, 0.001, 0.0072,
+                                          brand="并发校验")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=write, args=(w,)) for w in range(writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with sqlite3.connect(db_path) as conn:
+            checks = {
+                "verify_results": (
+                    conn.execute("SELECT COUNT(*) FROM verify_results").fetchone()[0],
+                    conn.execute("SELECT COALESCE(SUM(checks), 0) FROM verify_results_daily").fetchone()[0],
+                ),
+                "api_calls": (
+                    conn.execute("SELECT COUNT(*) FROM api_calls").fetchone()[0],
+                    conn.execute("SELECT COALESCE(SUM(calls), 0) FROM api_calls_daily").fetchone()[0],
+                ),
+            }
+    ok = not errors
+    for error in errors:
+        print(f"写入失败：{error}")
+    for table, (raw, daily) in checks.items():
+        print(f"{table}: 明细 {raw} 行，日汇总合计 {daily} {'✅' if raw == daily else '❌ 不一致'}")
+        ok = ok and raw == daily
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="从明细重建日汇总表")
+    parser.add_argument("--db", default=str(root / "geo_data.db"), help="SQLite 数据库路径")
+    parser.add_argument("--check-concurrency", action="store_true", help="在临时库上校验并发写入时增量汇总的正确性")
+    parser.add_argument("--writers", type=int, default=8, help="并发写入线程数（--check-concurrency）")
+    parser.add_argument("--batches", type=int, default=10, help="每个线程的写入批数（--check-concurrency）")
+    args = parser.parse_args()
+
+    if args.check_concurrency:
+        sys.exit(0 if check_concurrency(args.writers, args.batches, batch_size=5) else 1)
+
+    storage = DataStorage(storage_type="sqlite", db_path=args.db)
+    start = time.perf_counter()
+    counts = storage.rebuild_daily_rollups()
+    elapsed = time.perf_counter() - start
+    for table, rows in counts.items():
+        print(f"{table}: {rows} 行")
+    print(f"重建完成，耗时 {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+发布队列后台消费脚本
+
+在 Streamlit 进程之外持续消费 Tab9「发布队列」中的任务：按平台限速并发发布，
+失败任务指数退避后重试。可在多个进程中同时启动，租约机制保证同一任务只会被一个进程执行，
+幂等键保证重试不会重复发布。
+
+使用方式：
+    python scripts/run_publish_queue.py --db geo_data.db --workers 4
+    python scripts/run_publish_queue.py --once            # 处理完当前到期任务后退出
+"""
+import argparse
+import signal
+import sys
+from pathlib import Path
+
+# 项目根目录
+root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root))
+
+from modules.data_storage import DataStorage  # noqa: E402
+from platform_sync.publish_queue import DEFAULT_RATE_LIMITS, PublishQueue, build_publisher  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GEO 发布队列后台消费")
+    parser.add_argument("--db", default=str(root / "geo_data.db"), help="SQLite 数据库路径")
+    parser.add_argument("--workers", type=int, default=4, help="并发发布线程数")
+    parser.add_argument("--github-rate", type=float, default=DEFAULT_RATE_LIMITS["GitHub"], help="GitHub 每分钟发布次数上限")
+    parser.add_argument("--max-attempts", type=int, default=5, help="单个任务最大尝试次数")
+    parser.add_argument("--poll-interval", type=float, default=15.0, help="队列为空时的检查间隔（秒）")
+    parser.add_argument("--once", action="store_true", help="处理完当前到期任务后退出")
+    args = parser.parse_args()
+
+    storage = DataStorage(storage_type="sqlite", db_path=args.db)
+    queue = PublishQueue(
+        storage,
+        lambda platform, payload: build_publisher(storage, platform, payload.get("brand", "")),
+        max_workers=args.workers,
+        rate_limits={**DEFAULT_RATE_LIMITS, "GitHub": args.github_rate},
+        max_attempts=args.max_attempts,
+    )
+
+    def report(outcome):
+        line = f"[{outcome['status']}] 任务 {outcome['id']}（{outcome['platform']}，第 {outcome['attempts']} 次尝试）"
+        if outcome["error"]:
+            line += f"：{outcome['error']}"
+        print(line)
+
+    if args.once:
+        summary = queue.drain(on_done=report)
+        print(f"处理 {summary['processed']} 个任务：成功 {summary['success']}，稍后重试 {summary['retrying']}，失败 {summary['failed']}")
+        return
+
+    def handle_signal(signum, frame):
+        queue.stop()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+    print(f"发布队列消费启动（owner={queue.owner}，workers={args.workers}）")
+    queue.run_forever(args.poll_interval, on_done=report)
+    print("发布队列消费已停止")
+
+
+if __name__ == "__main__":
+    main()
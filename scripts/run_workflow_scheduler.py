@@ -0,0 +1,98 @@
+"""
+工作流后台调度器启动脚本
+
+在 Streamlit 进程之外运行，按工作流的 schedule 配置定时执行，
+并消费 Tab7 中“加入后台队列”提交的运行。可在多台机器/多个副本上同时启动，
+租约机制保证同一运行只会被一个副本执行。
+
+使用方式：
+    python scripts/run_workflow_scheduler.py --db geo_data.db --workers 2
+"""
+import argparse
+import json
+import signal
+import sys
+from pathlib import Path
+
+# 项目根目录
+root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root))
+
+from modules.data_storage import DataStorage  # noqa: E402
+from modules.llm_factory import model_defaults  # noqa: E402
+from modules.llm_gateway import close_http_clients, create_gateway  # noqa: E402
+from modules.llm_router import LLMRouter, routing_candidates  # noqa: E402
+from modules.workflow_callbacks import build_workflow_callbacks  # noqa: E402
+from modules.workflow_scheduler import WorkflowScheduler  # noqa: E402
+
+
+def load_config(config_path: Path) -> dict:
+    """读取与 Streamlit 主程序相同的 config.json"""
+    if not config_path.exists():
+        return {}
+    with config_path.open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data if isinstance(data, dict) else {}
+
+
+def make_callbacks_factory(cfg: dict):
+    """根据配置构建 LLM，并返回回调工厂（LLM 只构建一次，供所有运行复用）"""
+    temperature = float(cfg.get("temperature", 0.7))
+    gen_llm = None
+    if cfg.get("gen_provider") and cfg.get("gen_api_key"):
+        try:
+            gen_llm = create_gateway(cfg["gen_provider"], cfg["gen_api_key"], model_defaults(cfg["gen_provider"]), temperature)
+        except Exception as e:
+            print(f"[WARNING] 生成LLM加载失败：{e}")
+
+    verify_llms = {}
+    for vp in cfg.get("verify_providers", []):
+        key = cfg.get("verify_keys", {}).get(vp, "").strip()
+        if not key:
+            continue
+        try:
+            verify_llms[vp] = create_gateway(vp, key, model_defaults(vp), temperature)
+        except Exception as e:
+            print(f"[WARNING] {vp}验证LLM加载失败：{e}")
+
+    if gen_llm is not None and cfg.get("gen_routing"):
+        routed = [gen_llm] + [verify_llms[p] for p, _ in routing_candidates(cfg)[1:] if p in verify_llms]
+        if len(routed) > 1:
+            gen_llm = LLMRouter(routed)
+
+    return lambda: build_workflow_callbacks(gen_llm, verify_llms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GEO 工作流后台调度器")
+    parser.add_argument("--db", default=str(root / "geo_data.db"), help="SQLite 数据库路径")
+    parser.add_argument("--config", default=str(root / "config.json"), help="配置文件路径")
+    parser.add_argument("--workers", type=int, default=2, help="工作线程数")
+    parser.add_argument("--poll-interval", type=float, default=15.0, help="队列扫描间隔（秒）")
+    parser.add_argument("--lease-seconds", type=int, default=300, help="运行租约时长（秒）")
+    args = parser.parse_args()
+
+    cfg = load_config(Path(args.config))
+    storage = DataStorage(storage_type="sqlite", db_path=args.db)
+    scheduler = WorkflowScheduler(
+        storage,
+        callbacks_factory=make_callbacks_factory(cfg),
+        context={"brand": cfg.get("brand", ""), "advantages": cfg.get("advantages", "")},
+        max_workers=args.workers,
+        poll_interval=args.poll_interval,
+        lease_seconds=args.lease_seconds,
+    )
+
+    def handle_signal(signum, frame):
+        scheduler.stop()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+    try:
+        scheduler.run_forever()
+    finally:
+        close_http_clients()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+多提供商路由与对冲请求模拟
+
+用带随机延迟（对数正态 + 按比例出现的长尾，如限流排队）的模拟提供商替代真实模型，
+对同一批生成请求对比：
+1. 只用配置的生成模型（原方式）
+2. 按最近 P50 延迟与成本路由，不对冲
+3. 路由 + 对冲：首选请求超过其 P95 仍未完成时向次优提供商再发一份，落后的一方被取消
+输出单请求耗时的 P50 / P95 / P99、总耗时、各提供商调用数、对冲次数与被取消的调用数，
+以及按 resolve_route 记录成本时各提供商的归属次数（对冲时应归属胜出方）。
+
+使用方式：
+    python scripts/simulate_llm_routing.py --requests 200 --concurrency 8 --scale 0.1
+"""
+import argparse
+import math
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+# 项目根目录
+root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root))
+
+from modules.concurrency import run_ordered  # noqa: E402
+from modules.llm_gateway import LLMGateway, LLMMetrics, percentile  # noqa: E402
+from modules.llm_router import LLMRouter, resolve_route  # noqa: E402
+
+
+class FakeProviderChat(BaseChatModel):
+    """
+    模拟提供商：首 token 延迟服从对数正态分布，tail_rate 比例的请求延迟放大 tail_factor 倍；
+    第 slow_from 到 slow_until 次调用整体放慢 slow_factor 倍（模拟一段时间的限流 / 拥塞）
+    """
+
+    p50: float
+    tail_rate: float = 0.0
+    tail_factor: float = 6.0
+    slow_from: int = 0
+    slow_until: int = 0
+    slow_factor: float = 1.0
+    fail_rate: float = 0.0
+    tokens: int = 10
+    token_interval: float = 0.02
+    scale: float = 1.0
+    seed: int = 0
+
+    _rng: Any = PrivateAttr()
+    _lock: Any = PrivateAttr()
+    _stats: Any = PrivateAttr()
+
+    def __init__(self, **data: Any):
+        super().__init__(**data)
+        self._rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "aborted": 0, "tokens_saved": 0}
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-provider"
+
+    def _sample(self):
+        with self._lock:
+            self._stats["calls"] += 1
+            latency = self.p50 * math.exp(self._rng.gauss(0, 0.25))
+            if self.slow_from <= self._stats["calls"] < self.slow_until:
+                latency *= self.slow_factor
+            if self._rng.random() < self.tail_rate:
+                latency *= self.tail_factor
+            fail = self._rng.random() < self.fail_rate
+        return latency * self.scale, fail
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[Any] = None, **kwargs: Any) -> ChatResult:
+        latency, fail = self._sample()
+        time.sleep(latency + self.tokens * self.token_interval * self.scale)
+        if fail:
+            raise RuntimeError("模拟提供商返回 429")
+        message = AIMessage(content="字" * self.tokens,
+                            usage_metadata={"input_tokens": 50, "output_tokens": self.tokens, "total_tokens": 50 + self.tokens})
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Optional[Any] = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        latency, fail = self._sample()
+        time.sleep(latency)
+        if fail:
+            raise RuntimeError("模拟提供商返回 429")
+        sent = 0
+        try:
+            for i in range(self.tokens):
+                usage = None
+                if i == self.tokens - 1:
+                    usage = {"input_tokens": 50, "output_tokens": self.tokens, "total_tokens": 50 + self.tokens}
+                yield ChatGenerationChunk(message=AIMessageChunk(content="字", usage_metadata=usage))
+                sent += 1
+                time.sleep(self.token_interval * self.scale)
+        except GeneratorExit:
+            # 调用方关闭流：剩余 token 不再生成
+            with self._lock:
+                self._stats["aborted"] += 1
+                self._stats["tokens_saved"] += self.tokens - sent
+            raise
+
+
+def make_providers(scale: float) -> List[FakeProviderChat]:
+    return [
+        # 配置的生成模型：最快、最便宜，但 4% 的请求排队变慢，且第 60–120 次调用期间被限流（整体慢 5 倍）
+        FakeProviderChat(name="DeepSeek", p50=1.0, tail_rate=0.04, tail_factor=6.0,
+                         slow_from=60, slow_until=120, slow_factor=5.0, scale=scale, seed=1),
+        FakeProviderChat(name="Moonshot (Kimi)", p50=1.2, tail_rate=0.02, tail_factor=4.0, scale=scale, seed=2),
+        FakeProviderChat(name="OpenAI (GPT)", p50=1.6, tail_rate=0.01, tail_factor=3.0, scale=scale, seed=3),
+    ]
+
+
+def run_scenario(label: str, requests: int, concurrency: int, scale: float, mode: str):
+    metrics = LLMMetrics()
+    models = make_providers(scale)
+    gateways = [LLMGateway(m.name, m, model="fake", metrics=metrics) for m in models]
+    if mode == "single":
+        llm = gateways[0]
+        router = None
+    else:
+        router = LLMRouter(gateways, hedge=(mode == "hedge"), max_age=30.0 * scale,
+                           default_hedge_delay=3.0 * scale, min_hedge_delay=0.05 * scale)
+        llm = router
+
+    def call(i):
+        start = time.perf_counter()
+        llm.invoke(f"请为关键词 {i} 写一段介绍")
+        elapsed = time.perf_counter() - start
+        return elapsed, resolve_route(llm, gateways[0].provider)[0]
+
+    start = time.perf_counter()
+    outcomes = run_ordered(call, range(requests), max_workers=concurrency)
+    elapsed = time.perf_counter() - start
+
+    latencies = [o["result"][0] / scale for o in outcomes if o["error"] is None]
+    attributed = {}
+    for o in outcomes:
+        if o["error"] is None:
+            attributed[o["result"][1]] = attributed.get(o["result"][1], 0) + 1
+    failed = sum(1 for o in outcomes if o["error"])
+    calls = {m.name: m._stats["calls"] for m in models}
+    aborted = sum(m._stats["aborted"] for m in models)
+    saved = sum(m._stats["tokens_saved"] for m in models)
+    total_calls = sum(calls.values())
+    print(f"\n【{label}】")
+    print(f"  单请求耗时（按原始时间尺度）：P50 {percentile(latencies, 50):.2f}s  "
+          f"P95 {percentile(latencies, 95):.2f}s  P99 {percentile(latencies, 99):.2f}s  "
+          f"最大 {max(latencies):.2f}s")
+    print(f"  总耗时 {elapsed / scale:.1f}s，失败 {failed}，提供商调用 {total_calls}"
+          f"（额外 {total_calls - requests}，{(total_calls - requests) / requests:.0%}）")
+    print("  各提供商调用：" + "，".join(f"{name} {n}" for name, n in calls.items()))
+    print("  成本归属：" + "，".join(f"{name} {n}" for name, n in attributed.items()))
+    if router is not None:
+        s = router.stats
+        print(f"  对冲 {s['hedged']}（对冲胜出 {s['hedge_wins']}），失败转移 {s['failovers']}，"
+              f"被取消 {aborted}（省下 {saved} 个输出 token）")
+    return percentile(latencies, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="多提供商路由与对冲请求模拟")
+    parser.add_argument("--requests", type=int, default=200, help="请求数")
+    parser.add_argument("--concurrency", type=int, default=8, help="并发数")
+    parser.add_argument("--scale", type=float, default=0.1, help="时间缩放（0.1 表示按 1/10 时间运行）")
+    args = parser.parse_args()
+
+    single = run_scenario("只用配置的生成模型", args.requests, args.concurrency, args.scale, "single")
+    routed = run_scenario("延迟 / 成本路由", args.requests, args.concurrency, args.scale, "route")
+    hedged = run_scenario("路由 + 对冲", args.requests, args.concurrency, args.scale, "hedge")
+    print(f"\nP99：{single:.2f}s → {routed:.2f}s → {hedged:.2f}s")
+
+
+if __name__ == "__main__":
+    main()